@@ -24,13 +24,13 @@ import statistics
 from typing import Any, Dict, List, Callable, Set, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tabulate import tabulate
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from seqrule import AbstractObject, DSLRule
-from seqrule.analysis import RuleAnalyzer, RuleScorer, ComplexityScore
+from seqrule.analysis import BatchAnalysisResult, RuleAnalyzer, RuleScorer, ComplexityScore
 from seqrule.rulesets.general import create_property_match_rule
 from seqrule.rulesets import general
 
@@ -373,6 +373,18 @@ def create_example_rule(generator: Callable) -> Any:
         return f"Failed to create example rule: {str(e)}"
 
 
+def build_example_rule(name: str) -> Any:
+    """Create the example rule for a generator in general.py by name.
+
+    Runs in the analyzer's worker processes, since factory-built rules are
+    closures and can't be sent to them.
+    """
+    rule = create_example_rule(getattr(general, name))
+    if isinstance(rule, str):  # Error occurred
+        raise ValueError(rule)
+    return rule
+
+
 def benchmark_rule(rule: DSLRule, sequences: List[List[AbstractObject]], 
                   num_runs: int = 5) -> BenchmarkResult:
     """Benchmark a rule with given sequences."""
@@ -413,6 +425,22 @@ def benchmark_rule(rule: DSLRule, sequences: List[List[AbstractObject]],
     )
 
 
+# Worker-process state for benchmarking, populated once per worker
+_worker_sequences: Dict[int, List[List[AbstractObject]]] = {}
+
+
+def _init_benchmark_worker(sequences: Dict[int, List[List[AbstractObject]]]) -> None:
+    """Give a benchmark worker the test sequences once."""
+    global _worker_sequences
+    _worker_sequences = sequences
+
+
+def benchmark_generator(name: str) -> List[BenchmarkResult]:
+    """Benchmark a generator's example rule at every sequence size in a worker."""
+    rule = build_example_rule(name)
+    return [benchmark_rule(rule, size_sequences) for size_sequences in _worker_sequences.values()]
+
+
 def extract_example_usage(generator: Callable, name: str) -> str:
     """Extract example usage from docstring and test files."""
     doc = inspect.getdoc(generator) or ""
@@ -454,15 +482,17 @@ def extract_example_usage(generator: Callable, name: str) -> str:
 
 
 def analyze_rule_generator(name: str, generator: Callable, 
-                         sequences: Dict[int, List[List[AbstractObject]]],
-                         analyzer: RuleAnalyzer, scorer: RuleScorer) -> RuleAnalysisResult:
-    """Perform comprehensive analysis of a rule generator."""
+                         batch_result: BatchAnalysisResult, benchmarks: List[BenchmarkResult],
+                         scorer: RuleScorer) -> RuleAnalysisResult:
+    """Perform comprehensive analysis of a rule generator.
+
+    The rule analysis and benchmarks are computed in worker processes; this
+    combines them with scores and usage examples.
+    """
     doc = inspect.getdoc(generator) or ""
     signature = str(inspect.signature(generator))
     
-    example_rule = create_example_rule(generator)
-    
-    if isinstance(example_rule, str):  # Error occurred
+    if not batch_result.ok:
         return RuleAnalysisResult(
             name=name,
             signature=signature,
@@ -473,13 +503,12 @@ def analyze_rule_generator(name: str, generator: Callable,
             properties_accessed={},
             optimization_suggestions=[],
             example_usage="",
-            error=example_rule,
+            error=f"{batch_result.error}\n{batch_result.traceback}",
             size_time_correlation=None
         )
-    
+
     try:
-        # Analyze the rule
-        analysis = analyzer.analyze(example_rule)
+        analysis = batch_result.analysis
         
         # Convert property access info to serializable format
         properties_info = {}
@@ -498,12 +527,6 @@ def analyze_rule_generator(name: str, generator: Callable,
         if analysis.performance.size_time_correlation is not None:
             size_time_correlation = float(analysis.performance.size_time_correlation)
         
-        # Run benchmarks
-        benchmarks = []
-        for size, size_sequences in sequences.items():
-            benchmark = benchmark_rule(example_rule, size_sequences)
-            benchmarks.append(benchmark)
-        
         # Get complexity analysis
         complexity_info = {
             "time_complexity": str(analysis.complexity.time_complexity),
@@ -755,23 +778,39 @@ def main():
     
     print(f"Analyzing {len(generators)} rule generators...")
     
-    # Use ThreadPoolExecutor for parallel analysis
-    with ThreadPoolExecutor() as executor:
+    # Analyze the rules in worker processes; each worker gets the test
+    # sequences once and builds its rules from their generator names
+    batch_results = {
+        batch_result.name: batch_result
+        for batch_result in analyzer.analyze_many(list(generators), build=build_example_rule)
+    }
+
+    # Benchmark the analyzed rules in worker processes too
+    benchmarks: Dict[str, List[BenchmarkResult]] = {}
+    with ProcessPoolExecutor(
+        initializer=_init_benchmark_worker, initargs=(sequences,)
+    ) as executor:
         future_to_name = {
-            executor.submit(
-                analyze_rule_generator, name, generator, sequences, analyzer, scorer
-            ): name
-            for name, generator in generators.items()
+            executor.submit(benchmark_generator, name): name
+            for name, batch_result in batch_results.items()
+            if batch_result.ok
         }
-        
         for future in as_completed(future_to_name):
             name = future_to_name[future]
             try:
-                result = future.result()
-                results.append(result)
-                print(f"✓ Analyzed {name}")
+                benchmarks[name] = future.result()
             except Exception as e:
-                print(f"✗ Failed to analyze {name}: {str(e)}")
+                print(f"✗ Failed to benchmark {name}: {str(e)}")
+
+    for name, generator in generators.items():
+        result = analyze_rule_generator(
+            name, generator, batch_results[name], benchmarks.get(name, []), scorer
+        )
+        results.append(result)
+        if result.error is None:
+            print(f"✓ Analyzed {name}")
+        else:
+            print(f"✗ Failed to analyze {name}: {result.error.splitlines()[0]}")
     
     # Apply batch normalization to all scores
     print("\nApplying batch normalization to scores...")
@@ -8,7 +8,13 @@ This module provides tools for analyzing sequence rules, including:
 - Property access tracking
 """
 
-from .analyzer import AnalyzerOptions, RuleAnalysis, RuleAnalyzer
+from .analyzer import (
+    AnalyzerOptions,
+    BatchAnalysisResult,
+    RuleAnalysis,
+    RuleAnalyzer,
+)
+from .automata import ExactComparison, RuleAutomaton, compare_exact, compile_rule
 from .base import (
     AnalysisError,
     ComplexityClass,
@@ -17,15 +23,36 @@ from .base import (
     PropertyAccessType,
     ValidatedAccessTypeSet,
 )
-from .complexity import ComplexityAnalyzer, RuleComplexity
+from .cache import AnalysisCache, analysis_key, corpus_fingerprint, rule_fingerprint
+from .comparison import ComparisonStats, compare_stream
+from .complexity import ComplexityAnalyzer, Hotspot, RuleComplexity
+from .cost import CostModel, build_cost_model
+from .instrumentation import (
+    InstrumentedObject,
+    PropertyCounts,
+    apply_property_counts,
+    count_property_access,
+)
+from .lineprof import LineProfile, LineProfiler, LineStats
 from .performance import (
     HAS_MEMORY_PROFILER,
     HAS_SCIPY,
+    AllocationSite,
+    AllocationStats,
     PerformanceProfile,
     PerformanceProfiler,
+    TimingStats,
 )
 from .property import PropertyAnalyzer, PropertyVisitor
-from .scoring import RuleScore, RuleScorer
+from .scaling import ModelFit, ScalingAnalyzer, ScalingResult, fit_complexity
+from .scoring import (
+    QuantileSketch,
+    RuleScore,
+    RuleScorer,
+    ScoreSummary,
+    ScoreTable,
+)
+from .shrinking import SequenceShrinker, ShrinkResult
 
 __all__ = [
     # Base types
@@ -38,19 +65,59 @@ __all__ = [
     # Complexity analysis
     "RuleComplexity",
     "ComplexityAnalyzer",
+    "Hotspot",
     # Performance profiling
     "PerformanceProfile",
     "PerformanceProfiler",
+    "TimingStats",
+    "AllocationStats",
+    "AllocationSite",
     "HAS_MEMORY_PROFILER",
     "HAS_SCIPY",
+    # Line profiling
+    "LineProfiler",
+    "LineProfile",
+    "LineStats",
     # Property access tracking
     "PropertyVisitor",
     "PropertyAnalyzer",
+    # Empirical complexity fitting
+    "ScalingAnalyzer",
+    "ScalingResult",
+    "ModelFit",
+    "fit_complexity",
+    # Runtime property-access counting
+    "PropertyCounts",
+    "InstrumentedObject",
+    "count_property_access",
+    "apply_property_counts",
+    # Cost models
+    "CostModel",
+    "build_cost_model",
     # Rule scoring
     "RuleScore",
     "RuleScorer",
+    "QuantileSketch",
+    "ScoreSummary",
+    "ScoreTable",
+    # Rule comparison
+    "ComparisonStats",
+    "compare_stream",
+    "ExactComparison",
+    "RuleAutomaton",
+    "compare_exact",
+    "compile_rule",
+    # Failing sequence shrinking
+    "SequenceShrinker",
+    "ShrinkResult",
+    # Analysis caching
+    "AnalysisCache",
+    "analysis_key",
+    "rule_fingerprint",
+    "corpus_fingerprint",
     # Main analyzer
     "RuleAnalysis",
     "RuleAnalyzer",
     "AnalyzerOptions",
+    "BatchAnalysisResult",
 ]
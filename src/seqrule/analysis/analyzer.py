@@ -9,20 +9,317 @@ This module provides the main RuleAnalyzer class that coordinates all analysis c
 """
 
 import ast
+import functools
 import inspect
+import os
 import statistics
 import textwrap
+import traceback
 import types
+import weakref
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
 
 from ..core import AbstractObject, FormalRule, Sequence
 from ..dsl import DSLRule
+from .automata import compare_exact
 from .base import AnalysisError, ComplexityClass, PropertyAccessType
+from .cache import AnalysisCache, analysis_key
+from .comparison import compare_stream
 from .complexity import ComplexityAnalyzer, RuleComplexity
+from .cost import CostModel, build_cost_model
+from .instrumentation import (
+    PropertyCounts,
+    apply_property_counts,
+    count_property_access,
+)
 from .performance import PerformanceProfile, PerformanceProfiler
 from .property import PropertyAccess, PropertyAnalyzer
+from .scaling import ScalingAnalyzer, ScalingResult
 from .scoring import RuleScorer
+from .shrinking import SequenceShrinker
+
+# Names a rule may use without defining them
+_BUILTIN_NAMES = frozenset(
+    {
+        # Python built-ins
+        "len",
+        "range",
+        "enumerate",
+        "sorted",
+        "sum",
+        "min",
+        "max",
+        "all",
+        "any",
+        "zip",
+        "map",
+        "filter",
+        "list",
+        "tuple",
+        "set",
+        "dict",
+        "seq",
+        "obj",
+        "properties",
+        "value",
+        "type",
+        "group",
+        "ValueError",
+        "TypeError",
+        "IndexError",
+        "KeyError",
+        "Exception",
+        "isinstance",
+        "str",
+        "int",
+        "float",
+        "bool",
+        "True",
+        "False",
+        "None",
+        # Additional built-ins commonly used in rules
+        "abs",
+        "round",
+        "pow",
+        "divmod",
+        "complex",
+        "hash",
+        "hex",
+        "oct",
+        "bin",
+        "chr",
+        "ord",
+        "format",
+        "repr",
+        "bytes",
+        "bytearray",
+        "memoryview",
+        # Common math operations
+        "ceil",
+        "floor",
+        "trunc",
+        "exp",
+        "log",
+        "log10",
+        # Commonly used in rules
+        # Common types
+        "Sequence",
+        "AbstractObject",
+        "List",
+        "Dict",
+        "Set",
+        "Tuple",
+        "Optional",
+        "Union",
+        "Any",
+        "Callable",
+        "TypeVar",
+        "Generic",
+    }
+)
+
+# Parameters of the rule factories in seqrule.rulesets. Rules built by a factory
+# close over these, but the names can't be recovered from the closure cells.
+_FACTORY_PARAMETERS = (
+    "property_name",
+    "value",
+    "min_value",
+    "max_value",
+    "tolerance",
+    "pattern",
+    "condition",
+    "window",
+    "group_size",
+    "trend",
+    "groups",
+    "dependencies",
+    "rules",
+    "required_count",
+    "min_length",
+    "max_length",
+    "inner_rule",
+    "mode",
+    "min_ratio",
+    "max_ratio",
+    "filter_rule",
+    "valid_transitions",
+    "stat_func",
+    "scope",
+    "properties",
+)
+
+# Modules and math functions rules commonly use without importing them
+_COMMON_MODULES = ("math", "random", "statistics", "collections", "itertools")
+_MATH_FUNCTIONS = ("sqrt", "sin", "cos", "tan", "log", "exp")
+
+
+class UndefinedVariableVisitor(ast.NodeVisitor):
+    """Collects the names a rule defines and the names it uses."""
+
+    def __init__(self, closure_vars=None):
+        self.defined_names = set(_BUILTIN_NAMES)
+        # Add closure variables if provided
+        if closure_vars:
+            self.defined_names.update(closure_vars)
+        self.used_names = set()
+        self.imports = set()
+
+    def generic_visit(self, node):
+        self.record(node)
+        super().generic_visit(node)
+
+    def record(self, node: ast.AST) -> None:
+        """Record the names a single node defines or uses."""
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Store):
+                self.defined_names.add(node.id)
+            elif isinstance(node.ctx, ast.Load):
+                self.used_names.add(node.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.asname:
+                    self.defined_names.add(alias.asname)
+                if isinstance(node, ast.Import) or not alias.asname:
+                    self.defined_names.add(alias.name)
+                self.imports.add(alias.name)
+        elif isinstance(node, ast.FunctionDef):
+            # Add the function and its parameters to defined names
+            self.defined_names.add(node.name)
+            for arg in node.args.args:
+                self.defined_names.add(arg.arg)
+
+    def check(self) -> None:
+        """
+        Check that every used name is defined.
+
+        Raises:
+            AnalysisError: If undefined variables are found
+        """
+        undefined = self.used_names - self.defined_names
+        if not undefined:
+            return
+
+        # Try to provide more context about the undefined variable
+        undefined_var = next(iter(undefined))
+        # Check if it might be a module that needs to be imported
+        if undefined_var in _COMMON_MODULES:
+            raise AnalysisError(
+                f"Missing import for module: {undefined_var}. Add 'import {undefined_var}' to the rule."
+            )
+        # Check if it might be a common function from a module
+        elif undefined_var in _MATH_FUNCTIONS:
+            raise AnalysisError(
+                f"Missing import for math function: {undefined_var}. Add 'import math' and use 'math.{undefined_var}'."
+            )
+        # Check if it might be a parameter from the factory function
+        elif undefined_var in _FACTORY_PARAMETERS:
+            # This is likely a closure variable from a factory function
+            self.defined_names.add(undefined_var)
+            undefined = self.used_names - self.defined_names
+            if undefined:
+                # If there are still undefined variables, raise an error
+                raise AnalysisError(
+                    f"Undefined variable in rule: {next(iter(undefined))}"
+                )
+        # General case
+        else:
+            raise AnalysisError(f"Undefined variable in rule: {undefined_var}")
+
+
+def _closure_names(func: Callable) -> Set[str]:
+    """Names a rule may use from the factory function that created it."""
+    code = getattr(func, "__code__", None)
+    names = set(getattr(code, "co_freevars", ()))
+    try:
+        for cell in getattr(func, "__closure__", None) or ():
+            # Keep accepting the common parameter names of rule factories, which
+            # rules analyzed through wrappers may refer to
+            if isinstance(
+                cell.cell_contents, (str, int, float, bool, list, dict, set)
+            ):
+                return names | set(_FACTORY_PARAMETERS)
+    except Exception:
+        # If we can't extract closure variables, continue without them
+        pass
+    return names
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_code(code: types.CodeType, filename: str) -> ast.AST:
+    """
+    Parse the source of a code object.
+
+    Trees are shared between callers and must not be modified. The filename is
+    part of the cache key because equal code objects may come from different
+    files.
+    """
+    return ast.parse(textwrap.dedent(inspect.getsource(code)))
+
+
+def _first_line(func: Callable) -> int:
+    """Line number of a rule function's first source line in its file."""
+    code = getattr(inspect.unwrap(func), "__code__", None)
+    return code.co_firstlineno if isinstance(code, types.CodeType) else 1
+
+
+def _decision_points(node: ast.AST) -> int:
+    """Number of branches a single node adds to the cyclomatic complexity."""
+    # Count control flow statements
+    if isinstance(node, (ast.If, ast.For, ast.While)):
+        return 1
+    # Count boolean operations (and, or)
+    if isinstance(node, ast.BoolOp):
+        return len(node.values) - 1
+    # Count comparison operations with multiple comparators
+    if isinstance(node, ast.Compare):
+        return len(node.ops) - 1
+    # Count list/set comprehensions and generator expressions: 1 for each
+    # generator (for clause) and 1 for each if clause in the generators
+    if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
+        return len(node.generators) + sum(len(gen.ifs) for gen in node.generators)
+    # Count lambda functions
+    if isinstance(node, ast.Lambda):
+        return 1
+    # Count try/except blocks: 1 for each except clause
+    if isinstance(node, ast.Try):
+        return len(node.handlers)
+    # Count with blocks
+    if isinstance(node, ast.With):
+        return 1
+    return 0
+
+
+def _calls(node: ast.AST, name: str) -> bool:
+    """Whether a node is a call of the function with the given name."""
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == name
+    )
+
+
+@dataclass
+class _AstScan:
+    """Everything learned about a rule from a single traversal of its AST."""
+
+    names: UndefinedVariableVisitor
+    complexity_features: Dict[str, Any]
+    ast_patterns: Dict[str, Any]
+    cyclomatic_complexity: int
+    node_count: int
 
 
 @dataclass
@@ -36,6 +333,8 @@ class RuleAnalysis:
     optimization_suggestions: List[str]
     ast_node_count: int
     cyclomatic_complexity: int
+    property_counts: Optional[PropertyCounts] = None
+    cost_model: Optional[CostModel] = None
 
     def __post_init__(self):
         """Generate optimization suggestions after initialization."""
@@ -187,6 +486,29 @@ class AnalyzerOptions:
     max_sequence_length: int = 100
     min_coverage: float = 0.9
     cache_results: bool = False
+    cache_path: Optional[str] = None
+    cache_max_bytes: int = 64 * 1024 * 1024
+    benchmark: bool = False
+    allocation_profiling: bool = False
+    line_profiling: bool = False
+    runtime_property_counts: bool = False
+    cost_model: bool = False
+
+
+@dataclass
+class BatchAnalysisResult:
+    """Outcome of analyzing one rule of a batch with RuleAnalyzer.analyze_many."""
+
+    index: int
+    name: str
+    analysis: Optional[RuleAnalysis] = None
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the rule was analyzed successfully."""
+        return self.analysis is not None
 
 
 class RuleAnalyzer:
@@ -196,6 +518,10 @@ class RuleAnalyzer:
         """Initialize the analyzer with default options."""
         self._options = AnalyzerOptions()
         self._cache = {}
+        self._disk_cache: Optional[AnalysisCache] = None
+        self._cost_models: weakref.WeakKeyDictionary[Callable, CostModel] = (
+            weakref.WeakKeyDictionary()
+        )
         self._sequences = []
 
         # Initialize component analyzers
@@ -224,6 +550,7 @@ class RuleAnalyzer:
                     )
 
         self._sequences = sequences
+        self._cost_models.clear()
         return self
 
     def with_options(self, **kwargs) -> "RuleAnalyzer":
@@ -235,6 +562,27 @@ class RuleAnalyzer:
                 raise ValueError(f"Unknown option: {key}")
         return self
 
+    def _persistent_cache(self) -> Optional[AnalysisCache]:
+        """Get the on-disk cache configured by the cache_path option, if any."""
+        path = self._options.cache_path
+        if path is None:
+            return None
+        if self._disk_cache is None or self._disk_cache.path != path:
+            self._disk_cache = AnalysisCache(path, self._options.cache_max_bytes)
+        self._disk_cache.max_bytes = self._options.cache_max_bytes
+        return self._disk_cache
+
+    def _cached_analysis(self, key: str) -> Optional[RuleAnalysis]:
+        """Look an analysis up in memory, then on disk."""
+        analysis = self._cache.get(key)
+        if analysis is None:
+            disk_cache = self._persistent_cache()
+            if disk_cache is not None:
+                analysis = disk_cache.get(key)
+                if analysis is not None:
+                    self._cache[key] = analysis
+        return analysis
+
     def with_sequence_generator(
         self, generator: Callable[[int], List[Sequence]]
     ) -> "RuleAnalyzer":
@@ -246,6 +594,10 @@ class RuleAnalyzer:
         """
         Analyze a rule for complexity, performance, and optimization opportunities.
 
+        With the ``cache_results`` option, results are reused for rules whose
+        source, closure values, sample sequences and options are unchanged.
+        Setting ``cache_path`` also persists them in an on-disk cache.
+
         Args:
             rule: The rule to analyze
 
@@ -262,270 +614,75 @@ class RuleAnalyzer:
             else:
                 func = rule
 
-            # Get the source code
+            # Parse the source code
             try:
-                source = inspect.getsource(func)
+                tree = self._parse_rule(func)
             except (TypeError, OSError) as e:
                 raise AnalysisError(f"Could not get source code for rule: {str(e)}") from e
 
-            # Parse the AST
-            source = textwrap.dedent(source)  # Remove common leading whitespace
-            tree = ast.parse(source)
+            cache_key = None
+            if self._options.cache_results:
+                # Rules that can't be fingerprinted get no key and aren't cached
+                cache_key = analysis_key(func, self._sequences, self._options)
+            if cache_key is not None:
+                cached = self._cached_analysis(cache_key)
+                if cached is not None:
+                    return cached
 
-            # Check for undefined variables in the AST
-            class UndefinedVariableVisitor(ast.NodeVisitor):
-                def __init__(self, closure_vars=None):
-                    # Include Python builtins in defined_names
-                    self.defined_names = {
-                        # Python built-ins
-                        "len",
-                        "range",
-                        "enumerate",
-                        "sorted",
-                        "sum",
-                        "min",
-                        "max",
-                        "all",
-                        "any",
-                        "zip",
-                        "map",
-                        "filter",
-                        "list",
-                        "tuple",
-                        "set",
-                        "dict",
-                        "seq",
-                        "obj",
-                        "properties",
-                        "value",
-                        "type",
-                        "group",
-                        "ValueError",
-                        "TypeError",
-                        "IndexError",
-                        "KeyError",
-                        "Exception",
-                        "isinstance",
-                        "str",
-                        "int",
-                        "float",
-                        "bool",
-                        "True",
-                        "False",
-                        "None",
-                        # Additional built-ins commonly used in rules
-                        "abs",
-                        "round",
-                        "pow",
-                        "divmod",
-                        "complex",
-                        "hash",
-                        "hex",
-                        "oct",
-                        "bin",
-                        "chr",
-                        "ord",
-                        "format",
-                        "repr",
-                        "bytes",
-                        "bytearray",
-                        "memoryview",
-                        # Common math operations
-                        "ceil",
-                        "floor",
-                        "trunc",
-                        "exp",
-                        "log",
-                        "log10",
-                        # Commonly used in rules
-                        # Common types
-                        "Sequence",
-                        "AbstractObject",
-                        "List",
-                        "Dict",
-                        "Set",
-                        "Tuple",
-                        "Optional",
-                        "Union",
-                        "Any",
-                        "Callable",
-                        "TypeVar",
-                        "Generic",
-                    }
-
-                    # Add closure variables if provided
-                    if closure_vars:
-                        self.defined_names.update(closure_vars)
-
-                    self.used_names = set()
-                    self.imports = set()
-
-                def visit_Name(self, node):
-                    if isinstance(node.ctx, ast.Store):
-                        self.defined_names.add(node.id)
-                    elif isinstance(node.ctx, ast.Load):
-                        self.used_names.add(node.id)
-                    self.generic_visit(node)
-
-                def visit_Import(self, node):
-                    for name in node.names:
-                        self.defined_names.add(name.name)
-                        self.imports.add(name.name)
-                    self.generic_visit(node)
-
-                def visit_ImportFrom(self, node):
-                    for name in node.names:
-                        if name.asname:
-                            self.defined_names.add(name.asname)
-                        else:
-                            self.defined_names.add(name.name)
-                        self.imports.add(name.name)
-                    self.generic_visit(node)
-
-                def visit_FunctionDef(self, node):
-                    # Add function parameters to defined names
-                    for arg in node.args.args:
-                        self.defined_names.add(arg.arg)
-                    # Process function body
-                    self.generic_visit(node)
-
-            # Try to extract closure variables
-            closure_vars = set()
-            try:
-                # This is a factory function pattern - extract parameters from the outer function
-                if hasattr(func, "__closure__") and func.__closure__:
-                    for cell in func.__closure__:
-                        if hasattr(cell, "cell_contents"):
-                            # For simple variables, add their names
-                            if isinstance(
-                                cell.cell_contents,
-                                (str, int, float, bool, list, dict, set),
-                            ):
-                                # We can't get the variable name directly, but we can infer it from the source
-                                # by looking for common parameter names in rule factories
-                                for param in [
-                                    "property_name",
-                                    "value",
-                                    "min_value",
-                                    "max_value",
-                                    "tolerance",
-                                    "pattern",
-                                    "condition",
-                                    "window",
-                                    "group_size",
-                                    "trend",
-                                    "groups",
-                                    "dependencies",
-                                    "rules",
-                                    "required_count",
-                                    "min_length",
-                                    "max_length",
-                                    "inner_rule",
-                                    "mode",
-                                    "min_ratio",
-                                    "max_ratio",
-                                    "filter_rule",
-                                    "valid_transitions",
-                                    "stat_func",
-                                    "scope",
-                                    "properties",
-                                ]:
-                                    closure_vars.add(param)
-            except Exception:
-                # If we can't extract closure variables, continue without them
-                pass
+            # Collect names, complexity features and patterns in a single pass
+            scan = self._scan_ast(tree, _closure_names(func))
 
-            visitor = UndefinedVariableVisitor(closure_vars)
-            visitor.visit(tree)
-            undefined = visitor.used_names - visitor.defined_names
-            if undefined:
-                # Try to provide more context about the undefined variable
-                undefined_var = next(iter(undefined))
-                # Check if it might be a module that needs to be imported
-                if undefined_var in (
-                    "math",
-                    "random",
-                    "statistics",
-                    "collections",
-                    "itertools",
-                ):
-                    raise AnalysisError(
-                        f"Missing import for module: {undefined_var}. Add 'import {undefined_var}' to the rule."
-                    )
-                # Check if it might be a common function from a module
-                elif undefined_var in ("sqrt", "sin", "cos", "tan", "log", "exp"):
-                    raise AnalysisError(
-                        f"Missing import for math function: {undefined_var}. Add 'import math' and use 'math.{undefined_var}'."
-                    )
-                # Check if it might be a parameter from the factory function
-                elif undefined_var in [
-                    "property_name",
-                    "value",
-                    "min_value",
-                    "max_value",
-                    "tolerance",
-                    "pattern",
-                    "condition",
-                    "window",
-                    "group_size",
-                    "trend",
-                    "groups",
-                    "dependencies",
-                    "rules",
-                    "required_count",
-                    "min_length",
-                    "max_length",
-                    "inner_rule",
-                    "mode",
-                    "min_ratio",
-                    "max_ratio",
-                    "filter_rule",
-                    "valid_transitions",
-                    "stat_func",
-                    "scope",
-                    "properties",
-                ]:
-                    # This is likely a closure variable from a factory function
-                    # We'll add it to the defined names and rerun the analysis
-                    visitor.defined_names.add(undefined_var)
-                    undefined = visitor.used_names - visitor.defined_names
-                    if undefined:
-                        # If there are still undefined variables, raise an error
-                        raise AnalysisError(
-                            f"Undefined variable in rule: {next(iter(undefined))}"
-                        )
-                # General case
-                else:
-                    raise AnalysisError(f"Undefined variable in rule: {undefined_var}")
+            # Check for undefined variables in the AST
+            scan.names.check()
 
             # Analyze AST patterns
-            ast_patterns = (
-                self._analyze_ast_patterns(tree)
-                if self._options.analyze_ast_patterns
-                else {}
+            ast_patterns = scan.ast_patterns if self._options.analyze_ast_patterns else {}
+            complexity = self._complexity_analyzer.analyze_features(
+                scan.complexity_features, _first_line(func)
             )
-            complexity = self._complexity_analyzer.analyze_ast(tree)
 
-            # Track property access patterns
+            # Track property access patterns, replacing the estimated access
+            # counts with measured ones if requested
             properties = self._property_analyzer.analyze_ast(tree)
-
-            # Profile performance
-            performance = self._performance_profiler.profile_rule(
-                rule.func, self._sequences
-            )
+            property_counts = None
+            if self._options.runtime_property_counts:
+                property_counts = count_property_access(func, self._sequences)
+                apply_property_counts(properties, property_counts)
+
+            # Profile performance, with repeated calibrated timings, traced
+            # allocations and line timings if requested
+            instrumentation = {
+                "allocation_profiling": self._options.allocation_profiling,
+                "line_profiling": self._options.line_profiling,
+            }
+            if self._options.benchmark:
+                profiler = PerformanceProfiler.benchmarking(**instrumentation)
+            elif any(instrumentation.values()):
+                profiler = PerformanceProfiler(**instrumentation)
+            else:
+                profiler = self._performance_profiler
+            performance = profiler.profile_rule(rule.func, self._sequences)
 
             # Calculate coverage
             coverage = self._analyze_coverage(rule)
 
-            # Calculate cyclomatic complexity
-            cyclomatic_complexity = self._calculate_cyclomatic_complexity(tree)
-
-            # Count AST nodes
-            ast_node_count = sum(1 for _ in ast.walk(tree))
+            cyclomatic_complexity = scan.cyclomatic_complexity
+            ast_node_count = scan.node_count
 
             # Generate optimization suggestions
             optimization_suggestions = []
 
+            # Point at the lines taking most of the time
+            if performance.line_profile is not None:
+                line_profile = performance.line_profile
+                for stats in line_profile.hotspots(3):
+                    share = line_profile.share(stats)
+                    if share < 0.2:
+                        break
+                    optimization_suggestions.append(
+                        f"Line {stats.lineno} takes {share:.0%} of evaluation time: {stats.source}"
+                    )
+
             # Add time complexity suggestions
             if complexity.time_complexity >= ComplexityClass.QUADRATIC:
                 complexity_str = str(complexity.time_complexity)
@@ -588,11 +745,16 @@ class RuleAnalyzer:
                 optimization_suggestions=optimization_suggestions,
                 ast_node_count=ast_node_count,
                 cyclomatic_complexity=cyclomatic_complexity,
+                property_counts=property_counts,
+                cost_model=self.cost_model(rule) if self._options.cost_model else None,
             )
 
             # Cache the result if enabled
-            if self._options.cache_results:
-                self._cache[hash(inspect.getsource(rule.func))] = analysis
+            if cache_key is not None:
+                self._cache[cache_key] = analysis
+                disk_cache = self._persistent_cache()
+                if disk_cache is not None:
+                    disk_cache.put(cache_key, analysis)
 
             return analysis
 
@@ -607,12 +769,170 @@ class RuleAnalyzer:
             else:
                 raise AnalysisError(f"Failed to analyze rule: {str(e)}") from e
 
+    def analyze_many(
+        self,
+        rules: Union[Iterable[Any], Mapping[str, Any]],
+        workers: Optional[int] = None,
+        build: Optional[Callable[[Any], Union[FormalRule, DSLRule]]] = None,
+    ) -> Iterator[BatchAnalysisResult]:
+        """
+        Analyze a catalog of rules, yielding results as they complete.
+
+        With more than one worker, rules are analyzed in separate processes. The
+        analyzer's options and sample sequences are sent once to each worker and
+        every rule is sent to the worker analyzing it, so rules must be
+        picklable. Rules created by factories are closures, which aren't; for
+        those, pass picklable specs such as names together with a module-level
+        ``build`` function that creates the rule from its spec in the worker.
+
+        A rule that fails to build, transfer or analyze doesn't stop the batch:
+        its result carries the error and traceback instead of an analysis.
+
+        Args:
+            rules: Rules (or specs for ``build``), or a mapping of names to them
+            workers: Number of worker processes; defaults to the CPU count, and
+                1 analyzes the rules in this process
+            build: Optional function creating a rule from each item of ``rules``
+
+        Yields:
+            A BatchAnalysisResult per rule, in completion order
+        """
+        if isinstance(rules, Mapping):
+            items = [(str(name), rule) for name, rule in rules.items()]
+        else:
+            items = [(_rule_name(rule), rule) for rule in rules]
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(items) <= 1:
+            for index, (name, rule) in enumerate(items):
+                yield _analyze_one(self, index, name, rule, build)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(items)),
+            initializer=_init_worker,
+            initargs=(self._options, self._sequences),
+        ) as executor:
+            futures = {}
+            for index, (name, rule) in enumerate(items):
+                future = executor.submit(_worker_analyze, index, name, rule, build)
+                futures[future] = (index, name)
+            for future in as_completed(futures):
+                index, name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The rule couldn't be sent to or returned from the worker
+                    result = _failure(index, name, e)
+                yield result
+
+    def _parse_rule(self, func: Callable) -> ast.AST:
+        """
+        Parse a rule function's source.
+
+        Trees are cached per code object, so rules built by the same factory and
+        repeated analyses of a rule share one parse.
+
+        Args:
+            func: The rule function
+
+        Returns:
+            The parsed module; it must not be modified
+
+        Raises:
+            OSError: If the source code isn't available
+            TypeError: If the rule isn't a Python function
+        """
+        code = getattr(inspect.unwrap(func), "__code__", None)
+        if not isinstance(code, types.CodeType):
+            return ast.parse(textwrap.dedent(inspect.getsource(func)))
+        return _parse_code(code, code.co_filename)
+
+    def _scan_ast(self, tree: ast.AST, closure_vars=None) -> _AstScan:
+        """
+        Collect everything the analysis needs from an AST in one traversal.
+
+        Args:
+            tree: The AST to scan
+            closure_vars: Names to treat as defined by an enclosing factory
+
+        Returns:
+            Names, complexity features, loop patterns, cyclomatic complexity and
+            node count of the tree
+        """
+        names = UndefinedVariableVisitor(closure_vars)
+        collect = self._complexity_analyzer._collect_node
+        features = self._complexity_analyzer._new_features()
+        patterns = {
+            "total_loops": 0,
+            "nested_loops": 0,
+            "has_factorial": False,
+            "has_exponential": False,
+            "recursion_depth": 0,
+            "max_loop_depth": 0,
+        }
+        seen_functions = set()
+        recursive_calls = set()
+        binops = []
+        counts = {"nodes": 0, "cyclomatic": 1}  # Start with 1 for the rule itself
+
+        def visit(node: ast.AST, loop_depth: int) -> None:
+            counts["nodes"] += 1
+            counts["cyclomatic"] += _decision_points(node)
+            names.record(node)
+            collect(node, loop_depth, features)
+
+            if isinstance(node, (ast.For, ast.While)):
+                loop_depth += 1
+                patterns["total_loops"] += 1
+                patterns["max_loop_depth"] = max(patterns["max_loop_depth"], loop_depth)
+                if loop_depth > 1:
+                    patterns["nested_loops"] += 1
+            elif isinstance(node, ast.FunctionDef):
+                seen_functions.add(node.name)
+            elif isinstance(node, ast.Call):
+                # Calls of an enclosing or earlier function are recursive
+                if isinstance(node.func, ast.Name) and node.func.id in seen_functions:
+                    recursive_calls.add(node.func.id)
+            elif isinstance(node, ast.BinOp):
+                binops.append(node)
+
+            for child in ast.iter_child_nodes(node):
+                visit(child, loop_depth)
+
+        visit(tree, 0)
+
+        for name in recursive_calls:
+            for node in binops:
+                # Factorial pattern: recursive call in a multiplication
+                if isinstance(node.op, ast.Mult) and (
+                    (isinstance(node.left, ast.Name) and _calls(node.right, name))
+                    or (isinstance(node.right, ast.Name) and _calls(node.left, name))
+                ):
+                    patterns["has_factorial"] = True
+                # Exponential pattern: multiple recursive calls
+                elif (
+                    isinstance(node.op, ast.Add)
+                    and _calls(node.left, name)
+                    and _calls(node.right, name)
+                ):
+                    patterns["has_exponential"] = True
+        patterns["recursion_depth"] = len(recursive_calls)
+
+        return _AstScan(
+            names=names,
+            complexity_features=self._complexity_analyzer._finish_features(
+                features, tree
+            ),
+            ast_patterns=patterns,
+            cyclomatic_complexity=counts["cyclomatic"],
+            node_count=counts["nodes"],
+        )
+
     def _analyze_complexity(self, rule: Union[FormalRule, DSLRule]) -> RuleComplexity:
         """Analyze the complexity of a rule for testing."""
-        inner_func = self._extract_inner_function(rule.func)
-        source = inspect.getsource(inner_func)
-        source = textwrap.dedent(source)
-        tree = ast.parse(source)
+        tree = self._parse_rule(self._extract_inner_function(rule.func))
         return self._complexity_analyzer.analyze_ast(tree)
 
     def _analyze_ast(self, tree: ast.AST) -> None:
@@ -627,191 +947,7 @@ class RuleAnalyzer:
         Raises:
             AnalysisError: If undefined variables are found
         """
-
-        # Create a visitor to check for undefined variables
-        class UndefinedVariableVisitor(ast.NodeVisitor):
-            def __init__(self, closure_vars=None):
-                # Include Python builtins in defined_names
-                self.defined_names = {
-                    # Python built-ins
-                    "len",
-                    "range",
-                    "enumerate",
-                    "sorted",
-                    "sum",
-                    "min",
-                    "max",
-                    "all",
-                    "any",
-                    "zip",
-                    "map",
-                    "filter",
-                    "list",
-                    "tuple",
-                    "set",
-                    "dict",
-                    "seq",
-                    "obj",
-                    "properties",
-                    "value",
-                    "type",
-                    "group",
-                    "ValueError",
-                    "TypeError",
-                    "IndexError",
-                    "KeyError",
-                    "Exception",
-                    "isinstance",
-                    "str",
-                    "int",
-                    "float",
-                    "bool",
-                    "True",
-                    "False",
-                    "None",
-                    # Additional built-ins commonly used in rules
-                    "abs",
-                    "round",
-                    "pow",
-                    "divmod",
-                    "complex",
-                    "hash",
-                    "hex",
-                    "oct",
-                    "bin",
-                    "chr",
-                    "ord",
-                    "format",
-                    "repr",
-                    "bytes",
-                    "bytearray",
-                    "memoryview",
-                    # Common math operations
-                    "ceil",
-                    "floor",
-                    "trunc",
-                    "exp",
-                    "log",
-                    "log10",
-                    # Commonly used in rules
-                    # Common types
-                    "Sequence",
-                    "AbstractObject",
-                    "List",
-                    "Dict",
-                    "Set",
-                    "Tuple",
-                    "Optional",
-                    "Union",
-                    "Any",
-                    "Callable",
-                    "TypeVar",
-                    "Generic",
-                }
-
-                # Add closure variables if provided
-                if closure_vars:
-                    self.defined_names.update(closure_vars)
-
-                self.used_names = set()
-                self.imports = set()
-
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Store):
-                    self.defined_names.add(node.id)
-                elif isinstance(node.ctx, ast.Load):
-                    self.used_names.add(node.id)
-                self.generic_visit(node)
-
-            def visit_Import(self, node):
-                for name in node.names:
-                    self.defined_names.add(name.name)
-                    if name.asname:
-                        self.defined_names.add(name.asname)
-                    self.imports.add(name.name)
-                self.generic_visit(node)
-
-            def visit_ImportFrom(self, node):
-                for name in node.names:
-                    if name.asname:
-                        self.defined_names.add(name.asname)
-                    else:
-                        self.defined_names.add(name.name)
-                    self.imports.add(name.name)
-                self.generic_visit(node)
-
-            def visit_FunctionDef(self, node):
-                # Add function parameters to defined names
-                for arg in node.args.args:
-                    self.defined_names.add(arg.arg)
-                # Process function body
-                self.generic_visit(node)
-
-        # Create a visitor and visit the tree
-        visitor = UndefinedVariableVisitor()
-        visitor.visit(tree)
-
-        # Check for undefined variables
-        undefined = visitor.used_names - visitor.defined_names
-        if undefined:
-            # Try to provide more context about the undefined variable
-            undefined_var = next(iter(undefined))
-            # Check if it might be a module that needs to be imported
-            if undefined_var in (
-                "math",
-                "random",
-                "statistics",
-                "collections",
-                "itertools",
-            ):
-                raise AnalysisError(
-                    f"Missing import for module: {undefined_var}. Add 'import {undefined_var}' to the rule."
-                )
-            # Check if it might be a common function from a module
-            elif undefined_var in ("sqrt", "sin", "cos", "tan", "log", "exp"):
-                raise AnalysisError(
-                    f"Missing import for math function: {undefined_var}. Add 'import math' and use 'math.{undefined_var}'."
-                )
-            # Check if it might be a parameter from the factory function
-            elif undefined_var in [
-                "property_name",
-                "value",
-                "min_value",
-                "max_value",
-                "tolerance",
-                "pattern",
-                "condition",
-                "window",
-                "group_size",
-                "trend",
-                "groups",
-                "dependencies",
-                "rules",
-                "required_count",
-                "min_length",
-                "max_length",
-                "inner_rule",
-                "mode",
-                "min_ratio",
-                "max_ratio",
-                "filter_rule",
-                "valid_transitions",
-                "stat_func",
-                "scope",
-                "properties",
-            ]:
-                # This is likely a closure variable from a factory function
-                # We'll add it to the defined names and rerun the analysis
-                visitor.defined_names.add(undefined_var)
-                undefined = visitor.used_names - visitor.defined_names
-                if undefined:
-                    # If there are still undefined variables, raise an error
-                    raise AnalysisError(
-                        f"Undefined variable in rule: {next(iter(undefined))}"
-                    )
-            # General case
-            else:
-                raise AnalysisError(f"Undefined variable in rule: {undefined_var}")
+        self._check_undefined_variables(tree)
 
     def _check_undefined_variables(self, tree: ast.AST) -> None:
         """
@@ -825,191 +961,9 @@ class RuleAnalyzer:
         Raises:
             AnalysisError: If undefined variables are found
         """
-
-        # Create a visitor to check for undefined variables
-        class UndefinedVariableVisitor(ast.NodeVisitor):
-            def __init__(self, closure_vars=None):
-                # Include Python builtins in defined_names
-                self.defined_names = {
-                    # Python built-ins
-                    "len",
-                    "range",
-                    "enumerate",
-                    "sorted",
-                    "sum",
-                    "min",
-                    "max",
-                    "all",
-                    "any",
-                    "zip",
-                    "map",
-                    "filter",
-                    "list",
-                    "tuple",
-                    "set",
-                    "dict",
-                    "seq",
-                    "obj",
-                    "properties",
-                    "value",
-                    "type",
-                    "group",
-                    "ValueError",
-                    "TypeError",
-                    "IndexError",
-                    "KeyError",
-                    "Exception",
-                    "isinstance",
-                    "str",
-                    "int",
-                    "float",
-                    "bool",
-                    "True",
-                    "False",
-                    "None",
-                    # Additional built-ins commonly used in rules
-                    "abs",
-                    "round",
-                    "pow",
-                    "divmod",
-                    "complex",
-                    "hash",
-                    "hex",
-                    "oct",
-                    "bin",
-                    "chr",
-                    "ord",
-                    "format",
-                    "repr",
-                    "bytes",
-                    "bytearray",
-                    "memoryview",
-                    # Common math operations
-                    "ceil",
-                    "floor",
-                    "trunc",
-                    "exp",
-                    "log",
-                    "log10",
-                    # Commonly used in rules
-                    # Common types
-                    "Sequence",
-                    "AbstractObject",
-                    "List",
-                    "Dict",
-                    "Set",
-                    "Tuple",
-                    "Optional",
-                    "Union",
-                    "Any",
-                    "Callable",
-                    "TypeVar",
-                    "Generic",
-                }
-
-                # Add closure variables if provided
-                if closure_vars:
-                    self.defined_names.update(closure_vars)
-
-                self.used_names = set()
-                self.imports = set()
-
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Store):
-                    self.defined_names.add(node.id)
-                elif isinstance(node.ctx, ast.Load):
-                    self.used_names.add(node.id)
-                self.generic_visit(node)
-
-            def visit_Import(self, node):
-                for name in node.names:
-                    self.defined_names.add(name.name)
-                    if name.asname:
-                        self.defined_names.add(name.asname)
-                    self.imports.add(name.name)
-                self.generic_visit(node)
-
-            def visit_ImportFrom(self, node):
-                for name in node.names:
-                    if name.asname:
-                        self.defined_names.add(name.asname)
-                    else:
-                        self.defined_names.add(name.name)
-                    self.imports.add(name.name)
-                self.generic_visit(node)
-
-            def visit_FunctionDef(self, node):
-                # Add function parameters to defined names
-                for arg in node.args.args:
-                    self.defined_names.add(arg.arg)
-                # Process function body
-                self.generic_visit(node)
-
-        # Create a visitor and visit the tree
         visitor = UndefinedVariableVisitor()
         visitor.visit(tree)
-
-        # Check for undefined variables
-        undefined = visitor.used_names - visitor.defined_names
-        if undefined:
-            # Try to provide more context about the undefined variable
-            undefined_var = next(iter(undefined))
-            # Check if it might be a module that needs to be imported
-            if undefined_var in (
-                "math",
-                "random",
-                "statistics",
-                "collections",
-                "itertools",
-            ):
-                raise AnalysisError(
-                    f"Missing import for module: {undefined_var}. Add 'import {undefined_var}' to the rule."
-                )
-            # Check if it might be a common function from a module
-            elif undefined_var in ("sqrt", "sin", "cos", "tan", "log", "exp"):
-                raise AnalysisError(
-                    f"Missing import for math function: {undefined_var}. Add 'import math' and use 'math.{undefined_var}'."
-                )
-            # Check if it might be a parameter from the factory function
-            elif undefined_var in [
-                "property_name",
-                "value",
-                "min_value",
-                "max_value",
-                "tolerance",
-                "pattern",
-                "condition",
-                "window",
-                "group_size",
-                "trend",
-                "groups",
-                "dependencies",
-                "rules",
-                "required_count",
-                "min_length",
-                "max_length",
-                "inner_rule",
-                "mode",
-                "min_ratio",
-                "max_ratio",
-                "filter_rule",
-                "valid_transitions",
-                "stat_func",
-                "scope",
-                "properties",
-            ]:
-                # This is likely a closure variable from a factory function
-                # We'll add it to the defined names and rerun the analysis
-                visitor.defined_names.add(undefined_var)
-                undefined = visitor.used_names - visitor.defined_names
-                if undefined:
-                    # If there are still undefined variables, raise an error
-                    raise AnalysisError(
-                        f"Undefined variable in rule: {next(iter(undefined))}"
-                    )
-            # General case
-            else:
-                raise AnalysisError(f"Undefined variable in rule: {undefined_var}")
+        visitor.check()
 
     def _analyze_undefined_variables(self, tree: ast.AST) -> None:
         """
@@ -1023,200 +977,13 @@ class RuleAnalyzer:
         Raises:
             AnalysisError: If undefined variables are found
         """
-
-        # Create a visitor to check for undefined variables
-        class UndefinedVariableVisitor(ast.NodeVisitor):
-            def __init__(self, closure_vars=None):
-                # Include Python builtins in defined_names
-                self.defined_names = {
-                    # Python built-ins
-                    "len",
-                    "range",
-                    "enumerate",
-                    "sorted",
-                    "sum",
-                    "min",
-                    "max",
-                    "all",
-                    "any",
-                    "zip",
-                    "map",
-                    "filter",
-                    "list",
-                    "tuple",
-                    "set",
-                    "dict",
-                    "seq",
-                    "obj",
-                    "properties",
-                    "value",
-                    "type",
-                    "group",
-                    "ValueError",
-                    "TypeError",
-                    "IndexError",
-                    "KeyError",
-                    "Exception",
-                    "isinstance",
-                    "str",
-                    "int",
-                    "float",
-                    "bool",
-                    "True",
-                    "False",
-                    "None",
-                    # Additional built-ins commonly used in rules
-                    "abs",
-                    "round",
-                    "pow",
-                    "divmod",
-                    "complex",
-                    "hash",
-                    "hex",
-                    "oct",
-                    "bin",
-                    "chr",
-                    "ord",
-                    "format",
-                    "repr",
-                    "bytes",
-                    "bytearray",
-                    "memoryview",
-                    # Common math operations
-                    "ceil",
-                    "floor",
-                    "trunc",
-                    "exp",
-                    "log",
-                    "log10",
-                    # Commonly used in rules
-                    # Common types
-                    "Sequence",
-                    "AbstractObject",
-                    "List",
-                    "Dict",
-                    "Set",
-                    "Tuple",
-                    "Optional",
-                    "Union",
-                    "Any",
-                    "Callable",
-                    "TypeVar",
-                    "Generic",
-                }
-
-                # Add closure variables if provided
-                if closure_vars:
-                    self.defined_names.update(closure_vars)
-
-                self.used_names = set()
-                self.imports = set()
-
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Store):
-                    self.defined_names.add(node.id)
-                elif isinstance(node.ctx, ast.Load):
-                    self.used_names.add(node.id)
-                self.generic_visit(node)
-
-            def visit_Import(self, node):
-                for name in node.names:
-                    self.defined_names.add(name.name)
-                    if name.asname:
-                        self.defined_names.add(name.asname)
-                    self.imports.add(name.name)
-                self.generic_visit(node)
-
-            def visit_ImportFrom(self, node):
-                for name in node.names:
-                    if name.asname:
-                        self.defined_names.add(name.asname)
-                    else:
-                        self.defined_names.add(name.name)
-                    self.imports.add(name.name)
-                self.generic_visit(node)
-
-            def visit_FunctionDef(self, node):
-                # Add function parameters to defined names
-                for arg in node.args.args:
-                    self.defined_names.add(arg.arg)
-                # Process function body
-                self.generic_visit(node)
-
-        # Create a visitor and visit the tree
-        visitor = UndefinedVariableVisitor()
-        visitor.visit(tree)
-
-        # Check for undefined variables
-        undefined = visitor.used_names - visitor.defined_names
-        if undefined:
-            # Try to provide more context about the undefined variable
-            undefined_var = next(iter(undefined))
-            # Check if it might be a module that needs to be imported
-            if undefined_var in (
-                "math",
-                "random",
-                "statistics",
-                "collections",
-                "itertools",
-            ):
-                raise AnalysisError(
-                    f"Missing import for module: {undefined_var}. Add 'import {undefined_var}' to the rule."
-                )
-            # Check if it might be a common function from a module
-            elif undefined_var in ("sqrt", "sin", "cos", "tan", "log", "exp"):
-                raise AnalysisError(
-                    f"Missing import for math function: {undefined_var}. Add 'import math' and use 'math.{undefined_var}'."
-                )
-            # Check if it might be a parameter from the factory function
-            elif undefined_var in [
-                "property_name",
-                "value",
-                "min_value",
-                "max_value",
-                "tolerance",
-                "pattern",
-                "condition",
-                "window",
-                "group_size",
-                "trend",
-                "groups",
-                "dependencies",
-                "rules",
-                "required_count",
-                "min_length",
-                "max_length",
-                "inner_rule",
-                "mode",
-                "min_ratio",
-                "max_ratio",
-                "filter_rule",
-                "valid_transitions",
-                "stat_func",
-                "scope",
-                "properties",
-            ]:
-                # This is likely a closure variable from a factory function
-                # We'll add it to the defined names and rerun the analysis
-                visitor.defined_names.add(undefined_var)
-                undefined = visitor.used_names - visitor.defined_names
-                if undefined:
-                    # If there are still undefined variables, raise an error
-                    raise AnalysisError(
-                        f"Undefined variable in rule: {next(iter(undefined))}"
-                    )
-            # General case
-            else:
-                raise AnalysisError(f"Undefined variable in rule: {undefined_var}")
+        self._check_undefined_variables(tree)
 
     def _analyze_property_access(
         self, rule: Union[FormalRule, DSLRule]
     ) -> Dict[str, PropertyAccess]:
         """Analyze property access patterns in a rule for testing."""
-        inner_func = self._extract_inner_function(rule.func)
-        source = inspect.getsource(inner_func)
-        source = textwrap.dedent(source)
-        tree = ast.parse(source)
+        tree = self._parse_rule(self._extract_inner_function(rule.func))
         return self._property_analyzer.analyze_ast(tree)
 
     def _profile_rule(self, rule: Union[FormalRule, DSLRule]) -> PerformanceProfile:
@@ -1251,150 +1018,12 @@ class RuleAnalyzer:
 
     def _analyze_ast_patterns(self, tree: ast.AST) -> Dict[str, Any]:
         """Analyze AST patterns to detect complexity features."""
-        result = {
-            "total_loops": 0,
-            "nested_loops": 0,
-            "has_factorial": False,
-            "has_exponential": False,
-            "recursion_depth": 0,
-            "max_loop_depth": 0,
-        }
-
-        # Track current loop depth
-        current_loop_depth = 0
-
-        # Visitor to analyze loop patterns
-        class LoopVisitor(ast.NodeVisitor):
-            def __init__(self):
-                self.seen_functions = set()
-                self.recursive_calls = set()
-                self.factorial_pattern = False
-                self.exponential_pattern = False
-
-            def visit_For(self, node):
-                nonlocal current_loop_depth, result
-                current_loop_depth += 1
-                result["total_loops"] += 1
-                result["max_loop_depth"] = max(
-                    result["max_loop_depth"], current_loop_depth
-                )
-                if current_loop_depth > 1:
-                    result["nested_loops"] += 1
-                self.generic_visit(node)
-                current_loop_depth -= 1
-
-            def visit_While(self, node):
-                nonlocal current_loop_depth, result
-                current_loop_depth += 1
-                result["total_loops"] += 1
-                result["max_loop_depth"] = max(
-                    result["max_loop_depth"], current_loop_depth
-                )
-                if current_loop_depth > 1:
-                    result["nested_loops"] += 1
-                self.generic_visit(node)
-                current_loop_depth -= 1
-
-            def visit_FunctionDef(self, node):
-                self.seen_functions.add(node.name)
-                self.generic_visit(node)
-
-            def visit_Call(self, node):
-                # Check for recursive calls
-                if isinstance(node.func, ast.Name):
-                    func_name = node.func.id
-                    if func_name in self.seen_functions:
-                        self.recursive_calls.add(func_name)
-                        # Check for factorial pattern (recursive call in multiplication)
-                        for parent in ast.walk(tree):
-                            if isinstance(parent, ast.BinOp) and isinstance(
-                                parent.op, ast.Mult
-                            ):
-                                if (
-                                    isinstance(parent.left, ast.Name)
-                                    and isinstance(parent.right, ast.Call)
-                                    and isinstance(parent.right.func, ast.Name)
-                                    and parent.right.func.id == func_name
-                                ):
-                                    self.factorial_pattern = True
-                                elif (
-                                    isinstance(parent.right, ast.Name)
-                                    and isinstance(parent.left, ast.Call)
-                                    and isinstance(parent.left.func, ast.Name)
-                                    and parent.left.func.id == func_name
-                                ):
-                                    self.factorial_pattern = True
-
-                        # Check for exponential pattern (multiple recursive calls)
-                        for parent in ast.walk(tree):
-                            if isinstance(parent, ast.BinOp) and isinstance(
-                                parent.op, ast.Add
-                            ):
-                                left_is_recursive = (
-                                    isinstance(parent.left, ast.Call)
-                                    and isinstance(parent.left.func, ast.Name)
-                                    and parent.left.func.id == func_name
-                                )
-                                right_is_recursive = (
-                                    isinstance(parent.right, ast.Call)
-                                    and isinstance(parent.right.func, ast.Name)
-                                    and parent.right.func.id == func_name
-                                )
-                                if left_is_recursive and right_is_recursive:
-                                    self.exponential_pattern = True
-
-                self.generic_visit(node)
-
-        visitor = LoopVisitor()
-        visitor.visit(tree)
-
-        result["has_factorial"] = visitor.factorial_pattern
-        result["has_exponential"] = visitor.exponential_pattern
-        result["recursion_depth"] = len(visitor.recursive_calls)
-
-        return result
+        return self._scan_ast(tree).ast_patterns
 
     def _calculate_cyclomatic_complexity(self, tree: ast.AST) -> int:
         """Calculate the cyclomatic complexity of a rule."""
-        complexity = 1  # Start with 1 for the rule itself
-        visited = set()
-
-        def visit(node):
-            nonlocal complexity
-            if id(node) in visited:
-                return
-            visited.add(id(node))
-
-            # Count control flow statements
-            if isinstance(node, (ast.If, ast.For, ast.While)):
-                complexity += 1
-            # Count boolean operations (and, or)
-            elif isinstance(node, ast.BoolOp):
-                complexity += len(node.values) - 1
-            # Count comparison operations with multiple comparators
-            elif isinstance(node, ast.Compare):
-                complexity += len(node.ops) - 1
-            # Count list/set comprehensions and generator expressions
-            elif isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
-                # Add 1 for each generator (for clause)
-                complexity += len(node.generators)
-                # Add 1 for each if clause in the generators
-                complexity += sum(len(gen.ifs) for gen in node.generators)
-            # Count lambda functions
-            elif isinstance(node, ast.Lambda):
-                complexity += 1
-            # Count try/except blocks
-            elif isinstance(node, ast.Try):
-                complexity += len(node.handlers)  # Add 1 for each except clause
-            # Count with blocks
-            elif isinstance(node, ast.With):
-                complexity += 1
-
-            for child in ast.iter_child_nodes(node):
-                visit(child)
-
-        visit(tree)
-        return complexity
+        # Start with 1 for the rule itself
+        return 1 + sum(_decision_points(node) for node in ast.walk(tree))
 
     def _extract_inner_function(self, func):
         """Extract the inner function from a rule function."""
@@ -1452,151 +1081,305 @@ class RuleAnalyzer:
         self,
         rule1: Union[FormalRule, DSLRule],
         rule2: Union[FormalRule, DSLRule],
-        test_sequences: Optional[List[Sequence]] = None,
+        test_sequences: Optional[Iterable[Sequence]] = None,
+        max_differences: Optional[int] = 100,
+        stop_when_incomparable: bool = True,
+        equivalence_bound: Optional[float] = None,
+        confidence: float = 0.95,
+        workers: int = 1,
+        chunk_size: int = 1000,
+        seed: Optional[int] = None,
+        domain: Optional[List[AbstractObject]] = None,
+        max_states: int = 100_000,
     ) -> Dict[str, Any]:
-        """Compare two rules and analyze their relationships."""
+        """
+        Compare two rules and analyze their relationships.
+
+        The sequences are streamed through both rules with running counters, so
+        any number of them can be compared in bounded memory. Sequences either
+        rule raises an error on are skipped.
+
+        Given a domain of objects, rules that compile to finite automata over it
+        are instead compared exactly on all sequences of its objects, and the
+        differences are the shortest sequences accepted by one rule only.
+
+        Args:
+            rule1: First rule
+            rule2: Second rule
+            test_sequences: Sequences to compare the rules on, as any iterable;
+                defaults to the analyzer's sequences
+            max_differences: Number of differing sequences to keep as a random
+                sample in ``differences``, or None to keep all of them
+            stop_when_incomparable: Whether to stop once each rule has accepted
+                a sequence the other rejected; the acceptance rates then cover
+                the sequences evaluated so far
+            equivalence_bound: If given, stop once no difference has been seen
+                and the disagreement rate is below this bound with the given
+                confidence
+            confidence: Confidence level of the equivalence bound
+            workers: Number of worker processes; the rules must be picklable
+                when greater than 1
+            chunk_size: Number of sequences sent to a worker at a time
+            seed: Seed for sampling the differences
+            domain: Objects to decide the relationship exactly over, for rules
+                supported by ``compile_rule``
+            max_states: Number of automaton states after which the exact
+                comparison gives up and falls back to the sequences
+
+        Returns:
+            The relationship ("equivalent", "subset", "superset" or
+            "incomparable"), the stricter rule, both acceptance rates, the
+            sampled differences, the numbers of evaluated sequences, errors and
+            differences, and why the comparison stopped early, if it did. The
+            ``exact`` key tells whether the relationship was decided exactly, in
+            which case the acceptance rates are None, ``witness`` is a shortest
+            differing sequence and ``states`` the number of states explored
+
+        Raises:
+            ValueError: If there are no test sequences or a sequence isn't a
+                list of AbstractObjects
+        """
+        if domain is not None:
+            exact = compare_exact(rule1, rule2, domain, max_states=max_states)
+            if exact is not None:
+                return exact.to_dict()
+
         if test_sequences is None:
             test_sequences = self._sequences
 
-        if not test_sequences:
-            raise ValueError("No test sequences available for comparison")
+        stats = compare_stream(
+            rule1,
+            rule2,
+            test_sequences,
+            max_differences=max_differences,
+            stop_when_incomparable=stop_when_incomparable,
+            equivalence_bound=equivalence_bound,
+            confidence=confidence,
+            workers=workers,
+            chunk_size=chunk_size,
+            seed=seed,
+        )
+        return stats.to_dict()
 
-        # Validate sequences
-        for seq in test_sequences:
-            if not isinstance(seq, list):
-                raise ValueError("All sequences must be lists")
-            if not all(isinstance(obj, AbstractObject) for obj in seq):
-                raise ValueError(
-                    "All elements in sequences must be AbstractObject instances"
-                )
+    def find_minimal_failing_sequence(
+        self,
+        rule: Union[FormalRule, DSLRule],
+        sequence: Sequence,
+        max_evaluations: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        shrink_properties: bool = False,
+        workers: int = 1,
+    ) -> Optional[Sequence]:
+        """
+        Find a minimal subsequence that causes the rule to fail.
 
-        # Create evaluation records for each rule
-        rule1_results = []
-        rule2_results = []
-        differences = []
+        Uses a memoized delta-debugging shrinker, so the result is 1-minimal:
+        removing any single element makes the rule pass (unless the budget ran out).
 
-        for seq in test_sequences:
-            try:
-                result1 = rule1(seq)
-                result2 = rule2(seq)
-
-                rule1_results.append(result1)
-                rule2_results.append(result2)
-
-                if result1 != result2:
-                    differences.append(
-                        {
-                            "sequence": seq,
-                            "rule1_result": result1,
-                            "rule2_result": result2,
-                        }
-                    )
-            except Exception:
-                # Skip sequences that cause errors
-                continue
-
-        # Calculate acceptance rates
-        rule1_acceptance = (
-            sum(1 for r in rule1_results if r) / len(rule1_results)
-            if rule1_results
-            else 0
-        )
-        rule2_acceptance = (
-            sum(1 for r in rule2_results if r) / len(rule2_results)
-            if rule2_results
-            else 0
-        )
+        Args:
+            rule: The rule to evaluate
+            sequence: A sequence the rule rejects
+            max_evaluations: Optional cap on rule evaluations
+            time_limit: Optional cap on wall-clock seconds
+            shrink_properties: Whether to also simplify element properties
+            workers: Number of worker processes evaluating candidate reductions
 
-        # Determine relationship
-        is_subset = all(
-            not r1 or r2
-            for r1, r2 in zip(rule1_results, rule2_results)
-            if r1 is not None and r2 is not None
-        )
-        is_superset = all(
-            not r2 or r1
-            for r1, r2 in zip(rule1_results, rule2_results)
-            if r1 is not None and r2 is not None
+        Returns:
+            The reduced failing sequence, or None if the sequence passes the rule
+        """
+        shrinker = SequenceShrinker(
+            rule,
+            max_evaluations=max_evaluations,
+            time_limit=time_limit,
+            shrink_properties=shrink_properties,
+            workers=workers,
         )
+        result = shrinker.shrink(sequence)
+        return result.sequence if result is not None else None
 
-        relationship = None
-        stricter_rule = None
-
-        if is_subset and is_superset:
-            relationship = "equivalent"
-        elif is_subset:
-            relationship = "subset"
-            stricter_rule = "rule1"
-        elif is_superset:
-            relationship = "superset"
-            stricter_rule = "rule2"
-        else:
-            relationship = "incomparable"
-
-        return {
-            "relationship": relationship,
-            "stricter_rule": stricter_rule,
-            "rule1_acceptance_rate": rule1_acceptance,
-            "rule2_acceptance_rate": rule2_acceptance,
-            "differences": differences,
-        }
+    def analyze_scaling(
+        self,
+        rule: Union[FormalRule, DSLRule],
+        make_sequence: Optional[Callable[[int], Sequence]] = None,
+        sizes: Optional[List[int]] = None,
+        time_budget: float = 10.0,
+        min_confidence: float = 0.5,
+    ) -> ScalingResult:
+        """
+        Measure how a rule's evaluation time grows and fit its complexity.
 
-    def find_minimal_failing_sequence(
-        self, rule: Union[FormalRule, DSLRule], sequence: Sequence
-    ) -> Optional[Sequence]:
-        """Find a minimal subsequence that causes the rule to fail."""
-        if not sequence:
-            return None
+        The fitted complexity class is compared with the static estimate from
+        the rule's AST, so rules whose cost the static pass underestimates are
+        flagged by ``ScalingResult.disagrees``.
 
-        # Check if the full sequence passes the rule
-        try:
-            if rule(sequence):
-                return None  # Rule passes, no failing sequence
-        except Exception:
-            return None  # Error in rule evaluation, can't find failing sequence
-
-        # Binary search approach to find minimal failing subsequence
-        def find_minimal(start: int, end: int) -> Optional[Sequence]:
-            if start > end:
-                return None
+        Args:
+            rule: The rule to measure
+            make_sequence: Builds an input of the given size; defaults to
+                repeating the elements of the sample sequences
+            sizes: Sizes to time the rule at; defaults to 2^4 through 2^20
+            time_budget: Seconds after which no larger sizes are started
+            min_confidence: Confidence needed to flag a disagreement
 
-            # Check single element
-            if start == end:
-                subseq = [sequence[start]]
-                try:
-                    if not rule(subseq):
-                        return subseq
-                except Exception:
-                    pass
-                return None
+        Returns:
+            ScalingResult with the measurements and fitted models
+        """
+        if make_sequence is None:
+            make_sequence = self._sequence_builder()
+        static = self._static_complexity(rule)
+
+        func = rule.func if isinstance(rule, DSLRule) else rule
+        scaling = ScalingAnalyzer(
+            sizes=sizes, time_budget=time_budget, min_confidence=min_confidence
+        )
+        return scaling.analyze(func, make_sequence, static=static)
 
-            # Check first half
-            mid = (start + end) // 2
-            first_half = sequence[start : mid + 1]
+    def cost_model(
+        self,
+        rule: Union[FormalRule, DSLRule],
+        make_sequence: Optional[Callable[[int], Sequence]] = None,
+        sizes: Optional[List[int]] = None,
+        time_budget: float = 5.0,
+        min_confidence: float = 0.5,
+    ) -> CostModel:
+        """
+        Fit a model of a rule's evaluation time as a function of length.
+
+        The rule is timed at growing sizes and the best-fitting complexity
+        class is used, unless no class fits with ``min_confidence``, in which
+        case the static estimate from the rule's AST decides. Models built
+        with the default inputs are kept for the analyzer's lifetime.
+
+        Args:
+            rule: The rule to model
+            make_sequence: Builds an input of the given size; defaults to
+                repeating the elements of the sample sequences
+            sizes: Sizes to time the rule at; defaults to 2^4 through 2^16
+            time_budget: Seconds after which no larger sizes are started
+            min_confidence: Confidence the empirical fit needs to be used
+
+        Returns:
+            The rule's CostModel
+        """
+        func = rule.func if isinstance(rule, DSLRule) else rule
+        reusable = make_sequence is None and sizes is None
+        if reusable:
             try:
-                if not rule(first_half):
-                    return find_minimal(start, mid)
-            except Exception:
+                return self._cost_models[func]
+            except (KeyError, TypeError):
                 pass
 
-            # Check second half
-            second_half = sequence[mid + 1 : end + 1]
+        model = build_cost_model(
+            func,
+            make_sequence or self._sequence_builder(),
+            static=self._static_complexity(rule),
+            sizes=sizes,
+            time_budget=time_budget,
+            min_confidence=min_confidence,
+        )
+        if reusable:
             try:
-                if not rule(second_half):
-                    return find_minimal(mid + 1, end)
-            except Exception:
+                self._cost_models[func] = model
+            except TypeError:  # Not weakly referenceable
                 pass
+        return model
+
+    def predict_cost(
+        self,
+        rule: Union[FormalRule, DSLRule],
+        n: int,
+        p99: bool = False,
+        property_costs: Optional[Dict[str, float]] = None,
+    ) -> float:
+        """
+        Predict the time to evaluate a rule on a sequence of length n.
+
+        The rule's cost model is fitted on first use, which takes up to a few
+        seconds, and reused afterwards.
 
-            # Check if we need both parts
-            for i in range(start, mid + 1):
-                for j in range(mid + 1, end + 1):
-                    subseq = [sequence[i], sequence[j]]
-                    try:
-                        if not rule(subseq):
-                            return subseq
-                    except Exception:
-                        pass
+        Args:
+            rule: The rule
+            n: Sequence length
+            p99: Whether to predict the 99th percentile instead of the median
+            property_costs: Seconds per read of properties that are more
+                expensive than dictionary lookups
+
+        Returns:
+            Predicted evaluation time in seconds
+        """
+        return self.cost_model(rule).predict(n, p99, property_costs)
+
+    def _sequence_builder(self) -> Callable[[int], Sequence]:
+        """Build inputs of any size by repeating the sample sequences' elements."""
+        pool = [obj for seq in self._sequences for obj in seq] or [
+            AbstractObject(value=i) for i in range(10)
+        ]
+
+        def make_sequence(size: int) -> Sequence:
+            return [pool[i % len(pool)] for i in range(size)]
+
+        return make_sequence
+
+    def _static_complexity(
+        self, rule: Union[FormalRule, DSLRule]
+    ) -> Optional[RuleComplexity]:
+        """Complexity of a rule from its AST, if its source is available."""
+        func = rule.func if isinstance(rule, DSLRule) else rule
+        try:
+            return self._complexity_analyzer.analyze_ast(self._parse_rule(func))
+        except (OSError, TypeError, SyntaxError):
+            return None
 
-            return sequence[start : end + 1]  # Entire section needed
 
-        return find_minimal(0, len(sequence) - 1)
+def _rule_name(rule: Any) -> str:
+    """Name a rule for batch results."""
+    if isinstance(rule, DSLRule):
+        return rule.description
+    return getattr(rule, "__name__", None) or str(rule)
+
+
+def _failure(index: int, name: str, error: BaseException) -> BatchAnalysisResult:
+    """Record a rule that couldn't be analyzed."""
+    return BatchAnalysisResult(
+        index=index,
+        name=name,
+        error=f"{type(error).__name__}: {error}",
+        traceback="".join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        ),
+    )
+
+
+def _analyze_one(
+    analyzer: RuleAnalyzer,
+    index: int,
+    name: str,
+    rule: Any,
+    build: Optional[Callable[[Any], Any]],
+) -> BatchAnalysisResult:
+    """Build and analyze a single rule of a batch, capturing any failure."""
+    try:
+        if build is not None:
+            rule = build(rule)
+        analysis = analyzer.analyze(rule)
+    except Exception as e:
+        return _failure(index, name, e)
+    return BatchAnalysisResult(index=index, name=name, analysis=analysis)
+
+
+# Worker-process state, populated once per worker by _init_worker
+_worker_analyzer: Optional[RuleAnalyzer] = None
+
+
+def _init_worker(options: AnalyzerOptions, sequences: List[Sequence]) -> None:
+    """Give a worker process its own analyzer over the shared sequences."""
+    global _worker_analyzer
+    _worker_analyzer = RuleAnalyzer()
+    _worker_analyzer._options = options
+    _worker_analyzer._sequences = sequences
+
+
+def _worker_analyze(
+    index: int, name: str, rule: Any, build: Optional[Callable[[Any], Any]]
+) -> BatchAnalysisResult:
+    """Analyze a rule in a worker process."""
+    return _analyze_one(_worker_analyzer, index, name, rule, build)
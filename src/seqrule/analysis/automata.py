@@ -0,0 +1,479 @@
+"""
+Exact rule comparison with finite automata.
+
+Many rules only need a bounded amount of memory about the prefix they have
+read: the previous value for alternation and transitions, the position in a
+pattern or cycle, the length of the current run. Over a finite domain of
+objects such a rule is a deterministic finite automaton whose alphabet is the
+domain. Two rules are compared by exploring the product of their automata
+breadth first: rule1 accepts a subset of what rule2 accepts exactly when no
+reachable product state accepts for rule1 and rejects for rule2, and the first
+such state found gives a shortest sequence telling the rules apart.
+
+Rules are recognized by the factory that created them, whose parameters are
+read from the rule's closure. Each compiled automaton mirrors the rule's code,
+and a rule is not compiled when the domain holds values it couldn't mirror
+exactly, such as values the rule's predicates raise errors on.
+"""
+
+import inspect
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from ..core import AbstractObject, DictAccessProxy, Sequence
+from ..dsl import DSLRule
+
+
+class _Unsupported(Exception):
+    """Raised when a rule can't be compiled for a domain."""
+
+
+# Absorbing state of a rule that has rejected its input
+_DEAD = ("dead",)
+
+
+@dataclass(frozen=True)
+class RuleAutomaton:
+    """
+    A rule compiled to a deterministic finite automaton over a domain.
+
+    States are hashable values created on demand: ``step`` maps a state and the
+    index of a domain object to the next state, and ``accepting`` tells whether
+    the rule accepts the sequence read so far.
+    """
+
+    start: Hashable
+    step: Callable[[Hashable, int], Hashable]
+    accepting: Callable[[Hashable], bool]
+
+    def accepts(self, indices: Iterable[int]) -> bool:
+        """Whether the rule accepts the sequence of the given domain objects."""
+        state = self.start
+        for index in indices:
+            state = self.step(state, index)
+        return self.accepting(state)
+
+
+@dataclass
+class ExactComparison:
+    """Relationship between two rules decided over all sequences of a domain."""
+
+    relationship: str
+    only_rule1: Optional[Sequence] = None  # Shortest accepted by rule1 only
+    only_rule2: Optional[Sequence] = None  # Shortest accepted by rule2 only
+    states: int = 0  # Product states explored
+
+    @property
+    def stricter_rule(self) -> Optional[str]:
+        """The rule accepting fewer sequences, if one contains the other."""
+        return {"subset": "rule1", "superset": "rule2"}.get(self.relationship)
+
+    @property
+    def witness(self) -> Optional[Sequence]:
+        """A shortest sequence the rules disagree on, if they aren't equivalent."""
+        witnesses = [w for w in (self.only_rule1, self.only_rule2) if w is not None]
+        return min(witnesses, key=len) if witnesses else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The comparison in the form returned by RuleAnalyzer.compare_rules."""
+        differences = []
+        if self.only_rule1 is not None:
+            differences.append(
+                {
+                    "sequence": self.only_rule1,
+                    "rule1_result": True,
+                    "rule2_result": False,
+                }
+            )
+        if self.only_rule2 is not None:
+            differences.append(
+                {
+                    "sequence": self.only_rule2,
+                    "rule1_result": False,
+                    "rule2_result": True,
+                }
+            )
+        return {
+            "relationship": self.relationship,
+            "stricter_rule": self.stricter_rule,
+            "rule1_acceptance_rate": None,
+            "rule2_acceptance_rate": None,
+            "differences": differences,
+            "exact": True,
+            "witness": self.witness,
+            "states": self.states,
+        }
+
+
+def _column(domain: List[AbstractObject], read: Callable[[AbstractObject], Any]):
+    """
+    Read a value from every domain object as classes of equal values.
+
+    Returns:
+        The values, and for each object the index of the first object with an
+        equal value, so that states can compare values by index
+    """
+    values = [read(obj) for obj in domain]
+    classes = []
+    for value in values:
+        # Proxies compare by identity and NaN unequal to itself, so rules
+        # comparing such values can't be mirrored by their equality classes
+        if isinstance(value, DictAccessProxy) or not bool(value == value):
+            raise _Unsupported(f"Unsupported value {value!r}")
+        classes.append(next(j for j, other in enumerate(values) if other == value))
+    return values, classes
+
+
+def _truths(domain: List[AbstractObject], predicate: Callable[[Any], Any]):
+    """Truth values of a predicate on every domain object."""
+    return [bool(predicate(obj)) for obj in domain]
+
+
+def _property_match(closure, domain) -> RuleAutomaton:
+    name, value = closure["property_name"], closure["value"]
+    ok = _truths(domain, lambda obj: obj.properties.get(name) == value)
+    return RuleAutomaton(True, lambda state, a: state and ok[a], bool)
+
+
+def _alternation(closure, domain) -> RuleAutomaton:
+    name = closure["property_name"]
+    values, classes = _column(domain, lambda obj: obj.properties.get(name))
+
+    # The state is the class of the previous value, or None
+    def step(state, a):
+        if state is _DEAD:
+            return _DEAD
+        if values[a] is None:
+            return None
+        if state is not None and classes[a] == state:
+            return _DEAD
+        return classes[a]
+
+    return RuleAutomaton(None, step, lambda state: state is not _DEAD)
+
+
+def _pattern(closure, domain) -> RuleAutomaton:
+    pattern, name = closure["pattern"], closure["property_name"]
+    if not pattern:
+        raise _Unsupported("Empty pattern")
+    values = [obj.properties.get(name) for obj in domain]
+    matches = [[bool(value == p) for p in pattern] for value in values]
+
+    # The state is the position in the pattern, or None before any object
+    def step(state, a):
+        if state is _DEAD:
+            return _DEAD
+        position = state or 0
+        if not matches[a][position]:
+            return _DEAD
+        return (position + 1) % len(pattern)
+
+    return RuleAutomaton(
+        None, step, lambda state: state is not None and state is not _DEAD
+    )
+
+
+def _transitions(closure, domain) -> RuleAutomaton:
+    name, valid = closure["property_name"], closure["valid_transitions"]
+    present = [name in obj.properties for obj in domain]
+    values, classes = _column(domain, lambda obj: obj.properties.get(name))
+
+    def outcome(check: Callable[[], bool]) -> Optional[bool]:
+        # The rule skips objects whose checks raise a TypeError
+        try:
+            return bool(check())
+        except TypeError:
+            return None
+
+    has_rules = [outcome(lambda v=v: v in valid) for v in values]
+
+    # The state is the class of the last value checked, or None
+    def step(state, a):
+        if state is _DEAD or not present[a] or values[a] is None:
+            return state
+        if state is not None:
+            checked = has_rules[state]
+            if checked:
+                checked = outcome(lambda: values[a] not in valid[values[state]])
+                if checked:
+                    return _DEAD
+            if checked is None:
+                return state
+        return classes[a]
+
+    return RuleAutomaton(None, step, lambda state: state is not _DEAD)
+
+
+def _cycle(closure, domain) -> RuleAutomaton:
+    columns = [
+        _column(domain, lambda obj, p=p: obj.properties.get(p))[1]
+        for p in closure["properties"]
+    ]
+
+    # Per property, the state is ("seen", distinct classes so far) until the
+    # first repeat and ("cycle", cycle, position) after it
+    def advance(state, c):
+        if state[0] == "seen":
+            seen = state[1]
+            if c not in seen:
+                return ("seen", seen + (c,))
+            if c != seen[0]:
+                return _DEAD
+            return ("cycle", seen, 1 % len(seen))
+        cycle, position = state[1], state[2]
+        if c != cycle[position]:
+            return _DEAD
+        return ("cycle", cycle, (position + 1) % len(cycle))
+
+    def step(state, a):
+        if state is _DEAD:
+            return _DEAD
+        states = tuple(advance(s, classes[a]) for s, classes in zip(state, columns))
+        return _DEAD if _DEAD in states else states
+
+    def accepting(state):
+        # A property without a repeat passes only while at most one value is read
+        return state is not _DEAD and all(
+            s[0] == "cycle" or len(s[1]) <= 1 for s in state
+        )
+
+    return RuleAutomaton(tuple(("seen", ()) for _ in columns), step, accepting)
+
+
+def _if_then(closure, domain) -> RuleAutomaton:
+    condition = _truths(domain, closure["condition"])
+    consequence = _truths(domain, closure["consequence"])
+
+    # The state is whether the previous object satisfied the condition
+    def step(state, a):
+        if state is _DEAD or (state and not consequence[a]):
+            return _DEAD
+        return condition[a]
+
+    return RuleAutomaton(False, step, lambda state: state is not _DEAD)
+
+
+def _range(closure, domain) -> RuleAutomaton:
+    start, length = closure["start"], closure["length"]
+    if start < 0:
+        raise _Unsupported("Negative start index")
+    end = start + length
+    ok = _truths(domain, closure["condition"])
+
+    # The state is the number of objects read, capped at the end of the range
+    def step(state, a):
+        if state is _DEAD or state >= end:
+            return state
+        if state >= start and not ok[a]:
+            return _DEAD
+        return state + 1
+
+    return RuleAutomaton(0, step, lambda state: state is not _DEAD and state >= end)
+
+
+def _runs(is_counted: List[bool], classes: Optional[List[int]], limit: int):
+    """Automaton rejecting runs longer than ``limit``."""
+
+    # The state is the class of the run's value (or None when runs aren't
+    # split by value) and the run's length
+    def step(state, a):
+        if state is _DEAD:
+            return _DEAD
+        value, run = state
+        key = classes[a] if classes is not None else None
+        if not is_counted[a]:
+            return (key, 0)
+        run = run + 1 if run and key == value else 1
+        return _DEAD if run > limit else (key, run)
+
+    return RuleAutomaton((None, 0), step, lambda state: state is not _DEAD)
+
+
+def _no_consecutive(closure, domain) -> RuleAutomaton:
+    count = closure["count"]
+    if count < 1:
+        raise _Unsupported("Run length below 1")
+    _, classes = _column(domain, lambda obj: obj["base"])
+    return _runs([True] * len(domain), classes, count)
+
+
+def _max_consecutive(closure, domain) -> RuleAutomaton:
+    note_type = closure["note_type"].value
+    counted = _truths(domain, lambda obj: obj["note_type"] == note_type)
+    return _runs(counted, None, closure["max_count"])
+
+
+def _product(
+    first: RuleAutomaton,
+    second: RuleAutomaton,
+    combine: Callable[[bool, bool], bool],
+) -> RuleAutomaton:
+    """Automaton running two automata side by side."""
+    return RuleAutomaton(
+        (first.start, second.start),
+        lambda state, a: (first.step(state[0], a), second.step(state[1], a)),
+        lambda state: combine(first.accepting(state[0]), second.accepting(state[1])),
+    )
+
+
+def _and(closure, domain) -> RuleAutomaton:
+    first = _compile(closure["self"], domain)
+    return _product(first, _compile(closure["other"], domain), lambda a, b: a and b)
+
+
+def _or(closure, domain) -> RuleAutomaton:
+    first = _compile(closure["self"], domain)
+    return _product(first, _compile(closure["other"], domain), lambda a, b: a or b)
+
+
+def _not(closure, domain) -> RuleAutomaton:
+    inner = _compile(closure["self"], domain)
+    return RuleAutomaton(
+        inner.start, inner.step, lambda state: not inner.accepting(state)
+    )
+
+
+# Compilers by module and qualified name of the function a factory returns
+_COMPILERS: Dict[tuple, Callable[[Dict[str, Any], List[AbstractObject]], Any]] = {
+    ("seqrule.dsl", "DSLRule.__and__.<locals>.<lambda>"): _and,
+    ("seqrule.dsl", "DSLRule.__or__.<locals>.<lambda>"): _or,
+    ("seqrule.dsl", "DSLRule.__invert__.<locals>.<lambda>"): _not,
+    ("seqrule.dsl", "if_then_rule.<locals>.rule"): _if_then,
+    ("seqrule.dsl", "range_rule.<locals>.<lambda>"): _range,
+    (
+        "seqrule.rulesets.general",
+        "create_property_match_rule.<locals>.check_property",
+    ): _property_match,
+    (
+        "seqrule.rulesets.general",
+        "create_property_cycle_rule.<locals>.check_cycle",
+    ): _cycle,
+    (
+        "seqrule.rulesets.general",
+        "create_alternation_rule.<locals>.check_alternation",
+    ): _alternation,
+    (
+        "seqrule.rulesets.general",
+        "create_pattern_rule.<locals>.check_pattern",
+    ): _pattern,
+    (
+        "seqrule.rulesets.general",
+        "create_transition_rule.<locals>.check_transitions",
+    ): _transitions,
+    (
+        "seqrule.rulesets.dna",
+        "create_no_consecutive_rule.<locals>.check_consecutive",
+    ): _no_consecutive,
+    (
+        "seqrule.rulesets.music",
+        "create_max_consecutive_rule.<locals>.check_consecutive",
+    ): _max_consecutive,
+}
+
+
+def _compile(rule: Any, domain: List[AbstractObject]) -> RuleAutomaton:
+    """Compile a rule, raising _Unsupported if it isn't a known factory's."""
+    func = rule.func if isinstance(rule, DSLRule) else rule
+    key = (getattr(func, "__module__", None), getattr(func, "__qualname__", None))
+    compiler = _COMPILERS.get(key)
+    if compiler is None or not inspect.isfunction(func):
+        raise _Unsupported(f"No automaton for {key[1]}")
+    return compiler(inspect.getclosurevars(func).nonlocals, domain)
+
+
+def compile_rule(rule: Any, domain: List[AbstractObject]) -> Optional[RuleAutomaton]:
+    """
+    Compile a rule to an automaton over a finite domain.
+
+    Supported are the rules of ``create_property_match_rule``,
+    ``create_property_cycle_rule``, ``create_alternation_rule``,
+    ``create_pattern_rule``, ``create_transition_rule``, ``if_then_rule``,
+    ``range_rule``, the DNA ``create_no_consecutive_rule`` and the music
+    ``create_max_consecutive_rule``, and their combinations with ``&``, ``|``
+    and ``~``.
+
+    Args:
+        rule: The rule
+        domain: The objects sequences are made of
+
+    Returns:
+        The automaton, or None if the rule isn't supported or its predicates
+        fail on an object of the domain
+    """
+    try:
+        return _compile(rule, domain)
+    except Exception:
+        return None
+
+
+def compare_exact(
+    rule1: Any,
+    rule2: Any,
+    domain: List[AbstractObject],
+    max_states: int = 100_000,
+) -> Optional[ExactComparison]:
+    """
+    Decide how two rules relate over all sequences of domain objects.
+
+    Explores the product of both rules' automata breadth first, so that the
+    witnesses found are shortest sequences accepted by one rule only.
+
+    Args:
+        rule1: First rule
+        rule2: Second rule
+        domain: The objects sequences are made of
+        max_states: Number of product states after which to give up
+
+    Returns:
+        The exact comparison, or None if either rule can't be compiled or the
+        product has more than ``max_states`` reachable states
+    """
+    first, second = compile_rule(rule1, domain), compile_rule(rule2, domain)
+    if first is None or second is None:
+        return None
+
+    start = (first.start, second.start)
+    parents = {start: None}
+    queue = deque([start])
+    witnesses: Dict[bool, Sequence] = {}
+    try:
+        while queue and len(witnesses) < 2:
+            state = queue.popleft()
+            accepted = first.accepting(state[0]), second.accepting(state[1])
+            if accepted[0] != accepted[1] and accepted[0] not in witnesses:
+                witnesses[accepted[0]] = _path(parents, state, domain)
+            for a in range(len(domain)):
+                following = (first.step(state[0], a), second.step(state[1], a))
+                if following not in parents:
+                    if len(parents) >= max_states:
+                        return None
+                    parents[following] = (state, a)
+                    queue.append(following)
+    except Exception:
+        # A step the rules' code would have failed on
+        return None
+
+    if len(witnesses) == 2:
+        relationship = "incomparable"
+    elif True in witnesses:
+        relationship = "superset"
+    elif False in witnesses:
+        relationship = "subset"
+    else:
+        relationship = "equivalent"
+    return ExactComparison(
+        relationship=relationship,
+        only_rule1=witnesses.get(True),
+        only_rule2=witnesses.get(False),
+        states=len(parents),
+    )
+
+
+def _path(parents: Dict, state: Hashable, domain: List[AbstractObject]) -> Sequence:
+    """The sequence leading from the start to a product state."""
+    indices = []
+    while parents[state] is not None:
+        state, a = parents[state]
+        indices.append(a)
+    return [domain[a] for a in reversed(indices)]
@@ -9,7 +9,7 @@ This module provides the fundamental types used throughout the analysis system:
 
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Set
+from typing import Optional, Set
 
 
 class ComplexityClass(Enum):
@@ -89,6 +89,8 @@ class PropertyAccess:
     )
     access_count: int = 0
     nested_properties: Set[str] = field(default_factory=set)
+    # Mean accesses per evaluation measured on instrumented sequences, if any
+    measured_accesses: Optional[float] = None
 
 
 class ComplexityScore(Enum):
@@ -0,0 +1,340 @@
+"""
+Persistent analysis cache.
+
+This module provides an on-disk cache for rule analyses so that re-analyzing a
+large rule catalog only pays for rules that changed. Entries are keyed on a
+digest of everything an analysis depends on:
+
+- the rule's source and compiled code, default arguments, closure values and
+  the globals it references, including the functions it calls, recursively
+- the sample sequence corpus
+- the analyzer options
+
+Rules referencing values that can't be described stably, such as objects
+whose repr is only their address, are not cached.
+
+Entries live in a local SQLite database and the least recently used ones are
+evicted once the database grows beyond a size limit.
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import time
+from dataclasses import asdict, is_dataclass
+from types import CodeType
+from typing import Any, Callable, List, Optional, Set
+
+from ..core import AbstractObject, Sequence
+
+# Options that control caching itself and don't affect analysis results
+_CACHE_OPTIONS = {"cache_results", "cache_path", "cache_max_bytes"}
+
+# Values described by their repr
+_CONSTANT_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+
+class _Unfingerprintable(Exception):
+    """Raised for values that can't be described stably across processes."""
+
+
+def _fingerprint_value(value: Any, seen: Set[int]) -> str:
+    """Describe a value stably across processes."""
+    if isinstance(value, _CONSTANT_TYPES):
+        return f"{type(value).__name__}:{value!r}"
+    if id(value) in seen:
+        return "<cycle>"
+    seen.add(id(value))
+    try:
+        if isinstance(value, AbstractObject):
+            return "obj:" + _fingerprint_value(value.properties, seen)
+        if isinstance(value, dict):
+            items = sorted(
+                (_fingerprint_value(k, seen), _fingerprint_value(v, seen))
+                for k, v in value.items()
+            )
+            return "dict:{" + ",".join(f"{k}={v}" for k, v in items) + "}"
+        if isinstance(value, (list, tuple)):
+            parts = ",".join(_fingerprint_value(v, seen) for v in value)
+            return f"{type(value).__name__}:[{parts}]"
+        if isinstance(value, (set, frozenset)):
+            parts = ",".join(sorted(_fingerprint_value(v, seen) for v in value))
+            return f"{type(value).__name__}:{{{parts}}}"
+        if hasattr(value, "__code__"):
+            return "func:" + _fingerprint_function(value, seen)
+        if hasattr(value, "func") and callable(value.func):
+            # DSLRule and similar wrappers
+            description = getattr(value, "description", "")
+            return f"rule:{description!r}:" + _fingerprint_value(value.func, seen)
+        if is_dataclass(value) and not isinstance(value, type):
+            return f"{type(value).__qualname__}:" + _fingerprint_value(
+                asdict(value), seen
+            )
+        text = repr(value)
+        # Default reprs embed memory addresses instead of describing the value
+        if " at 0x" in text:
+            raise _Unfingerprintable(text)
+        return f"{type(value).__module__}.{type(value).__qualname__}:{text}"
+    finally:
+        seen.discard(id(value))
+
+
+def _global_names(code: Any) -> Set[str]:
+    """Names a code object and its nested comprehensions and lambdas refer to."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if hasattr(const, "co_names"):
+            names |= _global_names(const)
+    return names
+
+
+def _fingerprint_code(code: CodeType, seen: Set[int]) -> str:
+    """Describe a code object, telling apart functions defined on one line."""
+    consts = ",".join(
+        (
+            _fingerprint_code(const, seen)
+            if isinstance(const, CodeType)
+            else _fingerprint_value(const, seen)
+        )
+        for const in code.co_consts
+    )
+    # Column offsets distinguish lambdas sharing a line, from Python 3.11
+    positions = list(code.co_positions()) if hasattr(code, "co_positions") else []
+    return (
+        f"code:{code.co_code.hex()}:[{consts}]:{code.co_names!r}:"
+        f"{code.co_firstlineno}:{positions!r}"
+    )
+
+
+def _fingerprint_function(func: Callable, seen: Set[int]) -> str:
+    """Describe a function by its source, code and the values it closes over."""
+    code = func.__code__
+    try:
+        # Inspect returns the whole line for lambdas, so the code is added too
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = ""
+
+    parts = [
+        source,
+        _fingerprint_code(code, seen),
+        _fingerprint_value(func.__defaults__, seen),
+    ]
+    for name, cell in zip(code.co_freevars, func.__closure__ or (), strict=True):
+        try:
+            contents = cell.cell_contents
+        except ValueError:  # Empty cell
+            continue
+        parts.append(f"{name}={_fingerprint_value(contents, seen)}")
+    # Names missing from the globals are builtins or attribute names
+    func_globals = getattr(func, "__globals__", {})
+    for name in sorted(_global_names(code)):
+        if name in func_globals:
+            value = func_globals[name]
+            parts.append(f"global {name}={_fingerprint_value(value, seen)}")
+    return "\n".join(parts)
+
+
+def rule_fingerprint(func: Callable) -> Optional[str]:
+    """
+    Digest a rule function's source, code, defaults, closure values and globals.
+
+    Functions the rule references are digested the same way, recursively.
+
+    Args:
+        func: The rule function
+
+    Returns:
+        Hex SHA-256 digest, or None if the rule references a value that can't
+        be described stably
+    """
+    try:
+        description = _fingerprint_function(func, {id(func)})
+    except _Unfingerprintable:
+        return None
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def corpus_fingerprint(sequences: List[Sequence]) -> str:
+    """
+    Digest a corpus of sample sequences.
+
+    Args:
+        sequences: Sample sequences
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    seen: Set[int] = set()
+    for sequence in sequences:
+        for obj in sequence:
+            digest.update(_fingerprint_value(obj, seen).encode())
+            digest.update(b"\x1f")
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def analysis_key(
+    func: Callable, sequences: List[Sequence], options: Any
+) -> Optional[str]:
+    """
+    Build the cache key for analyzing a rule.
+
+    Args:
+        func: The rule function
+        sequences: Sample sequences used for profiling and coverage
+        options: AnalyzerOptions in effect
+
+    Returns:
+        Hex SHA-256 digest identifying the analysis, or None if the rule or
+        corpus can't be fingerprinted and the analysis shouldn't be cached
+    """
+    from .. import __version__
+
+    fingerprint = rule_fingerprint(func)
+    if fingerprint is None:
+        return None
+
+    settings = {k: v for k, v in asdict(options).items() if k not in _CACHE_OPTIONS}
+    digest = hashlib.sha256()
+    try:
+        parts = (
+            __version__,
+            fingerprint,
+            corpus_fingerprint(sequences),
+            _fingerprint_value(settings, set()),
+        )
+    except _Unfingerprintable:
+        return None
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def default_cache_path() -> str:
+    """Location of the cache database unless configured otherwise."""
+    base = os.environ.get("SEQRULE_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "seqrule"
+    )
+    return os.path.join(base, "analysis.sqlite")
+
+
+class AnalysisCache:
+    """SQLite-backed cache of pickled analysis results with LRU size eviction."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Open (creating if needed) a cache database.
+
+        Args:
+            path: Database file; defaults to ``analysis.sqlite`` in
+                ``$SEQRULE_CACHE_DIR`` or ``~/.cache/seqrule``
+            max_bytes: Total size of stored entries above which the least
+                recently used entries are evicted
+        """
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached entries."""
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up an entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if absent or unreadable
+        """
+        row = self._conn.execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # Written by an incompatible version of the analysis classes
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+        with self._conn:
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store an entry, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            value: Picklable value
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under the size limit."""
+        excess = self.size - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed"
+        ):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
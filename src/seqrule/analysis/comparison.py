@@ -0,0 +1,336 @@
+"""
+Streaming rule comparison.
+
+Two rules are compared by evaluating both on a stream of sequences. Only
+running counters are kept, along with a reservoir sample of a bounded number of
+sequences the rules disagree on, so memory stays constant however long the
+stream is. The comparison stops as soon as the rules are shown to be
+incomparable, since no further sequence can change that, and it can stop once
+no disagreement has been seen on enough sequences to bound the rate at which
+the rules disagree. Chunks of the stream can be evaluated in worker processes.
+"""
+
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from ..core import AbstractObject, Sequence
+
+Rule = Callable[[Sequence], Any]
+
+# Worker-process state, populated once per worker by _init_worker
+_worker_rules: Optional[tuple] = None
+
+
+def _init_worker(rule1: Rule, rule2: Rule) -> None:
+    """Send both rules to a worker once."""
+    global _worker_rules
+    _worker_rules = (rule1, rule2)
+
+
+@dataclass
+class ComparisonStats:
+    """Running counts of how two rules judge a stream of sequences."""
+
+    evaluated: int = 0
+    errors: int = 0
+    rule1_accepted: int = 0
+    rule2_accepted: int = 0
+    only_rule1: int = 0  # Accepted by rule1 and rejected by rule2
+    only_rule2: int = 0  # Accepted by rule2 and rejected by rule1
+    differences: List[Dict[str, Any]] = field(default_factory=list)
+    max_differences: Optional[int] = 100
+    stopped_early: Optional[str] = None  # "incomparable" or "equivalence"
+
+    @property
+    def difference_count(self) -> int:
+        """Number of sequences the rules disagreed on."""
+        return self.only_rule1 + self.only_rule2
+
+    @property
+    def relationship(self) -> str:
+        """Relationship between the sets of sequences the rules accept."""
+        if self.only_rule1 and self.only_rule2:
+            return "incomparable"
+        if self.only_rule1:
+            return "superset"
+        if self.only_rule2:
+            return "subset"
+        return "equivalent"
+
+    @property
+    def stricter_rule(self) -> Optional[str]:
+        """The rule accepting fewer sequences, if one contains the other."""
+        return {"subset": "rule1", "superset": "rule2"}.get(self.relationship)
+
+    def acceptance_rate(self, rule: int) -> float:
+        """Fraction of evaluated sequences rule 1 or 2 accepted."""
+        if not self.evaluated:
+            return 0.0
+        accepted = self.rule1_accepted if rule == 1 else self.rule2_accepted
+        return accepted / self.evaluated
+
+    def difference_rate_bound(self, confidence: float = 0.95) -> float:
+        """
+        Upper confidence bound on the rate at which the rules disagree.
+
+        Only meaningful when no difference has been seen and the sequences are
+        a random sample: if the rules disagreed on a fraction p of sequences,
+        n agreements in a row would occur with probability (1 - p)^n.
+
+        Args:
+            confidence: Confidence level of the bound
+
+        Returns:
+            The bound, or 1.0 if the rules disagreed or nothing was evaluated
+        """
+        if self.difference_count or not self.evaluated:
+            return 1.0
+        return 1.0 - (1.0 - confidence) ** (1.0 / self.evaluated)
+
+    def record(
+        self, sequence: Sequence, result1: Any, result2: Any, rng: random.Random
+    ) -> None:
+        """Count one evaluation, sampling the sequence if the rules disagree."""
+        self.evaluated += 1
+        result1, result2 = bool(result1), bool(result2)
+        self.rule1_accepted += result1
+        self.rule2_accepted += result2
+        if result1 == result2:
+            return
+        if result1:
+            self.only_rule1 += 1
+        else:
+            self.only_rule2 += 1
+        difference = {
+            "sequence": sequence,
+            "rule1_result": result1,
+            "rule2_result": result2,
+        }
+        # Reservoir sampling keeps each difference with equal probability
+        if self.max_differences is None or len(self.differences) < self.max_differences:
+            self.differences.append(difference)
+        else:
+            slot = rng.randrange(self.difference_count)
+            if slot < self.max_differences:
+                self.differences[slot] = difference
+
+    def merge(self, other: "ComparisonStats", rng: random.Random) -> None:
+        """Add the counts of another part of the stream to these."""
+        if self.max_differences is None:
+            differences = self.differences + other.differences
+        else:
+            # Draw from each reservoir in proportion to the differences it saw
+            mine, theirs = self.differences[:], other.differences[:]
+            rng.shuffle(mine)
+            rng.shuffle(theirs)
+            left, right = self.difference_count, other.difference_count
+            differences = []
+            while len(differences) < self.max_differences and (mine or theirs):
+                if theirs and (not mine or rng.random() * (left + right) >= left):
+                    differences.append(theirs.pop())
+                    right -= 1
+                else:
+                    differences.append(mine.pop())
+                    left -= 1
+        self.evaluated += other.evaluated
+        self.errors += other.errors
+        self.rule1_accepted += other.rule1_accepted
+        self.rule2_accepted += other.rule2_accepted
+        self.only_rule1 += other.only_rule1
+        self.only_rule2 += other.only_rule2
+        self.differences = differences
+        self.stopped_early = self.stopped_early or other.stopped_early
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The comparison in the form returned by RuleAnalyzer.compare_rules."""
+        return {
+            "relationship": self.relationship,
+            "stricter_rule": self.stricter_rule,
+            "rule1_acceptance_rate": self.acceptance_rate(1),
+            "rule2_acceptance_rate": self.acceptance_rate(2),
+            "differences": self.differences,
+            "evaluated": self.evaluated,
+            "errors": self.errors,
+            "difference_count": self.difference_count,
+            "stopped_early": self.stopped_early,
+            "exact": False,
+        }
+
+
+def _validate(sequence: Sequence) -> Sequence:
+    """Check that a sequence is a list of AbstractObjects."""
+    if not isinstance(sequence, list):
+        raise ValueError("All sequences must be lists")
+    if not all(isinstance(obj, AbstractObject) for obj in sequence):
+        raise ValueError("All elements in sequences must be AbstractObject instances")
+    return sequence
+
+
+def _should_stop(
+    stats: ComparisonStats,
+    stop_when_incomparable: bool,
+    equivalence_bound: Optional[float],
+    confidence: float,
+) -> bool:
+    """Whether the comparison is decided, recording why."""
+    if stop_when_incomparable and stats.relationship == "incomparable":
+        stats.stopped_early = "incomparable"
+    elif (
+        equivalence_bound is not None
+        and stats.difference_rate_bound(confidence) <= equivalence_bound
+    ):
+        stats.stopped_early = "equivalence"
+    return stats.stopped_early is not None
+
+
+def _compare_chunk(
+    rule1: Rule,
+    rule2: Rule,
+    sequences: Iterable[Sequence],
+    max_differences: Optional[int],
+    rng: random.Random,
+    stop_when_incomparable: bool,
+    equivalence_bound: Optional[float] = None,
+    confidence: float = 0.95,
+) -> ComparisonStats:
+    """Compare the rules on the stream or part of it."""
+    stats = ComparisonStats(max_differences=max_differences)
+    for sequence in sequences:
+        try:
+            result1 = rule1(sequence)
+            result2 = rule2(sequence)
+        except Exception:
+            # Sequences either rule can't evaluate don't count
+            stats.errors += 1
+            continue
+        stats.record(sequence, result1, result2, rng)
+        if _should_stop(stats, stop_when_incomparable, equivalence_bound, confidence):
+            break
+    return stats
+
+
+def _worker_compare(
+    chunk: List[Sequence],
+    max_differences: Optional[int],
+    seed: int,
+    stop_when_incomparable: bool,
+) -> ComparisonStats:
+    """Compare the rules on a chunk inside a worker process."""
+    rule1, rule2 = _worker_rules
+    return _compare_chunk(
+        rule1,
+        rule2,
+        chunk,
+        max_differences,
+        random.Random(seed),
+        stop_when_incomparable,
+    )
+
+
+def _chunks(sequences: Iterator[Sequence], size: int) -> Iterator[List[Sequence]]:
+    """Split a stream into validated lists of at most ``size`` sequences."""
+    while True:
+        chunk = [_validate(sequence) for sequence in islice(sequences, size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def compare_stream(
+    rule1: Rule,
+    rule2: Rule,
+    sequences: Iterable[Sequence],
+    max_differences: Optional[int] = 100,
+    stop_when_incomparable: bool = True,
+    equivalence_bound: Optional[float] = None,
+    confidence: float = 0.95,
+    workers: int = 1,
+    chunk_size: int = 1000,
+    seed: Optional[int] = None,
+) -> ComparisonStats:
+    """
+    Compare two rules on a stream of sequences in bounded memory.
+
+    Args:
+        rule1: First rule
+        rule2: Second rule
+        sequences: Sequences to evaluate both rules on; any iterable, which is
+            consumed lazily
+        max_differences: Size of the random sample of differing sequences to
+            keep, or None to keep all of them
+        stop_when_incomparable: Whether to stop once each rule has accepted a
+            sequence the other rejected
+        equivalence_bound: If given, stop once no difference has been seen and
+            the disagreement rate is bounded below this value with the given
+            confidence; the stream should then be in random order
+        confidence: Confidence level of the equivalence bound
+        workers: Number of worker processes evaluating chunks of the stream;
+            both rules must be picklable when greater than 1
+        chunk_size: Number of sequences per chunk sent to a worker; with
+            workers, the equivalence bound is checked after each chunk
+        seed: Seed of the reservoir sampling of differences
+
+    Returns:
+        ComparisonStats with the counts of the evaluated sequences
+
+    Raises:
+        ValueError: If the stream is empty or a sequence isn't a list of
+            AbstractObjects
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    rng = random.Random(seed)
+
+    if workers <= 1:
+        stats = _compare_chunk(
+            rule1,
+            rule2,
+            map(_validate, sequences),
+            max_differences,
+            rng,
+            stop_when_incomparable,
+            equivalence_bound,
+            confidence,
+        )
+    else:
+        stats = ComparisonStats(max_differences=max_differences)
+        chunks = _chunks(iter(sequences), chunk_size)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(rule1, rule2)
+        ) as executor:
+            pending = set()
+            done = False
+            while not done or pending:
+                # Keep a bounded number of chunks in flight
+                while not done and len(pending) < 2 * workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        done = True
+                        break
+                    pending.add(
+                        executor.submit(
+                            _worker_compare,
+                            chunk,
+                            max_differences,
+                            rng.randrange(2**32),
+                            stop_when_incomparable,
+                        )
+                    )
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stats.merge(future.result(), rng)
+                if _should_stop(
+                    stats, stop_when_incomparable, equivalence_bound, confidence
+                ):
+                    for future in pending:
+                        future.cancel()
+                    break
+
+    if not stats.evaluated and not stats.errors:
+        raise ValueError("No test sequences available for comparison")
+    return stats
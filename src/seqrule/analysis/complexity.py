@@ -2,16 +2,30 @@
 Complexity analysis module.
 
 This module provides functionality for analyzing the time and space complexity
-of sequence rules by examining their AST patterns.
+of sequence rules by examining their AST patterns, including the loops hidden
+in builtins, membership tests and slices.
 """
 
 import ast
-from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Set
 
 from .base import ComplexityClass
 
 
+@dataclass
+class Hotspot:
+    """An operation doing hidden work for each element of the sequence."""
+
+    lineno: int
+    complexity: ComplexityClass
+    description: str
+
+    def __str__(self) -> str:
+        """Return a human-readable description of the hotspot."""
+        return f"Line {self.lineno}: {self.description} ({self.complexity})"
+
+
 @dataclass
 class RuleComplexity:
     """Complexity analysis results for a rule."""
@@ -21,6 +35,7 @@ class RuleComplexity:
     description: str = ""
     bottlenecks: List[str] = field(default_factory=list)
     ast_features: Dict[str, Any] = field(default_factory=dict)
+    hotspots: List[Hotspot] = field(default_factory=list)
 
     def __str__(self) -> str:
         """Return a human-readable description of the complexity."""
@@ -237,16 +252,41 @@ class ComplexityAnalyzer:
 
     def analyze_ast(self, tree: ast.AST) -> RuleComplexity:
         """Analyze an AST to determine its complexity."""
+        return self.analyze_features(self._collect_ast_features(tree))
+
+    def analyze_features(
+        self, features: Dict[str, Any], first_line: int = 1
+    ) -> RuleComplexity:
+        """
+        Determine complexity from features already collected from an AST.
+
+        This lets callers that traverse the AST anyway collect the features in
+        the same pass with :meth:`_collect_node`.
+
+        Args:
+            features: Features from :meth:`_new_features`, filled by
+                :meth:`_collect_node` and completed by :meth:`_finish_features`
+            first_line: Line number of the parsed source's first line, so that
+                hotspots refer to lines of the rule's file
+
+        Returns:
+            RuleComplexity: The complexity analysis results
+        """
         # Reset counters
         self.operation_count = 0
 
-        features = self._collect_ast_features(tree)
         description = self._generate_complexity_description(features)
         bottlenecks = []
 
         if features.get("builds_result_list", False):
             bottlenecks.append("Memory usage from temporary collections")
 
+        hotspots = [
+            replace(hotspot, lineno=hotspot.lineno + first_line - 1)
+            for hotspot in features.get("hotspots") or []
+        ]
+        bottlenecks.extend(str(hotspot) for hotspot in hotspots)
+
         # Determine complexity class
         time_complexity = self._determine_time_complexity(features)
         space_complexity = self._determine_space_complexity(features)
@@ -257,11 +297,27 @@ class ComplexityAnalyzer:
             description=description,
             bottlenecks=bottlenecks,
             ast_features=features,
+            hotspots=hotspots,
         )
 
     def _collect_ast_features(self, tree: ast.AST) -> Dict[str, Any]:
         """Collect features from the AST."""
-        features = {
+        features = self._new_features()
+
+        def visit(node: ast.AST, loop_depth: int = 0) -> None:
+            self._collect_node(node, loop_depth, features)
+            if isinstance(node, (ast.For, ast.While)):
+                loop_depth += 1
+            for child in ast.iter_child_nodes(node):
+                visit(child, loop_depth)
+
+        visit(tree)
+        return self._finish_features(features, tree)
+
+    @staticmethod
+    def _new_features() -> Dict[str, Any]:
+        """Create an empty feature set for :meth:`_collect_node` to fill."""
+        return {
             "total_loops": 0,
             "nested_loops": 0,
             "max_loop_depth": 0,
@@ -275,109 +331,127 @@ class ComplexityAnalyzer:
             "loop_depths": set(),  # Track loop depths for better nesting detection
             "loop_ranges": [],  # Track loop ranges for dependency analysis
             "result_lists": [],  # Track result list assignments
+            "hotspots": [],  # Hidden super-linear operations
+            "hidden_complexity": ComplexityClass.CONSTANT,
         }
 
-        def visit(node: ast.AST, loop_depth: int = 0) -> None:
-            if isinstance(node, (ast.For, ast.While)):
-                features["total_loops"] += 1
-                features["loop_depths"].add(loop_depth)
-
-                # Track loop ranges for dependency analysis
-                if isinstance(node, ast.For) and isinstance(node.iter, ast.Call):
-                    if (
-                        isinstance(node.iter.func, ast.Name)
-                        and node.iter.func.id == "range"
-                    ):
-                        features["loop_ranges"].append(node.iter.args)
-
-                if loop_depth > 0:
-                    features["nested_loops"] += 1
-                features["max_loop_depth"] = max(
-                    features["max_loop_depth"], loop_depth + 1
-                )
+    def _collect_node(
+        self, node: ast.AST, loop_depth: int, features: Dict[str, Any]
+    ) -> None:
+        """
+        Record the features of a single AST node.
 
-                # Check for binary search pattern
-                if isinstance(node, ast.While):
-                    # Look for binary search variables
-                    binary_search_vars = {
-                        "left",
-                        "right",
-                        "l",
-                        "r",
-                        "start",
-                        "end",
-                        "mid",
-                        "middle",
-                    }
-                    assigns = [n for n in ast.walk(node) if isinstance(n, ast.Assign)]
-                    names = {
-                        t.id
-                        for a in assigns
-                        for t in ast.walk(a)
-                        if isinstance(t, ast.Name)
-                    }
-                    if any(v in binary_search_vars for v in names):
-                        # Look for mid calculation
-                        for assign in assigns:
-                            if isinstance(assign.value, ast.BinOp):
-                                if isinstance(
-                                    assign.value.op, (ast.Add, ast.Sub, ast.FloorDiv)
-                                ):
-                                    features["binary_search"] = True
-                                    break
-
-            elif isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp)):
-                features["comprehensions"] += 1
-                features["builds_result_list"] = True
-                # Count nested loops in comprehensions
-                loop_count = len(getattr(node, "generators", []))
-                features["total_loops"] += loop_count
-                if loop_count > 1:
-                    features["nested_loops"] += loop_count - 1
-
-            elif isinstance(node, ast.GeneratorExp):
-                features["generator_expressions"] += 1
-                # Count nested loops in generator expressions
-                loop_count = len(getattr(node, "generators", []))
-                features["total_loops"] += loop_count
-                if loop_count > 1:
-                    features["nested_loops"] += loop_count - 1
-
-            elif isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in {"sorted", "sort"}:
-                        features["sorting_operation"] = True
-                    elif node.func.id in {"set", "list", "dict", "tuple"}:
-                        features["builds_result_list"] = True
-                    elif node.func.id == "factorial":
-                        features["has_factorial"] = True
-                    elif node.func.id == "fibonacci":
-                        features["has_exponential"] = True
-
-            elif isinstance(node, ast.Assign):
-                # Track result list assignments
-                if isinstance(node.value, (ast.List, ast.Set, ast.Dict)):
-                    features["builds_result_list"] = True
-                    features["result_lists"].append(node.targets[0])
-                # Track append/extend operations on result lists
-                elif (
-                    isinstance(node.value, ast.Call)
-                    and isinstance(node.value.func, ast.Attribute)
-                    and node.value.func.attr in {"append", "extend", "add", "update"}
+        Args:
+            node: The node to inspect
+            loop_depth: Number of enclosing ``for`` and ``while`` loops
+            features: Feature set to update
+        """
+        if isinstance(node, (ast.For, ast.While)):
+            features["total_loops"] += 1
+            features["loop_depths"].add(loop_depth)
+
+            # Track loop ranges for dependency analysis
+            if isinstance(node, ast.For) and isinstance(node.iter, ast.Call):
+                if (
+                    isinstance(node.iter.func, ast.Name)
+                    and node.iter.func.id == "range"
                 ):
+                    features["loop_ranges"].append(node.iter.args)
+
+            if loop_depth > 0:
+                features["nested_loops"] += 1
+            features["max_loop_depth"] = max(features["max_loop_depth"], loop_depth + 1)
+
+            # Check for binary search pattern
+            if isinstance(node, ast.While):
+                # Look for binary search variables
+                binary_search_vars = {
+                    "left",
+                    "right",
+                    "l",
+                    "r",
+                    "start",
+                    "end",
+                    "mid",
+                    "middle",
+                }
+                assigns = [n for n in ast.walk(node) if isinstance(n, ast.Assign)]
+                names = {
+                    t.id
+                    for a in assigns
+                    for t in ast.walk(a)
+                    if isinstance(t, ast.Name)
+                }
+                if any(v in binary_search_vars for v in names):
+                    # Look for mid calculation
+                    for assign in assigns:
+                        if isinstance(assign.value, ast.BinOp):
+                            if isinstance(
+                                assign.value.op, (ast.Add, ast.Sub, ast.FloorDiv)
+                            ):
+                                features["binary_search"] = True
+                                break
+
+        elif isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp)):
+            features["comprehensions"] += 1
+            features["builds_result_list"] = True
+            # Count nested loops in comprehensions
+            loop_count = len(getattr(node, "generators", []))
+            features["total_loops"] += loop_count
+            if loop_count > 1:
+                features["nested_loops"] += loop_count - 1
+
+        elif isinstance(node, ast.GeneratorExp):
+            features["generator_expressions"] += 1
+            # Count nested loops in generator expressions
+            loop_count = len(getattr(node, "generators", []))
+            features["total_loops"] += loop_count
+            if loop_count > 1:
+                features["nested_loops"] += loop_count - 1
+
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                if node.func.id in {"sorted", "sort"}:
+                    features["sorting_operation"] = True
+                elif node.func.id in {"set", "list", "dict", "tuple"}:
                     features["builds_result_list"] = True
+                elif node.func.id == "factorial":
+                    features["has_factorial"] = True
+                elif node.func.id == "fibonacci":
+                    features["has_exponential"] = True
 
-            for child in ast.iter_child_nodes(node):
-                visit(
-                    child,
-                    (
-                        loop_depth + 1
-                        if isinstance(node, (ast.For, ast.While))
-                        else loop_depth
-                    ),
-                )
+        elif isinstance(node, ast.Assign):
+            # Track result list assignments
+            if isinstance(node.value, (ast.List, ast.Set, ast.Dict)):
+                features["builds_result_list"] = True
+                features["result_lists"].append(node.targets[0])
+            # Track append/extend operations on result lists
+            elif (
+                isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Attribute)
+                and node.value.func.attr in {"append", "extend", "add", "update"}
+            ):
+                features["builds_result_list"] = True
 
-        visit(tree)
+    @staticmethod
+    def _finish_features(features: Dict[str, Any], tree: ast.AST) -> Dict[str, Any]:
+        """
+        Complete a feature set once every node has been collected.
+
+        The costs hidden in builtins and containers are modelled here rather
+        than per node, since which names are sequence-sized is only known once
+        the whole tree, including names bound after their use, has been seen.
+
+        Args:
+            features: Features filled by :meth:`_collect_node`
+            tree: The tree the features were collected from
+
+        Returns:
+            The completed features
+        """
+        scan = _HiddenCostScan().scan(tree)
+        features["hotspots"] = scan.hotspots
+        features["hidden_complexity"] = scan.complexity
 
         # Analyze loop dependencies
         if len(features["loop_ranges"]) >= 2:
@@ -446,6 +520,14 @@ class ComplexityAnalyzer:
 
     def _determine_time_complexity(self, features: Dict[str, Any]) -> ComplexityClass:
         """Determine time complexity based on AST features."""
+        hidden = features.get("hidden_complexity", ComplexityClass.CONSTANT)
+        loops = self._loop_time_complexity(features)
+        return hidden if loops is None else max(loops, hidden)
+
+    def _loop_time_complexity(
+        self, features: Dict[str, Any]
+    ) -> Optional[ComplexityClass]:
+        """Determine time complexity from loops, recursion and sorting."""
         if features.get("has_factorial", False):
             return ComplexityClass.FACTORIAL
         elif features.get("has_exponential", False):
@@ -482,3 +564,389 @@ class ComplexityAnalyzer:
             # Generator expressions use constant space
             return ComplexityClass.LINEAR
         return ComplexityClass.CONSTANT
+
+
+# Builtins that consume an iterable argument in a single pass
+_CONSUMERS = {
+    "all",
+    "any",
+    "dict",
+    "frozenset",
+    "list",
+    "max",
+    "min",
+    "set",
+    "sum",
+    "tuple",
+    "Counter",
+}
+
+# Builtins whose result is as long as their iterable argument
+_SIZE_PRESERVING = {
+    "enumerate",
+    "filter",
+    "iter",
+    "list",
+    "map",
+    "reversed",
+    "sorted",
+    "tuple",
+    "zip",
+}
+
+# Builtins building hash-based containers
+_HASH_BUILDERS = {"set", "frozenset", "dict", "Counter"}
+
+# List methods that scan or shift the list
+_LINEAR_METHODS = {"index", "count", "remove", "insert", "copy"}
+
+# Methods growing a container by one element
+_GROWING_METHODS = {"append", "add", "insert", "appendleft"}
+
+# Polynomial degree and logarithmic factor of each class the scan produces
+_GROWTH = {
+    ComplexityClass.CONSTANT: (0, False),
+    ComplexityClass.LOGARITHMIC: (0, True),
+    ComplexityClass.LINEAR: (1, False),
+    ComplexityClass.LINEARITHMIC: (1, True),
+    ComplexityClass.QUADRATIC: (2, False),
+    ComplexityClass.CUBIC: (3, False),
+}
+
+
+def _growth_class(degree: int, log: bool = False) -> ComplexityClass:
+    """Complexity class of n^degree, times log n if ``log``."""
+    if degree >= 3:
+        return ComplexityClass.CUBIC
+    if degree == 2:
+        return ComplexityClass.QUADRATIC
+    if degree == 1:
+        return ComplexityClass.LINEARITHMIC if log else ComplexityClass.LINEAR
+    return ComplexityClass.LOGARITHMIC if log else ComplexityClass.CONSTANT
+
+
+def _describe(node: ast.AST) -> str:
+    """Short source text of an expression for messages."""
+    text = ast.unparse(node)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+
+class _HiddenCostScan:
+    """
+    Models the cost of operations whose loops are hidden in builtins.
+
+    Names bound to the rule's parameters, and to containers built from them,
+    are sequence-sized. Iterating over one multiplies the cost of everything
+    inside the loop by n; membership tests on lists, ``.index`` and similar
+    methods, slices and builtins consuming a sequence cost n themselves.
+    Lists grown inside a loop over the sequence are sequence-sized too, while
+    sets and dicts answer membership tests in constant time. Scans of lists of
+    unknown size, such as a factory's lookup table, are reported as well,
+    since their cost is multiplied by n when done per element.
+    """
+
+    def __init__(self) -> None:
+        self.sized: Dict[str, str] = {}  # Name -> "list", "hash" or "lazy"
+        self.lists: Set[str] = set()  # Names used with list-only methods
+        self.hotspots: List[Hotspot] = []
+        self.complexity = ComplexityClass.CONSTANT
+        self._report = False
+        self._depth = 0  # Number of enclosing function definitions
+
+    def scan(self, tree: ast.AST) -> "_HiddenCostScan":
+        """Scan a tree, first finding which names are sequence-sized."""
+        self.lists = {
+            node.func.value.id
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.attr in {"index", "count", "insert", "append", "extend"}
+        }
+        # Names can be bound after the loops using them, so repeat until the
+        # set of sequence-sized names is stable
+        for _ in range(4):
+            before = dict(self.sized)
+            self._visit(tree, [])
+            if self.sized == before:
+                break
+        self._report = True
+        self._visit(tree, [])
+        return self
+
+    # Expressions
+
+    def _kind(self, node: ast.AST) -> Optional[str]:
+        """The kind of sequence-sized value an expression is, if it is one."""
+        if isinstance(node, ast.Name):
+            return self.sized.get(node.id)
+        if isinstance(node, ast.Starred):
+            return self._kind(node.value)
+        if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice):
+            if self._kind(node.value) and not self._fixed_slice(node.slice):
+                return "list"
+            return None
+        if isinstance(
+            node, (ast.ListComp, ast.GeneratorExp, ast.SetComp, ast.DictComp)
+        ):
+            if not any(self._kind(gen.iter) for gen in node.generators):
+                return None
+            if isinstance(node, ast.ListComp):
+                return "list"
+            return "lazy" if isinstance(node, ast.GeneratorExp) else "hash"
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mult)):
+            return "list" if self._kind(node.left) or self._kind(node.right) else None
+        if isinstance(node, ast.Call):
+            args = [*node.args, *(k.value for k in node.keywords)]
+            name = _call_name(node)
+            if name == "range":
+                return "lazy" if any(self._mentions_size(a) for a in args) else None
+            if isinstance(node.func, ast.Attribute):
+                kind = self._kind(node.func.value)
+                if node.func.attr == "copy":
+                    return kind
+                if node.func.attr in {"items", "keys", "values"} and kind:
+                    return "lazy"
+                return None
+            if not any(self._kind(a) for a in args):
+                return None
+            if name in _HASH_BUILDERS:
+                return "hash"
+            if name in _SIZE_PRESERVING:
+                return "list" if name in {"list", "sorted", "tuple"} else "lazy"
+        return None
+
+    def _mentions_size(self, node: ast.AST) -> bool:
+        """Whether an expression depends on the length of a sized value."""
+        return any(
+            isinstance(sub, ast.Call)
+            and _call_name(sub) == "len"
+            and sub.args
+            and self._kind(sub.args[0])
+            for sub in ast.walk(node)
+        )
+
+    def _fixed_slice(self, node: ast.Slice) -> bool:
+        """Whether a slice has a length independent of the sequence's."""
+        lower, upper = node.lower, node.upper
+
+        def constant(bound: Optional[ast.AST]) -> bool:
+            if isinstance(bound, ast.UnaryOp):
+                bound = bound.operand
+            return isinstance(bound, ast.Constant)
+
+        if upper is None:
+            # seq[-k:] is fixed, seq[i:] isn't
+            return isinstance(lower, ast.UnaryOp) and constant(lower)
+        if lower is None or constant(lower):
+            return constant(upper)
+        # seq[i:i + k]
+        return (
+            isinstance(upper, ast.BinOp)
+            and isinstance(upper.op, ast.Add)
+            and ast.dump(upper.left) == ast.dump(lower)
+            and constant(upper.right)
+        )
+
+    # Traversal
+
+    def _visit(self, node: ast.AST, loops: List[str]) -> None:
+        """Visit a node inside the given loops over the sequence."""
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            if not self._depth:
+                # The rule's own parameters are the sequences it checks
+                for arg in node.args.posonlyargs + node.args.args:
+                    self.sized.setdefault(arg.arg, "list")
+            self._depth += 1
+            body = node.body if isinstance(node.body, list) else [node.body]
+            for child in body:
+                self._visit(child, loops)
+            self._depth -= 1
+            return
+
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            self._visit(node.iter, loops)
+            inner = self._enter_loop(node, node.iter, loops)
+            for child in node.body:
+                self._visit(child, inner)
+            for child in node.orelse:
+                self._visit(child, loops)
+            return
+        if isinstance(node, ast.While):
+            self._visit(node.test, loops)
+            inner = loops
+            if self._mentions_size(node.test):
+                inner = self._enter_loop(node, node.test, loops)
+            for child in node.body + node.orelse:
+                self._visit(child, inner)
+            return
+        if isinstance(
+            node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)
+        ):
+            inner = loops
+            for gen in node.generators:
+                self._visit(gen.iter, inner)
+                inner = self._enter_loop(node, gen.iter, inner)
+                for condition in gen.ifs:
+                    self._visit(condition, inner)
+            elements = (
+                [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            )
+            for element in elements:
+                self._visit(element, inner)
+            return
+
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                self._bind(target, node.value)
+        elif isinstance(node, ast.Call):
+            self._call(node, loops)
+        elif isinstance(node, ast.Compare):
+            self._compare(node, loops)
+        elif isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice):
+            if self._kind(node.value) and not self._fixed_slice(node.slice):
+                self._cost(
+                    node,
+                    ComplexityClass.LINEAR,
+                    f"copies slice {_describe(node)}",
+                    loops,
+                )
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mult)):
+            if self._kind(node.left) == "list" or self._kind(node.right) == "list":
+                self._cost(node, ComplexityClass.LINEAR, "concatenates lists", loops)
+
+        for child in ast.iter_child_nodes(node):
+            self._visit(child, loops)
+
+    def _enter_loop(
+        self, node: ast.AST, iterable: ast.AST, loops: List[str]
+    ) -> List[str]:
+        """The loops inside a loop, reporting it if it is nested."""
+        if not (self._kind(iterable) or self._mentions_size(iterable)):
+            return loops
+        if loops:
+            self._report_hotspot(
+                node,
+                _growth_class(len(loops) + 1),
+                f"iterates over {_describe(iterable)} inside {loops[-1]}",
+            )
+        return [*loops, f"loop over {_describe(iterable)}"]
+
+    def _bind(self, target: ast.AST, value: ast.AST) -> None:
+        """Record that a name is bound to a sequence-sized value."""
+        kind = self._kind(value)
+        if isinstance(target, ast.Name) and kind is not None:
+            self.sized[target.id] = kind
+
+    def _call(self, node: ast.Call, loops: List[str]) -> None:
+        """Model the cost of a call."""
+        name = _call_name(node)
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            owner = func.value
+            if (
+                func.attr in _GROWING_METHODS | {"extend"}
+                and isinstance(owner, ast.Name)
+                and owner.id not in self.sized
+            ):
+                # A container grown per element of the sequence is as long as it
+                if loops:
+                    self.sized[owner.id] = "hash" if func.attr == "add" else "list"
+                return
+            if self._kind(owner) == "list":
+                if func.attr == "sort":
+                    self._cost(node, ComplexityClass.LINEARITHMIC, "sorts", loops)
+                elif func.attr in _LINEAR_METHODS or (func.attr == "pop" and node.args):
+                    self._cost(
+                        node,
+                        ComplexityClass.LINEAR,
+                        f"calls .{func.attr}() on list {_describe(owner)}",
+                        loops,
+                    )
+            elif (
+                func.attr in {"index", "count", "remove"}
+                and isinstance(owner, ast.Name)
+                and owner.id in self.lists
+                and loops
+            ):
+                self._scan_of_unsized(node, f".{func.attr}()", owner, loops)
+            elif func.attr == "join" and node.args and self._kind(node.args[0]):
+                self._cost(node, ComplexityClass.LINEAR, "joins", loops)
+            return
+
+        if not node.args:
+            return
+        argument = node.args[0]
+        if name == "sorted" and self._kind(argument):
+            self._cost(node, ComplexityClass.LINEARITHMIC, "sorts", loops)
+        elif name in _CONSUMERS and self._kind(argument):
+            # Comprehensions are modelled as loops and slices as copies
+            if not isinstance(
+                argument, (ast.GeneratorExp, ast.ListComp, ast.Subscript)
+            ):
+                self._cost(
+                    node,
+                    ComplexityClass.LINEAR,
+                    f"{name}() consumes {_describe(argument)}",
+                    loops,
+                )
+
+    def _compare(self, node: ast.Compare, loops: List[str]) -> None:
+        """Model the cost of membership tests."""
+        for op, container in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            kind = self._kind(container)
+            if kind == "list":
+                self._cost(
+                    node,
+                    ComplexityClass.LINEAR,
+                    f"'in' scans list {_describe(container)}",
+                    loops,
+                )
+            elif (
+                kind is None
+                and isinstance(container, ast.Name)
+                and container.id in self.lists
+                and loops
+            ):
+                self._scan_of_unsized(node, "'in'", container, loops)
+
+    def _cost(
+        self, node: ast.AST, own: ComplexityClass, action: str, loops: List[str]
+    ) -> None:
+        """Record an operation of the given own cost inside loops."""
+        degree, log = _GROWTH[own]
+        total = _growth_class(degree + len(loops), log)
+        self.complexity = max(self.complexity, total)
+        if loops:
+            self._report_hotspot(node, total, f"{action} inside {loops[-1]}")
+
+    def _scan_of_unsized(
+        self, node: ast.AST, action: str, container: ast.Name, loops: List[str]
+    ) -> None:
+        """Report a scan of a list of unknown length done per element."""
+        self._report_hotspot(
+            node,
+            _growth_class(len(loops)),
+            f"{action} scans list {container.id} inside {loops[-1]}, "
+            f"costing len({container.id}) per iteration",
+        )
+
+    def _report_hotspot(
+        self, node: ast.AST, complexity: ComplexityClass, description: str
+    ) -> None:
+        """Record a hotspot in the final pass."""
+        self.complexity = max(self.complexity, complexity)
+        if self._report:
+            self.hotspots.append(
+                Hotspot(getattr(node, "lineno", 0), complexity, description)
+            )
+
+
+def _call_name(node: ast.AST) -> Optional[str]:
+    """Name of the function a call expression calls directly, if any."""
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return node.func.id
+    return None
@@ -0,0 +1,288 @@
+"""
+Cost models predicting rule evaluation time.
+
+A cost model gives the expected time to evaluate a rule on a sequence of
+length n, fitted from timings at growing sizes. When the timings don't single
+out a complexity class with confidence, the class derived statically from the
+rule's AST decides between the candidate fits. The model also records how
+often the rule reads each property as a function of n, so that the cost on
+objects with more expensive properties than plain dictionary lookups (computed,
+lazily loaded or remote values) can be predicted as well.
+"""
+
+import functools
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Union
+
+from ..core import AbstractObject, Sequence
+from .base import ComplexityClass
+from .complexity import RuleComplexity
+from .instrumentation import count_property_access
+from .performance import PerformanceProfiler
+from .scaling import MODELS, ModelFit, ScalingAnalyzer, fit_complexity, geometric_sizes
+
+# Largest size whose property accesses are counted
+_MAX_COUNTED_SIZE = 256
+
+# Share of the time budget spent on single-call timings for the tail factor
+_TAIL_BUDGET_SHARE = 0.1
+
+
+@functools.cache
+def property_access_cost() -> float:
+    """Measured time in seconds of reading one property of an AbstractObject."""
+    objects = [AbstractObject(value=i) for i in range(100)]
+
+    def read_all() -> None:
+        for obj in objects:
+            obj["value"]
+
+    profiler = PerformanceProfiler.benchmarking(
+        samples=5, warmup=1, min_round_time=0.001
+    )
+    return profiler.measure(read_all).median / len(objects)
+
+
+@dataclass
+class CostModel:
+    """Expected evaluation time of a rule as a function of sequence length."""
+
+    complexity: ComplexityClass
+    intercept: float
+    coefficient: float
+    confidence: float = 0.0
+    static_complexity: Optional[ComplexityClass] = None
+    # Ratio of the 99th percentile to the median of single-call times
+    tail_factor: float = 1.0
+    property_accesses: Dict[str, ModelFit] = field(default_factory=dict)
+    access_cost: float = 0.0
+    max_measured_size: int = 0
+
+    def accesses(self, name: str, n: int) -> float:
+        """Expected number of reads of a property per evaluation at length n."""
+        fit = self.property_accesses.get(name)
+        if fit is None:
+            return 0.0
+        try:
+            return max(fit.predict(max(n, 1)), 0.0)
+        except OverflowError:
+            return math.inf
+
+    def predict(
+        self,
+        n: int,
+        p99: bool = False,
+        property_costs: Optional[Dict[str, float]] = None,
+    ) -> float:
+        """
+        Predict the time to evaluate the rule on a sequence of length n.
+
+        Args:
+            n: Sequence length
+            p99: Whether to predict the 99th percentile instead of the median
+            property_costs: Seconds per read of properties that cost more (or
+                less) than the dictionary lookups the model was measured with
+
+        Returns:
+            Predicted evaluation time in seconds
+        """
+        n = max(n, 1)
+        try:
+            growth = MODELS[self.complexity](n)
+        except OverflowError:
+            return math.inf
+        cost = self.intercept + self.coefficient * growth
+        for name, unit_cost in (property_costs or {}).items():
+            cost += self.accesses(name, n) * (unit_cost - self.access_cost)
+        cost = max(cost, 0.0)
+        return cost * self.tail_factor if p99 else cost
+
+    def max_length(
+        self,
+        budget: float,
+        p99: bool = False,
+        property_costs: Optional[Dict[str, float]] = None,
+        limit: int = 10**9,
+    ) -> int:
+        """
+        Longest sequence the rule is predicted to evaluate within a time budget.
+
+        Args:
+            budget: Time budget in seconds
+            p99: Whether the 99th percentile must stay within the budget
+            property_costs: Per-read property costs, as for :meth:`predict`
+            limit: Largest length to consider
+
+        Returns:
+            The longest length within budget, 0 if none is, or ``limit`` if
+            every length up to it is
+        """
+
+        def fits(n: int) -> bool:
+            return self.predict(n, p99, property_costs) <= budget
+
+        if not fits(1):
+            return 0
+        low, high = 1, 2
+        while high < limit and fits(high):
+            low, high = high, high * 2
+        if high >= limit:
+            if fits(limit):
+                return limit
+            high = limit
+        # fits(low) holds and fits(high) doesn't
+        while high - low > 1:
+            middle = (low + high) // 2
+            if fits(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def __str__(self) -> str:
+        """Return a human-readable summary of the model."""
+        text = (
+            f"Cost: {self.intercept * 1e6:.3g}us + {self.coefficient * 1e6:.3g}us"
+            f" x {self.complexity} (confidence {self.confidence:.2f}, "
+            f"p99 x{self.tail_factor:.2f})"
+        )
+        if self.static_complexity is not None:
+            text += f"\nStatic: {self.static_complexity}"
+        if self.max_measured_size:
+            text += f"\nMeasured up to n={self.max_measured_size}"
+        return text
+
+
+def _select_fit(
+    fits: List[ModelFit],
+    static: Optional[ComplexityClass],
+    min_confidence: float,
+) -> ModelFit:
+    """The empirical best fit, or the static class's fit if it is uncertain."""
+    best = fits[0]
+    if best.weight >= min_confidence or static is None:
+        return best
+    for fit in fits:
+        if fit.complexity == static:
+            return fit
+    return best
+
+
+def _tail_factor(
+    rule_func: Callable[[Sequence], bool],
+    make_sequence: Callable[[int], Sequence],
+    medians: Dict[int, float],
+    samples: int,
+    budget: float,
+) -> float:
+    """
+    Ratio of the 99th percentile to the median of single-call times.
+
+    Each call is timed on its own, so that the occasional slow call (garbage
+    collection, cache misses, scheduling) shows up in the tail instead of being
+    averaged away. The largest measured size whose calls fit in the budget is
+    used, since longer calls are measured more precisely.
+
+    Args:
+        rule_func: The rule function
+        make_sequence: Builds an input sequence of the given size
+        medians: Median time per call of each measured size
+        samples: Number of calls to time
+        budget: Seconds the calls may take
+
+    Returns:
+        The tail factor, at least 1
+    """
+    affordable = [n for n in sorted(medians) if medians[n] * samples <= budget]
+    if not affordable or samples < 2:
+        return 1.0
+    sequence = make_sequence(affordable[-1])
+    profiler = PerformanceProfiler(samples=samples, warmup=1)
+    stats = profiler.measure(lambda: rule_func(sequence))
+    if stats.median <= 0:
+        return 1.0
+    tail_factor = stats.p99 / stats.median
+    return max(tail_factor, 1.0) if math.isfinite(tail_factor) else 1.0
+
+
+def build_cost_model(
+    rule_func: Callable[[Sequence], bool],
+    make_sequence: Callable[[int], Sequence],
+    static: Optional[Union[RuleComplexity, ComplexityClass]] = None,
+    sizes: Optional[List[int]] = None,
+    time_budget: float = 5.0,
+    min_confidence: float = 0.5,
+    profiler: Optional[PerformanceProfiler] = None,
+    tail_samples: int = 200,
+) -> CostModel:
+    """
+    Fit a cost model from timings of a rule at growing sizes.
+
+    Args:
+        rule_func: The rule function
+        make_sequence: Builds an input sequence of the given size
+        static: Static complexity estimate used when the timings are ambiguous
+        sizes: Sizes to time the rule at; defaults to 2^4 through 2^16
+        time_budget: Seconds after which no larger sizes are started
+        min_confidence: Akaike weight the empirical fit needs to be used over
+            the static estimate
+        profiler: Profiler timing each size; defaults to a benchmarking
+            profiler with ten samples
+        tail_samples: Number of single calls timed for the p99 tail factor;
+            they take at most a tenth of ``time_budget``
+
+    Returns:
+        The fitted CostModel
+
+    Raises:
+        ValueError: If fewer than three sizes could be measured
+    """
+    if isinstance(static, RuleComplexity):
+        static = static.time_complexity
+    if static not in MODELS:
+        static = None
+
+    scaling = ScalingAnalyzer(
+        sizes=sizes or geometric_sizes(4, 16),
+        profiler=profiler
+        or PerformanceProfiler.benchmarking(samples=10, warmup=1, min_round_time=0.001),
+        time_budget=time_budget,
+    )
+    timings = scaling.measure_stats(rule_func, make_sequence)
+    measured = sorted(timings)
+    fits = fit_complexity(measured, [timings[n].median for n in measured])
+    fit = _select_fit(fits, static, min_confidence)
+
+    # Per-size samples average many calls each, so time single calls for the
+    # tail instead
+    tail_factor = _tail_factor(
+        rule_func,
+        make_sequence,
+        {n: stats.median for n, stats in timings.items()},
+        tail_samples,
+        time_budget * _TAIL_BUDGET_SHARE,
+    )
+
+    # Count property reads at the smaller sizes, where instrumentation is cheap
+    counted = [n for n in measured if n <= _MAX_COUNTED_SIZE]
+    if len(counted) < 3:
+        counted = measured[:3]
+    counts = [count_property_access(rule_func, [make_sequence(n)]) for n in counted]
+    property_accesses = {}
+    for name in set().union(*(c.properties for c in counts)):
+        reads = [float(c.accesses(name)) for c in counts]
+        if any(reads):
+            property_accesses[name] = fit_complexity(counted, reads)[0]
+
+    return CostModel(
+        complexity=fit.complexity,
+        intercept=fit.intercept,
+        coefficient=fit.coefficient,
+        confidence=fit.weight,
+        static_complexity=static,
+        tail_factor=tail_factor,
+        property_accesses=property_accesses,
+        access_cost=property_access_cost(),
+        max_measured_size=measured[-1],
+    )
@@ -0,0 +1,217 @@
+"""
+Runtime property-access counting.
+
+This module measures how rules access element properties by evaluating them on
+instrumented copies of the sample sequences. The instrumented objects behave
+like AbstractObject and DictAccessProxy but count every ``obj[key]``,
+``properties[key]`` and ``properties.get(key)`` call per property path, along
+with the DictAccessProxy objects that nested access allocates.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from ..core import AbstractObject, DictAccessProxy, Sequence
+from .base import PropertyAccess, PropertyAccessType
+
+PropertyPath = Tuple[str, ...]
+
+
+@dataclass
+class PropertyCounts:
+    """Property accesses counted while evaluating a rule."""
+
+    evaluations: int = 0
+    reads: Dict[PropertyPath, int] = field(default_factory=Counter)
+    gets: Dict[PropertyPath, int] = field(default_factory=Counter)
+    checks: Dict[PropertyPath, int] = field(default_factory=Counter)
+    proxies: int = 0
+
+    @property
+    def properties(self) -> Set[str]:
+        """Top-level properties the rule accessed."""
+        return {path[0] for path in (*self.reads, *self.gets, *self.checks)}
+
+    def accesses(self, name: str) -> int:
+        """Number of reads and ``get`` calls of a property and its nested keys."""
+        return sum(
+            count
+            for counter in (self.reads, self.gets)
+            for path, count in counter.items()
+            if path[0] == name
+        )
+
+    @property
+    def nested_accesses(self) -> int:
+        """Number of reads and ``get`` calls below the top level."""
+        return sum(
+            count
+            for counter in (self.reads, self.gets)
+            for path, count in counter.items()
+            if len(path) > 1
+        )
+
+    def per_evaluation(self, name: str) -> float:
+        """Average number of accesses of a property per rule evaluation."""
+        return self.accesses(name) / self.evaluations if self.evaluations else 0.0
+
+
+class InstrumentedDict(dict):
+    """Property dictionary that counts key lookups."""
+
+    def __init__(self, data: Dict[str, Any], counts: PropertyCounts, path=()):
+        super().__init__(
+            (
+                key,
+                InstrumentedDict(value, counts, path + (key,))
+                if isinstance(value, dict)
+                else value,
+            )
+            for key, value in data.items()
+        )
+        self._counts = counts
+        self._path = path
+
+    def __getitem__(self, key: Any) -> Any:
+        self._counts.reads[self._path + (key,)] += 1
+        return dict.__getitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get a value, counting the call."""
+        self._counts.gets[self._path + (key,)] += 1
+        return dict.get(self, key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        self._counts.checks[self._path + (key,)] += 1
+        return dict.__contains__(self, key)
+
+
+class InstrumentedProxy(DictAccessProxy):
+    """DictAccessProxy that counts nested key lookups."""
+
+    def __init__(self, data: Dict[str, Any], counts: PropertyCounts, path):
+        super().__init__(data)
+        self._counts = counts
+        self._path = path
+        counts.proxies += 1
+
+    def _wrap(self, key: Any, value: Any) -> Any:
+        if isinstance(value, dict):
+            return InstrumentedProxy(value, self._counts, self._path + (key,))
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        self._counts.reads[self._path + (key,)] += 1
+        value = dict.get(self._data, key)
+        if value is None:
+            return None
+        return self._wrap(key, value)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get a value with a default if not found, counting the call."""
+        self._counts.gets[self._path + (key,)] += 1
+        return self._wrap(key, dict.get(self._data, key, default))
+
+    def __contains__(self, key: Any) -> bool:
+        """Support 'in' operator, counting the check."""
+        self._counts.checks[self._path + (key,)] += 1
+        return dict.__contains__(self._data, key)
+
+
+class InstrumentedObject(AbstractObject):
+    """AbstractObject copy that counts property accesses."""
+
+    def __init__(self, obj: AbstractObject, counts: PropertyCounts):
+        self.properties = InstrumentedDict(obj.properties, counts)
+        self._counts = counts
+
+    def __getitem__(self, key: str) -> Any:
+        self._counts.reads[(key,)] += 1
+        value = dict.get(self.properties, key)
+        if isinstance(value, dict):
+            return InstrumentedProxy(value, self._counts, (key,))
+        return value
+
+
+def instrument(sequence: Sequence, counts: PropertyCounts) -> Sequence:
+    """
+    Copy a sequence with instrumented objects.
+
+    Args:
+        sequence: The sequence to copy
+        counts: Counts to record accesses in
+
+    Returns:
+        Sequence of InstrumentedObjects; other elements are kept as they are
+    """
+    return [
+        InstrumentedObject(obj, counts) if isinstance(obj, AbstractObject) else obj
+        for obj in sequence
+    ]
+
+
+def count_property_access(
+    rule_func: Callable[[Sequence], bool], sequences: List[Sequence]
+) -> PropertyCounts:
+    """
+    Count a rule's property accesses over sample sequences.
+
+    Args:
+        rule_func: The rule function
+        sequences: Sequences to evaluate the rule on; evaluations that raise
+            are counted up to the point of failure
+
+    Returns:
+        PropertyCounts over all evaluations
+    """
+    counts = PropertyCounts()
+    for sequence in sequences:
+        instrumented = instrument(sequence, counts)
+        counts.evaluations += 1
+        try:
+            rule_func(instrumented)
+        except Exception:
+            pass
+    return counts
+
+
+def apply_property_counts(
+    properties: Dict[str, PropertyAccess], counts: PropertyCounts
+) -> Dict[str, PropertyAccess]:
+    """
+    Record measured access counts alongside the static estimates.
+
+    ``measured_accesses`` is set to the mean number of accesses per evaluation,
+    while ``access_count`` keeps the static estimate that scoring and the
+    frequent-access threshold rely on. Properties found at runtime but not in
+    the AST are added with a static count of zero, and properties the rule never
+    accessed get a measured count of zero.
+
+    Args:
+        properties: Property accesses from the AST analysis; updated in place
+        counts: Measured property accesses
+
+    Returns:
+        The updated property accesses
+    """
+    for name in counts.properties:
+        if name not in properties:
+            properties[name] = PropertyAccess(name=name)
+    for name, access in properties.items():
+        access.measured_accesses = counts.per_evaluation(name)
+        paths = [
+            path
+            for counter in (counts.reads, counts.gets)
+            for path in counter
+            if path[0] == name
+        ]
+        if any(path in counts.reads for path in paths):
+            access.access_types.add(PropertyAccessType.READ)
+        if any(path in counts.gets for path in paths):
+            access.access_types.add(PropertyAccessType.METHOD)
+        nested = {path[1] for path in paths if len(path) > 1}
+        if nested:
+            access.access_types.add(PropertyAccessType.NESTED)
+            access.nested_properties |= nested
+    return properties
@@ -0,0 +1,318 @@
+"""
+Line-level profiling of rule functions.
+
+This module counts how often each line of a rule runs and how long it takes.
+Only the rule's own code is instrumented: the function, the comprehensions,
+lambdas and functions nested in it, and rules held in its closure. Time spent
+in a nested function counts towards that function's lines rather than the line
+calling it, so lines shared by a function and its generator expressions aren't
+counted twice. Calls into other code count towards the calling line.
+
+On Python 3.12 and later the rule's code objects are instrumented with
+``sys.monitoring``, which leaves all other code running at full speed. Earlier
+versions fall back to ``sys.settrace``.
+"""
+
+import inspect
+import linecache
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+HAS_MONITORING = hasattr(sys, "monitoring")
+
+
+@dataclass
+class LineStats:
+    """Execution count and time of one source line."""
+
+    filename: str
+    lineno: int
+    hits: int = 0
+    time: float = 0.0
+
+    @property
+    def source(self) -> str:
+        """The line's source code, stripped."""
+        return linecache.getline(self.filename, self.lineno).strip()
+
+    def __str__(self) -> str:
+        """Return the line with its statistics."""
+        return (
+            f"line {self.lineno}: {self.hits} hits, {self.time * 1e6:.1f}us"
+            f"  {self.source}"
+        )
+
+
+@dataclass
+class LineProfile:
+    """Per-line statistics of a rule, accumulated over profiled calls."""
+
+    lines: Dict[Tuple[str, int], LineStats] = field(default_factory=dict)
+
+    @property
+    def total_time(self) -> float:
+        """Time spent in all profiled lines."""
+        return sum(stats.time for stats in self.lines.values())
+
+    def line(self, filename: str, lineno: int) -> LineStats:
+        """Get the statistics of a line, adding them if needed."""
+        key = (filename, lineno)
+        stats = self.lines.get(key)
+        if stats is None:
+            stats = self.lines[key] = LineStats(filename, lineno)
+        return stats
+
+    def hotspots(self, limit: Optional[int] = 5) -> List[LineStats]:
+        """
+        The lines taking the most time.
+
+        Args:
+            limit: Maximum number of lines to return, or None for all lines
+
+        Returns:
+            Lines ordered by decreasing time
+        """
+        ordered = sorted(self.lines.values(), key=lambda s: s.time, reverse=True)
+        return ordered if limit is None else ordered[:limit]
+
+    def share(self, stats: LineStats) -> float:
+        """Fraction of the total profiled time spent in a line."""
+        total = self.total_time
+        return stats.time / total if total > 0 else 0.0
+
+    def merge(self, other: "LineProfile") -> None:
+        """Add another profile's counts and times to this one."""
+        for (filename, lineno), stats in other.lines.items():
+            mine = self.line(filename, lineno)
+            mine.hits += stats.hits
+            mine.time += stats.time
+
+    def __str__(self) -> str:
+        """Return the lines in source order with their share of the time."""
+        return "\n".join(
+            f"{self.share(stats):6.1%}  {stats}"
+            for _, stats in sorted(self.lines.items())
+        )
+
+
+def rule_code_objects(func: Callable) -> Set[Any]:
+    """
+    Code objects making up a rule.
+
+    Args:
+        func: The rule function, or a rule object wrapping one
+
+    Returns:
+        Code objects of the function, the code nested in it, and the functions
+        and rules it closes over
+    """
+    codes: Set[Any] = set()
+    seen: Set[int] = set()
+
+    def add_code(code: Any) -> None:
+        if code in codes:
+            return
+        codes.add(code)
+        for const in code.co_consts:
+            if inspect.iscode(const):
+                add_code(const)
+
+    def add_function(obj: Any) -> None:
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        # Rule objects such as DSLRule wrap the function in ``func``
+        obj = getattr(obj, "func", obj)
+        obj = inspect.unwrap(obj) if callable(obj) else obj
+        code = getattr(obj, "__code__", None)
+        if not inspect.iscode(code):
+            return
+        add_code(code)
+        for cell in getattr(obj, "__closure__", None) or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:  # Empty cell
+                continue
+            values = contents if isinstance(contents, (list, tuple)) else [contents]
+            for value in values:
+                if callable(value):
+                    add_function(value)
+
+    add_function(func)
+    return codes
+
+
+class _Recorder:
+    """Attributes elapsed time to the current line of each active frame."""
+
+    def __init__(self, profile: LineProfile):
+        self.profile = profile
+        # Active frames of profiled code: [code, current line, time of last event]
+        self.stack: List[list] = []
+
+    def _charge(self, entry: list, now: float) -> None:
+        if entry[1] is not None:
+            self.profile.line(entry[0].co_filename, entry[1]).time += now - entry[2]
+
+    def enter(self, code: Any, lineno: Optional[int]) -> None:
+        now = time.perf_counter()
+        if self.stack:
+            # Pause the caller while the nested code runs
+            self._charge(self.stack[-1], now)
+        if lineno is not None:
+            self.profile.line(code.co_filename, lineno).hits += 1
+        self.stack.append([code, lineno, time.perf_counter()])
+
+    def line(self, code: Any, lineno: int) -> None:
+        now = time.perf_counter()
+        if not self.stack or self.stack[-1][0] is not code:
+            return
+        entry = self.stack[-1]
+        self._charge(entry, now)
+        self.profile.line(code.co_filename, lineno).hits += 1
+        entry[1] = lineno
+        entry[2] = time.perf_counter()
+
+    def leave(self, code: Any) -> None:
+        now = time.perf_counter()
+        if not self.stack or self.stack[-1][0] is not code:
+            return
+        self._charge(self.stack.pop(), now)
+        if self.stack:
+            self.stack[-1][2] = time.perf_counter()
+
+
+def _line_at(code: Any, offset: int) -> Optional[int]:
+    """Source line of a bytecode offset."""
+    for start, end, lineno in code.co_lines():
+        if start <= offset < end:
+            return lineno
+    return None
+
+
+class LineProfiler:
+    """Profiles the lines of a rule function and its closures."""
+
+    def __init__(self, func: Callable, use_monitoring: Optional[bool] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            func: The rule function, or a rule object wrapping one
+            use_monitoring: Whether to use ``sys.monitoring``; defaults to using
+                it when available
+        """
+        self.codes = rule_code_objects(func)
+        self.use_monitoring = HAS_MONITORING and use_monitoring is not False
+        self.profile = LineProfile()
+
+    def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Call a function, recording the lines of the rule it executes.
+
+        Args:
+            func: Function to call, usually the rule itself
+            *args: Arguments of the call
+
+        Returns:
+            The function's result
+        """
+        recorder = _Recorder(self.profile)
+        if self.use_monitoring:
+            tool = self._free_tool()
+            if tool is not None:
+                return self._run_monitored(tool, recorder, func, args)
+        return self._run_traced(recorder, func, args)
+
+    def _run_traced(
+        self, recorder: _Recorder, func: Callable, args: Tuple[Any, ...]
+    ) -> Any:
+        """Record lines with ``sys.settrace``."""
+        codes = self.codes
+
+        def trace_lines(frame, event, arg):
+            if event == "line":
+                recorder.line(frame.f_code, frame.f_lineno)
+            elif event == "return":
+                recorder.leave(frame.f_code)
+            return trace_lines
+
+        def trace_calls(frame, event, arg):
+            if event == "call" and frame.f_code in codes:
+                recorder.enter(frame.f_code, None)
+                return trace_lines
+            return None
+
+        previous = sys.gettrace()
+        sys.settrace(trace_calls)
+        try:
+            return func(*args)
+        finally:
+            sys.settrace(previous)
+
+    @staticmethod
+    def _free_tool() -> Optional[int]:
+        """A ``sys.monitoring`` tool id that isn't in use."""
+        monitoring = sys.monitoring
+        for tool in (monitoring.PROFILER_ID, 3, 4):
+            if monitoring.get_tool(tool) is None:
+                return tool
+        return None
+
+    def _run_monitored(
+        self, tool: int, recorder: _Recorder, func: Callable, args: Tuple[Any, ...]
+    ) -> Any:
+        """Record lines with ``sys.monitoring`` on the rule's code objects only."""
+        monitoring = sys.monitoring
+        events = monitoring.events
+        codes = self.codes
+
+        def on_start(code, offset):
+            recorder.enter(code, None)
+
+        def on_resume(code, offset):
+            recorder.enter(code, _line_at(code, offset))
+
+        def on_line(code, lineno):
+            recorder.line(code, lineno)
+
+        def on_leave(code, offset, value):
+            recorder.leave(code)
+
+        def on_unwind(code, offset, exception):
+            if code in codes:
+                recorder.leave(code)
+
+        callbacks = {
+            events.PY_START: on_start,
+            events.PY_RESUME: on_resume,
+            events.LINE: on_line,
+            events.PY_RETURN: on_leave,
+            events.PY_YIELD: on_leave,
+            events.PY_UNWIND: on_unwind,
+        }
+        local_events = (
+            events.PY_START
+            | events.PY_RESUME
+            | events.LINE
+            | events.PY_RETURN
+            | events.PY_YIELD
+        )
+
+        monitoring.use_tool_id(tool, "seqrule line profiler")
+        try:
+            for event, callback in callbacks.items():
+                monitoring.register_callback(tool, event, callback)
+            for code in codes:
+                monitoring.set_local_events(tool, code, local_events)
+            monitoring.set_events(tool, events.PY_UNWIND)
+            return func(*args)
+        finally:
+            monitoring.set_events(tool, 0)
+            for code in codes:
+                monitoring.set_local_events(tool, code, 0)
+            for event in callbacks:
+                monitoring.register_callback(tool, event, None)
+            monitoring.free_tool_id(tool)
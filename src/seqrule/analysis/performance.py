@@ -5,9 +5,17 @@ This module provides functionality for profiling the performance characteristics
 of sequence rules, including execution time, memory usage, and scaling behavior.
 """
 
+import gc
+import itertools
+import math
+import statistics
+import sys
 import time
+import tracemalloc
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .lineprof import LineProfile, LineProfiler
 
 try:
     import memory_profiler
@@ -24,6 +32,237 @@ except ImportError:
     HAS_SCIPY = False
 
 
+def _percentile(ordered: List[float], q: float) -> float:
+    """Linearly interpolated percentile of sorted values, with q in [0, 1]."""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (position - lower) * (ordered[upper] - ordered[lower])
+
+
+def _critical_value(confidence: float, df: int) -> float:
+    """Two-sided critical value of Student's t (normal without SciPy)."""
+    quantile = 0.5 + confidence / 2
+    if HAS_SCIPY:
+        return float(scipy.stats.t.ppf(quantile, df))
+    return statistics.NormalDist().inv_cdf(quantile)
+
+
+@dataclass
+class TimingStats:
+    """Distribution of per-call evaluation times for one sequence size."""
+
+    samples: List[float] = field(default_factory=list)
+    rejected: int = 0
+    loops: int = 1
+    confidence: float = 0.95
+
+    @classmethod
+    def from_samples(
+        cls,
+        samples: List[float],
+        loops: int = 1,
+        outlier_threshold: Optional[float] = None,
+        confidence: float = 0.95,
+    ) -> "TimingStats":
+        """
+        Summarize timings, optionally rejecting outliers.
+
+        Args:
+            samples: Per-call times in seconds
+            loops: Number of calls each sample was averaged over
+            outlier_threshold: If set, samples further than this many
+                interquartile ranges outside the quartiles are rejected
+                (Tukey's fences; 1.5 is conventional)
+            confidence: Confidence level of the interval around the mean
+
+        Returns:
+            TimingStats over the accepted samples
+        """
+        accepted = list(samples)
+        if outlier_threshold is not None and len(accepted) >= 4:
+            ordered = sorted(accepted)
+            q1, q3 = _percentile(ordered, 0.25), _percentile(ordered, 0.75)
+            margin = outlier_threshold * (q3 - q1)
+            accepted = [t for t in accepted if q1 - margin <= t <= q3 + margin]
+        return cls(
+            samples=accepted,
+            rejected=len(samples) - len(accepted),
+            loops=loops,
+            confidence=confidence,
+        )
+
+    @property
+    def count(self) -> int:
+        """Number of accepted samples."""
+        return len(self.samples)
+
+    @property
+    def mean(self) -> float:
+        """Mean time per call."""
+        return statistics.fmean(self.samples) if self.samples else 0.0
+
+    @property
+    def median(self) -> float:
+        """Median time per call."""
+        return statistics.median(self.samples) if self.samples else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation of the time per call."""
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def iqr(self) -> float:
+        """Interquartile range of the time per call."""
+        ordered = sorted(self.samples)
+        return _percentile(ordered, 0.75) - _percentile(ordered, 0.25)
+
+    @property
+    def p95(self) -> float:
+        """95th percentile of the time per call."""
+        return _percentile(sorted(self.samples), 0.95)
+
+    @property
+    def p99(self) -> float:
+        """99th percentile of the time per call."""
+        return _percentile(sorted(self.samples), 0.99)
+
+    @property
+    def confidence_interval(self) -> Tuple[float, float]:
+        """Confidence interval of the mean time per call."""
+        mean = self.mean
+        if len(self.samples) < 2:
+            return (mean, mean)
+        margin = _critical_value(self.confidence, len(self.samples) - 1) * (
+            self.stdev / math.sqrt(len(self.samples))
+        )
+        return (mean - margin, mean + margin)
+
+
+@dataclass
+class AllocationSite:
+    """Source line that allocated memory during a rule evaluation."""
+
+    filename: str
+    lineno: int
+    size: int
+    count: int
+
+    def __str__(self) -> str:
+        """Return the site and its allocations."""
+        return f"{self.filename}:{self.lineno}: {self.size} B in {self.count} blocks"
+
+
+@dataclass
+class AllocationStats:
+    """Memory allocated by a rule for one sequence size, traced by tracemalloc."""
+
+    peak_bytes: int = 0
+    retained_bytes: int = 0
+    allocation_count: int = 0
+    top_sites: List[AllocationSite] = field(default_factory=list)
+
+    def merge(self, other: "AllocationStats") -> "AllocationStats":
+        """Combine with another sequence's stats, keeping the larger values."""
+        sites = self.top_sites if self.peak_bytes >= other.peak_bytes else None
+        return AllocationStats(
+            peak_bytes=max(self.peak_bytes, other.peak_bytes),
+            retained_bytes=max(self.retained_bytes, other.retained_bytes),
+            allocation_count=max(self.allocation_count, other.allocation_count),
+            top_sites=sites if sites is not None else other.top_sites,
+        )
+
+
+# Allocations made by the profiler itself are left out of allocation sites
+_PROFILER_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def _top_sites(
+    snapshot: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot, limit: int
+) -> Tuple[List[AllocationSite], int]:
+    """Largest allocation sites that grew since the baseline, and their blocks."""
+    differences = [
+        diff
+        for diff in snapshot.filter_traces(_PROFILER_FILTERS).compare_to(
+            baseline.filter_traces(_PROFILER_FILTERS), "lineno"
+        )
+        if diff.size_diff > 0
+    ]
+    sites = [
+        AllocationSite(
+            filename=diff.traceback[0].filename,
+            lineno=diff.traceback[0].lineno,
+            size=diff.size_diff,
+            count=diff.count_diff,
+        )
+        for diff in differences[:limit]
+    ]
+    return sites, sum(max(diff.count_diff, 0) for diff in differences)
+
+
+def _trace_allocations(
+    rule_func: Callable, sequence: List[Any], top: int
+) -> AllocationStats:
+    """
+    Trace the memory a rule allocates on one sequence.
+
+    The rule is called twice. The first call measures peak and retained bytes.
+    The second snapshots the traces whenever live memory has grown by a quarter
+    since the last snapshot, so the sites of short-lived temporaries, such as
+    per-window lists, are caught near the peak.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        rule_func(sequence)
+        end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+        state = {"snapshot": None, "overhead": 0, "growth": 0}
+
+        def capture(frame, event, arg):
+            if event not in ("return", "c_return"):
+                return
+            growth = (
+                tracemalloc.get_traced_memory()[0] - state["overhead"] - end_bytes
+            )
+            if growth > 0 and growth >= state["growth"] * 1.25:
+                # Drop the previous snapshot before measuring the new one's size
+                state["snapshot"] = None
+                before = tracemalloc.get_traced_memory()[0]
+                state["snapshot"] = tracemalloc.take_snapshot()
+                state["overhead"] = tracemalloc.get_traced_memory()[0] - before
+                state["growth"] = growth
+
+        previous = sys.getprofile()
+        sys.setprofile(capture)
+        try:
+            rule_func(sequence)
+        finally:
+            sys.setprofile(previous)
+
+        peak = state["snapshot"] or tracemalloc.take_snapshot()
+        sites, count = _top_sites(peak, baseline, top)
+    finally:
+        if started:
+            tracemalloc.stop()
+    return AllocationStats(
+        peak_bytes=max(peak_bytes - start_bytes, 0),
+        retained_bytes=max(end_bytes - start_bytes, 0),
+        allocation_count=count,
+        top_sites=sites,
+    )
+
+
 @dataclass
 class PerformanceProfile:
     """Performance profiling results for a rule."""
@@ -34,6 +273,16 @@ class PerformanceProfile:
     sequence_sizes: List[int] = field(default_factory=list)
     timing_distribution: Dict[Any, float] = field(default_factory=dict)
     size_time_correlation: Optional[float] = None
+    timing_stats: Dict[int, TimingStats] = field(default_factory=dict)
+    allocation_stats: Dict[int, AllocationStats] = field(default_factory=dict)
+    line_profile: Optional[LineProfile] = None
+
+    @property
+    def peak_allocated_bytes(self) -> int:
+        """Largest peak of traced allocations over all sequence sizes."""
+        return max(
+            (stats.peak_bytes for stats in self.allocation_stats.values()), default=0
+        )
 
     def __post_init__(self):
         """Calculate correlation after initialization."""
@@ -108,26 +357,157 @@ class PerformanceProfile:
         else:
             time_format = ".3f" if self.avg_evaluation_time < 0.01 else ".2f"
             time_str = f"{self.avg_evaluation_time:{time_format}}s"
-        return (
+        text = (
             f"Average time: {time_str}\n"
             f"Peak memory: {self.peak_memory_usage:.2f}MB\n"
             f"Calls: {self.call_count}\n"
             f"Size-Time correlation: {self.size_time_correlation or 'N/A'}"
         )
+        if self.allocation_stats:
+            text += f"\nPeak allocations: {self.peak_allocated_bytes} B"
+        return text
 
 
 class PerformanceProfiler:
     """Profiles the performance characteristics of sequence rules."""
 
-    def __init__(self, memory_profiling: bool = False, samples: int = 1):
+    def __init__(
+        self,
+        memory_profiling: bool = False,
+        samples: int = 1,
+        warmup: int = 0,
+        min_round_time: float = 0.0,
+        disable_gc: bool = False,
+        outlier_threshold: Optional[float] = None,
+        confidence: float = 0.95,
+        allocation_profiling: bool = False,
+        allocation_sites: int = 10,
+        line_profiling: bool = False,
+    ):
         """Initialize the profiler.
 
+        The defaults time each sequence once. :meth:`benchmarking` returns a
+        profiler configured for stable, repeatable measurements instead.
+
         Args:
             memory_profiling: Whether to enable memory profiling
             samples: Number of samples to collect for each sequence
+            warmup: Number of untimed calls before timing each sequence
+            min_round_time: Minimum duration in seconds of each sample; fast
+                rules are called repeatedly per sample until it's reached
+            disable_gc: Whether to disable garbage collection while timing
+            outlier_threshold: If set, reject samples more than this many
+                interquartile ranges outside the quartiles of their size
+            confidence: Confidence level of the per-size intervals
+            allocation_profiling: Whether to trace allocations with
+                tracemalloc; the traced calls count towards the warmup
+            allocation_sites: Number of top allocation sites to keep per size
+            line_profiling: Whether to count executions and time of each line
+                of the rule; the profiled call counts towards the warmup
         """
         self.memory_profiling = memory_profiling and HAS_MEMORY_PROFILER
         self.samples = samples
+        self.warmup = warmup
+        self.min_round_time = min_round_time
+        self.disable_gc = disable_gc
+        self.outlier_threshold = outlier_threshold
+        self.confidence = confidence
+        self.allocation_profiling = allocation_profiling
+        self.allocation_sites = allocation_sites
+        self.line_profiling = line_profiling
+
+    @classmethod
+    def benchmarking(
+        cls,
+        samples: int = 30,
+        warmup: int = 3,
+        min_round_time: float = 0.005,
+        disable_gc: bool = True,
+        outlier_threshold: Optional[float] = 1.5,
+        confidence: float = 0.95,
+        memory_profiling: bool = False,
+        allocation_profiling: bool = False,
+        line_profiling: bool = False,
+    ) -> "PerformanceProfiler":
+        """
+        Create a profiler for statistically rigorous benchmarks.
+
+        Each sequence is warmed up, the number of calls per sample is
+        calibrated the way ``timeit`` does, and many samples are collected with
+        garbage collection disabled. Outliers are rejected per sequence size.
+
+        Returns:
+            PerformanceProfiler instance
+        """
+        return cls(
+            memory_profiling=memory_profiling,
+            samples=samples,
+            warmup=warmup,
+            min_round_time=min_round_time,
+            disable_gc=disable_gc,
+            outlier_threshold=outlier_threshold,
+            confidence=confidence,
+            allocation_profiling=allocation_profiling,
+            line_profiling=line_profiling,
+        )
+
+    def _calibrate(self, rule_func: Callable, sequence: List[Any]) -> int:
+        """Number of calls per sample needed to reach the minimum round time."""
+        if self.min_round_time <= 0:
+            return 1
+        base = 1
+        while base < 10**7:
+            for factor in (1, 2, 5):
+                loops = base * factor
+                start_time = time.perf_counter()
+                for _ in itertools.repeat(None, loops):
+                    rule_func(sequence)
+                if time.perf_counter() - start_time >= self.min_round_time:
+                    return loops
+            base *= 10
+        return base
+
+    def _time_sequence(
+        self, rule_func: Callable, sequence: List[Any], warmup: Optional[int] = None
+    ) -> Tuple[List[float], int]:
+        """Collect per-call time samples for a single sequence."""
+        for _ in range(self.warmup if warmup is None else warmup):
+            rule_func(sequence)
+        loops = self._calibrate(rule_func, sequence)
+
+        gc_was_enabled = gc.isenabled()
+        if self.disable_gc:
+            gc.disable()
+        try:
+            times = []
+            for _ in range(max(self.samples, 1)):
+                start_time = time.perf_counter()
+                for _ in itertools.repeat(None, loops):
+                    rule_func(sequence)
+                end_time = time.perf_counter()
+                times.append((end_time - start_time) / loops)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return times, loops
+
+    def measure(self, func: Callable[[], Any]) -> TimingStats:
+        """
+        Time repeated calls of a function with the profiler's settings.
+
+        Args:
+            func: Function taking no arguments
+
+        Returns:
+            TimingStats of the time per call
+        """
+        times, loops = self._time_sequence(lambda _: func(), None)
+        return TimingStats.from_samples(
+            times,
+            loops=loops,
+            outlier_threshold=self.outlier_threshold,
+            confidence=self.confidence,
+        )
 
     def profile_rule(
         self, rule_func: callable, sequences: List[List[Any]]
@@ -137,9 +517,11 @@ class PerformanceProfiler:
             return PerformanceProfile()
 
         # Initialize profiling data
-        total_time = 0.0
         peak_memory = 0.0
-        timing_distribution = {}
+        samples_by_size: Dict[int, List[float]] = {}
+        loops_by_size: Dict[int, int] = {}
+        allocation_stats: Dict[int, AllocationStats] = {}
+        line_profiler = None
         sequence_sizes = []
         call_count = 0
 
@@ -152,15 +534,31 @@ class PerformanceProfiler:
             try:
                 sequence_size = len(sequence)
 
-                # Time the rule evaluation
-                start_time = time.perf_counter()
-                rule_func(sequence)
-                end_time = time.perf_counter()
-                elapsed = end_time - start_time
+                # Trace allocations and lines first; these calls also warm up
+                warmup = self.warmup
+                if self.allocation_profiling:
+                    allocations = _trace_allocations(
+                        rule_func, sequence, self.allocation_sites
+                    )
+                    if sequence_size in allocation_stats:
+                        allocations = allocation_stats[sequence_size].merge(allocations)
+                    allocation_stats[sequence_size] = allocations
+                    warmup = max(warmup - 2, 0)
+                if self.line_profiling:
+                    if line_profiler is None:
+                        line_profiler = LineProfiler(rule_func)
+                    line_profiler.run(rule_func, sequence)
+                    warmup = max(warmup - 1, 0)
 
-                # Update timing data
-                total_time += elapsed
-                timing_distribution[sequence_size] = elapsed
+                # Time the rule evaluation
+                times, loops = self._time_sequence(rule_func, sequence, warmup)
+
+                # Update timing data; sequences of the same size share one
+                # distribution
+                samples_by_size.setdefault(sequence_size, []).extend(times)
+                loops_by_size[sequence_size] = max(
+                    loops, loops_by_size.get(sequence_size, 1)
+                )
                 sequence_sizes.append(sequence_size)
                 call_count += 1
 
@@ -180,13 +578,29 @@ class PerformanceProfiler:
                 print(f"Error profiling sequence: {e}")
                 continue
 
+        timing_stats = {
+            size: TimingStats.from_samples(
+                times,
+                loops=loops_by_size[size],
+                outlier_threshold=self.outlier_threshold,
+                confidence=self.confidence,
+            )
+            for size, times in samples_by_size.items()
+        }
+        accepted = [t for stats in timing_stats.values() for t in stats.samples]
+
         # Calculate average time
-        avg_time = total_time / call_count if call_count else 0.0
+        avg_time = statistics.fmean(accepted) if accepted else 0.0
 
         return PerformanceProfile(
             avg_evaluation_time=avg_time,
             peak_memory_usage=peak_memory,
             call_count=call_count,
             sequence_sizes=sequence_sizes,
-            timing_distribution=timing_distribution,
+            timing_distribution={
+                size: stats.median for size, stats in timing_stats.items()
+            },
+            timing_stats=timing_stats,
+            allocation_stats=allocation_stats,
+            line_profile=line_profiler.profile if line_profiler else None,
         )
@@ -0,0 +1,307 @@
+"""
+Empirical complexity fitting.
+
+This module measures how a rule's evaluation time grows with sequence length
+and fits the measurements against candidate complexity classes, as a check on
+the static estimate ComplexityAnalyzer derives from the rule's AST.
+
+Rules are timed on inputs at geometric sizes. Each candidate model
+``t(n) = a + b * g(n)`` is fitted by least squares on relative errors, so that
+small and large sizes count equally, and the models are compared with the
+small-sample Akaike information criterion. The Akaike weight of the best model
+serves as its confidence score.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Union
+
+from ..core import Sequence
+from .base import ComplexityClass
+from .complexity import RuleComplexity
+from .performance import PerformanceProfiler, TimingStats
+
+# Growth functions of the candidate models
+MODELS: Dict[ComplexityClass, Callable[[int], float]] = {
+    ComplexityClass.CONSTANT: lambda n: 0.0,
+    ComplexityClass.LOGARITHMIC: lambda n: math.log2(n),
+    ComplexityClass.LINEAR: lambda n: float(n),
+    ComplexityClass.LINEARITHMIC: lambda n: n * math.log2(n),
+    ComplexityClass.QUADRATIC: lambda n: float(n) ** 2,
+    ComplexityClass.CUBIC: lambda n: float(n) ** 3,
+    ComplexityClass.EXPONENTIAL: lambda n: 2.0**n,
+}
+
+# Largest size at which 2^n is still representable as a float
+_MAX_EXPONENTIAL_SIZE = 1000
+
+
+def geometric_sizes(
+    min_exponent: int = 4, max_exponent: int = 20, base: int = 2
+) -> List[int]:
+    """
+    Sequence sizes growing geometrically.
+
+    Args:
+        min_exponent: Exponent of the smallest size
+        max_exponent: Exponent of the largest size
+        base: Growth factor between consecutive sizes
+
+    Returns:
+        Sizes ``base**min_exponent`` through ``base**max_exponent``
+    """
+    return [base**e for e in range(min_exponent, max_exponent + 1)]
+
+
+@dataclass
+class ModelFit:
+    """Least-squares fit of one complexity class to timing measurements."""
+
+    complexity: ComplexityClass
+    intercept: float
+    coefficient: float
+    rss: float
+    aic: float
+    weight: float = 0.0
+
+    def predict(self, size: int) -> float:
+        """Predicted evaluation time in seconds at the given size."""
+        return self.intercept + self.coefficient * MODELS[self.complexity](size)
+
+
+def _fit_model(
+    complexity: ComplexityClass, sizes: List[int], times: List[float]
+) -> ModelFit:
+    """Fit ``t = a + b * g(n)`` with a, b >= 0, weighting by relative error."""
+    g = [MODELS[complexity](n) for n in sizes]
+    w = [1.0 / max(t, 1e-12) ** 2 for t in times]
+
+    s = sum(w)
+    sg = sum(wi * gi for wi, gi in zip(w, g, strict=True))
+    sgg = sum(wi * gi * gi for wi, gi in zip(w, g, strict=True))
+    st = sum(wi * ti for wi, ti in zip(w, times, strict=True))
+    sgt = sum(wi * gi * ti for wi, gi, ti in zip(w, g, times, strict=True))
+
+    det = s * sgg - sg * sg
+    b = (s * sgt - sg * st) / det if det > 1e-12 * s * sgg else 0.0
+    if b <= 0:
+        a, b = st / s, 0.0
+    else:
+        a = (st - b * sg) / s
+        if a < 0:
+            # Fit through the origin instead
+            a, b = 0.0, sgt / sgg
+
+    rss = sum(
+        wi * (ti - a - b * gi) ** 2 for wi, gi, ti in zip(w, g, times, strict=True)
+    )
+    k = 1 if complexity == ComplexityClass.CONSTANT else 2
+    m = len(sizes)
+    aic = m * math.log(max(rss, 1e-300) / m) + 2 * k
+    if m - k - 1 > 0:
+        aic += 2 * k * (k + 1) / (m - k - 1)
+    return ModelFit(complexity, intercept=a, coefficient=b, rss=rss, aic=aic)
+
+
+def fit_complexity(sizes: List[int], times: List[float]) -> List[ModelFit]:
+    """
+    Fit every candidate complexity class to timing measurements.
+
+    The exponential model is only considered when every size is small enough
+    for ``2**n`` to be computed.
+
+    Args:
+        sizes: Sequence sizes
+        times: Evaluation time in seconds at each size
+
+    Returns:
+        Fits ordered from most to least likely, with Akaike weights summing to 1
+
+    Raises:
+        ValueError: If fewer than three measurements are given
+    """
+    if len(sizes) != len(times):
+        raise ValueError("sizes and times must have the same length")
+    if len(sizes) < 3:
+        raise ValueError("At least three measurements are needed to fit complexity")
+
+    candidates = [
+        complexity
+        for complexity in MODELS
+        if complexity != ComplexityClass.EXPONENTIAL
+        or max(sizes) <= _MAX_EXPONENTIAL_SIZE
+    ]
+    fits = sorted(
+        (_fit_model(c, sizes, times) for c in candidates), key=lambda f: f.aic
+    )
+    best = fits[0].aic
+    likelihoods = [math.exp(-(fit.aic - best) / 2) for fit in fits]
+    total = sum(likelihoods)
+    for fit, likelihood in zip(fits, likelihoods, strict=True):
+        fit.weight = likelihood / total
+    return fits
+
+
+@dataclass
+class ScalingResult:
+    """Measured scaling behaviour of a rule and the complexity fitted to it."""
+
+    sizes: List[int]
+    times: List[float]
+    fits: List[ModelFit]
+    static_complexity: Optional[ComplexityClass] = None
+    min_confidence: float = 0.5
+    timings: Dict[int, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Index the measured times by size."""
+        if not self.timings:
+            self.timings = dict(zip(self.sizes, self.times, strict=True))
+
+    @property
+    def best_fit(self) -> ComplexityClass:
+        """The complexity class that best explains the measurements."""
+        return self.fits[0].complexity
+
+    @property
+    def confidence(self) -> float:
+        """Akaike weight of the best fit, between 0 and 1."""
+        return self.fits[0].weight
+
+    @property
+    def disagrees(self) -> bool:
+        """Whether a confident fit contradicts the static complexity estimate."""
+        return (
+            self.static_complexity is not None
+            and self.confidence >= self.min_confidence
+            and self.best_fit != self.static_complexity
+        )
+
+    def __str__(self) -> str:
+        """Return a human-readable scaling summary."""
+        text = f"Empirical: {self.best_fit} (confidence {self.confidence:.2f})"
+        if self.static_complexity is not None:
+            text += f"\nStatic: {self.static_complexity}"
+            if self.disagrees:
+                text += "\nWarning: measured scaling disagrees with static analysis"
+        return text
+
+
+class ScalingAnalyzer:
+    """Times a rule at growing input sizes and fits its complexity."""
+
+    def __init__(
+        self,
+        sizes: Optional[List[int]] = None,
+        profiler: Optional[PerformanceProfiler] = None,
+        time_budget: float = 10.0,
+        min_confidence: float = 0.5,
+    ):
+        """
+        Initialize the harness.
+
+        Args:
+            sizes: Sizes to time the rule at; defaults to 2^4 through 2^20
+            profiler: Profiler timing each size; defaults to a benchmarking
+                profiler with few samples
+            time_budget: Seconds after which no larger sizes are started
+            min_confidence: Confidence the best fit needs before disagreeing
+                with the static estimate is flagged
+        """
+        self.sizes = sorted(sizes) if sizes else geometric_sizes()
+        self.profiler = profiler or PerformanceProfiler.benchmarking(
+            samples=5, warmup=1, min_round_time=0.001
+        )
+        self.time_budget = time_budget
+        self.min_confidence = min_confidence
+
+    def measure(
+        self,
+        rule_func: Callable[[Sequence], bool],
+        make_sequence: Callable[[int], Sequence],
+    ) -> Dict[int, float]:
+        """
+        Time a rule at increasing sizes until the sizes or the budget run out.
+
+        A size is skipped once the previous measurements predict it would
+        overrun the remaining budget.
+
+        Args:
+            rule_func: The rule function
+            make_sequence: Builds an input sequence of the given size
+
+        Returns:
+            Median evaluation time in seconds for each measured size
+        """
+        return {
+            size: stats.median
+            for size, stats in self.measure_stats(rule_func, make_sequence).items()
+        }
+
+    def measure_stats(
+        self,
+        rule_func: Callable[[Sequence], bool],
+        make_sequence: Callable[[int], Sequence],
+    ) -> Dict[int, TimingStats]:
+        """
+        Time a rule like :meth:`measure`, keeping the timing distributions.
+
+        Returns:
+            TimingStats for each measured size
+        """
+        timings: Dict[int, TimingStats] = {}
+        start_time = time.perf_counter()
+        last_size, last_cost = None, 0.0
+        for size in self.sizes:
+            elapsed = time.perf_counter() - start_time
+            remaining = self.time_budget - elapsed
+            if remaining <= 0:
+                break
+            if last_size is not None and len(timings) >= 3:
+                # Assume up to quadratic growth when predicting the next cost
+                if last_cost * (size / last_size) ** 2 > remaining:
+                    break
+
+            sequence = make_sequence(size)
+            size_start = time.perf_counter()
+            profile = self.profiler.profile_rule(rule_func, [sequence])
+            last_size, last_cost = size, time.perf_counter() - size_start
+            stats = profile.timing_stats.get(len(sequence))
+            if stats is None or not stats.count:
+                break  # The rule failed on this input
+            timings[size] = stats
+        return timings
+
+    def analyze(
+        self,
+        rule_func: Callable[[Sequence], bool],
+        make_sequence: Callable[[int], Sequence],
+        static: Optional[Union[RuleComplexity, ComplexityClass]] = None,
+    ) -> ScalingResult:
+        """
+        Measure a rule's scaling and fit its complexity.
+
+        Args:
+            rule_func: The rule function
+            make_sequence: Builds an input sequence of the given size
+            static: Static complexity estimate to compare against
+
+        Returns:
+            ScalingResult with the measurements and fitted models
+
+        Raises:
+            ValueError: If fewer than three sizes could be measured
+        """
+        timings = self.measure(rule_func, make_sequence)
+        sizes = sorted(timings)
+        times = [timings[size] for size in sizes]
+        if isinstance(static, RuleComplexity):
+            static = static.time_complexity
+        return ScalingResult(
+            sizes=sizes,
+            times=times,
+            fits=fit_complexity(sizes, times),
+            static_complexity=static,
+            min_confidence=self.min_confidence,
+        )
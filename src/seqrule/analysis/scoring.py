@@ -3,13 +3,80 @@ Scoring module for rule analysis.
 
 This module provides classes for scoring rule analyses based on various complexity
 metrics and generating recommendations for optimization.
+
+Scores are normalized against running statistics of the raw scores seen so far,
+their maximum and quantiles estimated with the P² algorithm, so a scorer can run
+indefinitely in constant memory. Scoring can be divided into epochs that each
+start from fresh statistics.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List
+from bisect import insort
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Optional
 
 from seqrule.analysis.base import ComplexityClass, ComplexityScore, PropertyAccess
 
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Scores of time and space complexity classes
+_TIME_SCORES = {
+    ComplexityClass.CONSTANT: 0.0,
+    ComplexityClass.LOGARITHMIC: 10.0,
+    ComplexityClass.LINEAR: 25.0,
+    ComplexityClass.LINEARITHMIC: 40.0,
+    ComplexityClass.QUADRATIC: 60.0,
+    ComplexityClass.CUBIC: 80.0,
+    ComplexityClass.EXPONENTIAL: 95.0,
+    ComplexityClass.FACTORIAL: 100.0,
+}
+_SPACE_SCORES = {
+    ComplexityClass.CONSTANT: 0.0,
+    ComplexityClass.LOGARITHMIC: 10.0,
+    ComplexityClass.LINEAR: 30.0,
+    ComplexityClass.LINEARITHMIC: 50.0,
+    ComplexityClass.QUADRATIC: 70.0,
+    ComplexityClass.CUBIC: 85.0,
+    ComplexityClass.EXPONENTIAL: 95.0,
+    ComplexityClass.FACTORIAL: 100.0,
+}
+
+# Scores of counts: upper bounds, the score up to each bound, and the points
+# added per unit above the last bound, up to 100
+_CYCLOMATIC_THRESHOLDS = ((1, 3, 5, 10, 15), (0.0, 20.0, 40.0, 60.0, 80.0), 2.0)
+_AST_NODE_THRESHOLDS = ((10, 20, 30, 50, 100), (0.0, 20.0, 40.0, 60.0, 80.0), 0.2)
+_BOTTLENECK_THRESHOLDS = ((0, 1, 2), (0.0, 30.0, 60.0), 20.0)
+
+# Points per property, access, access type and nested property, each capped at
+# 100, and their weights in the property access score
+_PROPERTY_ACCESS_POINTS = (20.0, 2.0, 10.0, 25.0)
+_PROPERTY_ACCESS_WEIGHTS = (0.3, 0.3, 0.2, 0.2)
+
+# Number of most recent scores a scorer keeps for batch_normalize by default
+DEFAULT_RETAIN = 10_000
+
+# Complexity levels by normalized score, each starting 20 points above the last
+_LEVELS = [
+    ComplexityScore.TRIVIAL,
+    ComplexityScore.SIMPLE,
+    ComplexityScore.MODERATE,
+    ComplexityScore.COMPLEX,
+    ComplexityScore.EXTREME,
+]
+
+
+def _require_numpy() -> None:
+    """Raise an informative error if NumPy is not installed."""
+    if not HAS_NUMPY:
+        raise ImportError(
+            "Batch scoring requires NumPy. Install it with 'pip install numpy'."
+        )
+
 
 @dataclass
 class RuleScore:
@@ -49,6 +116,196 @@ class RuleScore:
         )
 
 
+class QuantileSketch:
+    """
+    Streaming estimate of a quantile with the P² algorithm.
+
+    Five markers track the minimum, the maximum, the quantile and the points
+    halfway to it, and are moved along a piecewise-parabolic curve as values
+    arrive, so the estimate takes constant memory and time per value.
+    """
+
+    def __init__(self, quantile: float):
+        """
+        Initialize the sketch.
+
+        Args:
+            quantile: The quantile to estimate, between 0 and 1.
+
+        Raises:
+            ValueError: If the quantile is not strictly between 0 and 1.
+        """
+        if not 0.0 < quantile < 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        self.quantile = quantile
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [
+            1.0,
+            1.0 + 2.0 * quantile,
+            1.0 + 4.0 * quantile,
+            3.0 + 2.0 * quantile,
+            5.0,
+        ]
+        self._increments = [0.0, quantile / 2.0, quantile, (1.0 + quantile) / 2.0, 1.0]
+
+    def add(self, value: float) -> None:
+        """Add a value to the sketch."""
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            insort(heights, value)
+            return
+
+        # Find the cell of the value, extending the extremes if needed
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (
+                offset <= -1 and positions[i - 1] - positions[i] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i]
+                    )
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Height of marker i moved by step along the parabola through its neighbors."""
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[float]:
+        """The estimated quantile, exact for up to five values, or None if empty."""
+        if not self.count:
+            return None
+        if self.count <= 5:
+            return self._heights[round(self.quantile * (self.count - 1))]
+        return self._heights[2]
+
+
+@dataclass
+class ScoreSummary:
+    """
+    Running statistics of the raw scores of one scoring epoch.
+
+    Attributes:
+        epoch: Number of the epoch, counting from 0.
+        count: Number of analyses scored in the epoch.
+        max_score: Highest raw score of the epoch.
+        quantiles: Estimated raw score quantiles of the epoch.
+    """
+
+    epoch: int
+    count: int
+    max_score: float
+    quantiles: Dict[float, Optional[float]] = field(default_factory=dict)
+
+
+@dataclass
+class ScoreTable:
+    """
+    Columnar scores of a batch of rule analyses.
+
+    Row ``i`` of every column belongs to the ``i``-th analysis scored.
+
+    Attributes:
+        raw_score: Float array of raw scores.
+        normalized_score: Float array of scores normalized to a 0-100 scale.
+        complexity_level: Object array of ComplexityScore levels.
+        contributing_factors: Float array of each factor's score, by factor.
+        bottlenecks: Integer array of the numbers of bottlenecks.
+    """
+
+    raw_score: Any
+    normalized_score: Any
+    complexity_level: Any
+    contributing_factors: Dict[str, Any]
+    bottlenecks: Any
+
+    def __len__(self) -> int:
+        """Return the number of scored analyses."""
+        return int(self.raw_score.shape[0])
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """The scores of one analysis as plain Python values."""
+        row = {
+            "raw_score": self.raw_score[i].item(),
+            "normalized_score": self.normalized_score[i].item(),
+            "complexity_level": self.complexity_level[i],
+            "bottlenecks": self.bottlenecks[i].item(),
+        }
+        for factor, scores in self.contributing_factors.items():
+            row[factor] = scores[i].item()
+        return row
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """The columns as lists, with one column per contributing factor."""
+        columns = {
+            "raw_score": self.raw_score.tolist(),
+            "normalized_score": self.normalized_score.tolist(),
+            "complexity_level": list(self.complexity_level),
+            "bottlenecks": self.bottlenecks.tolist(),
+        }
+        for factor, scores in self.contributing_factors.items():
+            columns[factor] = scores.tolist()
+        return columns
+
+
+def _threshold_score(value: float, thresholds: tuple) -> float:
+    """
+    Score a value by the first bound it doesn't exceed.
+
+    Values above the last bound score the last score plus the slope per unit
+    above it, up to 100.
+    """
+    bounds, scores, slope = thresholds
+    for bound, score in zip(bounds, scores, strict=True):
+        if value <= bound:
+            return score
+    return min(100.0, scores[-1] + (value - bounds[-1]) * slope)
+
+
+def _threshold_scores(values, thresholds: tuple):
+    """Score an array of values as _threshold_score does."""
+    bounds, scores, slope = thresholds
+    beyond = np.minimum(100.0, scores[-1] + (values - bounds[-1]) * slope)
+    return np.select([values <= bound for bound in bounds], scores, default=beyond)
+
+
+def _property_counts(properties: Dict[str, PropertyAccess]) -> tuple:
+    """Numbers of properties, accesses, access types and nested properties."""
+    return (
+        len(properties),
+        sum(prop.access_count for prop in properties.values()),
+        sum(len(prop.access_types) for prop in properties.values()),
+        sum(len(prop.nested_properties) for prop in properties.values()),
+    )
+
+
 class RuleScorer:
     """
     Class for scoring rule analyses based on various complexity metrics.
@@ -58,8 +315,26 @@ class RuleScorer:
     and bottleneck count. It also generates recommendations for optimizing the rule.
     """
 
-    def __init__(self):
-        """Initialize the RuleScorer with default weights."""
+    def __init__(
+        self,
+        retain: Optional[int] = DEFAULT_RETAIN,
+        epoch_size: Optional[int] = None,
+        quantiles: Iterable[float] = (0.5, 0.9, 0.99),
+        reference_quantile: Optional[float] = None,
+    ):
+        """
+        Initialize the RuleScorer with default weights.
+
+        Args:
+            retain: Number of most recent scores kept for batch_normalize;
+                0 keeps only running statistics and None keeps every score,
+                without bound.
+            epoch_size: If given, start a new epoch after this many scores.
+            quantiles: Raw score quantiles to estimate in each epoch.
+            reference_quantile: If given, normalize against this quantile of
+                the raw scores instead of their maximum, so that a few outliers
+                don't compress the other scores.
+        """
         self.weights = {
             "time_complexity": 25.0,
             "space_complexity": 15.0,
@@ -68,10 +343,61 @@ class RuleScorer:
             "ast_node_count": 10.0,
             "bottleneck_count": 10.0,
         }
-        # Store raw scores for batch normalization
-        self._raw_scores = []
-        self._score_objects = []
+        self.retain = retain
+        self.epoch_size = epoch_size
+        self.quantiles = tuple(quantiles)
+        if reference_quantile is not None and reference_quantile not in self.quantiles:
+            self.quantiles += (reference_quantile,)
+        self.reference_quantile = reference_quantile
+        # Recent scores for batch normalization
+        self._score_objects = deque(maxlen=retain)
+        self.last_epoch: Optional[ScoreSummary] = None
+        self._epoch = 0
+        self._reset_statistics()
+
+    def _reset_statistics(self) -> None:
+        """Start the running statistics afresh."""
+        self._count = 0
         self._max_observed_score = 0.0
+        self._sketches = {q: QuantileSketch(q) for q in self.quantiles}
+
+    @property
+    def summary(self) -> ScoreSummary:
+        """Running statistics of the current epoch."""
+        return ScoreSummary(
+            epoch=self._epoch,
+            count=self._count,
+            max_score=self._max_observed_score,
+            quantiles={q: sketch.value for q, sketch in self._sketches.items()},
+        )
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimated quantile of the raw scores of the current epoch.
+
+        Args:
+            q: One of the quantiles the scorer tracks.
+
+        Returns:
+            The estimate, or None if nothing was scored in the epoch.
+
+        Raises:
+            KeyError: If the quantile is not tracked.
+        """
+        return self._sketches[q].value
+
+    def start_epoch(self) -> ScoreSummary:
+        """
+        Start a new scoring epoch with fresh statistics and no retained scores.
+
+        Returns:
+            The summary of the finished epoch, also kept as ``last_epoch``.
+        """
+        self.last_epoch = self.summary
+        self._epoch += 1
+        self._reset_statistics()
+        self._score_objects.clear()
+        return self.last_epoch
 
     def with_custom_weights(self, weights: Dict[str, float]) -> "RuleScorer":
         """
@@ -83,7 +409,12 @@ class RuleScorer:
         Returns:
             A new RuleScorer with the specified weights.
         """
-        scorer = RuleScorer()
+        scorer = RuleScorer(
+            retain=self.retain,
+            epoch_size=self.epoch_size,
+            quantiles=self.quantiles,
+            reference_quantile=self.reference_quantile,
+        )
         scorer.weights = weights
         return scorer
 
@@ -97,6 +428,9 @@ class RuleScorer:
         Returns:
             A RuleScore object containing the score and recommendations.
         """
+        if self.epoch_size and self._count >= self.epoch_size:
+            self.start_epoch()
+
         # Calculate component scores
         time_complexity_score = self._score_time_complexity(
             analysis.complexity.time_complexity
@@ -128,9 +462,11 @@ class RuleScorer:
             for factor, score in contributing_factors.items()
         )
 
-        # Store raw score for batch normalization
-        self._raw_scores.append(raw_score)
+        # Update the running statistics
+        self._count += 1
         self._max_observed_score = max(self._max_observed_score, raw_score)
+        for sketch in self._sketches.values():
+            sketch.add(raw_score)
 
         # Apply initial normalization with current knowledge
         # This will be refined later in the batch_normalize step
@@ -166,11 +502,122 @@ class RuleScorer:
             recommendations=recommendations,
         )
 
-        # Store the score object for later batch normalization
-        self._score_objects.append(score_object)
+        # Keep the score object for later batch normalization
+        if self.retain != 0:
+            self._score_objects.append(score_object)
 
         return score_object
 
+    def score_batch(self, analyses: Iterable[Any]) -> ScoreTable:
+        """
+        Score many rule analyses at once with NumPy.
+
+        The contributing factors of all analyses are gathered into arrays, and
+        weights, normalization and complexity levels are applied to the arrays
+        as a whole. The batch is split where epochs end, as scoring one
+        analysis at a time would, and the running statistics are updated with
+        each part before normalizing it. Rows of the same epoch are thus
+        normalized against the same statistics, as batch_normalize would. No
+        RuleScore objects are kept and no recommendations are generated; use
+        score for those.
+
+        Args:
+            analyses: The rule analyses to score.
+
+        Returns:
+            A ScoreTable with a row per analysis.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        _require_numpy()
+        analyses = list(analyses)
+
+        complexities = [analysis.complexity for analysis in analyses]
+        cyclomatic = np.array(
+            [analysis.cyclomatic_complexity for analysis in analyses], dtype=float
+        )
+        ast_nodes = np.array(
+            [analysis.ast_node_count for analysis in analyses], dtype=float
+        )
+        bottlenecks = np.array(
+            [len(complexity.bottlenecks) for complexity in complexities], dtype=np.int64
+        )
+        properties, accesses, access_types, nested = (
+            np.array(
+                [_property_counts(analysis.properties) for analysis in analyses],
+                dtype=float,
+            )
+            .reshape(-1, 4)
+            .T
+        )
+
+        contributing_factors = {
+            "time_complexity": np.array(
+                [_TIME_SCORES.get(c.time_complexity, 50.0) for c in complexities],
+                dtype=float,
+            ),
+            "space_complexity": np.array(
+                [_SPACE_SCORES.get(c.space_complexity, 50.0) for c in complexities],
+                dtype=float,
+            ),
+            "cyclomatic_complexity": _threshold_scores(
+                cyclomatic, _CYCLOMATIC_THRESHOLDS
+            ),
+            "property_access_complexity": sum(
+                np.minimum(100.0, counts * points) * weight
+                for counts, points, weight in zip(
+                    (properties, accesses, access_types, nested),
+                    _PROPERTY_ACCESS_POINTS,
+                    _PROPERTY_ACCESS_WEIGHTS,
+                    strict=True,
+                )
+            ),
+            "ast_node_count": _threshold_scores(ast_nodes, _AST_NODE_THRESHOLDS),
+            "bottleneck_count": _threshold_scores(bottlenecks, _BOTTLENECK_THRESHOLDS),
+        }
+        raw_scores = np.zeros(len(analyses))
+        for factor, scores in contributing_factors.items():
+            raw_scores += scores * self.weights[factor] / 100.0
+
+        normalized_scores = np.zeros(len(analyses))
+        start = 0
+        while start < len(analyses):
+            if self.epoch_size and self._count >= self.epoch_size:
+                self.start_epoch()
+            end = len(analyses)
+            if self.epoch_size:
+                end = min(end, start + self.epoch_size - self._count)
+            part = raw_scores[start:end]
+
+            # Update the running statistics with this epoch's part of the batch
+            self._count += len(part)
+            self._max_observed_score = max(self._max_observed_score, float(part.max()))
+            for sketch in self._sketches.values():
+                for raw_score in part.tolist():
+                    sketch.add(raw_score)
+
+            # Normalize as _normalize_score does, against at least 60.0
+            reference = self._max_observed_score
+            if self.reference_quantile is not None:
+                reference = self.quantile(self.reference_quantile)
+            normalized_scores[start:end] = np.clip(
+                part / max(60.0, reference) * 100.0, 0, 100
+            )
+            start = end
+
+        levels = np.array(_LEVELS, dtype=object)[
+            np.digitize(normalized_scores, [20.0, 40.0, 60.0, 80.0])
+        ]
+
+        return ScoreTable(
+            raw_score=raw_scores,
+            normalized_score=normalized_scores,
+            complexity_level=levels,
+            contributing_factors=contributing_factors,
+            bottlenecks=bottlenecks,
+        )
+
     def _score_time_complexity(self, complexity_class: ComplexityClass) -> float:
         """
         Score the time complexity of a rule.
@@ -181,19 +628,7 @@ class RuleScorer:
         Returns:
             A score between 0 and 100.
         """
-        # Map complexity classes to scores
-        scores = {
-            ComplexityClass.CONSTANT: 0.0,
-            ComplexityClass.LOGARITHMIC: 10.0,
-            ComplexityClass.LINEAR: 25.0,
-            ComplexityClass.LINEARITHMIC: 40.0,
-            ComplexityClass.QUADRATIC: 60.0,
-            ComplexityClass.CUBIC: 80.0,
-            ComplexityClass.EXPONENTIAL: 95.0,
-            ComplexityClass.FACTORIAL: 100.0,
-        }
-
-        return scores.get(complexity_class, 50.0)
+        return _TIME_SCORES.get(complexity_class, 50.0)
 
     def _score_space_complexity(self, complexity_class: ComplexityClass) -> float:
         """
@@ -205,19 +640,7 @@ class RuleScorer:
         Returns:
             A score between 0 and 100.
         """
-        # Map complexity classes to scores
-        scores = {
-            ComplexityClass.CONSTANT: 0.0,
-            ComplexityClass.LOGARITHMIC: 10.0,
-            ComplexityClass.LINEAR: 30.0,
-            ComplexityClass.LINEARITHMIC: 50.0,
-            ComplexityClass.QUADRATIC: 70.0,
-            ComplexityClass.CUBIC: 85.0,
-            ComplexityClass.EXPONENTIAL: 95.0,
-            ComplexityClass.FACTORIAL: 100.0,
-        }
-
-        return scores.get(complexity_class, 50.0)
+        return _SPACE_SCORES.get(complexity_class, 50.0)
 
     def _score_cyclomatic_complexity(self, cyclomatic_complexity: int) -> float:
         """
@@ -229,19 +652,7 @@ class RuleScorer:
         Returns:
             A score between 0 and 100.
         """
-        # Cyclomatic complexity thresholds
-        if cyclomatic_complexity <= 1:
-            return 0.0
-        elif cyclomatic_complexity <= 3:
-            return 20.0
-        elif cyclomatic_complexity <= 5:
-            return 40.0
-        elif cyclomatic_complexity <= 10:
-            return 60.0
-        elif cyclomatic_complexity <= 15:
-            return 80.0
-        else:
-            return min(100.0, 80.0 + (cyclomatic_complexity - 15) * 2)
+        return _threshold_score(cyclomatic_complexity, _CYCLOMATIC_THRESHOLDS)
 
     def _score_property_access(self, properties: Dict[str, PropertyAccess]) -> float:
         """
@@ -261,32 +672,16 @@ class RuleScorer:
         # 2. Access count for each property
         # 3. Types of access (read, write, comparison, method call)
         # 4. Nested property access
+        counts = _property_counts(properties)
 
-        property_count = len(properties)
-        total_access_count = sum(prop.access_count for prop in properties.values())
-        access_type_diversity = sum(
-            len(prop.access_types) for prop in properties.values()
-        )
-        nested_property_count = sum(
-            len(prop.nested_properties) for prop in properties.values()
-        )
-
-        # Calculate a weighted score
-        property_count_score = min(100.0, property_count * 20.0)
-        access_count_score = min(100.0, total_access_count * 2.0)
-        access_type_score = min(100.0, access_type_diversity * 10.0)
-        nested_property_score = min(100.0, nested_property_count * 25.0)
-
-        # Combine scores with weights
-        combined_score = (
-            property_count_score * 0.3
-            + access_count_score * 0.3
-            + access_type_score * 0.2
-            + nested_property_score * 0.2
+        # Combine the capped scores of each with weights
+        return sum(
+            min(100.0, count * points) * weight
+            for count, points, weight in zip(
+                counts, _PROPERTY_ACCESS_POINTS, _PROPERTY_ACCESS_WEIGHTS, strict=True
+            )
         )
 
-        return combined_score
-
     def _score_ast_node_count(self, ast_node_count: int) -> float:
         """
         Score the AST node count of a rule.
@@ -297,19 +692,7 @@ class RuleScorer:
         Returns:
             A score between 0 and 100.
         """
-        # AST node count thresholds
-        if ast_node_count <= 10:
-            return 0.0
-        elif ast_node_count <= 20:
-            return 20.0
-        elif ast_node_count <= 30:
-            return 40.0
-        elif ast_node_count <= 50:
-            return 60.0
-        elif ast_node_count <= 100:
-            return 80.0
-        else:
-            return min(100.0, 80.0 + (ast_node_count - 100) * 0.2)
+        return _threshold_score(ast_node_count, _AST_NODE_THRESHOLDS)
 
     def _score_bottlenecks(self, bottlenecks: List[str]) -> float:
         """
@@ -321,17 +704,7 @@ class RuleScorer:
         Returns:
             A score between 0 and 100.
         """
-        # Score based on number of bottlenecks
-        bottleneck_count = len(bottlenecks)
-
-        if bottleneck_count == 0:
-            return 0.0
-        elif bottleneck_count == 1:
-            return 30.0
-        elif bottleneck_count == 2:
-            return 60.0
-        else:
-            return min(100.0, 60.0 + (bottleneck_count - 2) * 20.0)
+        return _threshold_score(len(bottlenecks), _BOTTLENECK_THRESHOLDS)
 
     def _normalize_score(self, raw_score: float) -> float:
         """
@@ -345,12 +718,15 @@ class RuleScorer:
         Returns:
             A score between 0 and 100.
         """
-        if not self._raw_scores:
+        if not self._count:
             return 0.0
 
         # Use maximum observed score so far, with a minimum threshold
         # This ensures scores don't change dramatically as new rules are added
         max_score = max(self._max_observed_score, raw_score)
+        if self.reference_quantile is not None:
+            reference = self.quantile(self.reference_quantile)
+            max_score = raw_score if reference is None else reference
 
         # Ensure we have a reasonable maximum (at least 60.0)
         max_normalization_value = max(60.0, max_score)
@@ -464,48 +840,37 @@ class RuleScorer:
 
         return recommendations
 
+    def normalize(self, score: RuleScore) -> RuleScore:
+        """
+        Normalize a score against the current running statistics.
+
+        Scores are normalized when computed against the statistics up to that
+        point; this gives the score they would get now.
+
+        Args:
+            score: A score computed by this or another scorer.
+
+        Returns:
+            A copy of the score with updated normalized score and complexity level.
+        """
+        normalized_score = self._normalize_score(score.raw_score)
+        return replace(
+            score,
+            normalized_score=normalized_score,
+            complexity_level=self._determine_complexity_level(normalized_score),
+        )
+
     def batch_normalize(self) -> List[RuleScore]:
         """
-        Apply batch normalization to all previously scored rules.
+        Apply batch normalization to the retained scores of the current epoch.
         This should be called after all rules have been scored individually.
 
         Returns:
             List of RuleScore objects with normalized scores.
         """
-        if not self._score_objects or not self._raw_scores:
-            return self._score_objects
-
-        # Find the true maximum raw score across all rules
-        max_raw_score = max(self._raw_scores)
-
-        # Ensure we have a reasonable maximum (at least 60.0)
-        max_normalization_value = max(60.0, max_raw_score)
-
-        # Create new normalized scores
-        normalized_scores = []
-        for score in self._score_objects:
-            # Recalculate normalized score using the true maximum
-            new_normalized_score = (score.raw_score / max_normalization_value) * 100.0
-            new_normalized_score = max(0.0, min(100.0, new_normalized_score))
-
-            # Recalculate complexity level
-            new_complexity_level = self._determine_complexity_level(
-                new_normalized_score
-            )
-
-            # Create a new RuleScore with updated values
-            normalized_scores.append(
-                RuleScore(
-                    raw_score=score.raw_score,
-                    normalized_score=new_normalized_score,
-                    complexity_level=new_complexity_level,
-                    contributing_factors=score.contributing_factors,
-                    bottlenecks=score.bottlenecks,
-                    recommendations=score.recommendations,
-                )
-            )
+        normalized_scores = [self.normalize(score) for score in self._score_objects]
 
         # Replace the original score objects with normalized ones
-        self._score_objects = normalized_scores
+        self._score_objects = deque(normalized_scores, maxlen=self.retain)
 
         return normalized_scores
@@ -0,0 +1,288 @@
+"""
+Failing sequence shrinking module.
+
+This module provides a delta-debugging (ddmin) shrinker that reduces a sequence
+violating a rule to a small subsequence that still violates it. Candidate
+reductions are identified by the runs of original indices they keep, and the
+outcome of every candidate is cached under that fingerprint so identical
+subsequences are never evaluated twice.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core import AbstractObject, FormalRule, Sequence
+
+# Runs of kept indices as (start, stop) pairs
+Fingerprint = Tuple[Tuple[int, int], ...]
+
+# Worker-process state, populated once per worker by _init_worker
+_worker_rule: Optional[FormalRule] = None
+_worker_sequence: Sequence = []
+
+
+def _init_worker(rule: FormalRule, sequence: Sequence) -> None:
+    """Send the rule and the original sequence to a worker once."""
+    global _worker_rule, _worker_sequence
+    _worker_rule = rule
+    _worker_sequence = sequence
+
+
+def _fails(rule: FormalRule, sequence: Sequence) -> bool:
+    """Whether the rule rejects the sequence; errors count as not failing."""
+    try:
+        return not rule(sequence)
+    except Exception:
+        return False
+
+
+def _worker_fails(fingerprint: Fingerprint) -> bool:
+    """Evaluate a candidate reduction inside a worker process."""
+    sequence = _worker_sequence
+    return _fails(
+        _worker_rule, [sequence[i] for start, stop in fingerprint for i in range(start, stop)]
+    )
+
+
+def _fingerprint(indices: List[int]) -> Fingerprint:
+    """Compress a sorted list of indices into runs."""
+    runs = []
+    start = prev = None
+    for i in indices:
+        if start is None:
+            start = prev = i
+        elif i == prev + 1:
+            prev = i
+        else:
+            runs.append((start, prev + 1))
+            start = prev = i
+    if start is not None:
+        runs.append((start, prev + 1))
+    return tuple(runs)
+
+
+def _simplest_value(value: Any) -> Any:
+    """Return the simplest value of the same type, used for property shrinking."""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return type(value)(0)
+    if isinstance(value, str):
+        return ""
+    if isinstance(value, (list, tuple, dict, set)):
+        return type(value)()
+    return None
+
+
+@dataclass
+class ShrinkResult:
+    """Results of shrinking a failing sequence."""
+
+    sequence: Sequence
+    evaluations: int
+    cache_hits: int
+    elapsed: float
+    exhausted: bool = False
+
+
+class _BudgetExceeded(Exception):
+    """Raised internally when the evaluation or time budget runs out."""
+
+
+class SequenceShrinker:
+    """Reduces a sequence that violates a rule to a 1-minimal failing subsequence."""
+
+    def __init__(
+        self,
+        rule: FormalRule,
+        max_evaluations: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        shrink_properties: bool = False,
+        workers: int = 1,
+    ):
+        """Initialize the shrinker.
+
+        Args:
+            rule: The rule the sequence violates
+            max_evaluations: Optional cap on rule evaluations
+            time_limit: Optional cap on wall-clock seconds
+            shrink_properties: Whether to also simplify properties of the
+                remaining elements (drop them or reset them to a zero value)
+            workers: Number of worker processes evaluating candidate reductions;
+                the rule must be picklable when greater than 1
+        """
+        self.rule = rule
+        self.max_evaluations = max_evaluations
+        self.time_limit = time_limit
+        self.shrink_properties = shrink_properties
+        self.workers = workers
+
+    def shrink(self, sequence: Sequence) -> Optional[ShrinkResult]:
+        """
+        Shrink a failing sequence.
+
+        Args:
+            sequence: A sequence the rule rejects
+
+        Returns:
+            ShrinkResult with the reduced sequence, or None if the sequence is
+            empty or does not fail the rule
+        """
+        if not sequence:
+            return None
+        try:
+            if self.rule(sequence):
+                return None
+        except Exception:
+            return None
+
+        self._start = time.perf_counter()
+        self._evaluations = 1
+        self._cache_hits = 0
+        self._cache: Dict[Any, bool] = {}
+        self._sequence = sequence
+
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.rule, sequence),
+            )
+        self._executor = executor
+
+        indices = list(range(len(sequence)))
+        exhausted = False
+        try:
+            indices = self._ddmin(indices)
+            result = [sequence[i] for i in indices]
+            if self.shrink_properties:
+                result = self._shrink_properties(result)
+        except _BudgetExceeded as e:
+            exhausted = True
+            result = e.args[0]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return ShrinkResult(
+            sequence=result,
+            evaluations=self._evaluations,
+            cache_hits=self._cache_hits,
+            elapsed=time.perf_counter() - self._start,
+            exhausted=exhausted,
+        )
+
+    def _check_budget(self, best: Sequence) -> None:
+        """Stop shrinking once the evaluation or time budget is spent."""
+        if (
+            self.max_evaluations is not None and self._evaluations >= self.max_evaluations
+        ) or (
+            self.time_limit is not None
+            and time.perf_counter() - self._start >= self.time_limit
+        ):
+            raise _BudgetExceeded(best)
+
+    def _first_failing(
+        self, candidates: List[List[int]], best: List[int]
+    ) -> Optional[List[int]]:
+        """Return the first candidate (in order) whose subsequence still fails."""
+        pending = []
+        for candidate in candidates:
+            key = _fingerprint(candidate)
+            if key in self._cache:
+                self._cache_hits += 1
+                if self._cache[key]:
+                    return candidate
+            else:
+                pending.append((candidate, key))
+
+        batch_size = self.workers if self._executor is not None else 1
+        for offset in range(0, len(pending), batch_size):
+            self._check_budget([self._sequence[i] for i in best])
+            batch = pending[offset : offset + batch_size]
+            if self._executor is not None:
+                outcomes = list(self._executor.map(_worker_fails, [key for _, key in batch]))
+            else:
+                outcomes = [
+                    _fails(self.rule, [self._sequence[i] for i in candidate])
+                    for candidate, _ in batch
+                ]
+            self._evaluations += len(batch)
+            for (candidate, key), failed in zip(batch, outcomes, strict=True):
+                self._cache[key] = failed
+                if failed:
+                    return candidate
+        return None
+
+    def _ddmin(self, indices: List[int]) -> List[int]:
+        """Run the ddmin algorithm over the kept indices."""
+        granularity = 2
+        while len(indices) >= 2:
+            size = len(indices)
+            bounds = [size * k // granularity for k in range(granularity + 1)]
+            chunks = [indices[bounds[k] : bounds[k + 1]] for k in range(granularity)]
+            chunks = [chunk for chunk in chunks if chunk]
+
+            # Reduce to a single chunk
+            reduced = self._first_failing(chunks, indices)
+            if reduced is not None:
+                indices = reduced
+                granularity = 2
+                continue
+
+            # Reduce to a complement
+            if granularity > 2:
+                complements = [
+                    indices[: bounds[k]] + indices[bounds[k + 1] :]
+                    for k in range(granularity)
+                ]
+                reduced = self._first_failing(complements, indices)
+                if reduced is not None:
+                    indices = reduced
+                    granularity = max(granularity - 1, 2)
+                    continue
+
+            # Increase granularity
+            if granularity >= size:
+                break
+            granularity = min(size, granularity * 2)
+        return indices
+
+    def _shrink_properties(self, sequence: Sequence) -> Sequence:
+        """Simplify the properties of each element while the rule keeps failing."""
+        result = list(sequence)
+        for position in range(len(result)):
+            for name in list(result[position].properties):
+                properties = result[position].properties
+                simplest = _simplest_value(properties[name])
+                reduced = {k: v for k, v in properties.items() if k != name}
+                candidates = [reduced]
+                if properties[name] != simplest:
+                    candidates.append({**properties, name: simplest})
+                for candidate in candidates:
+                    trial = list(result)
+                    trial[position] = AbstractObject(**candidate)
+                    if self._property_candidate_fails(trial, result):
+                        result = trial
+                        break
+        return result
+
+    def _property_candidate_fails(self, trial: Sequence, best: Sequence) -> bool:
+        """Evaluate a property-level candidate through the cache."""
+        try:
+            key = ("properties", tuple(trial))
+            hash(key)
+        except TypeError:
+            key = None
+        if key is not None and key in self._cache:
+            self._cache_hits += 1
+            return self._cache[key]
+        self._check_budget(best)
+        self._evaluations += 1
+        failed = _fails(self.rule, trial)
+        if key is not None:
+            self._cache[key] = failed
+        return failed
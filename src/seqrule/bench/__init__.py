@@ -0,0 +1,38 @@
+"""
+Performance regression benchmarks for seqrule.
+
+This package times a standard benchmark matrix — every rule factory in
+``seqrule.rulesets``, the DSL combinators, the generators and the analyzer —
+over deterministic synthetic corpora of several sizes. Runs are stored as JSON
+baselines, and comparing a run against a baseline flags statistically
+significant slowdowns. The ``seqrule-bench`` command wraps these functions.
+"""
+
+from .baseline import (
+    Baseline,
+    BenchmarkResult,
+    Change,
+    Comparison,
+    compare,
+    mann_whitney_p,
+)
+from .corpora import DOMAINS, make_corpus
+from .runner import run_benchmarks
+from .suite import DEFAULT_SIZES, Benchmark, default_suite, matches, select
+
+__all__ = [
+    "Benchmark",
+    "BenchmarkResult",
+    "Baseline",
+    "Change",
+    "Comparison",
+    "DEFAULT_SIZES",
+    "DOMAINS",
+    "compare",
+    "default_suite",
+    "make_corpus",
+    "mann_whitney_p",
+    "matches",
+    "run_benchmarks",
+    "select",
+]
@@ -0,0 +1,7 @@
+"""Allow running the benchmark suite with ``python -m seqrule.bench``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Benchmark baselines and regression checks.
+
+A baseline stores the raw per-call time samples of every benchmark and size as
+JSON, together with the environment it was recorded in; samples are recorded
+without outlier rejection, so a slowdown that only shows in the tail still
+counts. Comparing two runs tests each benchmark's samples with a two-sided
+Mann-Whitney U test, which makes no assumption about the shape of timing
+distributions, and reports a regression only when the slowdown of the median is
+both larger than a threshold and statistically significant.
+"""
+
+import json
+import math
+import platform
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import scipy.stats
+
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Time samples of one benchmark at one size."""
+
+    name: str
+    size: int
+    samples: List[float] = field(default_factory=list)
+    loops: int = 1
+
+    @property
+    def median(self) -> float:
+        """Median time per call in seconds."""
+        return statistics.median(self.samples) if self.samples else 0.0
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        """The benchmark name and size."""
+        return (self.name, self.size)
+
+
+def environment_metadata() -> Dict[str, Any]:
+    """Describe the interpreter and machine benchmarks run on."""
+    from .. import __version__
+
+    return {
+        "seqrule": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+@dataclass
+class Baseline:
+    """Results of a benchmark run with the environment they were recorded in."""
+
+    results: List[BenchmarkResult] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def get(self, name: str, size: int) -> Optional[BenchmarkResult]:
+        """The result of a benchmark at a size, if it was run."""
+        return self._index().get((name, size))
+
+    def _index(self) -> Dict[Tuple[str, int], BenchmarkResult]:
+        return {result.key: result for result in self.results}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "format": FORMAT_VERSION,
+            "metadata": self.metadata,
+            "results": [
+                {
+                    "name": result.name,
+                    "size": result.size,
+                    "loops": result.loops,
+                    "samples": result.samples,
+                }
+                for result in self.results
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Baseline":
+        """
+        Create a baseline from a dictionary written by :meth:`to_dict`.
+
+        Raises:
+            ValueError: If the data has an unsupported format version
+        """
+        if data.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported baseline format: {data.get('format')}")
+        return cls(
+            results=[
+                BenchmarkResult(
+                    name=entry["name"],
+                    size=int(entry["size"]),
+                    samples=[float(sample) for sample in entry["samples"]],
+                    loops=int(entry.get("loops", 1)),
+                )
+                for entry in data["results"]
+            ],
+            metadata=dict(data.get("metadata", {})),
+        )
+
+    def save(self, path: str) -> None:
+        """Write the baseline to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "Baseline":
+        """Read a baseline from a JSON file."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def mann_whitney_p(first: List[float], second: List[float]) -> float:
+    """
+    Two-sided p-value of the Mann-Whitney U test.
+
+    Uses SciPy when available, and otherwise the normal approximation with a
+    tie correction, which is accurate for the sample counts benchmarks collect.
+
+    Args:
+        first: First sample
+        second: Second sample
+
+    Returns:
+        Probability of a difference at least as large if both samples come from
+        the same distribution; 1.0 if either sample is empty
+    """
+    n1, n2 = len(first), len(second)
+    if not n1 or not n2:
+        return 1.0
+    if HAS_SCIPY:
+        result = scipy.stats.mannwhitneyu(first, second, alternative="two-sided")
+        return float(result.pvalue) if not math.isnan(result.pvalue) else 1.0
+
+    # Rank the pooled samples, averaging the ranks of ties
+    pooled = sorted(
+        (value, group)
+        for group, values in enumerate((first, second))
+        for value in values
+    )
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j < len(pooled) and pooled[j][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j + 1) / 2
+        rank_sum += rank * sum(1 for k in range(i, j) if pooled[k][1] == 0)
+        tie_term += (j - i) ** 3 - (j - i)
+        i = j
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # Continuity correction towards the mean
+    z = max(abs(u - n1 * n2 / 2) - 0.5, 0.0) / math.sqrt(variance)
+    return min(1.0, 2 * (1 - statistics.NormalDist().cdf(z)))
+
+
+@dataclass
+class Change:
+    """Difference of one benchmark between two runs."""
+
+    name: str
+    size: int
+    baseline: float
+    current: float
+    p_value: float
+    status: str = "unchanged"
+
+    @property
+    def ratio(self) -> float:
+        """Current median time relative to the baseline median."""
+        return self.current / self.baseline if self.baseline > 0 else math.inf
+
+    def __str__(self) -> str:
+        """Return a one-line summary of the change."""
+        return (
+            f"{self.name}[{self.size}]: {self.baseline * 1e6:.2f}us -> "
+            f"{self.current * 1e6:.2f}us ({self.ratio - 1:+.1%}, "
+            f"p={self.p_value:.3g}) {self.status}"
+        )
+
+
+@dataclass
+class Comparison:
+    """Outcome of comparing a run against a baseline."""
+
+    changes: List[Change] = field(default_factory=list)
+    missing: List[Tuple[str, int]] = field(default_factory=list)
+    added: List[Tuple[str, int]] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> List[Change]:
+        """Benchmarks that got significantly slower."""
+        return [change for change in self.changes if change.status == "regression"]
+
+    @property
+    def improvements(self) -> List[Change]:
+        """Benchmarks that got significantly faster."""
+        return [change for change in self.changes if change.status == "improvement"]
+
+    @property
+    def ok(self) -> bool:
+        """Whether no benchmark regressed."""
+        return not self.regressions
+
+    def __str__(self) -> str:
+        """Return a report listing every change, regressions first."""
+        order = {"regression": 0, "improvement": 1, "unchanged": 2}
+        lines = [f"Warning: {warning}" for warning in self.warnings]
+        lines.extend(
+            str(change)
+            for change in sorted(self.changes, key=lambda c: order[c.status])
+        )
+        lines.extend(f"{name}[{size}]: missing" for name, size in self.missing)
+        lines.extend(f"{name}[{size}]: new" for name, size in self.added)
+        lines.append(
+            f"{len(self.regressions)} regressions, "
+            f"{len(self.improvements)} improvements, "
+            f"{len(self.changes)} benchmarks compared"
+        )
+        return "\n".join(lines)
+
+
+def compare(
+    baseline: Baseline,
+    current: Baseline,
+    threshold: float = 0.1,
+    alpha: float = 0.01,
+) -> Comparison:
+    """
+    Compare a benchmark run against a baseline.
+
+    Args:
+        baseline: The stored baseline
+        current: The new run
+        threshold: Minimum relative change of the median to report, so that
+            significant but negligible differences are ignored
+        alpha: Significance level of the Mann-Whitney U test
+
+    Returns:
+        Comparison of every benchmark and size present in both runs
+    """
+    comparison = Comparison()
+    for key in ("seqrule", "python", "implementation", "machine"):
+        before, after = baseline.metadata.get(key), current.metadata.get(key)
+        if before and after and before != after:
+            comparison.warnings.append(f"{key} differs: {before} -> {after}")
+
+    index = current._index()
+    current_keys = set(index)
+    for result in baseline.results:
+        new = index.get(result.key)
+        if new is None:
+            comparison.missing.append(result.key)
+            continue
+        change = Change(
+            name=result.name,
+            size=result.size,
+            baseline=result.median,
+            current=new.median,
+            p_value=mann_whitney_p(result.samples, new.samples),
+        )
+        if change.p_value < alpha:
+            if change.ratio > 1 + threshold:
+                change.status = "regression"
+            elif change.ratio < 1 / (1 + threshold):
+                change.status = "improvement"
+        comparison.changes.append(change)
+        current_keys.discard(result.key)
+
+    comparison.added = sorted(current_keys)
+    return comparison
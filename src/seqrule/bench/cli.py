@@ -0,0 +1,158 @@
+"""
+Command line interface of the benchmark suite.
+
+Usage::
+
+    seqrule-bench list
+    seqrule-bench run --output baseline.json
+    seqrule-bench compare baseline.json [current.json]
+
+``compare`` runs the benchmarks recorded in the baseline unless a second
+baseline is given, and exits with status 1 if any benchmark regressed.
+"""
+
+import argparse
+from typing import List, Optional
+
+from ..analysis.performance import PerformanceProfiler
+from .baseline import Baseline, BenchmarkResult, compare
+from .runner import run_benchmarks
+from .suite import DEFAULT_SIZES, default_suite, matches, select
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    print(f"{result.name}[{result.size}]: {result.median * 1e6:.2f}us", flush=True)
+
+
+def _add_run_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        metavar="PATTERN",
+        help="only run benchmarks matching this name pattern (repeatable)",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=20, help="time samples per benchmark"
+    )
+    parser.add_argument(
+        "--min-round-time",
+        type=float,
+        default=0.005,
+        help="minimum duration in seconds of each sample",
+    )
+
+
+def _profiler(args: argparse.Namespace) -> PerformanceProfiler:
+    # Baselines keep every sample for the rank test, outliers included
+    return PerformanceProfiler.benchmarking(
+        samples=args.samples, min_round_time=args.min_round_time, outlier_threshold=None
+    )
+
+
+def _run(args: argparse.Namespace) -> int:
+    benchmarks = select(default_suite(), args.filter)
+    baseline = run_benchmarks(
+        benchmarks, args.sizes, _profiler(args), progress=_print_result
+    )
+    if args.output:
+        baseline.save(args.output)
+        print(f"Wrote {len(baseline.results)} results to {args.output}")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    baseline = Baseline.load(args.baseline)
+    baseline.results = [
+        result for result in baseline.results if matches(result.name, args.filter)
+    ]
+    if args.current:
+        current = Baseline.load(args.current)
+        current.results = [
+            result for result in current.results if matches(result.name, args.filter)
+        ]
+    else:
+        names = {result.name for result in baseline.results}
+        benchmarks = [
+            benchmark
+            for benchmark in select(default_suite(), args.filter)
+            if benchmark.name in names
+        ]
+        sizes = {result.size for result in baseline.results}
+        current = run_benchmarks(benchmarks, sizes, _profiler(args))
+        if args.output:
+            current.save(args.output)
+
+    comparison = compare(baseline, current, args.threshold, args.alpha)
+    print(comparison)
+    return 0 if comparison.ok else 1
+
+
+def _list(args: argparse.Namespace) -> int:
+    for benchmark in select(default_suite(), args.filter):
+        print(benchmark.name)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser of ``seqrule-bench``."""
+    parser = argparse.ArgumentParser(
+        prog="seqrule-bench",
+        description="Run seqrule's benchmark suite and check for regressions.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    _add_run_options(run)
+    run.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="corpus sizes to run each benchmark at",
+    )
+    run.add_argument("-o", "--output", help="write the results as a JSON baseline")
+    run.set_defaults(handler=_run)
+
+    check = commands.add_parser(
+        "compare", help="compare against a baseline, failing on regressions"
+    )
+    check.add_argument("baseline", help="baseline JSON file")
+    check.add_argument(
+        "current", nargs="?", help="results to compare; runs the benchmarks if omitted"
+    )
+    _add_run_options(check)
+    check.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="minimum relative slowdown of the median to report (default 0.1)",
+    )
+    check.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help="significance level of the Mann-Whitney U test (default 0.01)",
+    )
+    check.add_argument("-o", "--output", help="also save the new run as a baseline")
+    check.set_defaults(handler=_compare)
+
+    names = commands.add_parser("list", help="list the benchmarks")
+    names.add_argument("-k", "--filter", action="append", metavar="PATTERN")
+    names.set_defaults(handler=_list)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the ``seqrule-bench`` command.
+
+    Args:
+        argv: Command line arguments; defaults to ``sys.argv[1:]``
+
+    Returns:
+        Exit status: 1 if ``compare`` found regressions, 0 otherwise
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
@@ -0,0 +1,132 @@
+"""
+Deterministic synthetic corpora for benchmarks.
+
+Each domain builds sequences of its own object type from a random generator
+seeded with the domain, size and seed, so a corpus is identical across runs,
+processes and machines.
+"""
+
+import random
+from typing import Callable, Dict
+
+from ..core import AbstractObject, Sequence
+from ..rulesets.dna import MethylationState, Nucleotide
+from ..rulesets.eleusis import Card
+from ..rulesets.music import Note, NoteType
+from ..rulesets.pipeline import Environment, PipelineStage, ResourceType, StageStatus
+from ..rulesets.tea import ProcessingStep, QualityMetrics, TeaProcess, TeaType
+
+COLORS = ["red", "black"]
+SHAPES = ["circle", "square", "triangle"]
+GROUPS = ["a", "b", "c", "d"]
+SUITS = ["heart", "diamond", "spade", "club"]
+PITCHES = ["C4", "D4", "E4", "F4", "G4", "A4", "B4"]
+GREEN_TEA_STEPS = [
+    ProcessingStep.PLUCKING,
+    ProcessingStep.WITHERING,
+    ProcessingStep.FIXING,
+    ProcessingStep.ROLLING,
+    ProcessingStep.DRYING,
+]
+
+
+def _generic(rng: random.Random, index: int) -> AbstractObject:
+    return AbstractObject(
+        kind="item",
+        value=index,
+        color=COLORS[index % 2],
+        shape=SHAPES[index % 3],
+        group=rng.choice(GROUPS),
+        score=rng.random(),
+        meta={"inner": {"depth": rng.randint(0, 9)}},
+    )
+
+
+def _dna(rng: random.Random, index: int) -> AbstractObject:
+    return Nucleotide(
+        rng.choice("ACGT"),
+        methylation=rng.choice(list(MethylationState)),
+        position=index,
+    )
+
+
+def _cards(rng: random.Random, index: int) -> AbstractObject:
+    suit = rng.choice(SUITS)
+    color = "red" if suit in ("heart", "diamond") else "black"
+    return Card(color, suit, rng.randint(1, 13))
+
+
+def _music(rng: random.Random, index: int) -> AbstractObject:
+    return Note(
+        rng.choice(PITCHES),
+        rng.choice([0.5, 1.0, 2.0]),
+        NoteType.MELODY,
+        velocity=rng.randint(40, 100),
+        measure=index // 4,
+        beat=float(index % 4),
+    )
+
+
+def _pipeline(rng: random.Random, index: int) -> AbstractObject:
+    return PipelineStage(
+        f"stage_{index}",
+        rng.randint(1, 30),
+        required_approvals=rng.randint(0, 2),
+        environment=Environment.DEV,
+        retry_count=rng.randint(0, 2),
+        status=StageStatus.PASSED,
+        dependencies={f"stage_{index - 1}"} if index else None,
+        resources={ResourceType.CPU: rng.uniform(0.5, 4.0)},
+    )
+
+
+def _tea(rng: random.Random, index: int) -> AbstractObject:
+    return TeaProcess(
+        TeaType.GREEN,
+        GREEN_TEA_STEPS[index % len(GREEN_TEA_STEPS)],
+        temperature=rng.uniform(20, 120),
+        duration=rng.uniform(0.1, 12),
+        humidity=rng.uniform(40, 90),
+        quality=QualityMetrics(
+            moisture_content=rng.uniform(3, 70),
+            leaf_integrity=rng.random(),
+            color_value=rng.uniform(0, 100),
+            aroma_intensity=rng.random(),
+            taste_profile={"sweet": rng.random(), "bitter": rng.random()},
+        ),
+    )
+
+
+_DOMAINS: Dict[str, Callable[[random.Random, int], AbstractObject]] = {
+    "generic": _generic,
+    "dna": _dna,
+    "cards": _cards,
+    "music": _music,
+    "pipeline": _pipeline,
+    "tea": _tea,
+}
+
+DOMAINS = tuple(_DOMAINS)
+
+
+def make_corpus(domain: str, size: int, seed: int = 0) -> Sequence:
+    """
+    Build a deterministic sequence of a domain's objects.
+
+    Args:
+        domain: One of DOMAINS
+        size: Length of the sequence
+        seed: Seed distinguishing corpora of the same domain and size
+
+    Returns:
+        The sequence
+
+    Raises:
+        ValueError: If the domain is unknown
+    """
+    try:
+        factory = _DOMAINS[domain]
+    except KeyError:
+        raise ValueError(f"Unknown corpus domain: {domain}") from None
+    rng = random.Random(f"{domain}:{size}:{seed}")
+    return [factory(rng, index) for index in range(size)]
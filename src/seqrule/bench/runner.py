@@ -0,0 +1,52 @@
+"""
+Running the benchmark matrix.
+"""
+
+from typing import Callable, Iterable, Optional
+
+from ..analysis.performance import PerformanceProfiler
+from .baseline import Baseline, BenchmarkResult, environment_metadata
+from .suite import DEFAULT_SIZES, Benchmark
+
+
+def run_benchmarks(
+    benchmarks: Iterable[Benchmark],
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    profiler: Optional[PerformanceProfiler] = None,
+    progress: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> Baseline:
+    """
+    Time benchmarks at each size.
+
+    Args:
+        benchmarks: Benchmarks to run
+        sizes: Corpus sizes; sizes above a benchmark's ``max_size`` are skipped
+        profiler: Profiler timing each operation; defaults to a benchmarking
+            profiler with 20 samples and no outlier rejection, so that the
+            baseline holds the raw samples
+        progress: Optional callback receiving each result as it's measured
+
+    Returns:
+        Baseline of the results, with the current environment as metadata
+    """
+    if profiler is None:
+        profiler = PerformanceProfiler.benchmarking(samples=20, outlier_threshold=None)
+    sizes = sorted(set(sizes))
+
+    results = []
+    for benchmark in benchmarks:
+        for size in sizes:
+            if not benchmark.runs_at(size):
+                continue
+            stats = profiler.measure(benchmark.setup(size))
+            result = BenchmarkResult(
+                benchmark.name, size, samples=stats.samples, loops=stats.loops
+            )
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+    metadata = environment_metadata()
+    metadata["samples"] = profiler.samples
+    metadata["outlier_threshold"] = profiler.outlier_threshold
+    return Baseline(results, metadata)
@@ -0,0 +1,414 @@
+"""
+The standard benchmark matrix.
+
+Benchmarks cover every rule factory in ``seqrule.rulesets``, the DSL
+combinators, the sequence generators and the rule analyzer. Each benchmark
+builds its rule and corpus once per size in ``setup`` and returns the
+zero-argument operation that is timed.
+"""
+
+import fnmatch
+import itertools
+import random
+import statistics
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Iterable, List, Optional
+
+from ..analysis import RuleAnalyzer
+from ..core import AbstractObject, Sequence
+from ..dsl import DSLRule, and_atomic, if_then_rule, range_rule
+from ..generators import (
+    ConstrainedGenerator,
+    LazyGenerator,
+    MCMCSampler,
+    bulk,
+    generate_sequences,
+)
+from ..generators.constrained import GeneratorConfig
+from ..rulesets import dna, eleusis, general, music, pipeline, tea
+from .corpora import make_corpus
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+@dataclass
+class Benchmark:
+    """One entry of the benchmark matrix."""
+
+    name: str
+    group: str
+    setup: Callable[[int], Callable[[], Any]]
+    max_size: Optional[int] = None
+
+    def runs_at(self, size: int) -> bool:
+        """Whether the benchmark runs at a size."""
+        return self.max_size is None or size <= self.max_size
+
+
+def _is_red(obj: AbstractObject) -> bool:
+    return obj["color"] == "red"
+
+
+def _is_item(obj: AbstractObject) -> bool:
+    return obj["kind"] == "item"
+
+
+def _non_negative(obj: AbstractObject) -> bool:
+    return obj["value"] >= 0
+
+
+def _ascending(objs: List[AbstractObject]) -> bool:
+    return all(a["value"] < b["value"] for a, b in itertools.pairwise(objs))
+
+
+def _distinct(objs: List[AbstractObject]) -> bool:
+    return len({obj["value"] for obj in objs}) == len(objs)
+
+
+def _all_atomic() -> DSLRule:
+    check = and_atomic(_is_item, _non_negative)
+    return DSLRule(lambda seq: all(check(obj) for obj in seq))
+
+
+def _alternation() -> DSLRule:
+    return general.create_alternation_rule("color")
+
+
+def _increasing() -> DSLRule:
+    return general.create_property_trend_rule("value", "increasing")
+
+
+def _unique() -> DSLRule:
+    return general.create_unique_property_rule("value", "global")
+
+
+def _evaluate(
+    name: str, group: str, domain: str, make_rule: Callable[[int], Any]
+) -> Benchmark:
+    """Benchmark evaluating a rule on a corpus of each size."""
+
+    def setup(size: int) -> Callable[[], Any]:
+        return partial(make_rule(size), make_corpus(domain, size))
+
+    return Benchmark(name, group, setup)
+
+
+def _ruleset_benchmarks() -> List[Benchmark]:
+    rules = {
+        general: (
+            "generic",
+            {
+                "create_alternation_rule": lambda n: _alternation(),
+                "create_balanced_rule": lambda n: general.create_balanced_rule(
+                    "color", {"warm": {"red"}, "cool": {"black"}}
+                ),
+                "create_bounded_sequence_rule": lambda n: (
+                    general.create_bounded_sequence_rule(0, n, _alternation())
+                ),
+                "create_composite_rule": lambda n: general.create_composite_rule(
+                    [_alternation(), _increasing()], mode="all"
+                ),
+                "create_dependency_rule": lambda n: general.create_dependency_rule(
+                    "group", {"b": {"a"}}
+                ),
+                "create_group_rule": lambda n: general.create_group_rule(3, _ascending),
+                "create_historical_rule": lambda n: general.create_historical_rule(
+                    3, _distinct
+                ),
+                "create_meta_rule": lambda n: general.create_meta_rule(
+                    [_alternation(), _increasing(), _unique()], 2
+                ),
+                "create_numerical_range_rule": lambda n: (
+                    general.create_numerical_range_rule("score", 0.0, 1.0)
+                ),
+                "create_pattern_rule": lambda n: general.create_pattern_rule(
+                    ["red", "black"], "color"
+                ),
+                "create_property_cycle_rule": lambda n: (
+                    general.create_property_cycle_rule("shape")
+                ),
+                "create_property_match_rule": lambda n: (
+                    general.create_property_match_rule("kind", "item")
+                ),
+                "create_property_trend_rule": lambda n: _increasing(),
+                "create_ratio_rule": lambda n: general.create_ratio_rule(
+                    "color", 0.4, 0.6, _is_red
+                ),
+                "create_running_stat_rule": lambda n: general.create_running_stat_rule(
+                    "score", statistics.fmean, 0.0, 1.0, 5
+                ),
+                "create_sum_rule": lambda n: general.create_sum_rule("score", n / 2, n),
+                "create_transition_rule": lambda n: general.create_transition_rule(
+                    "color", {"red": {"black"}, "black": {"red"}}
+                ),
+                "create_unique_property_rule": lambda n: _unique(),
+            },
+        ),
+        dna: (
+            "dna",
+            {
+                "create_complementary_rule": lambda n: dna.create_complementary_rule(
+                    make_corpus("dna", n, seed=1)
+                ),
+                "create_complexity_rule": lambda n: dna.create_complexity_rule(0.5),
+                "create_gc_content_rule": lambda n: dna.create_gc_content_rule(0, 100),
+                "create_gc_skew_rule": lambda n: dna.create_gc_skew_rule(10, 1.0),
+                "create_methylation_rule": lambda n: dna.create_methylation_rule(),
+                "create_motif_rule": lambda n: dna.create_motif_rule(
+                    "ACGTA", max_mismatches=1
+                ),
+                "create_no_consecutive_rule": lambda n: dna.create_no_consecutive_rule(
+                    4
+                ),
+            },
+        ),
+        eleusis: (
+            "cards",
+            {
+                "create_historical_rule": lambda n: eleusis.create_historical_rule(3),
+                "create_meta_rule": lambda n: eleusis.create_meta_rule(
+                    [
+                        eleusis.create_historical_rule(3),
+                        eleusis.create_symmetry_rule(3),
+                        eleusis.create_property_cycle_rule("color"),
+                    ],
+                    2,
+                ),
+                "create_property_cycle_rule": lambda n: (
+                    eleusis.create_property_cycle_rule("color")
+                ),
+                "create_suit_value_rule": lambda n: eleusis.create_suit_value_rule(
+                    {"heart": 1, "diamond": 2, "spade": 3, "club": 4}
+                ),
+                "create_symmetry_rule": lambda n: eleusis.create_symmetry_rule(3),
+            },
+        ),
+        music: (
+            "music",
+            {
+                "create_max_consecutive_rule": lambda n: (
+                    music.create_max_consecutive_rule(music.NoteType.MELODY, n)
+                ),
+                "create_measure_rule": lambda n: music.create_measure_rule(
+                    music.TimeSignature(4, 4)
+                ),
+                "create_melody_pattern_rule": lambda n: (
+                    music.create_melody_pattern_rule(["C4", "E4", "G4"], transpose=True)
+                ),
+                "create_rhythm_pattern_rule": lambda n: (
+                    music.create_rhythm_pattern_rule(
+                        [1.0, 0.5], allow_consolidation=True
+                    )
+                ),
+                "create_total_duration_rule": lambda n: (
+                    music.create_total_duration_rule(float(n), 0.5)
+                ),
+            },
+        ),
+        pipeline: (
+            "pipeline",
+            {
+                "create_approval_rule": lambda n: pipeline.create_approval_rule(
+                    "deploy", 1
+                ),
+                "create_dependency_rule": lambda n: pipeline.create_dependency_rule(),
+                "create_duration_rule": lambda n: pipeline.create_duration_rule(30 * n),
+                "create_environment_promotion_rule": lambda n: (
+                    pipeline.create_environment_promotion_rule()
+                ),
+                "create_required_stages_rule": lambda n: (
+                    pipeline.create_required_stages_rule({"stage_0"})
+                ),
+                "create_resource_limit_rule": lambda n: (
+                    pipeline.create_resource_limit_rule(
+                        pipeline.ResourceType.CPU, 4.0 * n
+                    )
+                ),
+                "create_retry_rule": lambda n: pipeline.create_retry_rule(2),
+                "create_stage_order_rule": lambda n: pipeline.create_stage_order_rule(
+                    "stage_0", "stage_1"
+                ),
+            },
+        ),
+        tea: (
+            "tea",
+            {
+                "create_duration_rule": lambda n: tea.create_duration_rule(
+                    tea.ProcessingStep.WITHERING, 0, 24
+                ),
+                "create_humidity_rule": lambda n: tea.create_humidity_rule(
+                    tea.ProcessingStep.WITHERING, 0, 100
+                ),
+                "create_oxidation_level_rule": lambda n: (
+                    tea.create_oxidation_level_rule(tea.TeaType.GREEN)
+                ),
+                "create_quality_rule": lambda n: tea.create_quality_rule(
+                    tea.QualityMetrics(
+                        moisture_content=100.0,
+                        leaf_integrity=0.0,
+                        color_value=0.0,
+                        aroma_intensity=0.0,
+                        taste_profile={},
+                    )
+                ),
+                "create_tea_sequence_rule": lambda n: tea.create_tea_sequence_rule(
+                    tea.TeaType.GREEN
+                ),
+                "create_temperature_rule": lambda n: tea.create_temperature_rule(
+                    tea.ProcessingStep.FIXING, 0, 150
+                ),
+            },
+        ),
+    }
+    return [
+        _evaluate(
+            f"rulesets.{module.__name__.rsplit('.', 1)[-1]}.{factory}",
+            "rulesets",
+            domain,
+            make_rule,
+        )
+        for module, (domain, factories) in rules.items()
+        for factory, make_rule in factories.items()
+    ]
+
+
+def _dsl_benchmarks() -> List[Benchmark]:
+    rules = {
+        "and": lambda n: _alternation() & _increasing(),
+        "or": lambda n: _alternation() | _increasing(),
+        "not": lambda n: ~_alternation(),
+        "if_then_rule": lambda n: if_then_rule(_is_red, _non_negative),
+        "range_rule": lambda n: range_rule(0, n, _is_item),
+        "and_atomic": lambda n: _all_atomic(),
+    }
+    return [
+        _evaluate(f"dsl.{name}", "dsl", "generic", make_rule)
+        for name, make_rule in rules.items()
+    ]
+
+
+def _generator_benchmarks() -> List[Benchmark]:
+    """Generators produce ``size`` sequences, or sequences of ``size`` elements."""
+    domain = make_corpus("generic", 4)
+
+    def sequences(size: int) -> Callable[[], Any]:
+        def run() -> List[Sequence]:
+            random.seed(0)
+            return generate_sequences(domain, max_length=size)
+
+        return run
+
+    def lazy(size: int) -> Callable[[], Any]:
+        def run() -> List[Sequence]:
+            generator = LazyGenerator(domain, 8, _alternation(), seed=0)
+            return list(itertools.islice(generator, size))
+
+        return run
+
+    def constrained(size: int) -> Callable[[], Any]:
+        def run() -> List[Sequence]:
+            generator = ConstrainedGenerator(domain, GeneratorConfig(seed=0))
+            return list(itertools.islice(generator.generate(max_length=6), size))
+
+        return run
+
+    def mcmc(size: int) -> Callable[[], Any]:
+        sampler = MCMCSampler(domain, soft=[_alternation()], window=4, seed=0)
+        return partial(sampler.sample, size, 2, thin=10, burn_in=10)
+
+    def bulk_generator(size: int) -> Callable[[], Any]:
+        def run() -> List[Sequence]:
+            return list(bulk.BulkGenerator(domain, 10, seed=0).generate(size))
+
+        return run
+
+    generators = {
+        "generate_sequences": sequences,
+        "LazyGenerator": lazy,
+        "ConstrainedGenerator": constrained,
+        "MCMCSampler": mcmc,
+    }
+    if bulk.HAS_NUMPY:
+        generators["BulkGenerator"] = bulk_generator
+    return [
+        Benchmark(f"generators.{name}", "generators", setup)
+        for name, setup in generators.items()
+    ]
+
+
+def _analyzer_benchmarks() -> List[Benchmark]:
+    """The analyzer analyzes a rule against one corpus of each size."""
+    rules = {
+        "alternation": _alternation,
+        "composite": lambda: general.create_composite_rule(
+            [_alternation(), _increasing(), _unique()]
+        ),
+    }
+
+    def analyze(make_rule: Callable[[], DSLRule], size: int) -> Callable[[], Any]:
+        corpus = make_corpus("generic", size)
+        rule = make_rule()
+
+        def run() -> Any:
+            analyzer = (
+                RuleAnalyzer()
+                .with_options(max_sequence_length=size)
+                .with_sequences([corpus])
+            )
+            return analyzer.analyze(rule)
+
+        return run
+
+    return [
+        Benchmark(f"analysis.analyze.{name}", "analysis", partial(analyze, make_rule))
+        for name, make_rule in rules.items()
+    ]
+
+
+def default_suite() -> List[Benchmark]:
+    """The standard benchmark matrix."""
+    return [
+        *_ruleset_benchmarks(),
+        *_dsl_benchmarks(),
+        *_generator_benchmarks(),
+        *_analyzer_benchmarks(),
+    ]
+
+
+def matches(name: str, patterns: Optional[Iterable[str]] = None) -> bool:
+    """
+    Whether a benchmark name matches any of a list of patterns.
+
+    Args:
+        name: Benchmark name
+        patterns: Shell-style patterns such as ``"rulesets.dna.*"``; a pattern
+            without wildcards also matches names starting with it. Every name
+            matches when no patterns are given.
+
+    Returns:
+        True if the name matches
+    """
+    if not patterns:
+        return True
+    return any(
+        fnmatch.fnmatchcase(name, pattern) or name.startswith(pattern)
+        for pattern in patterns
+    )
+
+
+def select(
+    benchmarks: Iterable[Benchmark], patterns: Optional[Iterable[str]] = None
+) -> List[Benchmark]:
+    """
+    Select benchmarks by name.
+
+    Args:
+        benchmarks: Benchmarks to select from
+        patterns: Name patterns, as for :func:`matches`
+
+    Returns:
+        Selected benchmarks in their original order
+    """
+    patterns = list(patterns or ())
+    return [benchmark for benchmark in benchmarks if matches(benchmark.name, patterns)]
@@ -9,11 +9,21 @@ with support for bounded generation, filtering, constraints, and prediction.
 from typing import Any, Callable, Dict, List, TypeVar, Union
 
 from ..core import AbstractObject, Sequence
-from .constrained import ConstrainedGenerator
+from .bulk import BulkGenerator, SequenceFrame, generate_bulk, read_frames
+from .constrained import ConstrainedGenerator, score_delta
 from .constraints import Constraint
 from .core import generate_counter_examples, generate_sequences
-from .lazy import LazyGenerator, generate_lazy
-from .patterns import PropertyPattern
+from .lazy import GenerationExhaustedError, LazyGenerator, generate_lazy
+from .mcmc import ChainStats, MCMCSampler, sample_mcmc
+from .mutation import CounterExampleSearch, SearchResult, search_counter_examples
+from .patterns import PatternSet, PropertyPattern
+from .sink import SequenceSink, read_sequences, write_sequences
+from .symmetry import (
+    Symmetry,
+    SymmetryGroup,
+    expand_orbits,
+    property_permutations,
+)
 
 T = TypeVar("T")
 Domain = List[Union[AbstractObject, Dict[str, Any]]]
@@ -24,12 +34,32 @@ __all__ = [
     # Core classes
     "Constraint",
     "PropertyPattern",
+    "PatternSet",
     "ConstrainedGenerator",
     "LazyGenerator",
+    "BulkGenerator",
+    "SequenceFrame",
+    "CounterExampleSearch",
+    "SearchResult",
+    "MCMCSampler",
+    "ChainStats",
+    "SequenceSink",
+    "Symmetry",
+    "SymmetryGroup",
+    "GenerationExhaustedError",
     # Generation functions
     "generate_sequences",
     "generate_counter_examples",
+    "search_counter_examples",
     "generate_lazy",
+    "score_delta",
+    "generate_bulk",
+    "sample_mcmc",
+    "read_frames",
+    "write_sequences",
+    "read_sequences",
+    "property_permutations",
+    "expand_orbits",
     # Type aliases
     "Domain",
     "FilterRule",
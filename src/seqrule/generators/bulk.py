@@ -0,0 +1,352 @@
+"""
+Vectorized bulk sequence generation.
+
+This module provides functionality for generating very large numbers of random
+sequences at once. Sequences are drawn as NumPy index matrices into the domain
+and only mapped to domain objects when they are materialized, so millions of
+sequences can be produced, stored, or streamed to disk cheaply.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from ..core import AbstractObject, Sequence
+from .checkpoint import load_checkpoint, save_checkpoint
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# A length distribution is either a fixed length, a mapping of length -> weight,
+# or a callable taking (rng, count) and returning an array of lengths.
+LengthDistribution = Union[int, Dict[int, float], Callable[[Any, int], Any]]
+
+
+def _require_numpy() -> None:
+    """Raise an informative error if NumPy is not installed."""
+    if not HAS_NUMPY:
+        raise ImportError(
+            "Bulk sequence generation requires NumPy. Install it with 'pip install numpy'."
+        )
+
+
+def _index_dtype(domain_size: int):
+    """Return the smallest unsigned integer dtype able to index the domain."""
+    if domain_size <= np.iinfo(np.uint8).max + 1:
+        return np.uint8
+    if domain_size <= np.iinfo(np.uint16).max + 1:
+        return np.uint16
+    return np.uint32
+
+
+@dataclass
+class SequenceFrame:
+    """
+    A columnar batch of sequences stored as indices into a domain.
+
+    Row ``i`` of ``indices`` holds the domain indices of sequence ``i``; only the
+    first ``lengths[i]`` columns of that row are meaningful.
+
+    Attributes:
+        indices: Integer matrix of shape (count, max_length)
+        lengths: Integer array of shape (count,) holding each sequence's length
+        domain: The objects the indices refer to
+    """
+
+    indices: Any
+    lengths: Any
+    domain: List[AbstractObject]
+
+    def __len__(self) -> int:
+        """Return the number of sequences in the frame."""
+        return int(self.lengths.shape[0])
+
+    def __getitem__(self, i: int) -> Sequence:
+        """Materialize a single sequence."""
+        domain = self.domain
+        row = self.indices[i, : self.lengths[i]].tolist()
+        return [domain[j] for j in row]
+
+    def __iter__(self) -> Iterator[Sequence]:
+        """Materialize sequences one at a time."""
+        domain = self.domain
+        for row, length in zip(self.indices.tolist(), self.lengths.tolist()):
+            yield [domain[j] for j in row[:length]]
+
+    def to_sequences(self) -> List[Sequence]:
+        """Materialize every sequence in the frame."""
+        return list(self)
+
+    def column(self, property_name: str) -> Any:
+        """
+        Get a property column for the whole frame.
+
+        Args:
+            property_name: Name of the property to extract
+
+        Returns:
+            Object array of shape (count, max_length) with the property value at
+            each position; padding positions hold None
+        """
+        values = np.array(
+            [obj.properties.get(property_name) for obj in self.domain] + [None],
+            dtype=object,
+        )
+        width = self.indices.shape[1]
+        padded = np.where(
+            np.arange(width) < self.lengths[:, None],
+            self.indices.astype(np.int64),
+            len(self.domain),
+        )
+        return values[padded]
+
+    def save(self, path: str) -> None:
+        """
+        Write the frame to a compressed ``.npz`` file.
+
+        Only the index matrix and lengths are stored; the domain must be
+        supplied again when loading.
+
+        Args:
+            path: Destination file path
+        """
+        np.savez_compressed(path, indices=self.indices, lengths=self.lengths)
+
+    @classmethod
+    def load(cls, path: str, domain: List[AbstractObject]) -> "SequenceFrame":
+        """
+        Read a frame previously written with :meth:`save`.
+
+        Args:
+            path: Path to the ``.npz`` file
+            domain: The domain the stored indices refer to
+
+        Returns:
+            The loaded SequenceFrame
+        """
+        _require_numpy()
+        with np.load(path) as data:
+            return cls(indices=data["indices"], lengths=data["lengths"], domain=domain)
+
+
+class BulkGenerator:
+    """
+    Generator that draws random sequences in large vectorized batches.
+
+    Unlike generate_sequences, there is no cap on the number of sequences or on
+    how many are produced per length.
+    """
+
+    def __init__(
+        self,
+        domain: List[Union[AbstractObject, Dict[str, Any]]],
+        max_length: int = 10,
+        min_length: int = 0,
+        length_distribution: Optional[LengthDistribution] = None,
+        batch_size: int = 100_000,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize with generation parameters.
+
+        Args:
+            domain: List of objects to generate sequences from
+            max_length: Maximum length of generated sequences
+            min_length: Minimum length of generated sequences
+            length_distribution: Fixed length, mapping of length to weight, or a
+                callable ``(rng, count) -> lengths``. Defaults to uniform over
+                ``[min_length, max_length]``
+            batch_size: Number of sequences drawn per frame
+            seed: Optional seed for reproducible generation
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the parameters are inconsistent
+        """
+        _require_numpy()
+        if not domain:
+            raise ValueError("Domain must contain at least one object")
+        if min_length < 0 or max_length < min_length:
+            raise ValueError("Lengths must satisfy 0 <= min_length <= max_length")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        self.domain = [
+            obj if isinstance(obj, AbstractObject) else AbstractObject(**obj)
+            for obj in domain
+        ]
+        self.min_length = min_length
+        self.max_length = max_length
+        self.length_distribution = length_distribution
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self._dtype = _index_dtype(len(self.domain))
+
+    def _draw_lengths(self, count: int) -> Any:
+        """Draw sequence lengths according to the configured distribution."""
+        dist = self.length_distribution
+        if dist is None:
+            lengths = self.rng.integers(self.min_length, self.max_length + 1, size=count)
+        elif isinstance(dist, int):
+            lengths = np.full(count, dist)
+        elif isinstance(dist, dict):
+            choices = np.fromiter(dist.keys(), dtype=np.int64)
+            weights = np.fromiter(dist.values(), dtype=np.float64)
+            lengths = self.rng.choice(choices, size=count, p=weights / weights.sum())
+        else:
+            lengths = np.asarray(dist(self.rng, count))
+
+        lengths = lengths.astype(np.int64)
+        if lengths.shape != (count,):
+            raise ValueError("Length distribution must produce one length per sequence")
+        if count and (lengths.min() < self.min_length or lengths.max() > self.max_length):
+            raise ValueError(
+                f"Sequence lengths must lie within [{self.min_length}, {self.max_length}]"
+            )
+        return lengths
+
+    def frame(self, count: int) -> SequenceFrame:
+        """
+        Draw a single frame of sequences.
+
+        Args:
+            count: Number of sequences in the frame
+
+        Returns:
+            A SequenceFrame holding ``count`` sequences
+        """
+        lengths = self._draw_lengths(count)
+        width = int(lengths.max()) if count else 0
+        indices = self.rng.integers(
+            0, len(self.domain), size=(count, width), dtype=self._dtype
+        )
+        return SequenceFrame(indices=indices, lengths=lengths, domain=self.domain)
+
+    def frames(self, count: int) -> Iterator[SequenceFrame]:
+        """
+        Draw ``count`` sequences as a stream of frames of at most ``batch_size``.
+
+        Args:
+            count: Total number of sequences to generate
+
+        Yields:
+            SequenceFrame batches
+        """
+        remaining = count
+        while remaining > 0:
+            size = min(self.batch_size, remaining)
+            yield self.frame(size)
+            remaining -= size
+
+    def generate(self, count: int) -> Iterator[Sequence]:
+        """
+        Generate ``count`` materialized sequences.
+
+        Args:
+            count: Total number of sequences to generate
+
+        Yields:
+            Sequences of domain objects
+        """
+        for frame in self.frames(count):
+            yield from frame
+
+    def write(self, directory: str, count: int, resume: bool = False) -> List[str]:
+        """
+        Write ``count`` sequences to disk as compressed frame files.
+
+        After every frame, the random state and the number of sequences written
+        are checkpointed to ``checkpoint.json.gz`` in the directory. With
+        ``resume=True`` an interrupted job picks up after the last complete
+        frame and produces the same files an uninterrupted run would have.
+        Otherwise frame files and the checkpoint of an earlier run in the
+        directory are removed first, so that readers don't see a mix of runs.
+
+        Args:
+            directory: Directory to write ``frame-NNNNNN.npz`` files into
+            count: Total number of sequences to generate
+            resume: Whether to continue from an existing checkpoint
+
+        Returns:
+            Paths of the frame files written by this call
+        """
+        os.makedirs(directory, exist_ok=True)
+        checkpoint_path = os.path.join(directory, "checkpoint.json.gz")
+        emitted = 0
+        frame_index = 0
+        if resume and os.path.exists(checkpoint_path):
+            state = load_checkpoint(checkpoint_path, "bulk")
+            if state["domain_size"] != len(self.domain):
+                raise ValueError("Checkpoint was written for a different domain")
+            self.rng.bit_generator.state = state["rng_state"]
+            emitted = state["emitted"]
+            frame_index = state["frames_written"]
+        else:
+            for name in os.listdir(directory):
+                if _is_frame_file(name) or name == "checkpoint.json.gz":
+                    os.remove(os.path.join(directory, name))
+
+        paths = []
+        for frame in self.frames(count - emitted):
+            path = os.path.join(directory, f"frame-{frame_index:06d}.npz")
+            frame.save(path)
+            paths.append(path)
+            emitted += len(frame)
+            frame_index += 1
+            save_checkpoint(
+                checkpoint_path,
+                {
+                    "kind": "bulk",
+                    "domain_size": len(self.domain),
+                    "emitted": emitted,
+                    "frames_written": frame_index,
+                    "rng_state": self.rng.bit_generator.state,
+                },
+            )
+        return paths
+
+
+def _is_frame_file(name: str) -> bool:
+    """Whether a file name is that of a frame written by BulkGenerator.write."""
+    return name.startswith("frame-") and name.endswith(".npz")
+
+
+def read_frames(directory: str, domain: List[AbstractObject]) -> Iterator[SequenceFrame]:
+    """
+    Read frames written by :meth:`BulkGenerator.write` in order.
+
+    Args:
+        directory: Directory containing ``frame-NNNNNN.npz`` files
+        domain: The domain the stored indices refer to
+
+    Yields:
+        SequenceFrame batches
+    """
+    for name in sorted(os.listdir(directory)):
+        if _is_frame_file(name):
+            yield SequenceFrame.load(os.path.join(directory, name), domain)
+
+
+def generate_bulk(
+    domain: List[Union[AbstractObject, Dict[str, Any]]],
+    count: int,
+    max_length: int = 10,
+    **kwargs: Any,
+) -> Iterator[SequenceFrame]:
+    """
+    Generate ``count`` random sequences as columnar frames.
+
+    Args:
+        domain: List of objects to generate sequences from
+        count: Total number of sequences to generate
+        max_length: Maximum length of generated sequences
+        **kwargs: Additional BulkGenerator options
+
+    Returns:
+        Iterator of SequenceFrame batches
+    """
+    return BulkGenerator(domain, max_length=max_length, **kwargs).frames(count)
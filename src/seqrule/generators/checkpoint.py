@@ -0,0 +1,82 @@
+"""
+Checkpointing for long-running generation jobs.
+
+This module provides helpers for saving and loading generator checkpoints.
+Checkpoints are small gzip-compressed JSON documents written atomically, so an
+interrupted job either sees the previous checkpoint or the new one, never a
+partially written file.
+"""
+
+import gzip
+import json
+import os
+import random
+from typing import Any, Dict, List, Tuple
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """
+    Atomically write a checkpoint.
+
+    Args:
+        path: Destination file path
+        state: JSON-serializable generator state
+    """
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump({"version": CHECKPOINT_VERSION, **state}, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str, kind: str) -> Dict[str, Any]:
+    """
+    Read a checkpoint written by :func:`save_checkpoint`.
+
+    Args:
+        path: Checkpoint file path
+        kind: Expected generator kind stored in the checkpoint
+
+    Returns:
+        The stored generator state
+
+    Raises:
+        ValueError: If the checkpoint is for a different generator or version
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+    if state.get("kind") != kind:
+        raise ValueError(
+            f"Checkpoint is for a {state.get('kind')} generator, not {kind}"
+        )
+    return state
+
+
+def encode_rng_state(rng: random.Random) -> List[Any]:
+    """Convert a random.Random state to a JSON-serializable list."""
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def decode_rng_state(state: List[Any]) -> Tuple[Any, ...]:
+    """Convert a stored random.Random state back to the form setstate expects."""
+    version, internal, gauss_next = state
+    return (version, tuple(internal), gauss_next)
+
+
+def domain_index(domain: List[Any]) -> Dict[int, int]:
+    """Map the identity of each domain object to its position in the domain."""
+    return {id(obj): i for i, obj in enumerate(domain)}
+
+
+def encode_sequence(sequence: List[Any], index: Dict[int, int]) -> List[int]:
+    """Encode a sequence of domain objects as domain indices."""
+    return [index[id(obj)] for obj in sequence]
+
+
+def decode_sequence(indices: List[int], domain: List[Any]) -> List[Any]:
+    """Decode domain indices back into a sequence of domain objects."""
+    return [domain[i] for i in indices]
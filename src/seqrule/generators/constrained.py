@@ -5,15 +5,64 @@ This module provides functionality for generating sequences
 that satisfy a set of constraints.
 """
 
+import heapq
+import itertools
+import os
 import random
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from ..core import AbstractObject, Sequence
-from .patterns import PropertyPattern
+from .checkpoint import (
+    decode_rng_state,
+    decode_sequence,
+    domain_index,
+    encode_rng_state,
+    encode_sequence,
+    load_checkpoint,
+    save_checkpoint,
+)
+from .patterns import PatternSet, PropertyPattern
+from .symmetry import Symmetry, SymmetryGroup
 
 T = TypeVar("T")
 
+# Incremental score of appending an item to a prefix: step(prefix, item) -> float
+StepScore = Callable[[Sequence, AbstractObject], float]
+
+
+def score_delta(score: Callable[[Sequence], float]) -> StepScore:
+    """
+    Turn a whole-sequence score into an incremental step score.
+
+    The step score of appending ``item`` to ``prefix`` is
+    ``score(prefix + [item]) - score(prefix)``, so the accumulated score of a
+    sequence equals ``score(sequence) - score([])``. Prefer writing a native
+    step score when one is cheap to compute, since this re-scores the prefix.
+
+    Args:
+        score: Function scoring a complete sequence
+
+    Returns:
+        Step score suitable for beam_search and best_first
+    """
+
+    def step(prefix: Sequence, item: AbstractObject) -> float:
+        return score(prefix + [item]) - score(prefix)
+
+    return step
+
 
 @dataclass
 class GeneratorConfig:
@@ -23,6 +72,7 @@ class GeneratorConfig:
     randomize_candidates: bool = True
     max_candidates_per_step: int = 10
     backtracking_enabled: bool = False
+    seed: Optional[int] = None
 
 
 class ConstrainedGenerator:
@@ -48,6 +98,10 @@ class ConstrainedGenerator:
         self.constraints: List[Callable[[Sequence], bool]] = []
         self.patterns: List[PropertyPattern] = []
         self.config = config or GeneratorConfig()
+        self.symmetries: List[Symmetry] = []
+        self._pattern_set = PatternSet()
+        self._symmetry_group: Optional[SymmetryGroup] = None
+        self._rng = random.Random(self.config.seed)
 
     def add_constraint(
         self, constraint: Callable[[Sequence], bool]
@@ -77,13 +131,65 @@ class ConstrainedGenerator:
         self.patterns.append(pattern)
         return self
 
+    def add_symmetry(self, symmetry: Symmetry) -> "ConstrainedGenerator":
+        """
+        Declare a symmetry of the constraints and patterns.
+
+        Generation then yields only one canonical representative per class of
+        equivalent sequences. The constraints and patterns must be invariant
+        under the symmetry, otherwise valid sequences may be skipped.
+
+        Args:
+            symmetry: A Symmetry the valid sequences are closed under
+
+        Returns:
+            Self for method chaining
+        """
+        self.symmetries.append(symmetry)
+        return self
+
+    @property
+    def symmetry_group(self) -> Optional[SymmetryGroup]:
+        """The group generated by the declared symmetries, if any."""
+        if not self.symmetries:
+            return None
+        # Rebuild if symmetries were added since the last use
+        group = self._symmetry_group
+        if group is None or group.symmetries != self.symmetries:
+            self._symmetry_group = SymmetryGroup(self.domain, self.symmetries)
+        return self._symmetry_group
+
     def _satisfies_constraints(self, sequence: Sequence) -> bool:
         """Check if the sequence satisfies all constraints."""
         return all(constraint(sequence) for constraint in self.constraints)
 
     def _satisfies_patterns(self, sequence: Sequence, start_idx: int = 0) -> bool:
         """Check if the sequence satisfies all patterns starting from start_idx."""
-        return all(pattern.matches(sequence, start_idx) for pattern in self.patterns)
+        if not self.patterns:
+            return True
+        # Recompile if the pattern list was changed since the last check
+        if self._pattern_set.patterns != self.patterns:
+            self._pattern_set = PatternSet(self.patterns)
+        return self._pattern_set.matches(sequence, start_idx)
+
+    def _is_valid(self, sequence: Sequence) -> bool:
+        """Check a whole sequence against every constraint and pattern."""
+        return self._satisfies_constraints(sequence) and self._satisfies_patterns(
+            sequence
+        )
+
+    def _extensions(self, prefix: Sequence) -> Iterator[Sequence]:
+        """
+        Valid one-item extensions of a prefix, in domain order.
+
+        Unlike :meth:`predict_next`, which only checks patterns from the last
+        item of the prefix, every extension is checked from the start, the way
+        :meth:`generate` checks the sequences it yields.
+        """
+        for item in self.domain:
+            extended = prefix + [item]
+            if self._is_valid(extended):
+                yield extended
 
     def predict_next(self, sequence: Sequence) -> List[AbstractObject]:
         """
@@ -121,27 +227,84 @@ class ConstrainedGenerator:
 
         return candidates
 
-    def generate(self, max_length: int = 10) -> Iterator[Sequence]:
+    def generate(
+        self,
+        max_length: int = 10,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: int = 1000,
+        expand_orbits: bool = False,
+    ) -> Iterator[Sequence]:
         """
         Generate sequences satisfying all constraints and patterns.
 
+        With symmetries declared, only the lexicographically smallest sequence
+        of each equivalence class is generated, and prefixes that can't lead to
+        one are pruned. ``expand_orbits`` lazily yields every equivalent
+        sequence after its representative instead.
+
+        When ``checkpoint_path`` is given, the search frontier, random state and
+        number of emitted sequences are saved there every ``checkpoint_interval``
+        sequences. If the file already exists, generation resumes from it and
+        continues exactly where the checkpointed run left off.
+
         Args:
             max_length: Maximum length of generated sequences
+            checkpoint_path: Optional checkpoint file to save to and resume from
+            checkpoint_interval: Number of emitted sequences between checkpoints
+            expand_orbits: Whether to yield the full orbit of each representative
 
         Yields:
             Valid sequences of increasing length
         """
-        # Start with empty sequence
-        sequences_to_process = [[]]
+        index = domain_index(self.domain)
+        group = self.symmetry_group
+
+        def save(frontier, emitted):
+            save_checkpoint(
+                checkpoint_path,
+                {
+                    "kind": "constrained",
+                    "domain_size": len(self.domain),
+                    "max_length": max_length,
+                    "emitted": emitted,
+                    "rng_state": encode_rng_state(self._rng),
+                    "frontier": [encode_sequence(seq, index) for seq in frontier],
+                },
+            )
+
+        # Start with empty sequence, or resume from the checkpoint
+        sequences_to_process = deque([[]])
+        emitted = 0
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            state = load_checkpoint(checkpoint_path, "constrained")
+            if state["domain_size"] != len(self.domain):
+                raise ValueError("Checkpoint was written for a different domain")
+            self._rng.setstate(decode_rng_state(state["rng_state"]))
+            sequences_to_process = deque(
+                decode_sequence(seq, self.domain) for seq in state["frontier"]
+            )
+            emitted = state["emitted"]
+        last_saved = emitted
 
         while sequences_to_process:
-            current = sequences_to_process.pop(0)
+            # Sequences are only counted once the consumer has asked for more
+            if checkpoint_path and emitted - last_saved >= checkpoint_interval:
+                save(sequences_to_process, emitted)
+                last_saved = emitted
+
+            current = sequences_to_process.popleft()
 
-            # Yield if valid
-            if self._satisfies_constraints(current) and self._satisfies_patterns(
-                current
+            # Yield if valid (and canonical under the symmetries)
+            if self._is_valid(current) and (
+                group is None or group.is_canonical(group.indices(current))
             ):
-                yield current
+                if group is not None and expand_orbits:
+                    for sequence in group.orbit(current):
+                        emitted += 1
+                        yield sequence
+                else:
+                    emitted += 1
+                    yield current
 
             # Stop extending if we've reached max length
             if len(current) >= max_length:
@@ -156,7 +319,7 @@ class ConstrainedGenerator:
             # Randomize order to get variety
             if self.config.randomize_candidates:
                 shuffled = list(candidates)
-                random.shuffle(shuffled)
+                self._rng.shuffle(shuffled)
 
                 # Limit the number of candidates if configured
                 if self.config.max_candidates_per_step > 0:
@@ -164,12 +327,127 @@ class ConstrainedGenerator:
             else:
                 shuffled = candidates
 
-            # Add new sequences to process
+            # Add new sequences to process, pruning non-canonical prefixes
             for candidate in shuffled:
                 new_sequence = current + [candidate]
-                if self._satisfies_constraints(
-                    new_sequence
-                ) and self._satisfies_patterns(
-                    new_sequence
-                ):  # pragma: no branch
+                if group is not None and not group.is_canonical_prefix(
+                    group.indices(new_sequence)
+                ):
+                    continue
+                if self._is_valid(new_sequence):  # pragma: no branch
                     sequences_to_process.append(new_sequence)
+
+        # Record completion so a resumed run emits nothing further
+        if checkpoint_path:
+            save(sequences_to_process, emitted)
+
+    def beam_search(
+        self,
+        score: StepScore,
+        max_length: int = 10,
+        beam_width: int = 10,
+        top_k: Optional[int] = None,
+    ) -> List[Tuple[float, Sequence]]:
+        """
+        Find high-scoring valid sequences with a bounded beam search.
+
+        Sequences are extended one length at a time. Scores accumulate
+        incrementally: each appended item adds ``score(prefix, item)`` to the
+        score of its prefix. Only the ``beam_width`` best sequences of each length
+        are extended further, so memory is proportional to the beam rather than
+        to the search space.
+
+        Args:
+            score: Step score of appending an item to a prefix
+            max_length: Maximum length of generated sequences
+            beam_width: Number of sequences kept per length
+            top_k: Number of results to return (defaults to beam_width)
+
+        Returns:
+            Up to ``top_k`` (score, sequence) pairs, best first
+
+        Raises:
+            ValueError: If beam_width or top_k isn't positive
+        """
+        if beam_width <= 0:
+            raise ValueError("beam_width must be positive")
+        top_k = beam_width if top_k is None else top_k
+        if top_k <= 0:
+            raise ValueError("top_k must be positive")
+        order = itertools.count()
+
+        # Min-heaps of (score, -order, sequence): on ties earlier sequences win
+        best: List[Tuple[float, int, Sequence]] = []
+
+        def keep(heap, limit, total, sequence):
+            entry = (total, -next(order), sequence)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+        beam = [(0.0, [])]
+        if self._is_valid([]):
+            keep(best, top_k, 0.0, [])
+
+        for _ in range(max_length):
+            next_beam: List[Tuple[float, int, Sequence]] = []
+            for total, prefix in beam:
+                for extended in self._extensions(prefix):
+                    step = score(prefix, extended[-1])
+                    keep(next_beam, beam_width, total + step, extended)
+            if not next_beam:
+                break
+            beam = [(total, sequence) for total, _, sequence in next_beam]
+            for total, sequence in beam:
+                keep(best, top_k, total, sequence)
+
+        return [(total, sequence) for total, _, sequence in sorted(best, reverse=True)]
+
+    def best_first(
+        self,
+        score: StepScore,
+        max_length: int = 10,
+        max_frontier: Optional[int] = None,
+    ) -> Iterator[Tuple[float, Sequence]]:
+        """
+        Generate valid sequences, always expanding the highest-scoring prefix.
+
+        Scores accumulate incrementally as in :meth:`beam_search`. When step
+        scores are never positive (for example negated costs such as pipeline
+        duration), sequences are yielded in exact order of decreasing score.
+        Otherwise the order is a heuristic.
+
+        Args:
+            score: Step score of appending an item to a prefix
+            max_length: Maximum length of generated sequences
+            max_frontier: Optional bound on the priority queue; once it holds
+                twice this many prefixes, only the best ``max_frontier`` are kept
+
+        Yields:
+            (score, sequence) pairs
+        """
+        order = itertools.count()
+
+        if self._is_valid([]):
+            yield 0.0, []
+
+        # Max-heap via negated scores; on ties earlier sequences come first.
+        # Every queued extension has been checked by _extensions.
+        frontier: List[Tuple[float, int, Sequence]] = [(-0.0, next(order), [])]
+        while frontier:
+            negated, _, sequence = heapq.heappop(frontier)
+            if sequence:
+                yield -negated, sequence
+
+            if len(sequence) >= max_length:
+                continue
+
+            for extended in self._extensions(sequence):
+                heapq.heappush(
+                    frontier,
+                    (negated - score(sequence, extended[-1]), next(order), extended),
+                )
+
+            if max_frontier is not None and len(frontier) > 2 * max_frontier:
+                frontier = heapq.nsmallest(max_frontier, frontier)
@@ -5,7 +5,37 @@ This module provides functionality for lazy sequence generation,
 which only generates sequences as they are requested.
 """
 
+import math
 import random
+from dataclasses import asdict, dataclass
+
+from .checkpoint import (
+    decode_rng_state,
+    decode_sequence,
+    domain_index,
+    encode_rng_state,
+    encode_sequence,
+    load_checkpoint,
+    save_checkpoint,
+)
+
+
+class GenerationExhaustedError(Exception):
+    """Raised when no sequence length up to max_length admits a valid sequence."""
+
+
+@dataclass
+class LengthStats:
+    """Acceptance statistics for sequences of a single length."""
+
+    attempted: int = 0
+    accepted: int = 0
+    infeasible: bool = False
+
+    @property
+    def rate(self) -> float:
+        """Fraction of attempted sequences that passed the filter."""
+        return self.accepted / self.attempted if self.attempted else 0.0
 
 
 class LazyGenerator:
@@ -13,10 +43,22 @@ class LazyGenerator:
     Generator that lazily produces sequences.
 
     This generator only creates sequences when they are requested, making
-    it more memory efficient for large domains or long sequences.
+    it more memory efficient for large domains or long sequences. Lengths are
+    visited in increasing order; the number of candidates drawn for each batch
+    adapts to the observed acceptance rate, and a length is skipped for good once
+    ``max_attempts_per_length`` candidates have been rejected without a single
+    acceptance.
     """
 
-    def __init__(self, domain, max_length=10, filter_rule=None):
+    def __init__(
+        self,
+        domain,
+        max_length=10,
+        filter_rule=None,
+        max_attempts_per_length=1000,
+        max_batch_attempts=1000,
+        seed=None,
+    ):
         """
         Initialize with generation parameters.
 
@@ -24,74 +66,214 @@ class LazyGenerator:
             domain: List of objects to generate sequences from
             max_length: Maximum length of generated sequences
             filter_rule: Optional rule to filter generated sequences
+            max_attempts_per_length: Rejected attempts after which a length that
+                has never produced a valid sequence is considered infeasible
+            max_batch_attempts: Upper bound on candidates drawn for one batch
+            seed: Optional seed for reproducible generation
         """
         self.domain = domain
         self.max_length = max_length
         self.filter_rule = filter_rule
+        self.max_attempts_per_length = max_attempts_per_length
+        self.max_batch_attempts = max_batch_attempts
+        self._rng = random.Random(seed)
+        self._stats = {}
         self._state = self._get_initial_state()
+        self.emitted = 0
 
     def _get_initial_state(self):
         """Get the initial generator state."""
         return {"generated": 0, "current_length": 0, "current_batch": []}
 
-    def __call__(self):
-        """Generate the next sequence."""
-        # Shortcut if we've already generated some for this length
-        if self._state["current_batch"]:
-            return self._state["current_batch"].pop()
+    @property
+    def stats(self):
+        """Per-length acceptance statistics, keyed by sequence length."""
+        return dict(self._stats)
 
-        # If we've reached the max length, start over
-        if self._state["current_length"] > self.max_length:
-            self._state = self._get_initial_state()
+    @property
+    def exhausted(self):
+        """Whether every length up to max_length has been proven infeasible."""
+        return all(
+            self._length_stats(length).infeasible
+            for length in range(self.max_length + 1)
+        )
 
-        # Try to generate a sequence of the current length
-        length = self._state["current_length"]
+    def _length_stats(self, length):
+        """Get (creating if needed) the statistics for a length."""
+        stats = self._stats.get(length)
+        if stats is None:
+            stats = self._stats[length] = LengthStats()
+        return stats
 
-        # Empty sequence is a special case
-        if length == 0:
-            self._state["current_length"] = 1
-            if not self.filter_rule or self.filter_rule([]):
-                return []
-            else:
-                return self()
+    def _accepts(self, sequence, stats):
+        """Apply the filter to a candidate and record the outcome."""
+        stats.attempted += 1
+        if self.filter_rule and not self.filter_rule(sequence):
+            if not stats.accepted and stats.attempted >= self.max_attempts_per_length:
+                stats.infeasible = True
+            return False
+        stats.accepted += 1
+        return True
 
-        # Generate a batch of sequences for this length
-        batch_size = min(10, 100 // length)  # Generate fewer longer sequences
-        batch = []
+    def _draw_batch(self, length, stats):
+        """Draw candidates of one length until a batch is filled or the budget runs out."""
+        # Generate fewer longer sequences, but always at least one
+        batch_size = max(1, min(10, 100 // length))
+
+        # Laplace-smoothed acceptance estimate sizes the number of attempts
+        rate = (stats.accepted + 1) / (stats.attempted + 2)
+        attempts = min(math.ceil(batch_size / rate), self.max_batch_attempts)
+        attempts = max(attempts, batch_size)
 
-        for _ in range(batch_size * 10):  # Try harder for filtered sequences
-            if len(batch) >= batch_size:
+        batch = []
+        for _ in range(attempts):
+            if len(batch) >= batch_size or stats.infeasible:
                 break
+            sequence = self._rng.choices(self.domain, k=length)
+            if self._accepts(sequence, stats):
+                batch.append(sequence)
+        return batch
+
+    def _advance(self):
+        """
+        Produce the next sequence of the current pass over lengths.
 
-            sequence = random.choices(self.domain, k=length)
+        Returns:
+            The next sequence, or None once every length has been visited
+        """
+        state = self._state
+        while True:
+            if state["current_batch"]:
+                return state["current_batch"].pop()
 
-            if not self.filter_rule or self.filter_rule(sequence):
-                batch.append(sequence)
+            length = state["current_length"]
+            if length > self.max_length:
+                return None
 
-        # If we couldn't generate any, move to next length
-        if not batch:
-            self._state["current_length"] += 1
-            return self()
+            stats = self._length_stats(length)
+            if stats.infeasible:
+                state["current_length"] += 1
+                state["generated"] = 0
+                continue
 
-        # Store the batch and return one
-        self._state["current_batch"] = batch[:-1]
-        self._state["generated"] += len(batch)
+            # Empty sequence is a special case
+            if length == 0:
+                state["current_length"] = 1
+                if self._accepts([], stats):
+                    return []
+                stats.infeasible = True  # The filter is deterministic on []
+                continue
 
-        # If we've generated enough sequences of this length, move to next length
-        if self._state["generated"] >= 10 * (length + 1):
-            self._state["current_length"] += 1
-            self._state["generated"] = 0
+            batch = self._draw_batch(length, stats)
 
-        return batch[-1]
+            # If we couldn't generate any, move to next length
+            if not batch:
+                state["current_length"] += 1
+                state["generated"] = 0
+                continue
+
+            # Store the batch and return one
+            state["current_batch"] = batch[:-1]
+            state["generated"] += len(batch)
+
+            # If we've generated enough sequences of this length, move to next length
+            if state["generated"] >= 10 * (length + 1):
+                state["current_length"] += 1
+                state["generated"] = 0
+
+            return batch[-1]
+
+    def __call__(self):
+        """
+        Generate the next sequence.
+
+        Once every length has been visited the generator starts over from the
+        empty sequence. A dedicated exception rather than ``StopIteration``
+        signals exhaustion, since ``StopIteration`` raised while a calling
+        generator is running would be turned into a ``RuntimeError``
+        (PEP 479); iterate over the generator to simply stop instead.
+
+        Raises:
+            GenerationExhaustedError: If no length up to max_length admits a
+                valid sequence
+        """
+        while True:
+            sequence = self._advance()
+            if sequence is not None:
+                self.emitted += 1
+                return sequence
+            if self.exhausted:
+                raise GenerationExhaustedError(
+                    "No sequence length admits a valid sequence"
+                )
+            self._state = self._get_initial_state()
 
     def __iter__(self):
-        """Return an iterator that generates sequences."""
-        for length in range(self.max_length + 1):
-            # Yield a batch for each length
-            for _ in range(
-                min(100, 10**length)
-            ):  # Limit number of sequences per length
-                yield self()
+        """
+        Return an iterator over one pass through every sequence length.
+
+        Iteration continues an unfinished pass (for example one restored from a
+        checkpoint) and starts a new pass otherwise.
+        """
+        if self._state["current_length"] > self.max_length:
+            self._state = self._get_initial_state()
+        while True:
+            sequence = self._advance()
+            if sequence is None:
+                return
+            self.emitted += 1
+            yield sequence
+
+    def checkpoint(self, path):
+        """
+        Save the generator's position, statistics and random state.
+
+        Args:
+            path: Checkpoint file path
+        """
+        index = domain_index(self.domain)
+        state = dict(self._state)
+        state["current_batch"] = [
+            encode_sequence(seq, index) for seq in state["current_batch"]
+        ]
+        save_checkpoint(
+            path,
+            {
+                "kind": "lazy",
+                "domain_size": len(self.domain),
+                "max_length": self.max_length,
+                "emitted": self.emitted,
+                "rng_state": encode_rng_state(self._rng),
+                "state": state,
+                "stats": {str(k): asdict(v) for k, v in self._stats.items()},
+            },
+        )
+
+    def restore(self, path):
+        """
+        Resume from a checkpoint written by :meth:`checkpoint`.
+
+        The generator continues with exactly the sequences it would have
+        produced had it not been interrupted.
+
+        Args:
+            path: Checkpoint file path
+
+        Raises:
+            ValueError: If the checkpoint doesn't match this generator's domain
+        """
+        data = load_checkpoint(path, "lazy")
+        if data["domain_size"] != len(self.domain):
+            raise ValueError("Checkpoint was written for a different domain")
+        state = data["state"]
+        state["current_batch"] = [
+            decode_sequence(seq, self.domain) for seq in state["current_batch"]
+        ]
+        self._state = state
+        self._stats = {int(k): LengthStats(**v) for k, v in data["stats"].items()}
+        self._rng.setstate(decode_rng_state(data["rng_state"]))
+        self.max_length = data["max_length"]
+        self.emitted = data["emitted"]
 
 
 def generate_lazy(domain, max_length=10, filter_rule=None):
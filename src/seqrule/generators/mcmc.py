@@ -0,0 +1,378 @@
+"""
+Markov-chain Monte Carlo sequence sampling.
+
+This module provides a sampler for long sequences where exact generation is
+intractable. A chain starts from a valid sequence and proposes local moves
+(substitute, swap, and delete/insert pairs). Proposals that break a hard rule
+are rejected outright; soft rules contribute an energy penalty when violated,
+and proposals are accepted with the Metropolis criterion.
+
+When the rules are local, a ``window`` can be given: rules are then evaluated
+on every slice of ``window`` consecutive elements, and a move only re-evaluates
+the slices it touches.
+"""
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..core import AbstractObject, Sequence
+
+MOVES = ("substitute", "swap", "shift")
+
+Rule = Callable[[Sequence], bool]
+SoftRule = Union[Rule, Tuple[Rule, float]]
+
+
+@dataclass
+class ChainStats:
+    """Statistics of a single Markov chain."""
+
+    proposed: int = 0
+    accepted: int = 0
+    rejected_hard: int = 0
+    energy: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def acceptance_rate(self) -> float:
+        """Fraction of proposed moves that were accepted."""
+        return self.accepted / self.proposed if self.proposed else 0.0
+
+
+class MCMCSampler:
+    """Samples long sequences under hard and soft rules with local moves."""
+
+    def __init__(
+        self,
+        domain: List[Union[AbstractObject, Dict[str, Any]]],
+        hard: Optional[List[Rule]] = None,
+        soft: Optional[List[SoftRule]] = None,
+        window: Optional[int] = None,
+        temperature: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            domain: List of objects to build sequences from
+            hard: Rules every sampled sequence must satisfy
+            soft: Rules adding an energy penalty when violated, given either as
+                a rule (weight 1) or a ``(rule, weight)`` pair
+            window: If set, rules are local and evaluated on each slice of this
+                many consecutive elements; otherwise on the whole sequence
+            temperature: Metropolis temperature; lower values favour low energy
+            seed: Optional seed for reproducible chains
+        """
+        if not domain:
+            raise ValueError("Domain must contain at least one object")
+        if window is not None and window <= 0:
+            raise ValueError("window must be positive")
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        self.domain = [
+            obj if isinstance(obj, AbstractObject) else AbstractObject(**obj)
+            for obj in domain
+        ]
+        self.hard = list(hard or [])
+        self.soft = [
+            term if isinstance(term, tuple) else (term, 1.0) for term in soft or []
+        ]
+        self.window = window
+        self.temperature = temperature
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self.stats = ChainStats()
+
+    @classmethod
+    def from_generator(
+        cls, generator: Any, soft: Optional[List[SoftRule]] = None, **kwargs: Any
+    ) -> "MCMCSampler":
+        """
+        Create a sampler using a ConstrainedGenerator's domain and constraints.
+
+        The generator's constraints become hard rules. Patterns are not local,
+        so they are only supported without a window.
+
+        Args:
+            generator: ConstrainedGenerator to take the domain and rules from
+            soft: Optional soft rules
+            **kwargs: Additional MCMCSampler options
+
+        Returns:
+            MCMCSampler instance
+        """
+        hard = list(generator.constraints)
+        if generator.patterns:
+            if kwargs.get("window") is not None:
+                raise ValueError("Patterns can't be checked on windows")
+            hard.append(generator._satisfies_patterns)
+        return cls(generator.domain, hard=hard, soft=soft, **kwargs)
+
+    # Window bookkeeping
+
+    def _width(self, length: int) -> int:
+        """Number of elements in each evaluated slice."""
+        return length if self.window is None else min(self.window, length)
+
+    def _window_count(self, length: int) -> int:
+        """Number of evaluated slices in a sequence of the given length."""
+        return max(length - self._width(length) + 1, 1)
+
+    def _affected(self, lo: int, hi: int, length: int) -> range:
+        """Slices whose contents include any position in ``[lo, hi]``."""
+        width = self._width(length)
+        return range(
+            max(lo - width + 1, 0), min(hi, self._window_count(length) - 1) + 1
+        )
+
+    def _hard_ok(self, sequence: Sequence, starts: Iterable[int]) -> bool:
+        """Whether every given slice satisfies the hard rules."""
+        width = self._width(len(sequence))
+        for start in starts:
+            piece = sequence[start : start + width]
+            if not all(rule(piece) for rule in self.hard):
+                return False
+        return True
+
+    def _slice_energy(self, sequence: Sequence, start: int) -> float:
+        """Soft-rule penalty of a single slice."""
+        piece = sequence[start : start + self._width(len(sequence))]
+        return sum(weight for rule, weight in self.soft if not rule(piece))
+
+    def energy(self, sequence: Sequence) -> float:
+        """
+        Total soft-rule energy of a sequence.
+
+        Args:
+            sequence: Sequence to score
+
+        Returns:
+            Sum of the weights of violated soft rules over all slices
+        """
+        return sum(
+            self._slice_energy(sequence, start)
+            for start in range(self._window_count(len(sequence)))
+        )
+
+    def is_valid(self, sequence: Sequence) -> bool:
+        """Whether the sequence satisfies every hard rule."""
+        return self._hard_ok(sequence, range(self._window_count(len(sequence))))
+
+    # Chain construction
+
+    def initial_sequence(self, length: int, max_restarts: int = 100) -> Sequence:
+        """
+        Build a random valid sequence by extending it one element at a time.
+
+        This assumes every prefix of a valid sequence is valid; pass an explicit
+        ``initial`` sequence to :meth:`sample` for rules where that's not true.
+
+        Args:
+            length: Length of the sequence
+            max_restarts: Number of times to start over after a dead end
+
+        Returns:
+            A sequence satisfying every hard rule
+
+        Raises:
+            ValueError: If no valid sequence could be built
+        """
+        for _ in range(max_restarts):
+            sequence: Sequence = []
+            while len(sequence) < length:
+                candidates = list(self.domain)
+                self._rng.shuffle(candidates)
+                for item in candidates:
+                    sequence.append(item)
+                    # Only the slice ending at the new element is new
+                    last = len(sequence) - self._width(len(sequence))
+                    if self._hard_ok(sequence, (last,)):
+                        break
+                    sequence.pop()
+                else:
+                    break
+            if len(sequence) == length:
+                return sequence
+        raise ValueError(f"Could not build a valid sequence of length {length}")
+
+    def _propose(
+        self, sequence: Sequence
+    ) -> Tuple[Callable[[], None], List[Tuple[int, int]]]:
+        """
+        Apply a random move in place.
+
+        Returns:
+            An undo function and the inclusive position ranges the move changed
+        """
+        length = len(sequence)
+        move = self._rng.choice(MOVES if length > 1 else MOVES[:1])
+
+        if move == "substitute":
+            i = self._rng.randrange(length)
+            old = sequence[i]
+            sequence[i] = self._rng.choice(self.domain)
+
+            def undo() -> None:
+                sequence[i] = old
+
+            return undo, [(i, i)]
+
+        if move == "swap":
+            i, j = sorted(self._rng.sample(range(length), 2))
+            sequence[i], sequence[j] = sequence[j], sequence[i]
+
+            def undo() -> None:
+                sequence[i], sequence[j] = sequence[j], sequence[i]
+
+            return undo, [(i, i), (j, j)]
+
+        # Delete an element and insert a new one nearby, keeping the length
+        span = self.window or length
+        i = self._rng.randrange(length)
+        j = min(max(i + self._rng.randint(-span, span), 0), length - 1)
+        removed = sequence.pop(i)
+        sequence.insert(j, self._rng.choice(self.domain))
+
+        def undo() -> None:
+            sequence.pop(j)
+            sequence.insert(i, removed)
+
+        # Every position between i and j shifts by one
+        return undo, [(min(i, j), max(i, j))]
+
+    def _touched(self, changed: List[Tuple[int, int]], length: int) -> List[int]:
+        """Starts of the slices that contain any changed position."""
+        if self.window is None:
+            return [0]
+        starts = set()
+        for lo, hi in changed:
+            starts.update(self._affected(lo, hi, length))
+        return sorted(starts)
+
+    def sample(
+        self,
+        length: int,
+        samples: int,
+        thin: int = 100,
+        burn_in: int = 1000,
+        initial: Optional[Sequence] = None,
+    ) -> List[Sequence]:
+        """
+        Run a chain and collect samples.
+
+        Args:
+            length: Length of the sampled sequences
+            samples: Number of sequences to collect
+            thin: Number of proposals between collected samples
+            burn_in: Number of proposals discarded before the first sample
+            initial: Optional valid starting sequence of the given length
+
+        Returns:
+            List of sampled sequences, each satisfying every hard rule
+
+        Raises:
+            ValueError: If the initial sequence is invalid
+        """
+        start_time = time.perf_counter()
+        if initial is not None:
+            sequence = list(initial)
+            length = len(sequence)
+            if not self.is_valid(sequence):
+                raise ValueError("Initial sequence violates a hard rule")
+        else:
+            sequence = self.initial_sequence(length)
+
+        stats = self.stats = ChainStats()
+        slice_energy = [
+            self._slice_energy(sequence, start)
+            for start in range(self._window_count(length))
+        ]
+        stats.energy = sum(slice_energy)
+
+        results: List[Sequence] = []
+        steps = burn_in + samples * thin
+        for step in range(1, steps + 1):
+            if length:
+                self._step(sequence, slice_energy, stats)
+            if step > burn_in and (step - burn_in) % thin == 0:
+                results.append(list(sequence))
+
+        stats.elapsed = time.perf_counter() - start_time
+        return results
+
+    def _step(
+        self, sequence: Sequence, slice_energy: List[float], stats: ChainStats
+    ) -> None:
+        """Propose a single move and accept or reject it."""
+        stats.proposed += 1
+        undo, changed = self._propose(sequence)
+        starts = self._touched(changed, len(sequence))
+
+        if not self._hard_ok(sequence, starts):
+            stats.rejected_hard += 1
+            undo()
+            return
+
+        new_energy = {s: self._slice_energy(sequence, s) for s in starts}
+        delta = sum(new_energy[s] - slice_energy[s] for s in starts)
+        if delta <= 0 or self._rng.random() < math.exp(-delta / self.temperature):
+            for s, value in new_energy.items():
+                slice_energy[s] = value
+            stats.energy += delta
+            stats.accepted += 1
+        else:
+            undo()
+
+
+def _run_chain(
+    sampler: MCMCSampler, seed: int, options: Dict[str, Any]
+) -> Tuple[List[Sequence], ChainStats]:
+    """Run an independent chain in a worker process."""
+    sampler._rng = random.Random(seed)
+    return sampler.sample(**options), sampler.stats
+
+
+def sample_mcmc(
+    sampler: MCMCSampler,
+    length: int,
+    samples: int,
+    chains: int = 1,
+    workers: int = 1,
+    **kwargs: Any,
+) -> Tuple[List[Sequence], List[ChainStats]]:
+    """
+    Collect samples from several independent chains.
+
+    With ``workers > 1`` the chains run in separate processes, so the domain and
+    every rule must be picklable.
+
+    Args:
+        sampler: Configured MCMCSampler
+        length: Length of the sampled sequences
+        samples: Number of sequences to collect from each chain
+        chains: Number of independent chains
+        workers: Number of worker processes
+        **kwargs: Additional MCMCSampler.sample options
+
+    Returns:
+        The samples of all chains, in chain order, and each chain's statistics
+    """
+    base_seed = sampler.seed if sampler.seed is not None else random.randrange(2**32)
+    options = {"length": length, "samples": samples, **kwargs}
+    if workers <= 1:
+        runs = [_run_chain(sampler, base_seed + i, options) for i in range(chains)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_chain, sampler, base_seed + i, options)
+                for i in range(chains)
+            ]
+            runs = [future.result() for future in futures]
+
+    sequences = [sequence for chain_samples, _ in runs for sequence in chain_samples]
+    return sequences, [chain_stats for _, chain_stats in runs]
@@ -0,0 +1,310 @@
+"""
+Mutation-based counter-example search.
+
+This module provides a search engine that looks for sequences violating a rule
+by mutating sequences that satisfy it. Passing sequences form a corpus; each
+step picks a promising corpus entry, applies a few insert, delete, swap,
+substitute, or property-perturb mutations, and evaluates the result. Sequences
+that are close to violating the rule (near misses) are explored first. Without
+a distance function, closeness is judged from the rule's outcomes: a sequence
+whose mutations keep producing new counter-examples is a near miss.
+"""
+
+import heapq
+import itertools
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core import AbstractObject, FormalRule, Sequence
+
+MUTATIONS = ("insert", "delete", "swap", "substitute", "perturb")
+
+
+def _near_miss_priority(mutations: int, violations: int) -> float:
+    """
+    Priority of a corpus entry from its mutations' outcomes (lower is closer).
+
+    This is the negated share of its mutations that produced a new
+    counter-example, Laplace-smoothed so that unexplored entries rank between
+    productive and unproductive ones.
+    """
+    return -(violations + 1) / (mutations + 2)
+
+
+@dataclass
+class SearchResult:
+    """Results of a counter-example search."""
+
+    counter_examples: List[Sequence] = field(default_factory=list)
+    evaluations: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def evaluations_per_second(self) -> float:
+        """Rule evaluations performed per second of wall-clock time."""
+        return self.evaluations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class CounterExampleSearch:
+    """Searches for sequences that violate a rule by mutating passing sequences."""
+
+    def __init__(
+        self,
+        rule: FormalRule,
+        domain: List[AbstractObject],
+        max_length: int = 10,
+        distance: Optional[Callable[[Sequence], float]] = None,
+        seeds: Optional[List[Sequence]] = None,
+        max_corpus: int = 1000,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the search.
+
+        Args:
+            rule: The rule to find counter-examples for
+            domain: Domain of objects to build sequences from
+            max_length: Maximum length of mutated sequences
+            distance: Optional function estimating how close a passing sequence is
+                to violating the rule (lower is closer). Without it, sequences
+                whose mutations, or their parent's, produced the largest share
+                of new counter-examples are mutated first
+            seeds: Optional passing sequences to start from
+            max_corpus: Maximum number of passing sequences kept in the corpus
+            seed: Optional seed for reproducible searches
+        """
+        if not domain:
+            raise ValueError("Domain must contain at least one object")
+        self.rule = rule
+        self.domain = list(domain)
+        self.max_length = max_length
+        self.distance = distance
+        self.seeds = list(seeds) if seeds else []
+        self.max_corpus = max_corpus
+        self._rng = random.Random(seed)
+        self._property_values = self._collect_property_values()
+
+    def _collect_property_values(self) -> Dict[str, List[Any]]:
+        """Collect the distinct values each property takes across the domain."""
+        values: Dict[str, List[Any]] = {}
+        for obj in self.domain:
+            for name, value in obj.properties.items():
+                seen = values.setdefault(name, [])
+                if value not in seen:
+                    seen.append(value)
+        return values
+
+    def _fails(self, sequence: Sequence) -> Optional[bool]:
+        """Evaluate the rule, returning None if it raises."""
+        try:
+            return not self.rule(sequence)
+        except Exception:
+            return None
+
+    def _mutate(self, sequence: Sequence) -> Sequence:
+        """Apply a single random mutation to a copy of the sequence."""
+        rng = self._rng
+        result = list(sequence)
+        mutation = rng.choice(MUTATIONS)
+
+        if mutation == "insert" or not result:
+            if len(result) < self.max_length:
+                result.insert(rng.randint(0, len(result)), rng.choice(self.domain))
+        elif mutation == "delete":
+            del result[rng.randrange(len(result))]
+        elif mutation == "swap":
+            i, j = rng.randrange(len(result)), rng.randrange(len(result))
+            result[i], result[j] = result[j], result[i]
+        elif mutation == "substitute":
+            result[rng.randrange(len(result))] = rng.choice(self.domain)
+        else:
+            i = rng.randrange(len(result))
+            properties = dict(result[i].properties)
+            if properties:
+                name = rng.choice(list(properties))
+                choices = self._property_values.get(name) or [properties[name]]
+                properties[name] = rng.choice(choices)
+                result[i] = AbstractObject(**properties)
+        return result
+
+    def _initial_corpus(self) -> List[Sequence]:
+        """Build the starting corpus from the given seeds or random sequences."""
+        if self.seeds:
+            return list(self.seeds)
+        return [
+            self._rng.choices(self.domain, k=self._rng.randint(1, self.max_length))
+            for _ in range(10)
+        ]
+
+    def run(
+        self,
+        max_examples: int = 5,
+        time_budget: float = 1.0,
+        max_evaluations: Optional[int] = None,
+    ) -> SearchResult:
+        """
+        Search for distinct counter-examples.
+
+        Args:
+            max_examples: Number of distinct counter-examples to find
+            time_budget: Maximum wall-clock seconds to search for
+            max_evaluations: Optional cap on rule evaluations
+
+        Returns:
+            SearchResult with the counter-examples found and throughput figures
+        """
+        start = time.perf_counter()
+        deadline = start + time_budget
+        result = SearchResult()
+        found = set()
+        tie_breaker = itertools.count()
+        # Entries are (priority, tie breaker, sequence, [mutations, violations])
+        corpus: List[Tuple[float, int, Sequence, List[int]]] = []
+
+        def record(sequence: Sequence, priority: float) -> bool:
+            result.evaluations += 1
+            outcome = self._fails(sequence)
+            if outcome:
+                key = tuple(sequence)
+                if key not in found:
+                    found.add(key)
+                    result.counter_examples.append(sequence)
+                    return True
+            elif outcome is not None:
+                if self.distance is not None:
+                    priority = self.distance(sequence)
+                heapq.heappush(corpus, (priority, next(tie_breaker), sequence, [0, 0]))
+                if len(corpus) > 2 * self.max_corpus:
+                    corpus[:] = heapq.nsmallest(self.max_corpus, corpus)
+            return False
+
+        def exhausted() -> bool:
+            return (
+                len(result.counter_examples) >= max_examples
+                or time.perf_counter() >= deadline
+                or (max_evaluations is not None and result.evaluations >= max_evaluations)
+            )
+
+        for sequence in self._initial_corpus():
+            if exhausted():
+                break
+            record(sequence, _near_miss_priority(0, 0))
+
+        while not exhausted():
+            entry = heapq.heappop(corpus) if corpus else None
+            if entry is not None:
+                priority, _, parent, outcomes = entry
+            else:
+                priority = 0.0
+                outcomes = [0, 0]
+                parent = self._rng.choices(
+                    self.domain, k=self._rng.randint(1, self.max_length)
+                )
+            child = parent
+            for _ in range(self._rng.randint(1, 3)):
+                child = self._mutate(child)
+            # A passing child starts from its parent's estimate after this
+            # mutation, so the lineage of a near miss stays ahead
+            violated = record(
+                child,
+                _near_miss_priority(outcomes[0] + 1, outcomes[1])
+                if self.distance is None
+                else priority + 1.0,
+            )
+
+            if entry is not None:
+                outcomes[0] += 1
+                outcomes[1] += violated
+                if self.distance is None:
+                    priority = _near_miss_priority(*outcomes)
+                else:
+                    # Re-queue the parent one step less attractive so others
+                    # get explored
+                    priority += 1.0
+                heapq.heappush(corpus, (priority, next(tie_breaker), parent, outcomes))
+
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def _run_worker(
+    rule: FormalRule,
+    domain: List[AbstractObject],
+    options: Dict[str, Any],
+    run_options: Dict[str, Any],
+) -> SearchResult:
+    """Run an independent search in a worker process."""
+    return CounterExampleSearch(rule, domain, **options).run(**run_options)
+
+
+def search_counter_examples(
+    rule: FormalRule,
+    domain: List[AbstractObject],
+    max_length: int = 10,
+    max_examples: int = 5,
+    time_budget: float = 1.0,
+    max_evaluations: Optional[int] = None,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    **kwargs: Any,
+) -> SearchResult:
+    """
+    Search for sequences that don't satisfy the rule using mutation.
+
+    With ``workers > 1`` independent searches run in separate processes, so the
+    rule, domain, and any distance function must be picklable.
+
+    Args:
+        rule: The rule to find counter-examples for
+        domain: Domain of objects to build sequences from
+        max_length: Maximum length of generated sequences
+        max_examples: Number of distinct counter-examples to find
+        time_budget: Maximum wall-clock seconds to search for
+        max_evaluations: Optional cap on rule evaluations per worker
+        workers: Number of worker processes
+        seed: Optional seed for reproducible searches
+        **kwargs: Additional CounterExampleSearch options
+
+    Returns:
+        SearchResult combining the counter-examples found by all workers
+    """
+    run_options = {
+        "max_examples": max_examples,
+        "time_budget": time_budget,
+        "max_evaluations": max_evaluations,
+    }
+    if workers <= 1:
+        search = CounterExampleSearch(
+            rule, domain, max_length=max_length, seed=seed, **kwargs
+        )
+        return search.run(**run_options)
+
+    start = time.perf_counter()
+    base_seed = seed if seed is not None else random.randrange(2**32)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _run_worker,
+                rule,
+                domain,
+                {"max_length": max_length, "seed": base_seed + i, **kwargs},
+                run_options,
+            )
+            for i in range(workers)
+        ]
+        partials = [future.result() for future in futures]
+
+    combined = SearchResult()
+    found = set()
+    for partial in partials:
+        combined.evaluations += partial.evaluations
+        for sequence in partial.counter_examples:
+            key = tuple(sequence)
+            if key not in found and len(combined.counter_examples) < max_examples:
+                found.add(key)
+                combined.counter_examples.append(sequence)
+    combined.elapsed = time.perf_counter() - start
+    return combined
@@ -2,10 +2,24 @@
 Pattern-based sequence generation.
 
 This module provides functionality for pattern-based sequence generation
-and pattern matching.
+and pattern matching, including a compiled PatternSet that checks many
+patterns against a sequence in a single pass.
 """
 
-from typing import Any, Dict, List
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _get_property_value(obj: Any, property_name: str) -> Any:
+    """Get property value from either AbstractObject or dict."""
+    if hasattr(obj, "properties"):
+        return obj.properties.get(property_name)
+    elif hasattr(obj, "__getitem__"):
+        try:
+            return obj[property_name]
+        except (KeyError, TypeError):
+            return None
+    return getattr(obj, property_name, None)
 
 
 class PropertyPattern:
@@ -31,14 +45,7 @@ class PropertyPattern:
 
     def _get_property_value(self, obj: Any) -> Any:
         """Get property value from either AbstractObject or dict."""
-        if hasattr(obj, "properties"):
-            return obj.properties.get(self.property_name)
-        elif hasattr(obj, "__getitem__"):
-            try:
-                return obj[self.property_name]
-            except (KeyError, TypeError):
-                return None
-        return getattr(obj, self.property_name, None)
+        return _get_property_value(obj, self.property_name)
 
     def matches(self, sequence: List[Dict[str, Any]], start_idx: int = 0) -> bool:
         """Check if the sequence matches the pattern starting from start_idx."""
@@ -110,3 +117,216 @@ class PropertyPattern:
 
         # Otherwise, return the next value in the pattern
         return self.values[matched_length]
+
+
+class _AhoCorasick:
+    """Aho-Corasick automaton over property values for a group of patterns."""
+
+    def __init__(self, patterns: List[Tuple[int, Tuple[Any, ...]]]):
+        """
+        Build the automaton.
+
+        Args:
+            patterns: (pattern id, values) pairs; values must be hashable
+        """
+        self.goto: List[Dict[Any, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Each output is a (pattern id, pattern length) pair ending at the node
+        self.output: List[List[Tuple[int, int]]] = [[]]
+        self.max_length = 0
+
+        for pattern_id, values in patterns:
+            node = 0
+            for value in values:
+                nxt = self.goto[node].get(value)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][value] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = nxt
+            self.output[node].append((pattern_id, len(values)))
+            self.max_length = max(self.max_length, len(values))
+
+        # Breadth-first construction of failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for value, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and value not in self.goto[state]:
+                    state = self.fail[state]
+                target = self.goto[state].get(value, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def _step(self, node: int, value: Any) -> int:
+        """Follow one transition, falling back along failure links."""
+        try:
+            while node and value not in self.goto[node]:
+                node = self.fail[node]
+            return self.goto[node].get(value, 0)
+        except TypeError:
+            # Unhashable values can never equal a (hashable) pattern value
+            return 0
+
+    def scan(self, column: List[Any], start: int = 0, stop: Optional[int] = None):
+        """
+        Scan a property column.
+
+        Yields:
+            (pattern id, start position) for every occurrence in column[start:stop]
+        """
+        node = 0
+        for i in range(start, len(column) if stop is None else stop):
+            node = self._step(node, column[i])
+            for pattern_id, length in self.output[node]:
+                yield pattern_id, i - length + 1
+
+
+class PatternSet:
+    """
+    A compiled collection of PropertyPatterns.
+
+    Patterns are grouped by property so each property column is extracted once
+    per sequence. All non-cyclic patterns on a property are matched in a single
+    pass with an Aho-Corasick automaton, and cyclic patterns are checked with
+    modular index lookups into the same column.
+    """
+
+    def __init__(self, patterns: Iterable[PropertyPattern] = ()):
+        """
+        Initialize with an optional collection of patterns.
+
+        Args:
+            patterns: PropertyPattern instances to compile
+        """
+        self.patterns: List[PropertyPattern] = list(patterns)
+        self._compiled = False
+
+    def add(self, pattern: PropertyPattern) -> "PatternSet":
+        """
+        Add a pattern to the set.
+
+        Args:
+            pattern: A PropertyPattern instance
+
+        Returns:
+            Self for method chaining
+        """
+        self.patterns.append(pattern)
+        self._compiled = False
+        return self
+
+    def __len__(self) -> int:
+        """Return the number of patterns in the set."""
+        return len(self.patterns)
+
+    def _compile(self) -> None:
+        """Group patterns by property and build one automaton per property."""
+        groups: Dict[str, Dict[str, list]] = {}
+        # Patterns the automaton can't represent are matched individually
+        self._fallback: List[int] = []
+        for pattern_id, pattern in enumerate(self.patterns):
+            if pattern.is_cyclic and not pattern.values:
+                self._fallback.append(pattern_id)
+                continue
+            group = groups.setdefault(
+                pattern.property_name, {"acyclic": [], "cyclic": []}
+            )
+            if pattern.is_cyclic:
+                group["cyclic"].append((pattern_id, list(pattern.values)))
+                continue
+            values = tuple(pattern.values)
+            try:
+                hash(values)
+            except TypeError:
+                self._fallback.append(pattern_id)
+                continue
+            group["acyclic"].append((pattern_id, values))
+
+        self._groups = {
+            name: (
+                _AhoCorasick([(i, v) for i, v in group["acyclic"] if v]),
+                group["acyclic"],
+                group["cyclic"],
+            )
+            for name, group in groups.items()
+        }
+        self._compiled = True
+
+    def match_each(self, sequence: List[Any], start_idx: int = 0) -> List[bool]:
+        """
+        Check every pattern against the sequence.
+
+        Equivalent to ``[p.matches(sequence, start_idx) for p in patterns]``.
+
+        Args:
+            sequence: The sequence to check
+            start_idx: Position the patterns are anchored at
+
+        Returns:
+            One boolean per pattern, in insertion order
+        """
+        if not sequence:
+            return [True] * len(self.patterns)
+        if start_idx < 0:
+            return [p.matches(sequence, start_idx) for p in self.patterns]
+        if not self._compiled:
+            self._compile()
+
+        results = [False] * len(self.patterns)
+        length = len(sequence)
+        for name, (automaton, acyclic, cyclic) in self._groups.items():
+            column = [_get_property_value(obj, name) for obj in sequence]
+
+            # Non-cyclic patterns must occur exactly at start_idx
+            for pattern_id, values in acyclic:
+                if not values and start_idx <= length:
+                    results[pattern_id] = True
+            if automaton.max_length:
+                stop = min(length, start_idx + automaton.max_length)
+                for pattern_id, position in automaton.scan(column, start_idx, stop):
+                    if position == start_idx:
+                        results[pattern_id] = True
+
+            # Cyclic patterns repeat from start_idx
+            for pattern_id, values in cyclic:
+                period = len(values)
+                results[pattern_id] = all(
+                    column[i] == values[(i - start_idx) % period]
+                    for i in range(start_idx, length)
+                )
+
+        for pattern_id in self._fallback:
+            results[pattern_id] = self.patterns[pattern_id].matches(sequence, start_idx)
+        return results
+
+    def matches(self, sequence: List[Any], start_idx: int = 0) -> bool:
+        """Check if the sequence matches every pattern starting from start_idx."""
+        return all(self.match_each(sequence, start_idx))
+
+    def find_occurrences(self, sequence: List[Any]) -> Dict[int, List[int]]:
+        """
+        Find every position where each non-cyclic pattern occurs.
+
+        Args:
+            sequence: The sequence to search
+
+        Returns:
+            Mapping of pattern index to the sorted start positions of its occurrences
+        """
+        if not self._compiled:
+            self._compile()
+        occurrences: Dict[int, List[int]] = {}
+        for name, (automaton, _, _) in self._groups.items():
+            if not automaton.max_length:
+                continue
+            column = [_get_property_value(obj, name) for obj in sequence]
+            for pattern_id, position in automaton.scan(column):
+                occurrences.setdefault(pattern_id, []).append(position)
+        for positions in occurrences.values():
+            positions.sort()
+        return occurrences
@@ -0,0 +1,340 @@
+"""
+Streaming sequence sinks.
+
+This module provides sinks that consume sequences from any generator and write
+them to disk in batches, so arbitrarily many sequences can be produced with
+bounded memory. Sequences are encoded as indices into the domain on the calling
+thread; serialization and compression happen on a background writer thread fed
+through a bounded queue.
+
+Supported formats:
+
+- ``jsonl``: one JSON array of object properties per line
+- ``csv``: one row of domain indices per line
+- ``frames``: compressed SequenceFrame ``.npz`` files, readable with read_frames
+"""
+
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from ..core import AbstractObject, Sequence
+from .checkpoint import domain_index
+
+FORMATS = ("jsonl", "csv", "frames")
+
+# Marker telling the writer thread to finish
+_DONE = object()
+
+
+class SequenceSink:
+    """Writes sequences to disk in batches on a background thread."""
+
+    def __init__(
+        self,
+        path: str,
+        domain: List[Union[AbstractObject, Dict[str, Any]]],
+        format: str = "jsonl",
+        batch_size: int = 10_000,
+        queue_size: int = 4,
+        compress: bool = True,
+    ):
+        """
+        Open a sink.
+
+        Args:
+            path: Output file for ``jsonl`` and ``csv``, or output directory for
+                ``frames``
+            domain: The objects sequences are drawn from; written sequences must
+                consist of these objects
+            format: One of ``jsonl``, ``csv`` or ``frames``
+            batch_size: Number of sequences handed to the writer at a time
+            queue_size: Maximum number of batches waiting to be written; the
+                producer blocks when the writer falls behind
+            compress: Whether to gzip ``jsonl`` and ``csv`` output
+
+        Raises:
+            ValueError: If the format is unknown or the batch size isn't positive
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if format == "frames":
+            from .bulk import _require_numpy
+
+            _require_numpy()
+
+        self.path = path
+        self.domain = [
+            obj if isinstance(obj, AbstractObject) else AbstractObject(**obj)
+            for obj in domain
+        ]
+        self.format = format
+        self.batch_size = batch_size
+        self.compress = compress
+        self.count = 0
+        self.files: List[str] = []
+
+        self._index = domain_index(self.domain)
+        self._equal_index: Optional[Dict[AbstractObject, int]] = None
+        self._batch: List[List[int]] = []
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "SequenceSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _lookup(self, obj: AbstractObject) -> int:
+        """Get the domain index of an object, by identity or else by equality."""
+        index = self._index.get(id(obj))
+        if index is not None:
+            return index
+        if self._equal_index is None:
+            self._equal_index = {}
+            for i, item in enumerate(self.domain):
+                self._equal_index.setdefault(item, i)
+        try:
+            return self._equal_index[obj]
+        except (KeyError, TypeError):
+            raise ValueError(f"{obj!r} is not part of the sink's domain") from None
+
+    def _check(self) -> None:
+        """Re-raise an error from the writer thread in the producer."""
+        if self._error is not None:
+            raise RuntimeError("Sequence sink writer failed") from self._error
+        if self._closed:
+            raise ValueError("Sink is closed")
+
+    def write(self, sequence: Sequence) -> None:
+        """
+        Add a sequence to the sink.
+
+        Args:
+            sequence: Sequence of domain objects
+        """
+        if self._closed:
+            raise ValueError("Sink is closed")
+        self._batch.append([self._lookup(obj) for obj in sequence])
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def write_many(self, sequences: Iterable[Sequence]) -> int:
+        """
+        Consume sequences from any iterable or generator.
+
+        Args:
+            sequences: Sequences of domain objects
+
+        Returns:
+            Number of sequences consumed
+        """
+        written = 0
+        for sequence in sequences:
+            self.write(sequence)
+            written += 1
+        return written
+
+    def write_frame(self, frame: Any) -> None:
+        """
+        Add a SequenceFrame without materializing its sequences.
+
+        The frame must index into the same domain as the sink. With the
+        ``frames`` format its arrays are saved as they are.
+
+        Args:
+            frame: SequenceFrame to write
+        """
+        self._flush()
+        self._check()
+        self._queue.put(frame)
+
+    def _flush(self) -> None:
+        """Hand the pending batch to the writer thread."""
+        self._check()
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def close(self) -> None:
+        """Write pending sequences, wait for the writer and close the output."""
+        if self._closed:
+            return
+        try:
+            self._flush()
+        finally:
+            self._closed = True
+            self._queue.put(_DONE)
+            self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Sequence sink writer failed") from self._error
+
+    # Writer thread
+
+    def _run(self) -> None:
+        """Serialize batches until the sink is closed."""
+        writer = None
+        try:
+            writer = (
+                _FrameWriter(self) if self.format == "frames" else _TextWriter(self)
+            )
+            while True:
+                batch = self._queue.get()
+                if batch is _DONE:
+                    break
+                if isinstance(batch, list):
+                    writer.write(batch)
+                else:
+                    writer.write_frame(batch)
+                self.count += len(batch)
+        except BaseException as e:  # Surface any failure in the producer
+            self._error = e
+            # Keep draining so a blocked producer can make progress
+            while self._queue.get() is not _DONE:
+                pass
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+class _TextWriter:
+    """Writes JSONL or CSV rows to a single, optionally gzipped, file."""
+
+    def __init__(self, sink: SequenceSink):
+        directory = os.path.dirname(sink.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if sink.compress:
+            self._file: Any = gzip.open(sink.path, "wt", encoding="utf-8", newline="")
+        else:
+            self._file = open(sink.path, "w", encoding="utf-8", newline="")
+        sink.files.append(sink.path)
+        self._format = sink.format
+        # Serialize each domain object once
+        self._objects = [
+            json.dumps(obj.properties, separators=(",", ":"), default=str)
+            for obj in sink.domain
+        ]
+
+    def write(self, rows: List[List[int]]) -> None:
+        if self._format == "jsonl":
+            objects = self._objects
+            self._file.write(
+                "".join("[" + ",".join(objects[i] for i in row) + "]\n" for row in rows)
+            )
+        else:
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(rows)
+            self._file.write(buffer.getvalue())
+
+    def write_frame(self, frame: Any) -> None:
+        # Text needs Python integers, so the frame is converted row by row
+        self.write(
+            [
+                row[:length]
+                for row, length in zip(
+                    frame.indices.tolist(), frame.lengths.tolist(), strict=True
+                )
+            ]
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _FrameWriter:
+    """Writes each batch as a SequenceFrame ``.npz`` file."""
+
+    def __init__(self, sink: SequenceSink):
+        import numpy as np
+
+        from .bulk import SequenceFrame, _index_dtype
+
+        os.makedirs(sink.path, exist_ok=True)
+        self._np = np
+        self._frame = SequenceFrame
+        self._dtype = _index_dtype(len(sink.domain))
+        self._sink = sink
+
+    def write(self, rows: List[List[int]]) -> None:
+        np = self._np
+        lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+        width = int(lengths.max()) if rows else 0
+        # Scatter the concatenated rows into the padded matrix in one step
+        flat = np.fromiter(
+            itertools.chain.from_iterable(rows),
+            dtype=self._dtype,
+            count=int(lengths.sum()),
+        )
+        indices = np.zeros((len(rows), width), dtype=self._dtype)
+        indices[np.arange(width) < lengths[:, None]] = flat
+        self._save(indices, lengths)
+
+    def write_frame(self, frame: Any) -> None:
+        self._save(frame.indices.astype(self._dtype, copy=False), frame.lengths)
+
+    def _save(self, indices: Any, lengths: Any) -> None:
+        path = os.path.join(self._sink.path, f"frame-{len(self._sink.files):06d}.npz")
+        self._frame(indices=indices, lengths=lengths, domain=self._sink.domain).save(
+            path
+        )
+        self._sink.files.append(path)
+
+    def close(self) -> None:
+        pass
+
+
+def write_sequences(
+    sequences: Iterable[Sequence],
+    path: str,
+    domain: List[Union[AbstractObject, Dict[str, Any]]],
+    format: str = "jsonl",
+    **kwargs: Any,
+) -> int:
+    """
+    Stream sequences from any generator to disk.
+
+    Args:
+        sequences: Sequences of domain objects, e.g. a generator
+        path: Output file, or output directory for the ``frames`` format
+        domain: The objects sequences are drawn from
+        format: One of ``jsonl``, ``csv`` or ``frames``
+        **kwargs: Additional SequenceSink options
+
+    Returns:
+        Number of sequences written
+    """
+    with SequenceSink(path, domain, format=format, **kwargs) as sink:
+        written = sink.write_many(sequences)
+    return written
+
+
+def read_sequences(path: str, domain: List[AbstractObject]) -> Iterator[Sequence]:
+    """
+    Read sequences written in the ``csv`` format back as domain objects.
+
+    Args:
+        path: CSV file written by a SequenceSink, gzipped or not
+        domain: The domain the stored indices refer to
+
+    Yields:
+        Sequences of domain objects
+    """
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    opener: Any = gzip.open if compressed else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            yield [domain[int(i)] for i in row]
@@ -0,0 +1,484 @@
+"""
+Symmetry groups over sequence domains.
+
+This module lets exhaustive enumeration skip sequences that are equivalent
+under a known symmetry, such as permuting card suits, transposing pitches, or
+taking the reverse complement of a DNA strand. A symmetry maps every domain
+object to another domain object and may additionally reverse the sequence.
+
+Symmetries generate a finite group. A sequence is canonical (its orbit's
+lexicographic leader) when no group element maps it to a sequence with smaller
+domain indices. Element-wise symmetries preserve prefixes, so a prefix that
+isn't canonical can be pruned along with all its extensions; reversing
+symmetries can only be checked on complete sequences.
+
+Fully interchangeable property values, declared with
+:func:`property_permutations`, generate a symmetric group with n! elements.
+Those are never enumerated: the leader under every permutation of the values
+is built directly, by mapping each value to the smallest unused one at its
+first occurrence. The remaining symmetries are enumerated, up to a limit.
+"""
+
+import itertools
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..core import AbstractObject, Sequence
+
+# A resolved group element: domain index permutation and whether it reverses
+Element = Tuple[Tuple[int, ...], bool]
+
+# Largest number of group elements enumerated
+MAX_GROUP_ELEMENTS = 100_000
+
+
+class Symmetry:
+    """A transformation of sequences mapping domain objects to domain objects."""
+
+    def __init__(
+        self,
+        transform: Optional[Callable[[AbstractObject], AbstractObject]] = None,
+        reverse: bool = False,
+        name: str = "",
+    ):
+        """
+        Initialize a symmetry.
+
+        Args:
+            transform: Maps each domain object to its image, which must be equal
+                to an object of the domain. Defaults to the identity
+            reverse: Whether the symmetry also reverses the sequence
+            name: Optional name for display
+        """
+        self.transform = transform
+        self.reverse = reverse
+        self.name = name or (
+            "reversal" if reverse and transform is None else "symmetry"
+        )
+        # Set by property_permutations: (property, values) whose every
+        # permutation this symmetry helps generate
+        self.permutes: Optional[Tuple[str, Tuple[Any, ...]]] = None
+
+    def __repr__(self) -> str:
+        return f"Symmetry({self.name!r})"
+
+    @classmethod
+    def reversal(cls) -> "Symmetry":
+        """Symmetry reversing the order of the sequence."""
+        return cls(reverse=True, name="reversal")
+
+    @classmethod
+    def property_map(
+        cls, property_name: str, mapping: Dict[Any, Any], reverse: bool = False
+    ) -> "Symmetry":
+        """
+        Symmetry replacing property values according to a mapping.
+
+        Args:
+            property_name: Property whose values are replaced
+            mapping: Value substitutions; unmapped values are kept
+            reverse: Whether the symmetry also reverses the sequence (for
+                example a DNA reverse complement)
+
+        Returns:
+            Symmetry instance
+        """
+
+        def transform(obj: AbstractObject) -> AbstractObject:
+            value = obj.properties.get(property_name)
+            if value not in mapping:
+                return obj
+            return AbstractObject(**{**obj.properties, property_name: mapping[value]})
+
+        return cls(transform, reverse=reverse, name=f"{property_name} map")
+
+
+def property_permutations(property_name: str, values: List[Any]) -> List[Symmetry]:
+    """
+    Symmetries generating every permutation of a property's values.
+
+    A transposition and a full cycle generate the whole symmetric group, so
+    only two symmetries are needed however many values there are. Groups
+    containing both are canonicalized without enumerating their elements.
+
+    Args:
+        property_name: Property whose values are interchangeable
+        values: The interchangeable values
+
+    Returns:
+        Generating symmetries for the permutation group
+    """
+    if len(values) < 2:
+        return []
+    swap = {values[0]: values[1], values[1]: values[0]}
+    cycle = {value: values[(i + 1) % len(values)] for i, value in enumerate(values)}
+    symmetries = [Symmetry.property_map(property_name, swap)]
+    if len(values) > 2:
+        symmetries.append(Symmetry.property_map(property_name, cycle))
+    for symmetry in symmetries:
+        symmetry.permutes = (property_name, tuple(values))
+    return symmetries
+
+
+class _ValuePermutations:
+    """Every permutation of a property's values, as substitutions of indices."""
+
+    def __init__(self, slots: List[int], substitutes: List[List[int]]):
+        """
+        Args:
+            slots: Position of each domain object's value among the values, or
+                -1 if it has none of them
+            substitutes: For each domain object with one of the values, the
+                index of the object with each value substituted
+        """
+        self.slots = slots
+        self.substitutes = substitutes
+        self.size = max((len(row) for row in substitutes), default=0)
+
+
+class SymmetryGroup:
+    """The finite group generated by a set of symmetries over a domain."""
+
+    def __init__(
+        self,
+        domain: List[AbstractObject],
+        symmetries: List[Symmetry],
+        max_elements: int = MAX_GROUP_ELEMENTS,
+    ):
+        """
+        Resolve the symmetries against the domain and close them under composition.
+
+        Args:
+            domain: The domain sequences are drawn from
+            symmetries: Generating symmetries
+            max_elements: Largest number of group elements to enumerate; value
+                permutations from :func:`property_permutations` don't count
+
+        Raises:
+            ValueError: If a symmetry maps an object outside the domain or isn't
+                a bijection on the domain, or if the group is too large to
+                enumerate
+        """
+        self.domain = list(domain)
+        self.symmetries = list(symmetries)
+        self._index = {id(obj): i for i, obj in enumerate(self.domain)}
+        self._by_value: Dict[Any, int] = {}
+        for i, obj in enumerate(self.domain):
+            try:
+                self._by_value.setdefault(obj, i)
+            except TypeError:
+                pass
+
+        resolved = [(symmetry, self._resolve(symmetry)) for symmetry in self.symmetries]
+        declared: Dict[Tuple[str, Tuple[Any, ...]], List[Element]] = {}
+        for symmetry, element in resolved:
+            if symmetry.permutes is not None and not symmetry.reverse:
+                declared.setdefault(symmetry.permutes, []).append(element)
+        # Only complete sets of generators from property_permutations generate
+        # every permutation of the values
+        complete = [
+            key
+            for key, elements in declared.items()
+            if len({perm for perm, _ in elements}) == (2 if len(key[1]) > 2 else 1)
+        ]
+        generators = [
+            element
+            for symmetry, element in resolved
+            if symmetry.permutes not in complete or symmetry.reverse
+        ]
+        permutations = [(key, perm) for key in complete for perm, _ in declared[key]]
+        # The leader is built per value permutation only if they commute with
+        # each other and the other symmetries, so that every element factors
+        # into permutations of each property's values and one enumerated element
+        if all(
+            _commute(perm, other) for _, perm in permutations for other, _ in generators
+        ) and all(
+            _commute(perm, other)
+            for key, perm in permutations
+            for other_key, other in permutations
+            if key != other_key
+        ):
+            self._values = [self._value_permutations(*key) for key in complete]
+        else:
+            self._values = []
+            generators.extend((perm, False) for _, perm in permutations)
+
+        identity: Element = (tuple(range(len(self.domain))), False)
+        elements = {identity}
+        frontier = [identity]
+        while frontier:
+            found = []
+            for element in frontier:
+                for generator in generators:
+                    product = _compose(generator, element)
+                    if product not in elements:
+                        elements.add(product)
+                        found.append(product)
+                        if len(elements) > max_elements:
+                            raise ValueError(
+                                f"The symmetries generate more than {max_elements} "
+                                "elements; declare interchangeable values with "
+                                "property_permutations so that they are "
+                                "canonicalized without enumeration"
+                            )
+            frontier = found
+        elements.discard(identity)
+
+        # Deterministic order; element-wise symmetries can prune prefixes
+        self._elements = sorted(elements)
+        self._prefix_elements = [
+            perm for perm, reverse in self._elements if not reverse
+        ]
+        self._reversing_elements = [perm for perm, reverse in self._elements if reverse]
+
+    def _lookup(self, image: AbstractObject, symmetry: Symmetry, obj: Any) -> int:
+        """Index of the domain object equal to an image."""
+        index = self._position(image)
+        if index is None:
+            raise ValueError(f"{symmetry!r} maps {obj!r} outside the domain")
+        return index
+
+    def _position(self, obj: Any) -> Optional[int]:
+        """Domain index of an object, by identity or else by equality."""
+        index = self._index.get(id(obj))
+        if index is None:
+            try:
+                index = self._by_value.get(obj)
+            except TypeError:
+                index = None
+        return index
+
+    def _resolve(self, symmetry: Symmetry) -> Element:
+        """Turn a symmetry into a permutation of domain indices."""
+        permutation = []
+        for obj in self.domain:
+            image = obj if symmetry.transform is None else symmetry.transform(obj)
+            permutation.append(self._lookup(image, symmetry, obj))
+
+        if len(set(permutation)) != len(permutation):
+            raise ValueError(f"{symmetry!r} is not a bijection on the domain")
+        return tuple(permutation), symmetry.reverse
+
+    def _value_permutations(
+        self, property_name: str, values: Tuple[Any, ...]
+    ) -> _ValuePermutations:
+        """Resolve substitutions of a property's values against the domain."""
+        position = {value: i for i, value in enumerate(values)}
+        symmetry = Symmetry(name=f"{property_name} permutation")
+        slots = []
+        substitutes = []
+        for obj in self.domain:
+            slot = position.get(obj.properties.get(property_name), -1)
+            slots.append(slot)
+            substitutes.append(
+                []
+                if slot < 0
+                else [
+                    self._lookup(
+                        AbstractObject(**{**obj.properties, property_name: value}),
+                        symmetry,
+                        obj,
+                    )
+                    for value in values
+                ]
+            )
+        return _ValuePermutations(slots, substitutes)
+
+    def _substitute(self, index: int, mappings: List[Dict[int, int]]) -> int:
+        """Apply value mappings to a domain index."""
+        for values, mapping in zip(self._values, mappings, strict=True):
+            slot = values.slots[index]
+            if slot >= 0:
+                index = values.substitutes[index][mapping[slot]]
+        return index
+
+    def _leader(self, indices: List[int]) -> List[int]:
+        """
+        Smallest image of a sequence under the value permutations.
+
+        Each value is mapped to the unused value giving the smallest object at
+        its first occurrence. Earlier positions are already fixed by then, so
+        this choice decides the lexicographic order.
+        """
+        if not self._values:
+            return indices
+        mappings: List[Dict[int, int]] = [{} for _ in self._values]
+        unused = [set(range(values.size)) for values in self._values]
+        leader = []
+        for index in indices:
+            pending = [
+                k
+                for k, values in enumerate(self._values)
+                if values.slots[index] >= 0 and values.slots[index] not in mappings[k]
+            ]
+            if pending:
+                best = None
+                for choice in itertools.product(*(sorted(unused[k]) for k in pending)):
+                    for k, target in zip(pending, choice, strict=True):
+                        mappings[k][self._values[k].slots[index]] = target
+                    image = self._substitute(index, mappings)
+                    if best is None or image < best[0]:
+                        best = (image, choice)
+                for k, target in zip(pending, best[1], strict=True):
+                    mappings[k][self._values[k].slots[index]] = target
+                    unused[k].discard(target)
+            leader.append(self._substitute(index, mappings))
+        return leader
+
+    def _in_values(self, permutation: Tuple[int, ...]) -> bool:
+        """Whether an element-wise symmetry only permutes declared values."""
+        mappings: List[Dict[int, int]] = [{} for _ in self._values]
+        for i, image in enumerate(permutation):
+            for k, values in enumerate(self._values):
+                slot, target = values.slots[i], values.slots[image]
+                if (slot < 0) != (target < 0):
+                    return False
+                if slot >= 0 and mappings[k].setdefault(slot, target) != target:
+                    return False
+        return all(
+            self._substitute(i, mappings) == image
+            for i, image in enumerate(permutation)
+        )
+
+    def __len__(self) -> int:
+        """Order of the group, including the identity."""
+        permutations = math.prod(math.factorial(v.size) for v in self._values)
+        # Elements that only permute values are counted once
+        shared = 1 + sum(1 for perm in self._prefix_elements if self._in_values(perm))
+        return permutations * (len(self._elements) + 1) // shared
+
+    def indices(self, sequence: Sequence) -> List[int]:
+        """
+        Encode a sequence of domain objects as domain indices.
+
+        Objects are looked up by identity, or else by equality.
+
+        Raises:
+            ValueError: If an object isn't part of the domain
+        """
+        indices = []
+        for obj in sequence:
+            index = self._position(obj)
+            if index is None:
+                raise ValueError(f"{obj!r} is not part of the group's domain")
+            indices.append(index)
+        return indices
+
+    def is_canonical_prefix(self, indices: List[int]) -> bool:
+        """
+        Whether no element-wise symmetry maps the sequence to a smaller one.
+
+        A prefix failing this check has no canonical extension.
+        """
+        if self._values:
+            if self._leader(indices) != list(indices):
+                return False
+            return not any(
+                self._leader([permutation[i] for i in indices]) < list(indices)
+                for permutation in self._prefix_elements
+            )
+        for permutation in self._prefix_elements:
+            for i in indices:
+                image = permutation[i]
+                if image != i:
+                    if image < i:
+                        return False
+                    break
+        return True
+
+    def is_canonical(self, indices: List[int]) -> bool:
+        """Whether the sequence is the lexicographic leader of its orbit."""
+        if not self.is_canonical_prefix(indices):
+            return False
+        if self._values:
+            return not any(
+                self._leader([permutation[i] for i in reversed(indices)])
+                < list(indices)
+                for permutation in self._reversing_elements
+            )
+        for permutation in self._reversing_elements:
+            for i, j in zip(indices, reversed(indices), strict=True):
+                image = permutation[j]
+                if image != i:
+                    if image < i:
+                        return False
+                    break
+        return True
+
+    def orbit(self, sequence: Sequence) -> Iterator[Sequence]:
+        """
+        Lazily yield the distinct sequences equivalent to a sequence.
+
+        The sequence itself is yielded first.
+
+        Args:
+            sequence: Sequence of domain objects
+
+        Yields:
+            Each member of the orbit once
+        """
+        indices = self.indices(sequence)
+        seen = {tuple(indices)}
+        yield sequence
+        identity: Element = (tuple(range(len(self.domain))), False)
+        for permutation, reverse in [identity, *self._elements]:
+            mapped = [permutation[i] for i in indices]
+            if reverse:
+                mapped.reverse()
+            for image in self._value_images(mapped):
+                key = tuple(image)
+                if key not in seen:
+                    seen.add(key)
+                    yield [self.domain[i] for i in image]
+
+    def _value_images(self, indices: List[int]) -> Iterator[List[int]]:
+        """Lazily yield the images of a sequence under the value permutations."""
+        present = [
+            sorted({values.slots[i] for i in indices if values.slots[i] >= 0})
+            for values in self._values
+        ]
+
+        def assign(k: int, mappings: List[Dict[int, int]]) -> Iterator[List[int]]:
+            if k == len(self._values):
+                yield [self._substitute(i, mappings) for i in indices]
+                return
+            targets = itertools.permutations(
+                range(self._values[k].size), len(present[k])
+            )
+            for target in targets:
+                yield from assign(
+                    k + 1, [*mappings, dict(zip(present[k], target, strict=True))]
+                )
+
+        return assign(0, [])
+
+    def orbit_size(self, sequence: Sequence) -> int:
+        """Number of distinct sequences equivalent to a sequence."""
+        return sum(1 for _ in self.orbit(sequence))
+
+
+def _commute(first: Tuple[int, ...], second: Tuple[int, ...]) -> bool:
+    """Whether two permutations of domain indices commute."""
+    return all(first[second[i]] == second[first[i]] for i in range(len(first)))
+
+
+def _compose(first: Element, second: Element) -> Element:
+    """Apply ``second`` then ``first``."""
+    permutation = tuple(first[0][i] for i in second[0])
+    return permutation, first[1] != second[1]
+
+
+def expand_orbits(
+    group: SymmetryGroup, sequences: Iterator[Sequence]
+) -> Iterator[Sequence]:
+    """
+    Lazily expand canonical representatives into their full orbits.
+
+    Args:
+        group: Symmetry group the representatives were generated under
+        sequences: Canonical sequences
+
+    Yields:
+        Every member of every orbit
+    """
+    return itertools.chain.from_iterable(group.orbit(seq) for seq in sequences)
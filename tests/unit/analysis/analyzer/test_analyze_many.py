@@ -0,0 +1,106 @@
+"""
+Tests for batch analysis with RuleAnalyzer.analyze_many.
+
+These tests verify that rule catalogs are analyzed in-process and across worker
+processes, that results stream with their index and name, and that failing
+rules produce a failure report without stopping the batch.
+"""
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import BatchAnalysisResult, RuleAnalysis, RuleAnalyzer
+from seqrule.rulesets.general import create_property_match_rule
+
+
+def all_positive(seq):
+    return all(obj["value"] > 0 for obj in seq)
+
+
+def increasing(seq):
+    return all(a["value"] < b["value"] for a, b in zip(seq, seq[1:]))
+
+
+def broken(seq):
+    return undefined_name(seq)  # noqa: F821
+
+
+def build_match_rule(value):
+    """Build a factory rule from a picklable spec inside the worker."""
+    return create_property_match_rule("value", value)
+
+
+@pytest.fixture
+def analyzer():
+    sequences = [[AbstractObject(value=i) for i in range(1, 4)]]
+    return RuleAnalyzer().with_sequences(sequences)
+
+
+class TestAnalyzeMany:
+    """Test suite for RuleAnalyzer.analyze_many."""
+
+    def test_sequential_results(self, analyzer):
+        """A single worker analyzes every rule in order."""
+        rules = [DSLRule(all_positive, "positive"), DSLRule(increasing, "increasing")]
+
+        results = list(analyzer.analyze_many(rules, workers=1))
+
+        assert [r.index for r in results] == [0, 1]
+        assert [r.name for r in results] == ["positive", "increasing"]
+        assert all(r.ok and isinstance(r.analysis, RuleAnalysis) for r in results)
+
+    def test_failure_report(self, analyzer):
+        """A failing rule is reported without stopping the batch."""
+        rules = {"broken": DSLRule(broken), "positive": DSLRule(all_positive)}
+
+        results = {r.name: r for r in analyzer.analyze_many(rules, workers=1)}
+
+        assert results["positive"].ok
+        failure = results["broken"]
+        assert isinstance(failure, BatchAnalysisResult)
+        assert not failure.ok
+        assert "undefined_name" in failure.error
+        assert "Traceback" in failure.traceback
+
+    def test_parallel_matches_sequential(self, analyzer):
+        """Worker processes produce the same analyses as the parent."""
+        rules = [
+            DSLRule(all_positive, "positive"),
+            DSLRule(increasing, "increasing"),
+            DSLRule(broken, "broken"),
+        ]
+
+        sequential = {r.index: r for r in analyzer.analyze_many(rules, workers=1)}
+        parallel = {r.index: r for r in analyzer.analyze_many(rules, workers=2)}
+
+        assert sorted(parallel) == [0, 1, 2]
+        assert not parallel[2].ok
+        for index in (0, 1):
+            expected = sequential[index].analysis
+            actual = parallel[index].analysis
+            assert actual.complexity.time_complexity == (
+                expected.complexity.time_complexity
+            )
+            assert actual.ast_node_count == expected.ast_node_count
+            assert actual.coverage == expected.coverage
+
+    def test_unpicklable_rule_reported(self, analyzer):
+        """Closures can't reach a worker and are reported as failures."""
+        rules = [create_property_match_rule("value", 1), DSLRule(all_positive)]
+
+        results = sorted(analyzer.analyze_many(rules, workers=2), key=lambda r: r.index)
+
+        assert not results[0].ok
+        assert "pickle" in results[0].error.lower()
+        assert results[1].ok
+
+    def test_build_in_worker(self, analyzer):
+        """Factory rules are built from picklable specs in the workers."""
+        results = list(
+            analyzer.analyze_many(
+                {"one": 1, "two": 2}, workers=2, build=build_match_rule
+            )
+        )
+
+        assert sorted(r.name for r in results) == ["one", "two"]
+        assert all(r.ok for r in results)
@@ -0,0 +1,116 @@
+"""
+Tests for the single-pass AST analysis in RuleAnalyzer.
+
+These tests verify that a rule's source is parsed once per code object and that
+the fused traversal produces the same results as the individual analyses.
+"""
+
+import ast
+import inspect
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis.analyzer import AnalysisError, RuleAnalyzer
+
+
+def make_threshold_rule(threshold):
+    """Rule factory whose rules share a code object."""
+
+    def rule(seq):
+        return all(obj["value"] > threshold for obj in seq)
+
+    return DSLRule(rule, f"values above {threshold}")
+
+
+SOURCE = textwrap.dedent(
+    """
+    def rule(seq):
+        def fib(n):
+            return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+        def fact(n):
+            return 1 if n <= 1 else n * fact(n - 1)
+
+        total = []
+        for i in range(len(seq)):
+            for j in range(i):
+                if seq[i]["value"] > seq[j]["value"] and i > 0:
+                    total.append(fib(i) + fact(j))
+        while total:
+            total.pop()
+        return all(x > 0 for x in sorted([o["value"] for o in seq]) if x)
+    """
+)
+
+
+@pytest.fixture
+def sequences():
+    return [[AbstractObject(value=i) for i in range(1, 4)]]
+
+
+class TestFusedAnalysis:
+    """Test suite for the fused AST analysis."""
+
+    def test_source_parsed_once_per_code_object(self, sequences):
+        """Repeated analyses and rules from one factory share a parse."""
+        analyzer = RuleAnalyzer().with_sequences(sequences)
+        with patch("inspect.getsource", wraps=inspect.getsource) as src:
+            with patch("ast.parse", wraps=ast.parse) as parse:
+                analyzer.analyze(make_threshold_rule(0))
+                analyzer.analyze(make_threshold_rule(0))
+                analyzer.analyze(make_threshold_rule(5))
+
+        assert src.call_count == 1
+        assert parse.call_count == 1
+
+    def test_scan_matches_individual_analyses(self):
+        """The fused pass agrees with the standalone helpers."""
+        analyzer = RuleAnalyzer()
+        tree = ast.parse(SOURCE)
+
+        scan = analyzer._scan_ast(tree)
+
+        assert scan.node_count == sum(1 for _ in ast.walk(tree))
+        assert scan.cyclomatic_complexity == (
+            analyzer._calculate_cyclomatic_complexity(tree)
+        )
+        features = analyzer._complexity_analyzer._collect_ast_features(tree)
+        assert scan.complexity_features.keys() == features.keys()
+        for key in ("total_loops", "nested_loops", "max_loop_depth", "loop_depths"):
+            assert scan.complexity_features[key] == features[key]
+        assert scan.ast_patterns == {
+            "total_loops": 3,
+            "nested_loops": 1,
+            "has_factorial": True,
+            "has_exponential": True,
+            "recursion_depth": 2,
+            "max_loop_depth": 2,
+        }
+
+    def test_scan_collects_names(self):
+        """Names are collected in the same pass, including nested functions."""
+        analyzer = RuleAnalyzer()
+
+        scan = analyzer._scan_ast(ast.parse(SOURCE))
+        scan.names.check()
+        assert {"fib", "fact", "total"} <= scan.names.defined_names
+
+        scan = analyzer._scan_ast(ast.parse("def rule(seq):\n    return missing"))
+        with pytest.raises(AnalysisError, match="Undefined variable in rule: missing"):
+            scan.names.check()
+
+    def test_analysis_uses_fused_results(self, sequences):
+        """Node count and cyclomatic complexity come from the single pass."""
+        analyzer = RuleAnalyzer().with_sequences(sequences)
+        rule = make_threshold_rule(1)
+        tree = analyzer._parse_rule(rule.func)
+
+        analysis = analyzer.analyze(rule)
+
+        assert analysis.ast_node_count == sum(1 for _ in ast.walk(tree))
+        assert analysis.cyclomatic_complexity == (
+            analyzer._calculate_cyclomatic_complexity(tree)
+        )
@@ -0,0 +1,187 @@
+"""
+Tests for the persistent analysis cache.
+"""
+
+import sqlite3
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import (
+    AnalysisCache,
+    AnalyzerOptions,
+    RuleAnalyzer,
+    analysis_key,
+    corpus_fingerprint,
+    rule_fingerprint,
+)
+
+THRESHOLD = 2
+
+
+@pytest.fixture
+def sequences():
+    """Provide sample sequences."""
+    return [[AbstractObject(value=i) for i in range(3)], [AbstractObject(value=5)]]
+
+
+def make_min_rule(min_value):
+    """Factory producing rules that differ only in a closure value."""
+
+    def check_min(seq):
+        return all(obj["value"] >= min_value for obj in seq)
+
+    return DSLRule(check_min, f"values >= {min_value}")
+
+
+def check_threshold(seq):
+    """Rule depending on a module-level constant."""
+    return all(obj["value"] < THRESHOLD for obj in seq)
+
+
+def test_rule_fingerprint_tracks_closures_and_constants():
+    """Test that the fingerprint changes with closure values but not identity."""
+    assert rule_fingerprint(make_min_rule(1).func) == rule_fingerprint(
+        make_min_rule(1).func
+    )
+    assert rule_fingerprint(make_min_rule(1).func) != rule_fingerprint(
+        make_min_rule(2).func
+    )
+
+    global THRESHOLD
+    before = rule_fingerprint(check_threshold)
+    THRESHOLD = 3
+    try:
+        assert rule_fingerprint(check_threshold) != before
+    finally:
+        THRESHOLD = 2
+
+
+def test_rule_fingerprint_tells_apart_lambdas_on_one_line():
+    """Test that lambdas sharing a source line get different fingerprints."""
+    rules = [lambda seq: len(seq) > 1, lambda seq: len(seq) < 1]
+    assert rule_fingerprint(rules[0]) != rule_fingerprint(rules[1])
+    assert rule_fingerprint(rules[0]) == rule_fingerprint(rules[0])
+
+
+ALLOWED = {1, 2}
+
+
+def helper(value):
+    """Helper called by a rule."""
+    return value in ALLOWED
+
+
+def check_allowed(seq):
+    """Rule depending on a module-level set through a helper."""
+    return all(helper(obj["value"]) for obj in seq)
+
+
+def test_rule_fingerprint_tracks_globals_and_helpers():
+    """Test that referenced globals and helper functions are fingerprinted."""
+    global ALLOWED, helper
+    before = rule_fingerprint(check_allowed)
+    original_allowed, original_helper = ALLOWED, helper
+    try:
+        ALLOWED = {1, 2, 3}
+        assert rule_fingerprint(check_allowed) != before
+        ALLOWED = original_allowed
+        assert rule_fingerprint(check_allowed) == before
+
+        def helper(value):  # noqa: F811
+            return value not in ALLOWED
+
+        assert rule_fingerprint(check_allowed) != before
+    finally:
+        ALLOWED, helper = original_allowed, original_helper
+
+
+def test_unfingerprintable_rules_are_not_cached(sequences):
+    """Test that rules referencing opaque objects get no cache key."""
+    opaque = object()
+
+    def check_opaque(seq):
+        return opaque is not None
+
+    assert rule_fingerprint(check_opaque) is None
+    assert analysis_key(check_opaque, sequences, AnalyzerOptions()) is None
+
+    analyzer = RuleAnalyzer().with_sequences(sequences)
+    analyzer.with_options(cache_results=True)
+    analyzer.analyze(DSLRule(check_opaque))
+    assert not analyzer._cache
+
+
+def test_analysis_key_covers_corpus_and_options(sequences):
+    """Test that corpus and option changes produce different keys."""
+    func = make_min_rule(1).func
+    options = AnalyzerOptions()
+    key = analysis_key(func, sequences, options)
+
+    assert key == analysis_key(func, [list(seq) for seq in sequences], options)
+    assert key != analysis_key(func, sequences[:1], options)
+    assert corpus_fingerprint(sequences) != corpus_fingerprint(sequences[::-1])
+    assert key != analysis_key(func, sequences, AnalyzerOptions(min_coverage=0.5))
+    # Cache settings themselves don't affect the key
+    assert key == analysis_key(func, sequences, AnalyzerOptions(cache_path="x"))
+
+
+def test_analyzer_reads_persistent_cache(sequences, tmp_path, monkeypatch):
+    """Test that a fresh analyzer reuses results stored by an earlier one."""
+    path = str(tmp_path / "cache.sqlite")
+    rule = make_min_rule(1)
+
+    first = RuleAnalyzer().with_sequences(sequences)
+    first.with_options(cache_results=True, cache_path=path)
+    analysis = first.analyze(rule)
+    assert len(AnalysisCache(path)) == 1
+
+    second = RuleAnalyzer().with_sequences(sequences)
+    second.with_options(cache_results=True, cache_path=path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("analysis should have been served from the cache")
+
+    monkeypatch.setattr(second._performance_profiler, "profile_rule", fail)
+    cached = second.analyze(rule)
+
+    assert cached.complexity.time_complexity == analysis.complexity.time_complexity
+    assert cached.coverage == analysis.coverage
+    assert set(cached.properties) == set(analysis.properties)
+
+    # A changed rule misses the cache and is analyzed again
+    with pytest.raises(Exception, match="served from the cache"):
+        second.analyze(make_min_rule(2))
+
+
+def test_size_based_eviction(tmp_path):
+    """Test that least recently used entries are evicted over the size limit."""
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite"), max_bytes=2500)
+    payload = b"x" * 1000
+
+    cache.put("a", payload)
+    cache.put("b", payload)
+    assert cache.get("a") == payload  # "b" is now least recently used
+    cache.put("c", payload)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == payload and cache.get("c") == payload
+    assert cache.size <= 2500
+    assert cache.hits == 3 and cache.misses == 1
+
+
+def test_unreadable_entries_are_dropped(tmp_path):
+    """Test that corrupt entries count as misses and are removed."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = AnalysisCache(path)
+    cache.put("key", {"value": 1})
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE entries SET value = ?", (b"not a pickle",))
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+    cache.put("key", [1, 2])
+    cache.clear()
+    assert len(cache) == 0
+    cache.close()
@@ -0,0 +1,140 @@
+"""
+Tests for exact rule comparison with automata.
+
+These tests verify that compiled automata accept exactly the sequences their
+rules accept, that relationships are decided over all sequences of a domain
+with shortest witnesses, and that compare_rules falls back to the sequences
+for rules that can't be compiled.
+"""
+
+import itertools
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import RuleAnalyzer, compare_exact, compile_rule
+from seqrule.dsl import if_then_rule, range_rule
+from seqrule.rulesets import dna, general, music
+
+DOMAIN = [
+    AbstractObject(color="red", value=1, base="A"),
+    AbstractObject(color="blue", value=2, base="A"),
+    AbstractObject(color="red", value=None, base="C"),
+    AbstractObject(color="green", value=3, base="G"),
+    AbstractObject(color="blue", base="C"),
+]
+
+RULES = {
+    "match": general.create_property_match_rule("color", "red"),
+    "alternation": general.create_alternation_rule("color"),
+    "alternation with None": general.create_alternation_rule("value"),
+    "pattern": general.create_pattern_rule(["red", "blue"], "color"),
+    "transitions": general.create_transition_rule(
+        "color", {"red": {"blue"}, "blue": {"red", "green"}}
+    ),
+    "cycle": general.create_property_cycle_rule("color", "base"),
+    "if-then": if_then_rule(
+        lambda obj: obj["color"] == "red", lambda obj: obj["color"] == "blue"
+    ),
+    "range": range_rule(1, 2, lambda obj: obj["base"] == "A"),
+    "no consecutive": dna.create_no_consecutive_rule(2),
+}
+RULES["combined"] = RULES["pattern"] | (~RULES["if-then"] & RULES["no consecutive"])
+
+
+class TestCompileRule:
+    """Test compiling rules to automata."""
+
+    @pytest.mark.parametrize("name", sorted(RULES))
+    def test_agrees_with_rule(self, name):
+        """The automaton accepts exactly what the rule accepts."""
+        rule = RULES[name]
+        automaton = compile_rule(rule, DOMAIN)
+
+        assert automaton is not None
+        for length in range(5):
+            for indices in itertools.product(range(len(DOMAIN)), repeat=length):
+                sequence = [DOMAIN[i] for i in indices]
+                assert automaton.accepts(indices) == bool(rule(sequence)), sequence
+
+    def test_music_rule(self):
+        """Runs of a note type are counted."""
+        notes = [
+            AbstractObject(note_type="rest", pitch=None),
+            AbstractObject(note_type="note", pitch="C4"),
+        ]
+        rule = music.create_max_consecutive_rule("rest", 2)
+        automaton = compile_rule(rule, notes)
+
+        for indices in itertools.product(range(2), repeat=5):
+            sequence = [notes[i] for i in indices]
+            assert automaton.accepts(indices) == rule(sequence)
+
+    def test_unsupported(self):
+        """Unknown rules and values that can't be mirrored aren't compiled."""
+        proxied = [AbstractObject(base={"name": "A"})]
+
+        assert compile_rule(DSLRule(lambda seq: len(seq) < 3), DOMAIN) is None
+        assert compile_rule(dna.create_no_consecutive_rule(2), proxied) is None
+        assert compile_rule(general.create_pattern_rule([], "color"), DOMAIN) is None
+        # The condition fails on objects without a "size"
+        rule = if_then_rule(lambda obj: obj["size"] > 1, lambda obj: True)
+        assert compile_rule(rule, DOMAIN) is None
+
+
+class TestCompareExact:
+    """Test deciding relationships over a domain."""
+
+    def test_relationships(self):
+        """Containment is decided over sequences of any length."""
+        alternation = RULES["alternation"]
+        both = alternation & RULES["no consecutive"]
+
+        assert compare_exact(alternation, both, DOMAIN).relationship == "superset"
+        assert compare_exact(both, alternation, DOMAIN).relationship == "subset"
+        same = compare_exact(alternation, ~~alternation, DOMAIN)
+        assert same.relationship == "equivalent"
+        assert same.witness is None
+
+    def test_shortest_witness(self):
+        """The witnesses are shortest sequences accepted by one rule only."""
+        comparison = compare_exact(
+            RULES["alternation"], RULES["alternation"] & RULES["no consecutive"], DOMAIN
+        )
+
+        # Three objects with base "A" alternating in color
+        assert [obj["base"] for obj in comparison.only_rule1] == ["A"] * 3
+        assert RULES["alternation"](comparison.only_rule1)
+        assert comparison.only_rule2 is None
+
+        pattern = compare_exact(RULES["pattern"], RULES["match"], DOMAIN)
+        assert pattern.relationship == "incomparable"
+        assert pattern.witness == []
+
+    def test_state_limit(self):
+        """Products larger than the limit aren't decided."""
+        rule1, rule2 = RULES["cycle"], RULES["transitions"]
+
+        assert compare_exact(rule1, rule2, DOMAIN) is not None
+        assert compare_exact(rule1, rule2, DOMAIN, max_states=3) is None
+
+
+class TestAnalyzerExactComparison:
+    """Test exact comparison through compare_rules."""
+
+    def test_compare_rules_with_domain(self):
+        """Supported rules are compared exactly, others on the sequences."""
+        analyzer = RuleAnalyzer().with_sequences([[DOMAIN[0], DOMAIN[0]]])
+        both = RULES["alternation"] & RULES["no consecutive"]
+
+        exact = analyzer.compare_rules(both, RULES["alternation"], domain=DOMAIN)
+        assert exact["exact"] is True
+        assert exact["relationship"] == "subset"
+        assert exact["differences"] == [
+            {"sequence": exact["witness"], "rule1_result": False, "rule2_result": True}
+        ]
+
+        unknown = DSLRule(lambda seq: len(seq) < 3)
+        sampled = analyzer.compare_rules(unknown, RULES["alternation"], domain=DOMAIN)
+        assert sampled["exact"] is False
+        assert sampled["relationship"] == "superset"
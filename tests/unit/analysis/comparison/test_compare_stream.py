@@ -0,0 +1,154 @@
+"""
+Tests for streaming rule comparison.
+
+These tests verify the running counts and relationships, the bounded reservoir
+of differences, early stopping on incomparable rules and on the equivalence
+bound, and comparison in worker processes.
+"""
+
+import itertools
+import math
+import random
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import ComparisonStats, RuleAnalyzer, compare_stream
+
+
+def all_positive(seq):
+    return all(obj["value"] > 0 for obj in seq)
+
+
+def all_small(seq):
+    return all(0 < obj["value"] < 10 for obj in seq)
+
+
+def all_even(seq):
+    return all(obj["value"] % 2 == 0 for obj in seq)
+
+
+def all_positive_loop(seq):
+    for obj in seq:
+        if obj["value"] <= 0:
+            return False
+    return True
+
+
+def singletons(values):
+    return ([AbstractObject(value=value)] for value in values)
+
+
+class TestComparisonStats:
+    """Test the running counts."""
+
+    def test_relationship(self):
+        """The relationship follows from the one-sided disagreements."""
+        stats = ComparisonStats()
+        rng = random.Random(0)
+        assert stats.relationship == "equivalent"
+
+        stats.record([], False, True, rng)
+        assert (stats.relationship, stats.stricter_rule) == ("subset", "rule1")
+        stats.record([], True, False, rng)
+        assert stats.relationship == "incomparable"
+        assert stats.stricter_rule is None
+
+    def test_reservoir_is_bounded(self):
+        """Only a fixed number of differences is kept, chunks merge to it."""
+        rng = random.Random(0)
+        first, second = (
+            ComparisonStats(max_differences=5),
+            ComparisonStats(max_differences=5),
+        )
+        for i in range(100):
+            first.record([AbstractObject(value=i)], True, False, rng)
+            second.record([AbstractObject(value=-i)], True, False, rng)
+
+        first.merge(second, rng)
+
+        assert first.difference_count == 200
+        assert first.evaluated == 200
+        assert len(first.differences) == 5
+
+
+class TestCompareStream:
+    """Test comparing rules on streams."""
+
+    def test_counts_and_sample(self):
+        """Counts cover every sequence while differences are sampled."""
+        stats = compare_stream(
+            all_positive, all_small, singletons(range(1, 101)), max_differences=10
+        )
+
+        assert stats.evaluated == 100
+        assert stats.relationship == "superset"
+        assert stats.difference_count == 91
+        assert len(stats.differences) == 10
+        assert all(d["sequence"][0]["value"] >= 10 for d in stats.differences)
+        assert stats.acceptance_rate(2) == pytest.approx(0.09)
+
+    def test_stops_when_incomparable(self):
+        """An unbounded stream stops once each rule accepted one the other didn't."""
+        stats = compare_stream(all_positive, all_even, singletons(itertools.count()))
+
+        assert stats.relationship == "incomparable"
+        assert stats.stopped_early == "incomparable"
+        assert stats.evaluated == 2
+
+    def test_stops_on_equivalence_bound(self):
+        """Agreement on enough sequences bounds the disagreement rate."""
+        stats = compare_stream(
+            all_positive,
+            all_positive_loop,
+            singletons(itertools.count(1)),
+            equivalence_bound=0.01,
+            confidence=0.95,
+        )
+
+        assert stats.stopped_early == "equivalence"
+        assert stats.evaluated == math.ceil(math.log(0.05) / math.log(0.99))
+        assert stats.difference_rate_bound(0.95) <= 0.01
+
+    def test_workers_match_sequential(self):
+        """Chunks evaluated in worker processes add up to the same counts."""
+        sequences = list(singletons(range(-20, 80)))
+        options = {"stop_when_incomparable": False, "max_differences": 7}
+
+        sequential = compare_stream(all_even, all_small, sequences, **options)
+        parallel = compare_stream(
+            all_even, all_small, iter(sequences), workers=2, chunk_size=9, **options
+        )
+
+        for name in ("evaluated", "rule1_accepted", "only_rule1", "only_rule2"):
+            assert getattr(parallel, name) == getattr(sequential, name)
+        assert len(parallel.differences) == 7
+
+    def test_errors_and_invalid_input(self):
+        """Failing evaluations are counted and bad input is rejected."""
+        stats = compare_stream(all_positive, all_small, [[AbstractObject()]])
+        assert (stats.errors, stats.evaluated) == (1, 0)
+
+        with pytest.raises(ValueError, match="No test sequences"):
+            compare_stream(all_positive, all_small, iter([]))
+        with pytest.raises(ValueError, match="must be lists"):
+            compare_stream(all_positive, all_small, [(AbstractObject(value=1),)])
+
+
+class TestAnalyzerCompareRules:
+    """Test the analyzer's compare_rules method."""
+
+    def test_compare_rules(self):
+        """compare_rules returns the counts alongside the original keys."""
+        analyzer = RuleAnalyzer()
+
+        comparison = analyzer.compare_rules(
+            DSLRule(all_small), DSLRule(all_positive), singletons(range(1, 21))
+        )
+
+        assert comparison["relationship"] == "subset"
+        assert comparison["stricter_rule"] == "rule1"
+        assert comparison["rule1_acceptance_rate"] == pytest.approx(0.45)
+        assert comparison["evaluated"] == comparison["difference_count"] + 9
+        assert len(comparison["differences"]) == 11
+        assert comparison["stopped_early"] is None
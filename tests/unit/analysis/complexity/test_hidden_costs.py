@@ -0,0 +1,130 @@
+"""
+Tests for the costs hidden in builtins and containers.
+
+These tests verify that the static complexity analysis models membership
+tests, list methods, slices, consuming builtins and nested generator
+expressions, and reports super-linear operations as hotspots with line numbers.
+"""
+
+import ast
+import inspect
+import textwrap
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import ComplexityClass, Hotspot, RuleAnalyzer
+from seqrule.analysis.complexity import ComplexityAnalyzer
+from seqrule.rulesets import general, tea
+
+
+def analyze(func):
+    source = textwrap.dedent(inspect.getsource(func))
+    return ComplexityAnalyzer().analyze_ast(ast.parse(source))
+
+
+def pairwise(seq):
+    return all(a["weight"] == b["weight"] for a in seq for b in seq)
+
+
+def unique_with_list(seq):
+    seen = []
+    for obj in seq:
+        if obj["value"] in seen:
+            return False
+        seen.append(obj["value"])
+    return True
+
+
+def unique_with_set(seq):
+    seen = set()
+    for obj in seq:
+        if obj["value"] in seen:
+            return False
+        seen.add(obj["value"])
+    return True
+
+
+def suffix_sums(seq):
+    for i in range(len(seq)):
+        if sum(obj["value"] for obj in seq[i:]) < 0:
+            return False
+    return True
+
+
+def windows(seq):
+    values = [obj["value"] for obj in seq]
+    for i in range(len(values)):
+        if values[i : i + 3] == values[:3] or values.count(values[i]) > 2:
+            return False
+    return sum(values) > 0
+
+
+class TestHiddenCosts:
+    """Test modelling the costs hidden in builtins and containers."""
+
+    def test_nested_generator_expression(self):
+        """Generators over the sequence nested in each other are quadratic."""
+        complexity = analyze(pairwise)
+
+        assert complexity.time_complexity == ComplexityClass.QUADRATIC
+        assert complexity.hotspots == [
+            Hotspot(
+                2, ComplexityClass.QUADRATIC, "iterates over seq inside loop over seq"
+            )
+        ]
+
+    def test_membership_in_list_vs_set(self):
+        """Growing lists are scanned by 'in', while sets are hashed."""
+        listed = analyze(unique_with_list)
+        hashed = analyze(unique_with_set)
+
+        assert listed.time_complexity == ComplexityClass.QUADRATIC
+        assert [h.lineno for h in listed.hotspots] == [4]
+        assert "seen" in listed.hotspots[0].description
+        assert hashed.time_complexity == ComplexityClass.LINEAR
+        assert hashed.hotspots == []
+
+    def test_slices_and_consuming_builtins(self):
+        """Slices copy and builtins consume; fixed-length slices are free."""
+        suffixes = analyze(suffix_sums)
+        window = analyze(windows)
+
+        assert suffixes.time_complexity == ComplexityClass.QUADRATIC
+        assert any("copies slice seq[i:]" in h.description for h in suffixes.hotspots)
+        # values[i : i + 3] and values[:3] don't grow with the sequence, and
+        # sum(values) runs once, but values.count(...) scans per element
+        assert window.time_complexity == ComplexityClass.QUADRATIC
+        assert [h.description for h in window.hotspots] == [
+            "calls .count() on list values inside loop over range(len(values))"
+        ]
+
+    def test_linear_rule_unchanged(self):
+        """A single pass over the sequence stays linear without hotspots."""
+        complexity = analyze(lambda seq: sum(obj["value"] for obj in seq) > 0)
+
+        assert complexity.time_complexity == ComplexityClass.LINEAR
+        assert complexity.hotspots == []
+        assert complexity.bottlenecks == []
+
+    def test_ruleset_hotspots(self):
+        """The hidden quadratic costs of the rulesets are found."""
+        dependency = analyze(general.create_dependency_rule("stage", {}).func)
+        cycle = analyze(general.create_property_cycle_rule("color").func)
+        steps = analyze(tea.create_tea_sequence_rule(tea.TeaType.GREEN).func)
+
+        assert dependency.time_complexity == ComplexityClass.QUADRATIC
+        assert cycle.time_complexity == ComplexityClass.QUADRATIC
+        assert any("seen_values" in h.description for h in cycle.hotspots)
+        # The tea rule scans its factory's step list for each step
+        assert steps.time_complexity == ComplexityClass.LINEAR
+        assert {h.lineno for h in steps.hotspots} == {15, 17}
+        assert all("len(required_steps)" in h.description for h in steps.hotspots)
+
+    def test_analyzer_reports_file_lines(self):
+        """The analyzer reports hotspots at lines of the rule's file."""
+        analyzer = RuleAnalyzer().with_sequences([[AbstractObject(value=1)]])
+
+        analysis = analyzer.analyze(DSLRule(unique_with_list))
+
+        first_line = unique_with_list.__code__.co_firstlineno
+        assert [h.lineno for h in analysis.complexity.hotspots] == [first_line + 3]
+        assert str(analysis.complexity.hotspots[0]) in analysis.complexity.bottlenecks
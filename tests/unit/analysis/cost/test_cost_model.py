@@ -0,0 +1,176 @@
+"""
+Tests for rule cost models.
+
+These tests verify predictions and budget queries of CostModel, fitting models
+from timings with the static estimate as a tie-breaker, and the analyzer's
+cost_model and predict_cost methods.
+"""
+
+import itertools
+import math
+import time
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import ComplexityClass, CostModel, RuleAnalyzer, build_cost_model
+from seqrule.analysis.cost import _select_fit
+from seqrule.analysis.performance import PerformanceProfiler
+from seqrule.analysis.scaling import ModelFit
+
+
+def make_sequence(size):
+    return [AbstractObject(value=i, weight=1) for i in range(size)]
+
+
+def linear_rule(seq):
+    return all(obj["value"] >= 0 for obj in seq)
+
+
+def pairwise_rule(seq):
+    return all(a["weight"] == b["weight"] for a in seq for b in seq)
+
+
+def linear_model(**kwargs):
+    return CostModel(
+        complexity=ComplexityClass.LINEAR,
+        intercept=1e-6,
+        coefficient=1e-7,
+        **kwargs,
+    )
+
+
+class TestCostModel:
+    """Test predictions of a given model."""
+
+    def test_predict(self):
+        """Predictions follow the fitted growth and the tail factor."""
+        model = linear_model(tail_factor=1.5)
+
+        assert model.predict(1000) == pytest.approx(1e-6 + 1e-4)
+        assert model.predict(1000, p99=True) == pytest.approx(1.5 * (1e-6 + 1e-4))
+        assert model.predict(0) == model.predict(1)
+
+    def test_property_costs(self):
+        """Expensive properties add their extra cost per predicted read."""
+        reads = ModelFit(ComplexityClass.LINEAR, 0.0, 2.0, rss=0.0, aic=0.0)
+        model = linear_model(property_accesses={"value": reads}, access_cost=1e-8)
+
+        assert model.accesses("value", 100) == 200
+        assert model.accesses("other", 100) == 0
+        extra = model.predict(100, property_costs={"value": 1e-6}) - model.predict(100)
+        assert extra == pytest.approx(200 * (1e-6 - 1e-8))
+
+    def test_max_length(self):
+        """The longest length within budget is found by search."""
+        model = linear_model()
+
+        n = model.max_length(1e-3)
+
+        assert model.predict(n) <= 1e-3 < model.predict(n + 1)
+        assert model.max_length(1e-7) == 0
+        assert model.max_length(1.0, limit=100) == 100
+
+    def test_exponential_overflow(self):
+        """Exponential models predict infinity instead of overflowing."""
+        model = CostModel(ComplexityClass.EXPONENTIAL, 0.0, 1e-9)
+
+        assert model.predict(5000) == math.inf
+        assert model.max_length(1.0) < 64
+
+
+class TestBuildCostModel:
+    """Test fitting cost models."""
+
+    def test_static_breaks_ties(self):
+        """An uncertain empirical fit defers to the static estimate."""
+        fits = [
+            ModelFit(ComplexityClass.LINEAR, 0, 1, rss=1, aic=0, weight=0.4),
+            ModelFit(ComplexityClass.LINEARITHMIC, 0, 1, rss=1, aic=0.1, weight=0.35),
+        ]
+
+        selected = _select_fit(fits, ComplexityClass.LINEARITHMIC, 0.5)
+        assert selected.complexity == ComplexityClass.LINEARITHMIC
+        assert _select_fit(fits, None, 0.5) is fits[0]
+        fits[0].weight = 0.9
+        assert _select_fit(fits, ComplexityClass.LINEARITHMIC, 0.5) is fits[0]
+
+    def test_fits_quadratic_rule(self):
+        """Pairwise rules get a quadratic model and quadratic property reads."""
+        model = build_cost_model(
+            pairwise_rule,
+            make_sequence,
+            sizes=[8, 16, 32, 64, 128],
+            time_budget=5.0,
+        )
+
+        assert model.complexity >= ComplexityClass.LINEARITHMIC
+        assert model.property_accesses["weight"].complexity == (
+            ComplexityClass.QUADRATIC
+        )
+        assert model.accesses("weight", 10) == pytest.approx(200)
+        assert model.predict(256) > model.predict(128) > 0
+        assert model.tail_factor >= 1.0
+        assert model.max_measured_size == 128
+
+    def test_tail_factor_times_single_calls(self):
+        """Rare slow calls show up in the tail instead of being averaged away."""
+        model = build_cost_model(
+            make_stalling_rule(25),
+            make_sequence,
+            sizes=[8, 16, 32],
+            profiler=PerformanceProfiler(samples=3),
+            tail_samples=200,
+        )
+
+        assert model.tail_factor > 5
+
+        steady = build_cost_model(
+            linear_rule, make_sequence, sizes=[8, 16, 32], tail_samples=0
+        )
+        assert steady.tail_factor == 1.0
+
+
+def make_stalling_rule(every):
+    """A linear rule whose every ``every``-th call stalls for a millisecond."""
+    calls = itertools.count(1)
+
+    def rule(seq):
+        if next(calls) % every == 0:
+            deadline = time.perf_counter() + 1e-3
+            while time.perf_counter() < deadline:
+                pass
+        return linear_rule(seq)
+
+    return rule
+
+
+class TestAnalyzerCostModel:
+    """Test the analyzer's cost model methods."""
+
+    def test_predict_cost_reuses_model(self):
+        """predict_cost fits a model once per rule and sample corpus."""
+        analyzer = RuleAnalyzer().with_sequences([make_sequence(5)])
+        rule = DSLRule(linear_rule)
+
+        model = analyzer.cost_model(rule, sizes=[8, 16, 32, 64])
+        assert model.static_complexity == ComplexityClass.LINEAR
+        assert set(model.property_accesses) == {"value"}
+
+        first = analyzer.predict_cost(rule, 1000)
+        assert analyzer.cost_model(rule) is analyzer.cost_model(DSLRule(linear_rule))
+        assert analyzer.predict_cost(rule, 1000) == first
+        assert analyzer.predict_cost(rule, 1000, p99=True) >= first
+
+        analyzer.with_sequences([make_sequence(3)])
+        assert not analyzer._cost_models
+
+    def test_analysis_option(self):
+        """The cost_model option attaches a model to the analysis."""
+        analyzer = RuleAnalyzer().with_sequences([make_sequence(5)])
+
+        assert analyzer.analyze(DSLRule(linear_rule)).cost_model is None
+
+        analysis = analyzer.with_options(cost_model=True).analyze(DSLRule(linear_rule))
+        assert isinstance(analysis.cost_model, CostModel)
+        assert analysis.cost_model.predict(100) > 0
@@ -0,0 +1,101 @@
+"""
+Tests for allocation profiling in the performance module.
+
+These tests verify that tracemalloc-based profiling reports peak and retained
+bytes, allocation counts and allocation sites per sequence size, in the same
+pass as timing.
+"""
+
+import tracemalloc
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import AllocationStats, RuleAnalyzer
+from seqrule.analysis.performance import AllocationSite, PerformanceProfiler
+
+
+def make_sequence(size):
+    return [AbstractObject(value=i) for i in range(size)]
+
+
+def windowed_rule(seq):
+    windows = [seq[i : i + 3] for i in range(len(seq))]
+    return all(len(window) > 0 for window in windows)
+
+
+def streaming_rule(seq):
+    return all(obj["value"] >= 0 for obj in seq)
+
+
+class TestAllocationProfiling:
+    """Test tracemalloc-based allocation profiling."""
+
+    def test_disabled_by_default(self):
+        """Allocations are only traced when asked."""
+        profile = PerformanceProfiler().profile_rule(streaming_rule, [make_sequence(5)])
+
+        assert profile.allocation_stats == {}
+        assert "Peak allocations" not in str(profile)
+
+    def test_per_size_stats(self):
+        """Temporary per-window lists show up in peaks and allocation sites."""
+        profiler = PerformanceProfiler(allocation_profiling=True)
+        sizes = (10, 100, 1000)
+
+        profile = profiler.profile_rule(
+            windowed_rule, [make_sequence(n) for n in sizes]
+        )
+
+        assert sorted(profile.allocation_stats) == list(sizes)
+        small = profile.allocation_stats[10]
+        large = profile.allocation_stats[1000]
+        assert large.peak_bytes > 20 * small.peak_bytes
+        assert large.allocation_count >= 1000
+        assert profile.peak_allocated_bytes == large.peak_bytes
+
+        site = large.top_sites[0]
+        assert isinstance(site, AllocationSite)
+        assert site.filename == __file__
+        assert site.lineno == windowed_rule.__code__.co_firstlineno + 1
+        assert "Peak allocations" in str(profile)
+
+    def test_streaming_rule_stays_flat(self):
+        """A rule without per-element allocations has a constant peak."""
+        profiler = PerformanceProfiler(allocation_profiling=True)
+
+        profile = profiler.profile_rule(
+            streaming_rule, [make_sequence(10), make_sequence(1000)]
+        )
+
+        stats = profile.allocation_stats
+        assert stats[1000].peak_bytes < 4 * max(stats[10].peak_bytes, 256)
+
+    def test_traced_calls_count_as_warmup(self):
+        """Allocation profiling adds no calls beyond the configured warmup."""
+        calls = []
+        profiler = PerformanceProfiler(samples=2, warmup=2, allocation_profiling=True)
+
+        profiler.profile_rule(lambda seq: calls.append(1), [make_sequence(1)])
+
+        assert len(calls) == 4
+        assert not tracemalloc.is_tracing()
+
+    def test_merge_keeps_largest(self):
+        """Sequences of the same size keep the largest values."""
+        site = AllocationSite("rule.py", 3, 100, 2)
+        merged = AllocationStats(10, 5, 1).merge(AllocationStats(20, 0, 4, [site]))
+
+        assert (merged.peak_bytes, merged.retained_bytes) == (20, 5)
+        assert merged.allocation_count == 4
+        assert merged.top_sites == [site]
+
+    def test_analyzer_option(self):
+        """The analyzer traces allocations with the allocation_profiling option."""
+        analyzer = (
+            RuleAnalyzer()
+            .with_sequences([make_sequence(3), make_sequence(6)])
+            .with_options(allocation_profiling=True)
+        )
+
+        analysis = analyzer.analyze(DSLRule(windowed_rule))
+
+        assert sorted(analysis.performance.allocation_stats) == [3, 6]
@@ -0,0 +1,151 @@
+"""
+Tests for the benchmarking mode of the performance module.
+
+These tests verify per-size timing distributions, repeat calibration, warmup,
+outlier rejection and garbage collection control in PerformanceProfiler.
+"""
+
+import gc
+from unittest.mock import patch
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import RuleAnalyzer
+from seqrule.analysis.performance import PerformanceProfiler, TimingStats
+
+
+def make_sequence(size):
+    return [AbstractObject(value=i) for i in range(size)]
+
+
+class TestTimingStats:
+    """Test the TimingStats summary statistics."""
+
+    def test_summary_statistics(self):
+        """Percentiles interpolate linearly between samples."""
+        stats = TimingStats.from_samples([float(i) for i in range(1, 101)])
+
+        assert stats.count == 100
+        assert stats.median == pytest.approx(50.5)
+        assert stats.iqr == pytest.approx(49.5)
+        assert stats.p95 == pytest.approx(95.05)
+        assert stats.p99 == pytest.approx(99.01)
+        low, high = stats.confidence_interval
+        assert low < stats.mean < high
+
+    def test_confidence_interval_without_scipy(self):
+        """The interval falls back to the normal distribution."""
+        samples = [1.0, 2.0, 3.0, 4.0, 5.0]
+        with patch("seqrule.analysis.performance.HAS_SCIPY", False):
+            low, high = TimingStats.from_samples(samples).confidence_interval
+
+        margin = 1.959964 * TimingStats(samples=samples).stdev / 5**0.5
+        assert low == pytest.approx(3.0 - margin)
+        assert high == pytest.approx(3.0 + margin)
+
+    def test_outlier_rejection(self):
+        """Samples beyond Tukey's fences are rejected."""
+        samples = [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 50.0]
+
+        kept = TimingStats.from_samples(samples)
+        filtered = TimingStats.from_samples(samples, outlier_threshold=1.5)
+
+        assert kept.rejected == 0
+        assert filtered.rejected == 1
+        assert max(filtered.samples) < 2
+        assert filtered.mean < kept.mean
+
+    def test_single_sample(self):
+        """A single sample has no spread."""
+        stats = TimingStats.from_samples([0.5])
+
+        assert stats.stdev == 0.0
+        assert stats.confidence_interval == (0.5, 0.5)
+
+
+class TestBenchmarkingProfiler:
+    """Test the benchmarking mode of PerformanceProfiler."""
+
+    def test_same_size_timings_are_pooled(self):
+        """Sequences of the same size no longer overwrite each other."""
+        profiler = PerformanceProfiler(samples=3)
+
+        profile = profiler.profile_rule(
+            lambda seq: True, [make_sequence(2), make_sequence(2), make_sequence(4)]
+        )
+
+        assert profile.call_count == 3
+        assert profile.timing_stats[2].count == 6
+        assert profile.timing_stats[4].count == 3
+        assert profile.timing_distribution[2] == profile.timing_stats[2].median
+
+    def test_warmup_and_calibration(self):
+        """Warmup calls run first and fast rules are looped per sample."""
+        calls = []
+        profiler = PerformanceProfiler(samples=4, warmup=2, min_round_time=0.001)
+
+        profile = profiler.profile_rule(lambda seq: calls.append(1), [make_sequence(1)])
+
+        stats = profile.timing_stats[1]
+        assert stats.loops > 1
+        assert stats.count == 4
+        assert len(calls) >= 2 + 4 * stats.loops
+
+    def test_measure_function(self):
+        """measure times a zero-argument function with the same settings."""
+        calls = []
+        profiler = PerformanceProfiler(samples=3, warmup=1)
+
+        stats = profiler.measure(lambda: calls.append(1))
+
+        assert isinstance(stats, TimingStats)
+        assert stats.count == 3
+        assert len(calls) == 4
+
+    def test_gc_disabled_while_timing(self):
+        """Garbage collection is off during timed calls and restored after."""
+        states = []
+        profiler = PerformanceProfiler(samples=2, disable_gc=True)
+
+        profiler.profile_rule(lambda seq: states.append(gc.isenabled()), [[]])
+
+        assert states == [False, False]
+        assert gc.isenabled()
+
+    def test_benchmarking_defaults(self):
+        """The benchmarking constructor enables the rigorous settings."""
+        profiler = PerformanceProfiler.benchmarking(samples=5, min_round_time=0.0005)
+
+        assert profiler.warmup > 0
+        assert profiler.disable_gc
+        assert profiler.outlier_threshold == 1.5
+
+        profile = profiler.profile_rule(
+            lambda seq: sum(obj["value"] for obj in seq),
+            [make_sequence(n) for n in (1, 10, 100)],
+        )
+        assert sorted(profile.timing_stats) == [1, 10, 100]
+        assert all(stats.count <= 5 for stats in profile.timing_stats.values())
+        assert profile.avg_evaluation_time > 0
+
+    def test_analyzer_benchmark_option(self):
+        """The analyzer profiles with a benchmarking profiler when asked."""
+        analyzer = (
+            RuleAnalyzer()
+            .with_sequences([make_sequence(3)])
+            .with_options(benchmark=True)
+        )
+
+        def rule(seq):
+            return len(seq) > 0
+
+        with patch.object(
+            PerformanceProfiler,
+            "benchmarking",
+            return_value=PerformanceProfiler(samples=3),
+        ) as benchmarking:
+            analysis = analyzer.analyze(DSLRule(rule))
+
+        benchmarking.assert_called_once()
+        assert analysis.performance.timing_stats[3].count == 3
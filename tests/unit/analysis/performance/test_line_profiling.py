@@ -0,0 +1,129 @@
+"""
+Tests for line-level profiling of rules.
+
+These tests verify that the lines of a rule, its nested code and the rules it
+closes over are counted and timed, with both the sys.monitoring and the
+sys.settrace backends.
+"""
+
+import sys
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import LineProfiler, RuleAnalyzer
+from seqrule.analysis.lineprof import HAS_MONITORING, rule_code_objects
+from seqrule.analysis.performance import PerformanceProfiler
+
+BACKENDS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(
+            not HAS_MONITORING, reason="sys.monitoring requires Python 3.12"
+        ),
+    ),
+]
+
+
+def make_sequence(size):
+    return [AbstractObject(value=i) for i in range(size)]
+
+
+def pairwise_rule(seq):
+    total = 0
+    for i in range(len(seq)):
+        for j in range(i):
+            total += seq[i]["value"] * seq[j]["value"]
+    return all(obj["value"] >= 0 for obj in seq) and total >= 0
+
+
+def make_combined_rule(inner):
+    def combined(seq):
+        return bool(seq) and inner(seq)
+
+    return DSLRule(combined, "combined")
+
+
+def line_of(func, offset):
+    return func.__code__.co_firstlineno + offset
+
+
+class TestLineProfiler:
+    """Test the line profiler."""
+
+    def test_code_objects(self):
+        """Nested code and closed-over rules are profiled."""
+        rule = make_combined_rule(DSLRule(pairwise_rule))
+
+        names = {code.co_name for code in rule_code_objects(rule)}
+
+        assert names == {"combined", "pairwise_rule", "<genexpr>"}
+
+    @pytest.mark.parametrize("use_monitoring", BACKENDS)
+    def test_counts_and_hotspot(self, use_monitoring):
+        """Hit counts follow the loops and the inner loop is the hotspot."""
+        profiler = LineProfiler(pairwise_rule, use_monitoring=use_monitoring)
+
+        assert profiler.run(pairwise_rule, make_sequence(30)) is True
+
+        profile = profiler.profile
+        inner = profile.line(__file__, line_of(pairwise_rule, 4))
+        assert inner.hits == 30 * 29 // 2
+        assert profile.line(__file__, line_of(pairwise_rule, 1)).hits == 1
+        assert profile.hotspots(1)[0].lineno in (
+            line_of(pairwise_rule, 3),
+            line_of(pairwise_rule, 4),
+        )
+        assert "total +=" in inner.source
+        assert 0 < profile.share(inner) < 1
+
+    @pytest.mark.parametrize("use_monitoring", BACKENDS)
+    def test_closure_rules_profiled(self, use_monitoring):
+        """Lines of a rule held in a closure are recorded."""
+        rule = make_combined_rule(DSLRule(pairwise_rule))
+        profiler = LineProfiler(rule, use_monitoring=use_monitoring)
+
+        profiler.run(rule, make_sequence(5))
+
+        linenos = {lineno for _, lineno in profiler.profile.lines}
+        assert line_of(pairwise_rule, 4) in linenos
+
+    def test_previous_trace_function_restored(self):
+        """The settrace backend puts back any existing trace function."""
+        previous = sys.gettrace()
+        profiler = LineProfiler(pairwise_rule, use_monitoring=False)
+
+        profiler.run(pairwise_rule, make_sequence(3))
+
+        assert sys.gettrace() is previous
+
+    def test_profiler_option(self):
+        """PerformanceProfiler accumulates a line profile over sequences."""
+        calls = []
+
+        def rule(seq):
+            calls.append(1)
+            return True
+
+        profiler = PerformanceProfiler(samples=1, warmup=1, line_profiling=True)
+        profile = profiler.profile_rule(rule, [make_sequence(2), make_sequence(4)])
+
+        assert len(calls) == 4  # the profiled call replaces the warmup
+        stats = profile.line_profile.line(__file__, line_of(rule, 1))
+        assert stats.hits == 2
+
+    def test_analyzer_suggests_hot_line(self):
+        """The analyzer names the hottest line in its suggestions."""
+        analyzer = (
+            RuleAnalyzer()
+            .with_sequences([make_sequence(40)])
+            .with_options(line_profiling=True)
+        )
+
+        analysis = analyzer.analyze(DSLRule(pairwise_rule))
+
+        assert analysis.performance.line_profile is not None
+        hot = [s for s in analysis.optimization_suggestions if s.startswith("Line ")]
+        assert hot
+        assert "of evaluation time" in hot[0]
@@ -0,0 +1,139 @@
+"""
+Tests for runtime property-access counting.
+
+These tests verify that instrumented objects count item access, dictionary
+lookups and nested proxy allocations, and that the measured counts are recorded
+in RuleAnalysis.properties next to the AST estimates.
+"""
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import (
+    InstrumentedObject,
+    PropertyAccessType,
+    RuleAnalyzer,
+    count_property_access,
+)
+from seqrule.analysis.instrumentation import PropertyCounts, instrument
+from seqrule.core import DictAccessProxy
+
+
+def make_sequence(size):
+    return [
+        AbstractObject(value=i, color="red", meta={"inner": {"deep": i}})
+        for i in range(size)
+    ]
+
+
+def nested_rule(seq):
+    return all(obj["meta"]["inner"]["deep"] >= 0 for obj in seq)
+
+
+def mixed_rule(seq):
+    return all(
+        obj["value"] >= 0 and obj.properties.get("color") == "red" for obj in seq
+    )
+
+
+class TestInstrumentedObjects:
+    """Test the instrumented AbstractObject and DictAccessProxy."""
+
+    def test_behaves_like_original(self):
+        """Instrumented objects compare, hash and read like the originals."""
+        original = make_sequence(1)[0]
+        counts = PropertyCounts()
+        copy = InstrumentedObject(original, counts)
+
+        assert isinstance(copy, AbstractObject)
+        assert copy == original and hash(copy) == hash(original)
+        assert copy["value"] == 0
+        assert isinstance(copy["meta"], DictAccessProxy)
+        assert copy["meta"]["inner"]["deep"] == 0
+        assert copy["missing"] is None
+        assert "inner" in copy["meta"]
+        assert copy.properties.get("color") == "red"
+
+    def test_counts_by_path(self):
+        """Accesses are counted per property path, with proxy allocations."""
+        counts = PropertyCounts()
+        (obj,) = instrument(make_sequence(1), counts)
+
+        obj["meta"]["inner"].get("deep")
+        obj.properties["value"]
+        assert "color" in obj.properties
+
+        assert counts.reads == {("meta",): 1, ("meta", "inner"): 1, ("value",): 1}
+        assert counts.gets == {("meta", "inner", "deep"): 1}
+        assert counts.checks == {("color",): 1}
+        assert counts.proxies == 2
+        assert counts.accesses("meta") == 3
+        assert counts.nested_accesses == 2
+
+
+class TestCountPropertyAccess:
+    """Test counting over sample sequences."""
+
+    def test_counts_over_sequences(self):
+        """Counts accumulate over every evaluation."""
+        counts = count_property_access(
+            nested_rule, [make_sequence(3), make_sequence(5)]
+        )
+
+        assert counts.evaluations == 2
+        assert counts.reads[("meta", "inner", "deep")] == 8
+        assert counts.proxies == 16
+        assert counts.per_evaluation("meta") == 12.0
+
+    def test_failing_evaluations_counted(self):
+        """Accesses made before a rule raises are kept."""
+
+        def failing(seq):
+            seq[0]["value"]
+            raise ValueError("boom")
+
+        counts = count_property_access(failing, [make_sequence(2)])
+
+        assert counts.reads == {("value",): 1}
+
+    def test_analysis_records_measured_counts(self):
+        """Measured counts are per evaluation and leave the static counts alone."""
+        analyzer = (
+            RuleAnalyzer()
+            .with_sequences([make_sequence(4)] * 3)
+            .with_options(runtime_property_counts=True)
+        )
+
+        analysis = analyzer.analyze(DSLRule(mixed_rule))
+
+        properties = analysis.properties
+        assert properties["value"].measured_accesses == 4.0
+        assert properties["color"].measured_accesses == 4.0
+        estimated = RuleAnalyzer().with_sequences([make_sequence(4)] * 3)
+        expected = estimated.analyze(DSLRule(mixed_rule)).properties
+        for name, access in properties.items():
+            static = expected[name].access_count if name in expected else 0
+            assert access.access_count == static
+        assert all(access.measured_accesses is None for access in expected.values())
+        assert PropertyAccessType.METHOD in properties["color"].access_types
+        assert analysis.property_counts.evaluations == 3
+
+    def test_nested_access_recorded(self):
+        """Nested keys measured at runtime are recorded on the property."""
+        analyzer = (
+            RuleAnalyzer()
+            .with_sequences([make_sequence(2)])
+            .with_options(runtime_property_counts=True)
+        )
+
+        meta = analyzer.analyze(DSLRule(nested_rule)).properties["meta"]
+
+        assert meta.measured_accesses == 6.0
+        assert "inner" in meta.nested_properties
+        assert PropertyAccessType.NESTED in meta.access_types
+
+    def test_disabled_by_default(self):
+        """Without the option the counts are estimated from the AST."""
+        analyzer = RuleAnalyzer().with_sequences([make_sequence(4)])
+
+        analysis = analyzer.analyze(DSLRule(mixed_rule))
+
+        assert analysis.property_counts is None
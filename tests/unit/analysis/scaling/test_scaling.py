@@ -0,0 +1,152 @@
+"""
+Tests for empirical complexity fitting.
+
+These tests verify the least-squares model selection on synthetic timings and
+that the scaling harness catches rules whose cost the static analysis misses.
+"""
+
+import math
+
+import pytest
+
+from seqrule import AbstractObject, DSLRule
+from seqrule.analysis import (
+    ComplexityClass,
+    RuleAnalyzer,
+    ScalingAnalyzer,
+    ScalingResult,
+    fit_complexity,
+)
+from seqrule.analysis.performance import PerformanceProfiler
+from seqrule.analysis.scaling import geometric_sizes
+
+
+def make_sequence(size):
+    return [AbstractObject(value=i) for i in range(size)]
+
+
+def has_duplicate(seq):
+    return any(a == b for i, a in enumerate(seq) for b in seq[i + 1 :])
+
+
+def _pairs(seq):
+    return [(a, b) for i, a in enumerate(seq) for b in seq[i + 1 :]]
+
+
+def has_duplicate_pair(seq):
+    return any(a == b for a, b in _pairs(seq))
+
+
+def all_positive(seq):
+    return all(obj["value"] >= 0 for obj in seq)
+
+
+def fast_profiler():
+    return PerformanceProfiler(samples=3, min_round_time=0.001, disable_gc=True)
+
+
+class TestFitComplexity:
+    """Test model selection on synthetic timings."""
+
+    @pytest.mark.parametrize(
+        "complexity, growth",
+        [
+            (ComplexityClass.CONSTANT, lambda n: 0.0),
+            (ComplexityClass.LINEAR, lambda n: n),
+            (ComplexityClass.LINEARITHMIC, lambda n: n * math.log2(n)),
+            (ComplexityClass.QUADRATIC, lambda n: n**2),
+            (ComplexityClass.CUBIC, lambda n: n**3),
+        ],
+    )
+    def test_recovers_growth(self, complexity, growth):
+        """The generating class is the best fit with high confidence."""
+        sizes = geometric_sizes(4, 14)
+        noise = [1.02, 0.98, 1.01, 0.99]
+        times = [(1e-6 + 1e-8 * growth(n)) * noise[i % 4] for i, n in enumerate(sizes)]
+
+        fits = fit_complexity(sizes, times)
+
+        assert fits[0].complexity == complexity
+        if complexity != ComplexityClass.CONSTANT:
+            # Flat data is fitted about as well by any growth with b near 0
+            assert fits[0].weight > 0.9
+        assert sum(fit.weight for fit in fits) == pytest.approx(1.0)
+
+    def test_exponential_only_for_small_sizes(self):
+        """2^n is a candidate only where it can be computed."""
+        small = fit_complexity([4, 6, 8, 10], [2.0**n * 1e-9 for n in (4, 6, 8, 10)])
+        large = fit_complexity(geometric_sizes(8, 12), [1e-6] * 5)
+
+        assert small[0].complexity == ComplexityClass.EXPONENTIAL
+        assert ComplexityClass.EXPONENTIAL not in {fit.complexity for fit in large}
+
+    def test_prediction(self):
+        """A fit predicts times from its coefficients."""
+        sizes = geometric_sizes(4, 10)
+        fit = fit_complexity(sizes, [2e-6 + 3e-9 * n for n in sizes])[0]
+
+        assert fit.complexity == ComplexityClass.LINEAR
+        assert fit.predict(4096) == pytest.approx(2e-6 + 3e-9 * 4096, rel=1e-6)
+
+    def test_too_few_measurements(self):
+        """At least three sizes are needed."""
+        with pytest.raises(ValueError, match="three"):
+            fit_complexity([16, 32], [1.0, 2.0])
+
+
+class TestScalingAnalyzer:
+    """Test the scaling harness."""
+
+    def test_disagreement_flag(self):
+        """A confident fit different from the static estimate is flagged."""
+        fits = fit_complexity(
+            [16, 32, 64, 128], [n**2 * 1e-9 for n in (16, 32, 64, 128)]
+        )
+
+        agrees = ScalingResult([], [], fits, ComplexityClass.QUADRATIC)
+        disagrees = ScalingResult([], [], fits, ComplexityClass.LINEAR)
+
+        assert not agrees.disagrees
+        assert disagrees.disagrees
+        assert "disagrees" in str(disagrees)
+        assert not ScalingResult([], [], fits).disagrees
+
+    def test_time_budget_stops_growth(self):
+        """No further sizes are started once the budget is spent."""
+        harness = ScalingAnalyzer(profiler=fast_profiler(), time_budget=0.0)
+
+        assert harness.measure(all_positive, make_sequence) == {}
+
+    def test_measures_quadratic_rule(self):
+        """A pairwise comparison rule scales quadratically."""
+        harness = ScalingAnalyzer(
+            sizes=geometric_sizes(4, 9), profiler=fast_profiler(), time_budget=30.0
+        )
+
+        result = harness.analyze(has_duplicate, make_sequence)
+
+        assert result.sizes == geometric_sizes(4, 9)
+        assert result.best_fit == ComplexityClass.QUADRATIC
+
+    def test_analyzer_flags_hidden_quadratic(self):
+        """RuleAnalyzer compares the measured scaling with the AST estimate."""
+        analyzer = RuleAnalyzer().with_sequences([make_sequence(5)])
+
+        result = analyzer.analyze_scaling(
+            DSLRule(has_duplicate_pair), make_sequence, sizes=geometric_sizes(4, 9)
+        )
+
+        assert result.static_complexity < ComplexityClass.QUADRATIC
+        assert result.best_fit == ComplexityClass.QUADRATIC
+        assert result.disagrees
+
+    def test_analyzer_accepts_formal_rule(self):
+        """Plain rule functions are measured like DSL rules."""
+        analyzer = RuleAnalyzer().with_sequences([make_sequence(5)])
+
+        result = analyzer.analyze_scaling(
+            all_positive, make_sequence, sizes=geometric_sizes(4, 8)
+        )
+
+        assert result.sizes == geometric_sizes(4, 8)
+        assert result.static_complexity == ComplexityClass.LINEAR
@@ -0,0 +1,164 @@
+"""
+Tests for vectorized batch scoring.
+
+These tests verify that RuleScorer.score_batch computes the same factors, raw
+scores, normalized scores and complexity levels as scoring each analysis and
+batch normalizing, and the columnar ScoreTable it returns.
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from seqrule.analysis import RuleScorer, ScoreTable
+from seqrule.analysis.base import (
+    ComplexityClass,
+    ComplexityScore,
+    PropertyAccessType,
+)
+from seqrule.analysis.complexity import RuleComplexity
+from seqrule.analysis.property import PropertyAccess
+
+np = pytest.importorskip("numpy")
+
+
+def random_analysis(rng):
+    properties = {}
+    for i in range(rng.randrange(6)):
+        prop = PropertyAccess(name=f"prop{i}")
+        prop.access_count = rng.randrange(40)
+        for access_type in rng.sample(list(PropertyAccessType), rng.randrange(3)):
+            prop.access_types.add(access_type)
+        for j in range(rng.randrange(3)):
+            prop.nested_properties.add(f"nested{j}")
+        properties[prop.name] = prop
+    return SimpleNamespace(
+        complexity=RuleComplexity(
+            time_complexity=rng.choice(list(ComplexityClass)),
+            space_complexity=rng.choice(list(ComplexityClass)),
+            description="",
+            bottlenecks=["slow"] * rng.randrange(6),
+            ast_features={},
+        ),
+        cyclomatic_complexity=rng.randrange(30),
+        ast_node_count=rng.randrange(300),
+        properties=properties,
+    )
+
+
+@pytest.fixture
+def analyses():
+    rng = random.Random(0)
+    return [random_analysis(rng) for _ in range(500)]
+
+
+class TestScoreBatch:
+    """Test scoring analyses in one batch."""
+
+    @pytest.mark.parametrize("reference_quantile", [None, 0.9])
+    def test_matches_scoring_one_at_a_time(self, analyses, reference_quantile):
+        """Batch scores equal individual scores after batch normalization."""
+        scorer = RuleScorer(reference_quantile=reference_quantile)
+        for analysis in analyses:
+            scorer.score(analysis)
+        expected = scorer.batch_normalize()
+
+        table = RuleScorer(reference_quantile=reference_quantile).score_batch(analyses)
+
+        assert len(table) == len(analyses)
+        assert table.raw_score == pytest.approx([s.raw_score for s in expected])
+        assert table.normalized_score == pytest.approx(
+            [s.normalized_score for s in expected]
+        )
+        assert list(table.complexity_level) == [s.complexity_level for s in expected]
+        for factor, scores in table.contributing_factors.items():
+            assert scores == pytest.approx(
+                [s.contributing_factors[factor] for s in expected]
+            )
+
+    def test_factors_match_score_at_thresholds(self, analyses):
+        """Every factor is scored as score() does, on and around each threshold."""
+        rng = random.Random(1)
+        varied = []
+        for value in range(120):
+            analysis = random_analysis(rng)
+            analysis.cyclomatic_complexity = value % 60
+            analysis.ast_node_count = value * 4 + value % 3
+            analysis.complexity.bottlenecks = ["slow"] * (value % 9)
+            varied.append(analysis)
+        varied += analyses[:100]
+
+        table = RuleScorer().score_batch(varied)
+        scorer = RuleScorer()
+        expected = [scorer.score(analysis) for analysis in varied]
+
+        assert table.raw_score.tolist() == [s.raw_score for s in expected]
+        for factor, scores in table.contributing_factors.items():
+            assert scores.tolist() == [s.contributing_factors[factor] for s in expected]
+
+    def test_custom_weights_and_statistics(self, analyses):
+        """Weights apply to every row and the running statistics are updated."""
+        weights = dict.fromkeys(RuleScorer().weights, 0.0)
+        weights["bottleneck_count"] = 100.0
+        scorer = RuleScorer(retain=0).with_custom_weights(weights)
+
+        table = scorer.score_batch(analyses)
+
+        assert np.array_equal(
+            table.raw_score, table.contributing_factors["bottleneck_count"]
+        )
+        assert scorer.summary.count == len(analyses)
+        assert scorer.summary.max_score == table.raw_score.max()
+
+    def test_epochs_split_the_batch(self, analyses):
+        """A batch spanning epochs is scored as if split at their boundaries."""
+        scorer = RuleScorer(epoch_size=200)
+        scorer.score_batch(analyses[:50])
+
+        table = scorer.score_batch(analyses[50:])
+
+        assert scorer.summary.epoch == 2
+        assert scorer.summary.count == 100
+        assert scorer.last_epoch.count == 200
+        parts = [analyses[:50], analyses[50:200], analyses[200:400], analyses[400:]]
+        fresh = RuleScorer(epoch_size=200)
+        expected = [fresh.score_batch(parts[0]), fresh.score_batch(parts[1])]
+        expected += [RuleScorer().score_batch(part) for part in parts[2:]]
+        assert table.normalized_score == pytest.approx(
+            np.concatenate([t.normalized_score for t in expected[1:]])
+        )
+
+    def test_table(self):
+        """The table converts to plain columns and rows."""
+        analysis = SimpleNamespace(
+            complexity=RuleComplexity(
+                time_complexity=ComplexityClass.LINEAR,
+                space_complexity=ComplexityClass.CONSTANT,
+                description="",
+                bottlenecks=[],
+                ast_features={},
+            ),
+            cyclomatic_complexity=1,
+            properties={},
+            ast_node_count=5,
+        )
+
+        table = RuleScorer().score_batch([analysis])
+        empty = RuleScorer().score_batch([])
+
+        assert isinstance(table, ScoreTable)
+        assert table.row(0) == {
+            "raw_score": 6.25,
+            "normalized_score": pytest.approx(6.25 / 60 * 100),
+            "complexity_level": ComplexityScore.TRIVIAL,
+            "bottlenecks": 0,
+            "time_complexity": 25.0,
+            "space_complexity": 0.0,
+            "cyclomatic_complexity": 0.0,
+            "property_access_complexity": 0.0,
+            "ast_node_count": 0.0,
+            "bottleneck_count": 0.0,
+        }
+        assert len(empty) == 0
+        assert empty.to_dict()["raw_score"] == []
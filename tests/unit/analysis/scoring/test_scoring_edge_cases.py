@@ -234,8 +234,8 @@ class TestRuleScorerEdgeCases:
         # Test with empty raw scores
         assert scorer._normalize_score(0.0) == 0.0
 
-        # Add a raw score and test normalization
-        scorer._raw_scores.append(0.0)
+        # Count a raw score and test normalization
+        scorer._count += 1
         assert scorer._normalize_score(0.0) == 0.0
 
         # Test with max_normalization_value = 0
@@ -277,7 +277,7 @@ class TestRuleScorerEdgeCases:
 
         # Add scores to the scorer
         scorer._score_objects = [score1, score2, score3]
-        scorer._raw_scores = [25.0, 50.0, 75.0]
+        scorer._count = 3
         scorer._max_observed_score = 75.0
 
         # Normalize the scores
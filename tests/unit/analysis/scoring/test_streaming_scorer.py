@@ -0,0 +1,186 @@
+"""
+Tests for streaming rule scoring.
+
+These tests verify the P² quantile sketch, that the scorer keeps a bounded
+number of scores alongside running statistics, lazy normalization against those
+statistics, and scoring epochs.
+"""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from seqrule.analysis import QuantileSketch, RuleScorer
+from seqrule.analysis.base import ComplexityClass
+from seqrule.analysis.complexity import RuleComplexity
+from seqrule.analysis.scoring import DEFAULT_RETAIN
+
+
+def make_analysis(
+    time_complexity=ComplexityClass.LINEAR,
+    space_complexity=ComplexityClass.CONSTANT,
+    cyclomatic_complexity=1,
+    ast_node_count=5,
+    bottlenecks=0,
+):
+    return SimpleNamespace(
+        complexity=RuleComplexity(
+            time_complexity=time_complexity,
+            space_complexity=space_complexity,
+            description="",
+            bottlenecks=["slow"] * bottlenecks,
+            ast_features={},
+        ),
+        cyclomatic_complexity=cyclomatic_complexity,
+        properties={},
+        ast_node_count=ast_node_count,
+    )
+
+
+SIMPLE = make_analysis()
+COMPLEX = make_analysis(
+    time_complexity=ComplexityClass.FACTORIAL,
+    space_complexity=ComplexityClass.FACTORIAL,
+    cyclomatic_complexity=20,
+    ast_node_count=200,
+    bottlenecks=4,
+)
+
+
+class TestQuantileSketch:
+    """Test the streaming quantile estimate."""
+
+    def test_small_counts_are_exact(self):
+        """Up to five values the quantile is read off the sorted values."""
+        sketch = QuantileSketch(0.5)
+        assert sketch.value is None
+
+        for value in (5.0, 1.0, 3.0):
+            sketch.add(value)
+
+        assert sketch.value == 3.0
+
+    @pytest.mark.parametrize("quantile", [0.5, 0.9, 0.99])
+    def test_estimate(self, quantile):
+        """The estimate is close to the exact quantile of a long stream."""
+        rng = random.Random(1)
+        values = [rng.expovariate(1.0) for _ in range(20000)]
+        sketch = QuantileSketch(quantile)
+        for value in values:
+            sketch.add(value)
+
+        exact = sorted(values)[int(quantile * len(values))]
+        assert sketch.value == pytest.approx(exact, rel=0.05)
+        assert sketch.count == len(values)
+
+    def test_invalid_quantile(self):
+        """Quantiles must lie strictly between 0 and 1."""
+        with pytest.raises(ValueError):
+            QuantileSketch(1.0)
+
+
+class TestStreamingScorer:
+    """Test the scorer's bounded state."""
+
+    def test_retain_bounds_memory(self):
+        """Only the most recent scores are kept, statistics cover all of them."""
+        scorer = RuleScorer(retain=3)
+        for _ in range(10):
+            scorer.score(SIMPLE)
+        scorer.score(COMPLEX)
+
+        assert len(scorer.batch_normalize()) == 3
+        assert scorer.summary.count == 11
+        assert scorer.summary.max_score == scorer.score(COMPLEX).raw_score
+
+        streaming = RuleScorer(retain=0)
+        streaming.score(SIMPLE)
+        assert streaming.batch_normalize() == []
+        assert streaming.summary.count == 1
+
+    def test_default_retain_is_bounded(self):
+        """By default only a window of recent scores is kept; None keeps all."""
+        assert RuleScorer().retain == DEFAULT_RETAIN == 10_000
+
+        scorer = RuleScorer(retain=4)
+        unbounded = RuleScorer(retain=None)
+        for _ in range(6):
+            scorer.score(SIMPLE)
+            unbounded.score(SIMPLE)
+
+        assert len(scorer.batch_normalize()) == 4
+        assert len(unbounded.batch_normalize()) == 6
+
+    def test_lazy_normalization(self):
+        """Earlier scores are normalized against the statistics as they are now."""
+        scorer = RuleScorer(retain=0)
+        early = scorer.score(make_analysis(cyclomatic_complexity=4))
+        for _ in range(5):
+            scorer.score(COMPLEX)
+
+        later = scorer.normalize(early)
+
+        assert later.raw_score == early.raw_score
+        assert later.normalized_score < early.normalized_score
+        assert later.contributing_factors == early.contributing_factors
+
+    def test_reference_quantile(self):
+        """Normalizing to a quantile keeps an outlier from compressing the rest."""
+        by_max = RuleScorer(retain=0)
+        by_median = RuleScorer(retain=0, reference_quantile=0.5)
+        moderate = make_analysis(
+            time_complexity=ComplexityClass.QUADRATIC,
+            cyclomatic_complexity=20,
+            ast_node_count=200,
+        )
+        for scorer in (by_max, by_median):
+            scorer.score(COMPLEX)
+            for _ in range(20):
+                scorer.score(moderate)
+
+        assert 0.5 in by_median.quantiles
+        assert by_median.quantile(0.5) < by_median.summary.max_score
+        assert (
+            by_median.score(moderate).normalized_score
+            > by_max.score(moderate).normalized_score
+        )
+
+
+class TestScoringEpochs:
+    """Test dividing scoring into epochs."""
+
+    def test_start_epoch(self):
+        """A new epoch starts from fresh statistics and no retained scores."""
+        scorer = RuleScorer()
+        scorer.score(COMPLEX)
+        scorer.score(SIMPLE)
+
+        finished = scorer.start_epoch()
+
+        assert (finished.epoch, finished.count) == (0, 2)
+        assert finished.quantiles[0.5] is not None
+        assert scorer.last_epoch is finished
+        assert scorer.summary.epoch == 1
+        assert scorer.summary.count == 0
+        assert scorer.batch_normalize() == []
+
+    def test_epoch_size(self):
+        """Epochs of a fixed size start automatically."""
+        scorer = RuleScorer(epoch_size=4)
+        for _ in range(10):
+            scorer.score(SIMPLE)
+
+        assert scorer.summary.epoch == 2
+        assert scorer.summary.count == 2
+        assert scorer.last_epoch.count == 4
+        assert len(scorer.batch_normalize()) == 2
+
+    def test_custom_weights_keep_settings(self):
+        """with_custom_weights keeps the streaming settings."""
+        scorer = RuleScorer(retain=5, epoch_size=10, reference_quantile=0.9)
+
+        weighted = scorer.with_custom_weights(dict(scorer.weights))
+
+        assert (weighted.retain, weighted.epoch_size) == (5, 10)
+        assert weighted.reference_quantile == 0.9
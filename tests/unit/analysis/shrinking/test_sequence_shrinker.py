@@ -0,0 +1,123 @@
+"""
+Tests for the delta-debugging sequence shrinker.
+"""
+
+import time
+
+import pytest
+
+from seqrule import AbstractObject
+from seqrule.analysis import SequenceShrinker, ShrinkResult
+
+
+def no_three_increasing(seq):
+    """Rule that fails on three strictly increasing consecutive values."""
+    return not any(
+        seq[i]["value"] < seq[i + 1]["value"] < seq[i + 2]["value"]
+        for i in range(len(seq) - 2)
+    )
+
+
+def no_two_and_three(seq):
+    """Rule that fails when both 2 and 3 appear anywhere."""
+    values = {obj["value"] for obj in seq}
+    return not (2 in values and 3 in values)
+
+
+class TestSequenceShrinker:
+    """Test cases for SequenceShrinker."""
+
+    def test_passing_and_empty_sequences(self):
+        """Test that nothing is returned when there is nothing to shrink."""
+        shrinker = SequenceShrinker(no_two_and_three)
+        assert shrinker.shrink([]) is None
+        assert shrinker.shrink([AbstractObject(value=2)]) is None
+
+    def test_finds_one_minimal_subsequence(self):
+        """Test that the result is 1-minimal and preserves order."""
+        sequence = [AbstractObject(value=v) for v in [7, 3, 1, 9, 9, 2, 5]]
+        result = SequenceShrinker(no_two_and_three).shrink(sequence)
+
+        assert isinstance(result, ShrinkResult)
+        assert [obj["value"] for obj in result.sequence] == [3, 2]
+        assert not result.exhausted
+
+    def test_cache_avoids_reevaluation(self):
+        """Test that identical candidates are answered from the cache."""
+        calls = []
+
+        def counting_rule(seq):
+            calls.append(len(seq))
+            return no_three_increasing(seq)
+
+        sequence = [AbstractObject(value=v) for v in [5, 4, 1, 2, 3, 0, 9, 8]]
+        result = SequenceShrinker(counting_rule).shrink(sequence)
+
+        assert len(result.sequence) == 3
+        assert not no_three_increasing(result.sequence)
+        assert result.evaluations == len(calls)
+        assert result.cache_hits > 0
+
+    def test_large_sequence_shrinks_quickly(self):
+        """Test that a 100k-element failure is triaged in seconds."""
+        sequence = [AbstractObject(value=1) for _ in range(100_000)]
+        sequence[61_234] = AbstractObject(value=2)
+        sequence[87_001] = AbstractObject(value=3)
+
+        start = time.perf_counter()
+        result = SequenceShrinker(no_two_and_three).shrink(sequence)
+        elapsed = time.perf_counter() - start
+
+        assert [obj["value"] for obj in result.sequence] == [2, 3]
+        assert elapsed < 10.0
+
+    def test_evaluation_budget(self):
+        """Test that shrinking stops with a failing sequence when the budget runs out."""
+        sequence = [AbstractObject(value=v) for v in range(1, 40)]
+        result = SequenceShrinker(no_three_increasing, max_evaluations=3).shrink(sequence)
+
+        assert result.exhausted
+        assert result.evaluations <= 3
+        assert not no_three_increasing(result.sequence)
+
+    def test_time_budget(self):
+        """Test that a zero time limit returns the original failing sequence."""
+        sequence = [AbstractObject(value=v) for v in range(1, 10)]
+        result = SequenceShrinker(no_three_increasing, time_limit=0.0).shrink(sequence)
+
+        assert result.exhausted
+        assert result.sequence == sequence
+
+    def test_property_shrinking(self):
+        """Test that irrelevant properties are dropped and values simplified."""
+
+        def no_red_heavy(seq):
+            return not any(obj["color"] == "red" and obj["weight"] > 5 for obj in seq)
+
+        sequence = [
+            AbstractObject(color="blue", weight=9, label="a"),
+            AbstractObject(color="red", weight=7, label="b", tags=["x"]),
+        ]
+        result = SequenceShrinker(no_red_heavy, shrink_properties=True).shrink(sequence)
+
+        assert result.sequence == [AbstractObject(color="red", weight=7)]
+
+    def test_parallel_evaluation(self):
+        """Test that worker processes produce the same result as serial shrinking."""
+        sequence = [AbstractObject(value=v) for v in [7, 3, 1, 9, 9, 2, 5, 4, 8, 6]]
+        serial = SequenceShrinker(no_two_and_three).shrink(sequence)
+        parallel = SequenceShrinker(no_two_and_three, workers=2).shrink(sequence)
+
+        assert parallel.sequence == serial.sequence
+
+
+@pytest.mark.parametrize("values", [[3, 4], [0, 1, 2, 3, 4]])
+def test_rule_analyzer_uses_shrinker(values):
+    """Test that RuleAnalyzer.find_minimal_failing_sequence returns a minimal failure."""
+    from seqrule.analysis import RuleAnalyzer
+
+    sequence = [AbstractObject(value=v) for v in values]
+    minimal = RuleAnalyzer().find_minimal_failing_sequence(
+        lambda seq: all(obj["value"] < 3 for obj in seq), sequence
+    )
+    assert [obj["value"] for obj in minimal] == [3]
@@ -0,0 +1,139 @@
+"""
+Tests for benchmark baselines and regression checks.
+
+These tests verify the JSON round trip of baselines, the Mann-Whitney U test,
+the classification of changes and the exit status of the command line.
+"""
+
+import random
+
+import pytest
+
+from seqrule.bench import Baseline, BenchmarkResult, compare, mann_whitney_p
+from seqrule.bench import baseline as baseline_module
+from seqrule.bench.cli import main
+
+
+def timings(median, count=30, seed=0):
+    rng = random.Random(seed)
+    return [median * rng.uniform(0.95, 1.05) for _ in range(count)]
+
+
+def make_baseline(median, name="dsl.and", size=10, seed=0, **metadata):
+    return Baseline(
+        [BenchmarkResult(name, size, timings(median, seed=seed))], dict(metadata)
+    )
+
+
+class TestBaseline:
+    """Test storing baselines."""
+
+    def test_round_trip(self, tmp_path):
+        """Saved baselines load with the same results and metadata."""
+        path = str(tmp_path / "baseline.json")
+        original = make_baseline(1e-3, python="3.11.0")
+
+        original.save(path)
+        loaded = Baseline.load(path)
+
+        assert loaded == original
+        assert loaded.get("dsl.and", 10).median == original.results[0].median
+        assert loaded.get("dsl.and", 100) is None
+
+    def test_unknown_format(self):
+        """Baselines of another format version are rejected."""
+        with pytest.raises(ValueError, match="Unsupported baseline format"):
+            Baseline.from_dict({"format": 99, "results": []})
+
+
+class TestMannWhitney:
+    """Test the Mann-Whitney U test."""
+
+    @pytest.mark.parametrize("use_scipy", [False, True])
+    def test_p_values(self, monkeypatch, use_scipy):
+        """Shifted samples are significant and identical distributions aren't."""
+        if use_scipy:
+            pytest.importorskip("scipy")
+        monkeypatch.setattr(baseline_module, "HAS_SCIPY", use_scipy)
+
+        assert mann_whitney_p(timings(1.0), timings(1.3, seed=1)) < 1e-6
+        assert mann_whitney_p(timings(1.0), timings(1.0, seed=1)) > 0.01
+        assert mann_whitney_p([1.0] * 5, [1.0] * 5) == 1.0
+        assert mann_whitney_p([], [1.0]) == 1.0
+
+
+class TestCompare:
+    """Test comparing runs."""
+
+    def test_regression(self):
+        """A significant slowdown beyond the threshold is a regression."""
+        comparison = compare(make_baseline(1e-3), make_baseline(1.3e-3, seed=1))
+
+        assert [c.name for c in comparison.regressions] == ["dsl.and"]
+        assert comparison.regressions[0].ratio == pytest.approx(1.3, rel=0.05)
+        assert not comparison.ok
+        assert "1 regressions" in str(comparison)
+
+    def test_improvement(self):
+        """A significant speedup is an improvement and passes."""
+        comparison = compare(make_baseline(1e-3), make_baseline(0.7e-3, seed=1))
+
+        assert len(comparison.improvements) == 1
+        assert comparison.ok
+
+    def test_small_change_ignored(self):
+        """Significant changes below the threshold are unchanged."""
+        comparison = compare(
+            make_baseline(1e-3), make_baseline(1.05e-3, seed=1), threshold=0.1
+        )
+
+        assert comparison.changes[0].status == "unchanged"
+
+    def test_missing_and_added(self):
+        """Benchmarks in only one run are listed separately."""
+        comparison = compare(
+            make_baseline(1e-3, name="dsl.or"), make_baseline(1e-3, name="dsl.not")
+        )
+
+        assert comparison.missing == [("dsl.or", 10)]
+        assert comparison.added == [("dsl.not", 10)]
+        assert comparison.changes == []
+
+    def test_environment_warning(self):
+        """Runs from different Python versions are flagged."""
+        comparison = compare(
+            make_baseline(1e-3, python="3.11.0"), make_baseline(1e-3, python="3.12.0")
+        )
+
+        assert comparison.warnings == ["python differs: 3.11.0 -> 3.12.0"]
+
+
+class TestCommandLine:
+    """Test the seqrule-bench command."""
+
+    def test_compare_exit_status(self, tmp_path, capsys):
+        """compare exits with 1 on regressions and 0 otherwise."""
+        old, slow, same = (str(tmp_path / f"{n}.json") for n in ("old", "slow", "same"))
+        make_baseline(1e-3).save(old)
+        make_baseline(1.5e-3, seed=1).save(slow)
+        make_baseline(1e-3, seed=2).save(same)
+
+        assert main(["compare", old, slow]) == 1
+        assert "regression" in capsys.readouterr().out
+        assert main(["compare", old, same]) == 0
+
+    def test_run_and_compare(self, tmp_path, capsys):
+        """A stored run can be compared by rerunning its benchmarks."""
+        path = str(tmp_path / "baseline.json")
+        options = ["-k", "dsl.not", "--samples", "3", "--min-round-time", "0"]
+
+        assert main(["run", *options, "--sizes", "5", "--output", path]) == 0
+        assert Baseline.load(path).get("dsl.not", 5) is not None
+
+        assert main(["compare", path, *options]) == 0
+        assert "1 benchmarks compared" in capsys.readouterr().out
+
+    def test_list(self, capsys):
+        """list prints the benchmark names."""
+        assert main(["list", "-k", "generators"]) == 0
+        assert "generators.MCMCSampler" in capsys.readouterr().out.split()
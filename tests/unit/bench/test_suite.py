@@ -0,0 +1,118 @@
+"""
+Tests for the benchmark matrix and corpora.
+
+These tests verify that the corpora are deterministic, that the matrix covers
+every ruleset factory, and that every benchmark runs on a small corpus.
+"""
+
+import inspect
+
+import pytest
+
+from seqrule.analysis.performance import PerformanceProfiler
+from seqrule.bench import (
+    DOMAINS,
+    default_suite,
+    make_corpus,
+    run_benchmarks,
+    select,
+)
+from seqrule.rulesets import dna, eleusis, general, music, pipeline, tea
+
+
+class TestCorpora:
+    """Test the synthetic corpora."""
+
+    @pytest.mark.parametrize("domain", DOMAINS)
+    def test_deterministic(self, domain):
+        """A corpus is identical for the same domain, size and seed."""
+        first = make_corpus(domain, 20)
+
+        assert len(first) == 20
+        assert first == make_corpus(domain, 20)
+        assert first != make_corpus(domain, 20, seed=1)
+
+    def test_unknown_domain(self):
+        """Unknown domains are rejected."""
+        with pytest.raises(ValueError, match="Unknown corpus domain"):
+            make_corpus("chess", 5)
+
+
+class TestSuite:
+    """Test the benchmark matrix."""
+
+    def test_covers_every_ruleset_factory(self):
+        """Every create_* function defined in a ruleset module is benchmarked."""
+        names = {benchmark.name for benchmark in default_suite()}
+
+        for module in (general, dna, eleusis, music, pipeline, tea):
+            domain = module.__name__.rsplit(".", 1)[-1]
+            for name, func in inspect.getmembers(module, inspect.isfunction):
+                if name.startswith("create_") and func.__module__ == module.__name__:
+                    assert f"rulesets.{domain}.{name}" in names
+
+    def test_groups(self):
+        """The matrix includes DSL, generator and analyzer benchmarks."""
+        groups = {benchmark.group for benchmark in default_suite()}
+
+        assert {"rulesets", "dsl", "generators", "analysis"} <= groups
+
+    def test_names_unique(self):
+        """Benchmark names identify baseline entries, so they are unique."""
+        names = [benchmark.name for benchmark in default_suite()]
+
+        assert len(names) == len(set(names))
+
+    def test_select(self):
+        """Patterns match by wildcard or by prefix."""
+        suite = default_suite()
+
+        assert {b.group for b in select(suite, ["rulesets.dna.*"])} == {"rulesets"}
+        assert [b.name for b in select(suite, ["dsl.not"])] == ["dsl.not"]
+        assert select(suite, None) == suite
+
+    def test_every_benchmark_runs(self):
+        """Each benchmark's operation runs on a small corpus."""
+        for benchmark in default_suite():
+            benchmark.setup(5)()
+
+    def test_run_benchmarks(self):
+        """Runs record samples per benchmark and size with metadata."""
+        seen = []
+        profiler = PerformanceProfiler(samples=3)
+
+        baseline = run_benchmarks(
+            select(default_suite(), ["dsl.and"]),
+            sizes=[4, 8],
+            profiler=profiler,
+            progress=seen.append,
+        )
+
+        keys = [result.key for result in baseline.results]
+        assert keys == [
+            ("dsl.and", 4),
+            ("dsl.and", 8),
+            ("dsl.and_atomic", 4),
+            ("dsl.and_atomic", 8),
+        ]
+        assert seen == baseline.results
+        assert all(len(result.samples) == 3 for result in baseline.results)
+        assert baseline.metadata["python"]
+        assert baseline.metadata["samples"] == 3
+
+    def test_run_benchmarks_keeps_outliers(self, monkeypatch):
+        """The default profiler records every sample, without outlier rejection."""
+        profilers = []
+        benchmarking = PerformanceProfiler.benchmarking.__func__
+
+        def record(cls, *args, **kwargs):
+            profilers.append(benchmarking(cls, *args, **kwargs))
+            profilers[-1].min_round_time = 0
+            return profilers[-1]
+
+        monkeypatch.setattr(PerformanceProfiler, "benchmarking", classmethod(record))
+        baseline = run_benchmarks(select(default_suite(), ["dsl.not"]), sizes=[4])
+
+        assert profilers[0].outlier_threshold is None
+        assert baseline.metadata["outlier_threshold"] is None
+        assert [len(result.samples) for result in baseline.results] == [20]
@@ -0,0 +1,141 @@
+"""
+Unit tests for vectorized bulk sequence generation.
+"""
+
+import os
+
+import pytest
+
+from seqrule import AbstractObject
+from seqrule.generators import BulkGenerator, SequenceFrame, generate_bulk, read_frames
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def simple_domain():
+    """Provide a simple domain of abstract objects for testing."""
+    return [
+        AbstractObject(value=1, color="red"),
+        AbstractObject(value=2, color="blue"),
+        AbstractObject(value=3, color="green"),
+    ]
+
+
+def test_frame_shape_and_materialization(simple_domain):
+    """Test that frames hold index matrices and materialize to domain objects."""
+    generator = BulkGenerator(simple_domain, max_length=5, seed=1)
+    frame = generator.frame(1000)
+
+    assert isinstance(frame, SequenceFrame)
+    assert len(frame) == 1000
+    assert frame.indices.shape[0] == 1000
+    assert frame.indices.dtype == np.uint8
+    assert frame.lengths.min() >= 0 and frame.lengths.max() <= 5
+
+    sequences = frame.to_sequences()
+    assert [len(seq) for seq in sequences] == frame.lengths.tolist()
+    assert all(obj in simple_domain for seq in sequences for obj in seq)
+    assert frame[3] == sequences[3]
+
+
+def test_no_hard_cap(simple_domain):
+    """Test that more than 100 sequences are generated across batches."""
+    generator = BulkGenerator(simple_domain, max_length=3, batch_size=256, seed=2)
+    frames = list(generator.frames(1000))
+
+    assert [len(frame) for frame in frames] == [256, 256, 256, 232]
+    assert sum(1 for _ in generator.generate(500)) == 500
+
+
+def test_seed_reproducibility(simple_domain):
+    """Test that the same seed produces the same sequences."""
+    first = BulkGenerator(simple_domain, seed=42).frame(50).to_sequences()
+    second = BulkGenerator(simple_domain, seed=42).frame(50).to_sequences()
+    assert first == second
+
+
+def test_length_distributions(simple_domain):
+    """Test fixed, weighted, and callable length distributions."""
+    fixed = BulkGenerator(simple_domain, max_length=4, length_distribution=4, seed=0)
+    assert set(fixed.frame(100).lengths.tolist()) == {4}
+
+    weighted = BulkGenerator(
+        simple_domain, max_length=4, length_distribution={1: 0.0, 3: 1.0}, seed=0
+    )
+    assert set(weighted.frame(100).lengths.tolist()) == {3}
+
+    custom = BulkGenerator(
+        simple_domain,
+        max_length=4,
+        length_distribution=lambda rng, n: rng.integers(2, 3, size=n),
+        seed=0,
+    )
+    assert set(custom.frame(100).lengths.tolist()) == {2}
+
+    too_long = BulkGenerator(simple_domain, max_length=2, length_distribution=5)
+    with pytest.raises(ValueError):
+        too_long.frame(10)
+
+    too_short = BulkGenerator(
+        simple_domain, min_length=2, max_length=4, length_distribution={1: 1.0, 3: 1.0}
+    )
+    with pytest.raises(ValueError, match=r"\[2, 4\]"):
+        too_short.frame(10)
+
+
+def test_column_extraction(simple_domain):
+    """Test extracting a property column with padding."""
+    generator = BulkGenerator(
+        simple_domain, max_length=3, length_distribution={1: 1.0, 3: 1.0}, seed=3
+    )
+    frame = generator.frame(20)
+    colors = frame.column("color")
+
+    assert colors.shape == frame.indices.shape
+    for row, seq in zip(colors, frame):
+        assert list(row[: len(seq)]) == [obj["color"] for obj in seq]
+        assert all(value is None for value in row[len(seq) :])
+
+
+def test_write_and_read_frames(simple_domain, tmp_path):
+    """Test writing frames to disk and reading them back."""
+    generator = BulkGenerator(simple_domain, max_length=4, batch_size=30, seed=5)
+    paths = generator.write(str(tmp_path), 70)
+    assert len(paths) == 3
+
+    expected = BulkGenerator(simple_domain, max_length=4, batch_size=30, seed=5)
+    expected_sequences = list(expected.generate(70))
+    loaded = [seq for frame in read_frames(str(tmp_path), simple_domain) for seq in frame]
+    assert loaded == expected_sequences
+
+    # A shorter run replaces the earlier run's frames instead of mixing with them
+    (tmp_path / "notes.txt").write_text("kept")
+    rewritten = BulkGenerator(simple_domain, max_length=4, batch_size=30, seed=6)
+    assert len(rewritten.write(str(tmp_path), 20)) == 1
+    loaded = [seq for frame in read_frames(str(tmp_path), simple_domain) for seq in frame]
+    assert loaded == list(
+        BulkGenerator(simple_domain, max_length=4, batch_size=30, seed=6).generate(20)
+    )
+    assert sorted(os.listdir(tmp_path)) == [
+        "checkpoint.json.gz",
+        "frame-000000.npz",
+        "notes.txt",
+    ]
+
+
+def test_generate_bulk_and_validation(simple_domain):
+    """Test the generate_bulk factory and parameter validation."""
+    frames = list(generate_bulk(simple_domain, 10, max_length=2, seed=1))
+    assert sum(len(frame) for frame in frames) == 10
+
+    # Dict domains are normalized to AbstractObjects
+    frame = BulkGenerator([{"value": 1}], seed=1).frame(5)
+    assert all(isinstance(obj, AbstractObject) for seq in frame for obj in seq)
+
+    with pytest.raises(ValueError):
+        BulkGenerator([])
+    with pytest.raises(ValueError):
+        BulkGenerator(simple_domain, min_length=3, max_length=2)
+    with pytest.raises(ValueError):
+        BulkGenerator(simple_domain, batch_size=0)
@@ -0,0 +1,134 @@
+"""
+Unit tests for generator checkpointing and resume.
+"""
+
+import gzip
+import json
+from itertools import islice
+
+import pytest
+
+from seqrule import AbstractObject
+from seqrule.generators import ConstrainedGenerator, LazyGenerator
+from seqrule.generators.checkpoint import load_checkpoint, save_checkpoint
+from seqrule.generators.constrained import GeneratorConfig
+
+
+@pytest.fixture
+def domain():
+    """Provide a small domain of colored objects."""
+    return [
+        AbstractObject(value=i, color=color)
+        for i, color in enumerate(["red", "blue", "green"])
+    ]
+
+
+def values(sequences):
+    """Reduce sequences to comparable value tuples."""
+    return [tuple(obj["value"] for obj in seq) for seq in sequences]
+
+
+def no_adjacent_repeats(seq):
+    """Rule rejecting sequences with two equal neighbouring colors."""
+    return all(a["color"] != b["color"] for a, b in zip(seq, seq[1:]))
+
+
+def test_save_and_load_checkpoint(tmp_path):
+    """Test the checkpoint file round trip and validation."""
+    path = str(tmp_path / "state.json.gz")
+    save_checkpoint(path, {"kind": "lazy", "emitted": 3})
+
+    assert load_checkpoint(path, "lazy")["emitted"] == 3
+    with pytest.raises(ValueError, match="constrained"):
+        load_checkpoint(path, "constrained")
+
+    with gzip.open(path, "wt") as f:
+        json.dump({"version": 99, "kind": "lazy"}, f)
+    with pytest.raises(ValueError, match="version"):
+        load_checkpoint(path, "lazy")
+
+
+def test_constrained_resume_matches_uninterrupted_run(domain, tmp_path):
+    """Test that an interrupted constrained run resumes without gaps or duplicates."""
+
+    def make_generator():
+        generator = ConstrainedGenerator(domain, GeneratorConfig(seed=7))
+        generator.add_constraint(no_adjacent_repeats)
+        return generator
+
+    expected = values(make_generator().generate(max_length=5))
+
+    path = str(tmp_path / "constrained.json.gz")
+    first = make_generator().generate(
+        max_length=5, checkpoint_path=path, checkpoint_interval=10
+    )
+    head = values(islice(first, 25))
+    first.close()  # Simulate the job being killed
+
+    saved = load_checkpoint(path, "constrained")["emitted"]
+    assert saved == 20
+
+    resumed = values(
+        make_generator().generate(
+            max_length=5, checkpoint_path=path, checkpoint_interval=10
+        )
+    )
+    assert head[:saved] + resumed == expected
+
+    # A completed run leaves a checkpoint that yields nothing further
+    assert list(make_generator().generate(max_length=5, checkpoint_path=path)) == []
+
+
+def test_constrained_rejects_foreign_checkpoint(domain, tmp_path):
+    """Test that resuming with a different domain is rejected."""
+    path = str(tmp_path / "constrained.json.gz")
+    list(ConstrainedGenerator(domain).generate(max_length=2, checkpoint_path=path))
+
+    with pytest.raises(ValueError):
+        next(
+            ConstrainedGenerator(domain[:2]).generate(
+                max_length=2, checkpoint_path=path
+            )
+        )
+
+
+def test_lazy_restore_continues_sequence(domain, tmp_path):
+    """Test that a restored lazy generator continues where it left off."""
+    path = str(tmp_path / "lazy.json.gz")
+    original = LazyGenerator(
+        domain, max_length=4, filter_rule=no_adjacent_repeats, seed=3
+    )
+    for _ in range(17):
+        original()
+    original.checkpoint(path)
+    expected = values(original() for _ in range(40))
+
+    restored = LazyGenerator(domain, max_length=4, filter_rule=no_adjacent_repeats)
+    restored.restore(path)
+
+    assert restored.emitted == 17
+    assert values(restored() for _ in range(40)) == expected
+    assert restored.stats.keys() == original.stats.keys()
+
+    with pytest.raises(ValueError):
+        LazyGenerator(domain[:1]).restore(path)
+
+
+def test_bulk_write_resume(domain, tmp_path):
+    """Test that bulk writing resumes after the last complete frame."""
+    pytest.importorskip("numpy")
+    from seqrule.generators import BulkGenerator, read_frames
+
+    full_dir = tmp_path / "full"
+    BulkGenerator(domain, max_length=4, batch_size=10, seed=5).write(str(full_dir), 45)
+    expected = [values(frame) for frame in read_frames(str(full_dir), domain)]
+
+    partial_dir = str(tmp_path / "partial")
+    generator = BulkGenerator(domain, max_length=4, batch_size=10, seed=5)
+    generator.write(partial_dir, 20)  # Two frames written before the "crash"
+
+    paths = BulkGenerator(domain, max_length=4, batch_size=10, seed=0).write(
+        partial_dir, 45, resume=True
+    )
+    assert len(paths) == 3
+    assert [values(frame) for frame in read_frames(partial_dir, domain)] == expected
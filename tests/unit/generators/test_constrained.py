@@ -417,3 +417,107 @@ def test_generate_with_candidate_failing_patterns(card_domain):
     # Restore the original methods
     generator._satisfies_constraints = original_satisfies_constraints
     generator._satisfies_patterns = original_satisfies_patterns
+
+
+def value_step(prefix, item):
+    """Step score rewarding high card values."""
+    return item["value"]
+
+
+def test_beam_search_returns_best_sequences(card_domain):
+    """Test that beam search finds the top-scoring valid sequences."""
+    generator = ConstrainedGenerator(card_domain)
+    generator.add_constraint(
+        lambda seq: all(a["color"] != b["color"] for a, b in zip(seq, seq[1:]))
+    )
+
+    results = generator.beam_search(value_step, max_length=3, beam_width=4, top_k=2)
+
+    assert len(results) == 2
+    assert [score for score, _ in results] == [10, 9]
+    best_score, best = results[0]
+    assert [obj["value"] for obj in best] == [4, 2, 4]
+    assert best_score == sum(obj["value"] for obj in best)
+
+
+def test_beam_search_width_one_is_greedy(card_domain):
+    """Test that a beam of width one follows the greedy path."""
+    generator = ConstrainedGenerator(card_domain)
+    generator.add_constraint(lambda seq: len(set(map(id, seq))) == len(seq))
+
+    ((score, sequence),) = generator.beam_search(value_step, max_length=4, beam_width=1)
+
+    assert [obj["value"] for obj in sequence] == [4, 3, 2, 1]
+    assert score == 10
+
+    with pytest.raises(ValueError):
+        generator.beam_search(value_step, beam_width=0)
+
+    with pytest.raises(ValueError, match="top_k"):
+        generator.beam_search(value_step, beam_width=1, top_k=0)
+
+
+def test_best_first_yields_in_cost_order(card_domain):
+    """Test that best-first search with costs yields sequences cheapest first."""
+    generator = ConstrainedGenerator(card_domain)
+    results = list(
+        generator.best_first(lambda prefix, item: -item["value"], max_length=2)
+    )
+
+    scores = [score for score, _ in results]
+    assert scores == sorted(scores, reverse=True)
+    assert len(results) == 1 + 4 + 16
+    assert results[0] == (0.0, [])
+    assert all(score == -sum(obj["value"] for obj in seq) for score, seq in results)
+
+
+def test_best_first_bounded_frontier(card_domain):
+    """Test that best-first search respects the frontier bound and patterns."""
+    generator = ConstrainedGenerator(card_domain)
+    generator.add_pattern(PropertyPattern("color", ["red", "black"], is_cyclic=True))
+
+    results = list(
+        generator.best_first(
+            lambda prefix, item: -item["value"], max_length=6, max_frontier=3
+        )
+    )
+
+    assert results
+    for _, seq in results:
+        colors = [obj["color"] for obj in seq]
+        assert colors == ["red", "black"] * (len(colors) // 2) + ["red"] * (len(colors) % 2)
+
+
+def test_score_delta_wraps_sequence_scores(card_domain):
+    """Test that whole-sequence scores can drive beam search."""
+    from seqrule.generators import score_delta
+
+    def diversity(seq):
+        return len({obj["suit"] for obj in seq})
+
+    generator = ConstrainedGenerator(card_domain)
+    ((score, sequence),) = generator.beam_search(
+        score_delta(diversity), max_length=4, beam_width=8, top_k=1
+    )
+
+    assert score == 4
+    assert diversity(sequence) == 4
+
+
+def test_searches_only_return_sequences_generate_accepts(card_domain):
+    """Test that every beam and best-first result passes generate's check."""
+    generator = ConstrainedGenerator(card_domain)
+    # Checking this pattern from the last item alone accepts three reds in a row
+    generator.add_pattern(
+        PropertyPattern("color", ["red", "red", "black"], is_cyclic=True)
+    )
+
+    beam = generator.beam_search(value_step, max_length=5, beam_width=50, top_k=100)
+    best = list(generator.best_first(value_step, max_length=5))
+
+    assert beam
+    assert best
+    for _, seq in beam + best:
+        assert generator._satisfies_constraints(seq)
+        assert generator._satisfies_patterns(seq)
+    assert max(len(seq) for _, seq in best) == 5
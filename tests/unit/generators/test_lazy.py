@@ -7,7 +7,7 @@ import itertools
 import pytest
 
 from seqrule import AbstractObject
-from seqrule.generators import LazyGenerator, generate_lazy
+from seqrule.generators import GenerationExhaustedError, LazyGenerator, generate_lazy
 
 
 @pytest.fixture
@@ -225,3 +225,100 @@ def test_lazy_generator_iterator_exhaustion():
     # Test that we can iterate again after exhaustion
     more_sequences = list(itertools.islice(generator, 5))
     assert len(more_sequences) > 0
+
+
+def test_lazy_generator_selective_filter_is_iterative(simple_domain):
+    """Test that an impossible filter stops instead of recursing or spinning."""
+
+    def reject_all(seq):
+        return False
+
+    generator = LazyGenerator(
+        simple_domain, max_length=50, filter_rule=reject_all, max_attempts_per_length=50
+    )
+
+    # Every length is rejected, so the generator must report exhaustion
+    with pytest.raises(GenerationExhaustedError):
+        generator()
+
+    assert generator.exhausted
+    stats = generator.stats
+    assert all(s.infeasible and s.accepted == 0 for s in stats.values())
+    # Attempts per length are bounded by the budget
+    assert all(s.attempted <= 50 for s in stats.values())
+    assert list(generator) == []
+
+
+def test_lazy_generator_stats_tracking(simple_domain):
+    """Test that acceptance statistics are tracked per length."""
+
+    def starts_red(seq):
+        return not seq or seq[0]["color"] == "red"
+
+    generator = LazyGenerator(
+        simple_domain, max_length=3, filter_rule=starts_red, seed=7
+    )
+    sequences = list(generator)
+
+    assert all(starts_red(seq) for seq in sequences)
+    stats = generator.stats
+    assert set(stats) == {0, 1, 2, 3}
+    for length in (1, 2, 3):
+        assert stats[length].accepted > 0
+        assert stats[length].attempted >= stats[length].accepted
+        assert 0.0 < stats[length].rate <= 1.0
+        assert not stats[length].infeasible
+
+
+def test_lazy_generator_skips_infeasible_lengths(simple_domain):
+    """Test that infeasible lengths are skipped while feasible ones keep producing."""
+
+    def short_only(seq):
+        return len(seq) <= 1
+
+    generator = LazyGenerator(
+        simple_domain, max_length=4, filter_rule=short_only, max_attempts_per_length=20
+    )
+    sequences = [generator() for _ in range(200)]
+
+    assert all(len(seq) <= 1 for seq in sequences)
+    assert generator.stats[4].infeasible
+    assert not generator.exhausted
+
+
+def test_lazy_generator_iteration_yields_valid_sequences_only(simple_domain):
+    """Test that a full pass ends once every length has been visited."""
+    generator = LazyGenerator(simple_domain, max_length=2, seed=3)
+    sequences = list(generator)
+
+    # One empty sequence plus the per-length quotas for lengths 1 and 2
+    assert len(sequences) == 1 + 20 + 30
+    assert sequences[0] == []
+
+
+def test_lazy_generator_exhaustion_inside_generator(simple_domain):
+    """Test that exhaustion isn't turned into a RuntimeError by PEP 479."""
+    generator = LazyGenerator(
+        simple_domain,
+        max_length=3,
+        filter_rule=lambda seq: False,
+        max_attempts_per_length=10,
+    )
+
+    def draw():
+        while True:
+            yield generator()
+
+    with pytest.raises(GenerationExhaustedError):
+        next(draw())
+
+
+def test_lazy_generator_lengths_over_one_hundred(simple_domain):
+    """Test that lengths over 100 still get a batch of at least one sequence."""
+    generator = LazyGenerator(
+        simple_domain, max_length=105, filter_rule=lambda seq: len(seq) > 100, seed=0
+    )
+
+    lengths = {len(seq) for seq in generator}
+
+    assert lengths == set(range(101, 106))
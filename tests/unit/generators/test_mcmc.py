@@ -0,0 +1,116 @@
+"""
+Unit tests for the MCMC sequence sampler.
+"""
+
+import pytest
+
+from seqrule import AbstractObject
+from seqrule.generators import (
+    ChainStats,
+    ConstrainedGenerator,
+    MCMCSampler,
+    PropertyPattern,
+    sample_mcmc,
+)
+
+
+@pytest.fixture
+def note_domain():
+    """Provide a domain of notes with pitches."""
+    return [AbstractObject(pitch=p, color=c) for p, c in zip(range(6), "rgbrgb")]
+
+
+def small_steps(seq):
+    """Hard rule: neighbouring pitches differ by at most two."""
+    return all(abs(a["pitch"] - b["pitch"]) <= 2 for a, b in zip(seq, seq[1:]))
+
+
+def no_repeats(seq):
+    """Soft rule: neighbouring pitches differ."""
+    return all(a["pitch"] != b["pitch"] for a, b in zip(seq, seq[1:]))
+
+
+def test_windowed_chain_respects_hard_rules(note_domain):
+    """Test that every sample of a long windowed chain satisfies the hard rules."""
+    sampler = MCMCSampler(
+        note_domain, hard=[small_steps], soft=[(no_repeats, 2.0)], window=2, seed=1
+    )
+    samples = sampler.sample(length=1000, samples=5, thin=200, burn_in=500)
+
+    assert len(samples) == 5
+    assert all(len(seq) == 1000 for seq in samples)
+    assert all(small_steps(seq) for seq in samples)
+    assert isinstance(sampler.stats, ChainStats)
+    assert sampler.stats.proposed == 1500
+    assert 0 < sampler.stats.acceptance_rate < 1
+    # The incrementally tracked energy matches a full re-evaluation
+    assert sampler.stats.energy == pytest.approx(sampler.energy(samples[-1]))
+
+
+def test_low_temperature_minimizes_energy(note_domain):
+    """Test that soft rules pull the chain towards low energy."""
+    sampler = MCMCSampler(
+        note_domain, soft=[no_repeats], window=2, temperature=0.05, seed=2
+    )
+    initial = [note_domain[0]] * 50
+    (sample,) = sampler.sample(
+        length=50, samples=1, thin=1, burn_in=3000, initial=initial
+    )
+
+    assert sampler.energy(initial) == 49
+    assert sampler.energy(sample) < 5
+
+
+def test_global_rules_and_invalid_initial(note_domain):
+    """Test whole-sequence rules and rejection of an invalid starting sequence."""
+
+    def distinct_colors(seq):
+        return len({obj["color"] for obj in seq}) == min(len(seq), 3)
+
+    sampler = MCMCSampler(note_domain, hard=[distinct_colors], seed=3)
+    samples = sampler.sample(length=3, samples=10, thin=5, burn_in=0)
+    assert all(distinct_colors(seq) for seq in samples)
+
+    with pytest.raises(ValueError):
+        sampler.sample(length=3, samples=1, initial=[note_domain[0]] * 3)
+    with pytest.raises(ValueError):
+        MCMCSampler([])
+    with pytest.raises(ValueError):
+        MCMCSampler(note_domain, window=0)
+
+
+def test_from_generator_uses_constraints_and_patterns(note_domain):
+    """Test building a sampler from a ConstrainedGenerator."""
+    generator = ConstrainedGenerator(note_domain)
+    generator.add_constraint(small_steps)
+    generator.add_pattern(PropertyPattern("color", ["r", "g", "b"], is_cyclic=True))
+
+    sampler = MCMCSampler.from_generator(generator, seed=4)
+    samples = sampler.sample(length=12, samples=5, thin=20, burn_in=0)
+
+    for seq in samples:
+        assert small_steps(seq)
+        assert [obj["color"] for obj in seq] == list("rgb" * 4)
+
+    with pytest.raises(ValueError):
+        MCMCSampler.from_generator(generator, window=3)
+
+
+def test_parallel_chains(note_domain):
+    """Test that independent chains run in worker processes."""
+    sampler = MCMCSampler(note_domain, hard=[small_steps], window=2, seed=5)
+    sequences, stats = sample_mcmc(
+        sampler, length=200, samples=3, chains=2, workers=2, thin=50, burn_in=100
+    )
+
+    assert len(sequences) == 6
+    assert len(stats) == 2
+    assert all(small_steps(seq) for seq in sequences)
+    assert all(chain.proposed == 250 for chain in stats)
+
+    serial, _ = sample_mcmc(
+        sampler, length=200, samples=3, chains=2, thin=50, burn_in=100
+    )
+    assert [[o["pitch"] for o in s] for s in serial] == [
+        [o["pitch"] for o in s] for s in sequences
+    ]
@@ -0,0 +1,140 @@
+"""
+Unit tests for the mutation-based counter-example search.
+"""
+
+import pytest
+
+from seqrule import AbstractObject
+from seqrule.generators import (
+    CounterExampleSearch,
+    SearchResult,
+    search_counter_examples,
+)
+
+
+@pytest.fixture
+def color_domain():
+    """Provide a domain with many colors so specific runs are rare."""
+    colors = ["red", "blue", "green", "yellow", "black", "white", "cyan", "pink"]
+    return [AbstractObject(value=i, color=color) for i, color in enumerate(colors)]
+
+
+def no_triple_red(seq):
+    """Rule that is only violated by three consecutive red objects."""
+    return not any(
+        all(obj["color"] == "red" for obj in seq[i : i + 3])
+        for i in range(len(seq) - 2)
+    )
+
+
+def test_finds_distinct_counter_examples(color_domain):
+    """Test that the search finds the requested number of distinct violations."""
+    search = CounterExampleSearch(no_triple_red, color_domain, max_length=8, seed=1)
+    result = search.run(max_examples=3, time_budget=5.0)
+
+    assert isinstance(result, SearchResult)
+    assert len(result.counter_examples) == 3
+    assert all(not no_triple_red(seq) for seq in result.counter_examples)
+    assert len({tuple(seq) for seq in result.counter_examples}) == 3
+    assert all(len(seq) <= 8 for seq in result.counter_examples)
+    assert result.evaluations > 0
+    assert result.evaluations_per_second > 0
+
+
+def test_distance_guides_search(color_domain):
+    """Test that a near-miss distance function is used to prioritize the corpus."""
+    calls = []
+
+    def red_distance(seq):
+        calls.append(seq)
+        return -sum(obj["color"] == "red" for obj in seq)
+
+    search = CounterExampleSearch(
+        no_triple_red, color_domain, max_length=8, distance=red_distance, seed=2
+    )
+    result = search.run(max_examples=2, time_budget=5.0)
+
+    assert len(result.counter_examples) == 2
+    assert calls
+
+
+def test_near_misses_expanded_first(color_domain):
+    """Test that without a distance, near misses are mutated before the rest."""
+
+    def shorter_than_six(seq):
+        return len(seq) < 6
+
+    evaluated = []
+    parents = []
+
+    class RecordingSearch(CounterExampleSearch):
+        def _fails(self, sequence):
+            evaluated.append(sequence)
+            return super()._fails(sequence)
+
+        def _mutate(self, sequence):
+            # Intermediate mutations of a child are never evaluated
+            if any(sequence is seq for seq in evaluated):
+                parents.append(sequence)
+            return super()._mutate(sequence)
+
+    # Only the last seed is one insertion away from violating the rule
+    seeds = [[obj] for obj in color_domain] + [color_domain[:5]]
+    search = RecordingSearch(
+        shorter_than_six, color_domain, max_length=8, seeds=seeds, seed=3
+    )
+    result = search.run(max_examples=1000, time_budget=5.0, max_evaluations=300)
+
+    near_misses = sum(len(parent) == 5 for parent in parents)
+    assert near_misses > len(parents) / 3
+    assert len(result.counter_examples) > 20
+
+
+def test_respects_evaluation_budget(color_domain):
+    """Test that the search stops at the evaluation budget for unbreakable rules."""
+    search = CounterExampleSearch(lambda seq: True, color_domain, seed=3)
+    result = search.run(max_examples=5, time_budget=10.0, max_evaluations=200)
+
+    assert result.counter_examples == []
+    assert result.evaluations == 200
+
+
+def test_seeds_and_rule_errors(color_domain):
+    """Test that explicit seeds are used and rule errors are ignored."""
+
+    def fragile(seq):
+        if len(seq) > 3:
+            raise ValueError("too long")
+        return no_triple_red(seq)
+
+    seed = [color_domain[0], color_domain[0]]
+    search = CounterExampleSearch(fragile, color_domain, max_length=5, seeds=[seed], seed=4)
+    result = search.run(max_examples=1, time_budget=5.0)
+
+    assert len(result.counter_examples) == 1
+    (example,) = result.counter_examples
+    assert [obj["color"] for obj in example] == ["red"] * 3
+
+
+def test_empty_domain_rejected():
+    """Test that an empty domain is rejected."""
+    with pytest.raises(ValueError):
+        CounterExampleSearch(no_triple_red, [])
+
+
+def test_parallel_search(color_domain):
+    """Test that workers run in parallel and results are merged without duplicates."""
+    result = search_counter_examples(
+        no_triple_red,
+        color_domain,
+        max_length=8,
+        max_examples=4,
+        time_budget=5.0,
+        workers=2,
+        seed=5,
+    )
+
+    assert len(result.counter_examples) == 4
+    assert len({tuple(seq) for seq in result.counter_examples}) == 4
+    assert all(not no_triple_red(seq) for seq in result.counter_examples)
+    assert result.evaluations_per_second > 0
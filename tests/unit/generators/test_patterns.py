@@ -2,12 +2,13 @@
 Unit tests for the pattern-based sequence generation functionality.
 """
 
+import random
 from unittest.mock import Mock
 
 import pytest
 
 from seqrule import AbstractObject
-from seqrule.generators import PropertyPattern
+from seqrule.generators import PatternSet, PropertyPattern
 
 
 @pytest.fixture
@@ -243,3 +244,67 @@ def test_property_pattern_with_dict_like_objects():
     empty_dict = {}
     test_sequence = [empty_dict]
     assert not pattern.matches(test_sequence)
+
+
+def test_pattern_set_agrees_with_individual_patterns():
+    """Test that a compiled PatternSet gives the same answers as each pattern."""
+    rng = random.Random(0)
+    colors = ["red", "green", "blue"]
+    patterns = []
+    for _ in range(60):
+        values = [rng.choice(colors) for _ in range(rng.randint(0, 4))]
+        is_cyclic = rng.random() < 0.3 and bool(values)
+        prop = rng.choice(["color", "shade"])
+        patterns.append(PropertyPattern(prop, values, is_cyclic=is_cyclic))
+    pattern_set = PatternSet(patterns)
+
+    for _ in range(300):
+        sequence = [
+            AbstractObject(color=rng.choice(colors), shade=rng.choice(colors))
+            for _ in range(rng.randint(0, 6))
+        ]
+        start_idx = rng.randint(0, 6)
+        expected = [p.matches(sequence, start_idx) for p in patterns]
+        assert pattern_set.match_each(sequence, start_idx) == expected
+        assert pattern_set.matches(sequence, start_idx) == all(expected)
+
+
+def test_pattern_set_find_occurrences():
+    """Test finding overlapping occurrences of several patterns in one pass."""
+    pattern_set = PatternSet(
+        [
+            PropertyPattern("color", ["red", "red"]),
+            PropertyPattern("color", ["red", "blue"]),
+            PropertyPattern("color", ["blue"]),
+            PropertyPattern("color", ["red"], is_cyclic=True),
+        ]
+    )
+    colors = ["red", "red", "red", "blue", "green", "blue"]
+    sequence = [AbstractObject(color=color) for color in colors]
+
+    assert pattern_set.find_occurrences(sequence) == {
+        0: [0, 1],
+        1: [2],
+        2: [3, 5],
+    }
+
+
+def test_pattern_set_fallbacks_and_add():
+    """Test unhashable and empty cyclic patterns, and adding patterns later."""
+    pattern_set = PatternSet()
+    assert pattern_set.matches([AbstractObject(tags=["a"])]) is True
+
+    pattern_set.add(PropertyPattern("tags", [["a"], ["b"]]))
+    assert len(pattern_set) == 1
+    sequence = [AbstractObject(tags=["a"]), AbstractObject(tags=["b"])]
+    assert pattern_set.matches(sequence) is True
+    assert pattern_set.matches(list(reversed(sequence))) is False
+
+    # Unhashable property values simply fail to match hashable patterns
+    hashable = PatternSet([PropertyPattern("tags", ["a"])])
+    assert hashable.matches(sequence) is False
+
+    # Negative start indices defer to the individual patterns
+    assert hashable.match_each(sequence, -1) == [
+        PropertyPattern("tags", ["a"]).matches(sequence, -1)
+    ]
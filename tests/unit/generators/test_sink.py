@@ -0,0 +1,125 @@
+"""
+Unit tests for the streaming sequence sinks.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from seqrule import AbstractObject
+from seqrule.generators import (
+    LazyGenerator,
+    SequenceSink,
+    read_sequences,
+    write_sequences,
+)
+
+
+@pytest.fixture
+def domain():
+    """Provide a small domain of numbered objects."""
+    return [AbstractObject(value=i, color=c) for i, c in enumerate("rgb")]
+
+
+def sequence_stream(domain, count):
+    """Yield ``count`` deterministic sequences, including the empty one."""
+    for i in range(count):
+        yield [domain[(i + j) % len(domain)] for j in range(i % 5)]
+
+
+def test_jsonl_sink(domain, tmp_path):
+    """Test that JSONL output holds one array of properties per line."""
+    path = str(tmp_path / "out.jsonl.gz")
+    written = write_sequences(sequence_stream(domain, 25), path, domain, batch_size=4)
+
+    assert written == 25
+    with gzip.open(path, "rt") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 25
+    expected = [[obj.properties for obj in seq] for seq in sequence_stream(domain, 25)]
+    assert lines == expected
+
+
+def test_csv_round_trip(domain, tmp_path):
+    """Test that CSV index output decodes back to the original sequences."""
+    for compress in (True, False):
+        path = str(tmp_path / f"out-{compress}.csv")
+        with SequenceSink(
+            path, domain, format="csv", batch_size=3, compress=compress
+        ) as sink:
+            sink.write_many(sequence_stream(domain, 10))
+            # Equal but distinct objects are matched by value
+            sink.write([AbstractObject(value=2, color="b")])
+
+        sequences = list(read_sequences(path, domain))
+        assert sequences == list(sequence_stream(domain, 10)) + [[domain[2]]]
+        assert sink.count == 11
+
+
+def test_frames_sink(domain, tmp_path):
+    """Test that frame output is readable with read_frames and accepts frames."""
+    pytest.importorskip("numpy")
+    from seqrule.generators import BulkGenerator, read_frames
+
+    directory = str(tmp_path / "frames")
+    bulk = BulkGenerator(domain, max_length=4, seed=1)
+    frame = bulk.frame(6)
+    with SequenceSink(directory, domain, format="frames", batch_size=5) as sink:
+        sink.write_many(sequence_stream(domain, 7))
+        sink.write_frame(frame)
+
+    assert len(sink.files) == 3
+    sequences = [seq for f in read_frames(directory, domain) for seq in f]
+    assert sequences == list(sequence_stream(domain, 7)) + frame.to_sequences()
+
+
+def test_frames_are_saved_as_arrays(domain, tmp_path):
+    """Test that frames keep their arrays and text formats still accept them."""
+    np = pytest.importorskip("numpy")
+    from seqrule.generators import BulkGenerator, SequenceFrame
+
+    frame = BulkGenerator(domain, max_length=6, seed=3).frame(50)
+    directory = str(tmp_path / "frames")
+    with SequenceSink(directory, domain, format="frames") as sink:
+        sink.write_frame(frame)
+
+    saved = SequenceFrame.load(sink.files[0], domain)
+    assert saved.indices.dtype == frame.indices.dtype
+    assert np.array_equal(saved.indices, frame.indices)
+    assert np.array_equal(saved.lengths, frame.lengths)
+    assert sink.count == 50
+
+    path = str(tmp_path / "frame.csv")
+    with SequenceSink(path, domain, format="csv") as sink:
+        sink.write_frame(frame)
+    assert list(read_sequences(path, domain)) == frame.to_sequences()
+
+
+def test_sink_consumes_generators(domain, tmp_path):
+    """Test that a lazy generator can be streamed straight to disk."""
+    path = str(tmp_path / "lazy.csv")
+    generator = LazyGenerator(domain, max_length=3, seed=2)
+    written = write_sequences(generator, path, domain, format="csv")
+
+    assert written == generator.emitted
+    assert len(list(read_sequences(path, domain))) == written
+
+
+def test_sink_errors(domain, tmp_path):
+    """Test that invalid input and writer failures are reported."""
+    with pytest.raises(ValueError):
+        SequenceSink(str(tmp_path / "x"), domain, format="parquet")
+
+    with SequenceSink(str(tmp_path / "x.csv"), domain, format="csv") as sink:
+        with pytest.raises(ValueError):
+            sink.write([AbstractObject(value=99)])
+    with pytest.raises(ValueError):
+        sink.write([domain[0]])
+
+    unwritable = tmp_path / "file"
+    unwritable.write_text("")
+    sink = SequenceSink(str(unwritable / "out.jsonl"), domain, batch_size=1)
+    with pytest.raises(RuntimeError):
+        sink.write_many(sequence_stream(domain, 50))
+        sink.close()
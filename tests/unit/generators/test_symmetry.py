@@ -0,0 +1,169 @@
+"""
+Unit tests for symmetry-aware enumeration.
+"""
+
+import copy
+import itertools
+import math
+
+import pytest
+
+from seqrule import AbstractObject
+from seqrule.generators import (
+    ConstrainedGenerator,
+    Symmetry,
+    SymmetryGroup,
+    expand_orbits,
+    property_permutations,
+)
+from seqrule.generators.constrained import GeneratorConfig
+
+SUITS = ["heart", "diamond", "spade", "club"]
+
+
+@pytest.fixture
+def card_domain():
+    """Provide cards of every suit with two values."""
+    return [AbstractObject(suit=suit, value=v) for suit in SUITS for v in (1, 2)]
+
+
+@pytest.fixture
+def dna_domain():
+    """Provide the four DNA bases."""
+    return [AbstractObject(base=b) for b in "ACGT"]
+
+
+def keys(sequences, prop):
+    """Reduce sequences to comparable tuples of one property."""
+    return [tuple(obj[prop] for obj in seq) for seq in sequences]
+
+
+def exhaustive(domain):
+    """Create a generator that enumerates every valid sequence."""
+    return ConstrainedGenerator(domain, GeneratorConfig(randomize_candidates=False))
+
+
+def no_repeated_suit(seq):
+    """Suit-symmetric rule: neighbouring cards have different suits."""
+    return all(a["suit"] != b["suit"] for a, b in zip(seq, seq[1:]))
+
+
+def test_group_closure(card_domain, dna_domain):
+    """Test that generating symmetries are closed into the full group."""
+    assert len(SymmetryGroup(card_domain, property_permutations("suit", SUITS))) == 24
+    assert len(SymmetryGroup(card_domain, [Symmetry.reversal()])) == 2
+
+    complement = {"A": "T", "T": "A", "C": "G", "G": "C"}
+    group = SymmetryGroup(
+        dna_domain, [Symmetry.property_map("base", complement), Symmetry.reversal()]
+    )
+    assert len(group) == 4
+
+
+def test_canonical_enumeration_covers_all_orbits(card_domain):
+    """Test that canonical representatives and their orbits cover every sequence."""
+    full = keys(
+        exhaustive(card_domain).add_constraint(no_repeated_suit).generate(3), "suit"
+    )
+
+    generator = exhaustive(card_domain).add_constraint(no_repeated_suit)
+    for symmetry in property_permutations("suit", SUITS):
+        generator.add_symmetry(symmetry)
+    canonical = list(generator.generate(3))
+
+    group = generator.symmetry_group
+    assert len(canonical) < len(full) / 5
+    assert sum(group.orbit_size(seq) for seq in canonical) == len(full)
+    assert all(seq[0]["suit"] == "heart" for seq in canonical if seq)
+
+    expanded = keys(generator.generate(3, expand_orbits=True), "suit")
+    assert sorted(expanded) == sorted(full)
+    assert sorted(keys(expand_orbits(group, iter(canonical)), "suit")) == sorted(full)
+
+
+def test_reverse_complement(dna_domain):
+    """Test enumeration of DNA strands up to reverse complement."""
+    complement = {"A": "T", "T": "A", "C": "G", "G": "C"}
+    generator = exhaustive(dna_domain).add_symmetry(
+        Symmetry.property_map("base", complement, reverse=True)
+    )
+    strands = ["".join(k) for k in keys(generator.generate(4), "base")]
+
+    assert len(strands) == len(set(strands))
+    # 4**4 strands of length 4 form (256 + 16) / 2 classes
+    assert sum(len(s) == 4 for s in strands) == 136
+    assert "AAAA" in strands and "TTTT" not in strands
+
+
+def test_orbits_of_equal_objects(dna_domain):
+    """Test that objects equal to domain objects are looked up by value."""
+    group = SymmetryGroup(dna_domain, [Symmetry.reversal()])
+    strand = [AbstractObject(base=b) for b in "ACG"]
+
+    assert group.indices(strand) == [0, 1, 2]
+    assert group.orbit_size(strand) == 2
+    assert keys(group.orbit(strand), "base") == [tuple("ACG"), tuple("GCA")]
+
+    with pytest.raises(ValueError, match="not part of"):
+        group.indices([AbstractObject(base="U")])
+
+
+def test_invalid_symmetries(card_domain):
+    """Test that symmetries leaving the domain are rejected."""
+    outside = Symmetry.property_map("suit", {"heart": "star"})
+    with pytest.raises(ValueError):
+        SymmetryGroup(card_domain, [outside])
+
+    collapse = Symmetry(lambda obj: card_domain[0])
+    with pytest.raises(ValueError):
+        SymmetryGroup(card_domain, [collapse])
+
+
+def enumerated(symmetries):
+    """Copies of symmetries that are closed by enumerating the group."""
+    copies = [copy.copy(symmetry) for symmetry in symmetries]
+    for symmetry in copies:
+        symmetry.permutes = None
+    return copies
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        [],
+        [Symmetry.reversal()],
+        property_permutations("value", [1, 2]),
+    ],
+)
+def test_value_permutations_match_enumeration(card_domain, extra):
+    """Test that canonicalizing value permutations agrees with enumeration."""
+    symmetries = property_permutations("suit", SUITS) + extra
+    direct = SymmetryGroup(card_domain, symmetries)
+    group = SymmetryGroup(card_domain, enumerated(symmetries))
+
+    assert len(direct) == len(group)
+    for length in range(4):
+        for indices in itertools.product(range(len(card_domain)), repeat=length):
+            indices = list(indices)
+            assert direct.is_canonical_prefix(indices) == group.is_canonical_prefix(
+                indices
+            )
+            assert direct.is_canonical(indices) == group.is_canonical(indices)
+            sequence = [card_domain[i] for i in indices]
+            assert direct.orbit_size(sequence) == group.orbit_size(sequence)
+
+
+def test_large_value_permutations_are_not_enumerated():
+    """Test that n! permutations are canonicalized without enumerating them."""
+    domain = [AbstractObject(color=i) for i in range(20)]
+    symmetries = property_permutations("color", list(range(20)))
+
+    group = SymmetryGroup(domain, symmetries)
+
+    assert len(group) == math.factorial(20)
+    assert group.is_canonical([0, 1, 0, 2])
+    assert not group.is_canonical_prefix([0, 2])
+    assert group.orbit_size(domain[:2]) == 20 * 19
+
+    with pytest.raises(ValueError, match="property_permutations"):
+        SymmetryGroup(domain, enumerated(symmetries))